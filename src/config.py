@@ -1,9 +1,90 @@
+import json
+import logging
+import os
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 # Construye una ruta al directorio 'CasosOpenFOAM' en la carpeta de inicio del usuario.
 # Esto funciona tanto en Windows (C:\Users\username\CasosOpenFOAM) como en Linux (/home/username/CasosOpenFOAM).
 RUTA_LOCAL = Path.home() / "CasosOpenFOAM"
 
-def create_dir():    
+# Configuración de ejecución propia de cada máquina: qué backend corre los scripts
+# de OpenFOAM (Docker, instalación nativa o el backend falso para benchmarks).
+EXECUTION_CONFIG_PATH = RUTA_LOCAL / "execution_config.json"
+
+# Variable de entorno que permite forzar el backend sin editar el archivo
+BACKEND_ENV_VAR = "HIDROSIM_BACKEND"
+
+DEFAULT_EXECUTION_CONFIG = {
+    "backend": "docker",
+    "docker": {
+        "image": "cbonamy/sedfoam_2312_ubuntu",
+    },
+    "native": {
+        "openfoam_bashrc": "/usr/lib/openfoam/openfoam2312/etc/bashrc",
+    },
+    "fake": {
+        "steps_per_second": 50.0,
+        "delta_t": 0.001,
+        "end_time": None,
+        "write_interval": None,
+    },
+    # Corridas paralelas: conservar los processor* entre corridas si la malla y la
+    # descomposición no cambiaron, y qué tiempos reconstruir al terminar
+    # ('latest', 'all' o 'none'; el resto se reconstruye bajo demanda).
+    # Al mallar en paralelo: checkMesh opcional y reconstruir la malla enseguida
+    # o recién cuando un paso serial la necesite.
+    "parallel": {
+        "keep_decomposed": True,
+        "reconstruct": "latest",
+        "check_mesh": False,
+        "reconstruct_mesh": False,
+    },
+    # Visor de geometría: frecuencia máxima del picking al pasar el mouse (o, con
+    # 'hover_on_idle', picking recién cuando el mouse se detiene), picking por
+    # hardware (z-buffer) en lugar del localizador de celdas, el contador de
+    # tiempo por cuadro para depurar y el nivel de detalle: mallas de más de
+    # 'lod_threshold' triángulos se dibujan diezmadas a 'lod_triangle_budget'
+    # mientras se mueve la cámara (0 lo desactiva).
+    "viewer": {
+        "hover_pick_hz": 30,
+        "hover_on_idle": False,
+        "hardware_picking": False,
+        "frame_time_overlay": False,
+        "lod_triangle_budget": 300000,
+        "lod_threshold": 1000000,
+        "playback_fps": 10,
+        "frame_cache_mb": 512,
+        "prefetch_frames": 4,
+    },
+}
+
+def create_dir():
     # Crea el directorio si no existe para asegurar que esté disponible.
     RUTA_LOCAL.mkdir(exist_ok=True)
+
+def load_execution_config(path: Path = None) -> dict:
+    """
+    Lee la configuración de ejecución de la máquina, completando con los valores
+    por defecto las claves que falten.
+    """
+    path = path or EXECUTION_CONFIG_PATH
+    config = json.loads(json.dumps(DEFAULT_EXECUTION_CONFIG))
+
+    if path.exists():
+        try:
+            with open(path, 'r') as f:
+                user_config = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"No se pudo leer la configuración de ejecución {path}: {e}. Se usan los valores por defecto.")
+            user_config = {}
+        for key, value in user_config.items():
+            if isinstance(value, dict) and isinstance(config.get(key), dict):
+                config[key].update(value)
+            else:
+                config[key] = value
+
+    if os.environ.get(BACKEND_ENV_VAR):
+        config["backend"] = os.environ[BACKEND_ENV_VAR]
+    return config
@@ -0,0 +1,327 @@
+import asyncio
+import inspect
+import logging
+import os
+import random
+import re
+import shutil
+import signal
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+
+from .exceptions import DockerHandlerError, DockerNotInstalledError
+from .docker_job import DockerJob, STREAM_LIMIT
+from .docker_engine import EngineDockerJob, get_engine_client
+
+logger = logging.getLogger(__name__)
+
+SCRIPTS_DIR = Path(__file__).parent
+CONTAINER_SCRIPTS_DIR = "/scripts"
+
+# Scripts que corren un solver (el resto genera o convierte la malla)
+SOLVER_SCRIPTS = (
+    'run_openfoam.sh', 'run_openfoam_parallel.sh',
+    'run_sedfoam.sh', 'run_sedfoam_parallel.sh',
+)
+
+
+class ExecutionBackend(ABC):
+    """
+    Interfaz de los backends que ejecutan los scripts de OpenFOAM de un caso.
+
+    'start' lanza el script sin esperar a que termine y devuelve un trabajo con
+    la interfaz de DockerJob (iteración asíncrona de las líneas, 'wait',
+    'cancel' y 'close').
+    """
+    name = ""
+
+    @abstractmethod
+    async def start(self, script_name: str, num_processors: int, work_dir: str, case_path: Path,
+                    job_name: str, temp_dir: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> DockerJob:
+        """
+        Args:
+            script_name: El nombre del script a ejecutar (ej. "run_openfoam.sh").
+            num_processors: El número de procesadores para correr la simulación.
+            work_dir: Carpeta sobre la que corre el script (el caso o una copia temporal).
+            case_path: Carpeta del caso, donde se copian los resultados de 'temp_dir'.
+            job_name: Nombre único del trabajo (nombre del contenedor en Docker).
+            temp_dir: Carpeta temporal a copiar al caso y eliminar al terminar.
+            env: Variables de entorno adicionales para el script.
+        """
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Indica si el backend puede ejecutar scripts en esta máquina."""
+
+
+class DockerBackend(ExecutionBackend):
+    """Ejecuta los scripts dentro de un contenedor de la imagen de OpenFOAM."""
+    name = "docker"
+
+    def __init__(self, image: str = "cbonamy/sedfoam_2312_ubuntu"):
+        self.image = image
+
+    async def start(self, script_name, num_processors, work_dir, case_path, job_name, temp_dir=None, env=None):
+        # Se monta la carpeta de scripts completa para que puedan incluir funciones compartidas
+        script_in_container = f"{CONTAINER_SCRIPTS_DIR}/{script_name}"
+        binds = [f"{work_dir}:/case", f"{SCRIPTS_DIR.as_posix()}:{CONTAINER_SCRIPTS_DIR}:ro"]
+
+        engine_client = get_engine_client()
+        if engine_client is not None:
+            # Con el socket del Engine disponible, el contenedor se maneja por la API
+            # sin lanzar procesos de la CLI.
+            container_id = await asyncio.to_thread(
+                engine_client.create_container,
+                self.image,
+                [script_in_container, str(num_processors)],
+                binds,
+                job_name,
+                ["bash"],
+                env,
+            )
+            await asyncio.to_thread(engine_client.start_container, container_id)
+            return EngineDockerJob(engine_client, container_id, script_name, job_name, case_path, temp_dir)
+
+        env_args = []
+        for key, value in (env or {}).items():
+            env_args += ["-e", f"{key}={value}"]
+
+        docker_command = [
+            "docker", "run", "--name", job_name,
+            "-v", binds[0],
+            "-v", binds[1],
+            *env_args,
+            "--entrypoint", "bash", self.image,
+            script_in_container, str(num_processors)
+        ]
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *docker_command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+                limit=STREAM_LIMIT
+            )
+        except FileNotFoundError:
+            raise DockerNotInstalledError("Docker no está instalado o no se encuentra en el PATH del sistema.")
+        return DockerJob(script_name, job_name, process, case_path, temp_dir)
+
+    def is_available(self) -> bool:
+        # Import diferido: el monitor de salud vive en dockerHandler
+        from .dockerHandler import get_health_monitor
+        return get_health_monitor().is_healthy()
+
+
+class ProcessJob(DockerJob):
+    """Un script ejecutándose como proceso local (sin contenedor)."""
+
+    async def cancel(self, timeout: int = 10) -> bool:
+        self.was_cancelled = True
+        if self.process.returncode is not None:
+            return True
+        # Se termina todo el grupo de procesos para alcanzar también a mpirun y al solver
+        _signal_process_group(self.process, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout)
+        except asyncio.TimeoutError:
+            _signal_process_group(self.process, getattr(signal, "SIGKILL", signal.SIGTERM))
+            await self.process.wait()
+        logger.info(f"Proceso {self.container_name} detenido.")
+        return True
+
+    async def _remove_container(self):
+        pass
+
+
+def _signal_process_group(process, sig):
+    try:
+        if sys.platform.startswith("win"):
+            process.send_signal(sig)
+        else:
+            os.killpg(process.pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+class NativeBackend(ExecutionBackend):
+    """
+    Ejecuta los scripts con una instalación nativa de OpenFOAM (por ejemplo en
+    los nodos del cluster), sin la capa del contenedor.
+    """
+    name = "native"
+
+    def __init__(self, openfoam_bashrc: str = "/usr/lib/openfoam/openfoam2312/etc/bashrc"):
+        self.openfoam_bashrc = openfoam_bashrc
+
+    async def start(self, script_name, num_processors, work_dir, case_path, job_name, temp_dir=None, env=None):
+        env = dict(os.environ, **(env or {}), CASE_DIR=str(work_dir), FOAM_BASHRC=self.openfoam_bashrc)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "bash", str(SCRIPTS_DIR / script_name), str(num_processors),
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+                limit=STREAM_LIMIT, cwd=str(work_dir), env=env,
+                start_new_session=not sys.platform.startswith("win")
+            )
+        except FileNotFoundError:
+            raise DockerHandlerError("No se encontró 'bash' para ejecutar los scripts de OpenFOAM.")
+        return ProcessJob(script_name, job_name, process, case_path, temp_dir)
+
+    def is_available(self) -> bool:
+        if not Path(self.openfoam_bashrc).exists():
+            logger.warning(f"No se encontró la instalación de OpenFOAM ({self.openfoam_bashrc}).")
+            return False
+        return True
+
+
+class FakeJob(DockerJob):
+    """
+    Trabajo simulado en el mismo proceso: emite un log con el formato de los
+    solvers de OpenFOAM y escribe carpetas de tiempo al ritmo configurado.
+    """
+
+    def __init__(self, script_name: str, job_name: str, work_dir: Path, case_path: Path,
+                 num_processors: int, steps_per_second: float, delta_t: float,
+                 end_time: float, write_interval: float, temp_dir: Optional[str] = None):
+        super().__init__(script_name, job_name, None, case_path, temp_dir)
+        self.work_dir = Path(work_dir)
+        self.num_processors = num_processors
+        self.steps_per_second = steps_per_second
+        self.delta_t = delta_t
+        self.end_time = end_time
+        self.write_interval = write_interval
+        self._finished = asyncio.Event()
+
+    async def lines(self) -> AsyncIterator[str]:
+        try:
+            if self.script_name in SOLVER_SCRIPTS:
+                async for line in self._solver_lines():
+                    yield line
+            else:
+                for line in (f"Running {self.script_name} (fake backend)", "Mesh OK.", "End"):
+                    yield line
+        finally:
+            self._finished.set()
+
+    async def _solver_lines(self) -> AsyncIterator[str]:
+        rng = random.Random(0)
+        period = 1.0 / self.steps_per_second if self.steps_per_second > 0 else 0.0
+        yield f"Fake solver: {self.num_processors} processor(s), endTime = {self.end_time:g}"
+
+        step = 0
+        sim_time = 0.0
+        next_write = self.write_interval
+        while sim_time < self.end_time - 1e-12 and not self.was_cancelled:
+            step += 1
+            sim_time = min(step * self.delta_t, self.end_time)
+            courant = 0.3 + 0.1 * rng.random()
+            yield f"Courant Number mean: {courant / 10:.6g} max: {courant:.6g}"
+            yield f"Interface Courant Number mean: 0 max: {courant / 2:.6g}"
+            yield f"deltaT = {self.delta_t:g}"
+            yield f"Time = {sim_time:g}"
+            yield ""
+            yield "PIMPLE: iteration 1"
+            yield (f"smoothSolver:  Solving for alpha.water, Initial residual = {rng.random() * 1e-3:.6g}, "
+                   f"Final residual = {rng.random() * 1e-9:.6g}, No Iterations 1")
+            yield (f"DICPCG:  Solving for p_rgh, Initial residual = {rng.random() * 1e-2:.6g}, "
+                   f"Final residual = {rng.random() * 1e-8:.6g}, No Iterations {rng.randint(5, 30)}")
+            yield f"ExecutionTime = {step * period:.4g} s  ClockTime = {int(step * period)} s"
+            yield ""
+
+            if sim_time >= next_write - 1e-12 or sim_time >= self.end_time - 1e-12:
+                await asyncio.to_thread(self._write_time_directory, sim_time)
+                next_write += self.write_interval
+            await asyncio.sleep(period)
+
+        if not self.was_cancelled:
+            yield "End"
+
+    def _write_time_directory(self, sim_time: float):
+        """Crea la carpeta de tiempo copiando los campos de '0' (si existen)."""
+        time_dir = self.work_dir / f"{sim_time:g}"
+        initial_dir = self.work_dir / "0"
+        if initial_dir.is_dir():
+            shutil.copytree(initial_dir, time_dir, dirs_exist_ok=True)
+        else:
+            time_dir.mkdir(parents=True, exist_ok=True)
+
+    async def _wait_for_exit(self) -> int:
+        if not self.was_cancelled:
+            await self._finished.wait()
+        return 0
+
+    async def cancel(self, timeout: int = 10) -> bool:
+        self.was_cancelled = True
+        return True
+
+    async def _remove_container(self):
+        pass
+
+
+class FakeBackend(ExecutionBackend):
+    """
+    Backend falso para medir todo el pipeline sin OpenFOAM: genera un log
+    realista y carpetas de tiempo a una tasa configurable.
+    """
+    name = "fake"
+
+    def __init__(self, steps_per_second: float = 50.0, delta_t: float = 0.001,
+                 end_time: Optional[float] = None, write_interval: Optional[float] = None):
+        self.steps_per_second = steps_per_second
+        self.delta_t = delta_t
+        self.end_time = end_time
+        self.write_interval = write_interval
+
+    async def start(self, script_name, num_processors, work_dir, case_path, job_name, temp_dir=None, env=None):
+        control = _read_control_dict(Path(work_dir))
+        end_time = self.end_time if self.end_time is not None else control.get('endTime', 100 * self.delta_t)
+        write_interval = self.write_interval if self.write_interval is not None else control.get('writeInterval', end_time)
+        return FakeJob(script_name, job_name, Path(work_dir), case_path, num_processors,
+                       self.steps_per_second, self.delta_t, end_time, write_interval, temp_dir)
+
+    def is_available(self) -> bool:
+        return True
+
+
+def _read_control_dict(case_dir: Path) -> dict:
+    """Lee endTime y writeInterval del controlDict del caso, si existe."""
+    values = {}
+    control_dict = case_dir / "system" / "controlDict"
+    if not control_dict.exists():
+        return values
+    text = control_dict.read_text(errors="replace")
+    for key in ('endTime', 'writeInterval'):
+        match = re.search(rf'^\s*{key}\s+([-+0-9.eE]+)\s*;', text, re.MULTILINE)
+        if match:
+            values[key] = float(match.group(1))
+    return values
+
+
+BACKENDS = {
+    DockerBackend.name: DockerBackend,
+    NativeBackend.name: NativeBackend,
+    FakeBackend.name: FakeBackend,
+}
+
+
+def create_backend(config: dict) -> ExecutionBackend:
+    """
+    Crea el backend indicado en la configuración de ejecución de la máquina
+    (ver 'load_execution_config' en src/config.py).
+
+    Las opciones de la sección del backend que su constructor no acepta (por
+    ejemplo, una clave mal escrita) se ignoran con una advertencia.
+
+    Raises:
+        DockerHandlerError: Si el backend configurado no existe.
+    """
+    name = config.get("backend", DockerBackend.name)
+    if name not in BACKENDS:
+        raise DockerHandlerError(f"Backend de ejecución desconocido: '{name}'. Opciones: {', '.join(BACKENDS)}.")
+    backend_class = BACKENDS[name]
+    accepted = inspect.signature(backend_class).parameters
+    options = config.get(name) or {}
+    unknown = [key for key in options if key not in accepted]
+    if unknown:
+        logger.warning(f"Opciones desconocidas para el backend '{name}' en la configuración de ejecución: "
+                       f"{', '.join(unknown)}. Se ignoran (opciones válidas: {', '.join(accepted)}).")
+    return backend_class(**{key: value for key, value in options.items() if key in accepted})
@@ -96,7 +96,7 @@
 
 
 
-#     def execute_script_in_docker(self, script_name: str, num_processors: int = 1):
+#     def execute_script_in_docker(self, script_name: str, num_processors: int = 1, env: dict = None):
 #         """
 #         Ejecuta un script dentro de un contenedor Docker y transmite la salida.
 
@@ -269,24 +269,91 @@
 
 
 from pathlib import Path
+import asyncio
 import subprocess
 import logging
 import uuid
 import tempfile
 import shutil
-from .exceptions import DockerNotInstalledError, ContainerExecutionError
+from .exceptions import DockerNotInstalledError, ContainerExecutionError, DockerDaemonError
+from .docker_job import DockerJob, iterate_async, stop_container
+from .docker_engine import DaemonHealthMonitor, get_engine_client
+from .backends import ExecutionBackend, DockerBackend, create_backend
+from src.config import load_execution_config
+from src.file_handler.decomposed_case import mesh_is_decomposed, discard_decomposed_mesh
+from src.file_handler.mesh_cache import reset_lineage
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Scripts que importan la malla del caso fuera del pipeline de mallado
+MESH_IMPORTING_SCRIPTS = ('run_transform_blockMeshDict.sh', 'run_transform_UNV.sh')
+
+# Scripts que generan una malla nueva desde cero
+MESH_REPLACING_SCRIPTS = ('run_blockMeshDict.sh',) + MESH_IMPORTING_SCRIPTS
+
+# Tiempo (en segundos) durante el cual se reutiliza el último estado conocido del demonio
+DOCKER_HEALTH_TTL = 30.0
+
+
+def _check_docker_daemon() -> bool:
+    """
+    Verifica el demonio de Docker: por la API del Engine (un GET /_ping sobre
+    una conexión persistente) si hay socket, o con 'docker info' si no lo hay.
+    """
+    client = get_engine_client()
+    if client is not None:
+        if client.ping():
+            return True
+        logger.warning("El demonio de Docker no responde en su socket.")
+        return False
+
+    try:
+        subprocess.run(
+            ["docker", "info"],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        return True
+    except FileNotFoundError:
+        logger.warning("Comando 'docker' no encontrado. Docker puede no estar instalado o no estar en el PATH.")
+        return False
+    except subprocess.CalledProcessError:
+        logger.warning("El demonio de Docker no está corriendo o no es accesible (el comando 'docker info' falló).")
+        return False
+
+
+_health_monitor = None
+
+
+def get_health_monitor() -> DaemonHealthMonitor:
+    """Devuelve el monitor compartido del estado del demonio de Docker."""
+    global _health_monitor
+    if _health_monitor is None:
+        _health_monitor = DaemonHealthMonitor(_check_docker_daemon, ttl=DOCKER_HEALTH_TTL)
+    return _health_monitor
+
+
+def reset_health_cache():
+    """Descarta el estado cacheado del demonio (y detiene su refresco en segundo plano)."""
+    global _health_monitor
+    if _health_monitor is not None:
+        _health_monitor.stop()
+    _health_monitor = None
+
+
 class DockerHandler():
-    def __init__(self,case_path:Path):
+    def __init__(self,case_path:Path, backend: ExecutionBackend = None):
         self.case_path = case_path
-        self.IMAGEN_SEDFOAM = "cbonamy/sedfoam_2312_ubuntu"
+        # El backend (Docker, OpenFOAM nativo o falso) se elige por máquina en la configuración
+        self.backend = backend or create_backend(load_execution_config())
+        self.IMAGEN_SEDFOAM = getattr(self.backend, "image", "cbonamy/sedfoam_2312_ubuntu")
         self.process = None
         self.was_stopped_by_user = False
         self.container_name = None
+        self.current_job = None
 
     # def execute_script_in_docker(self, script_name: str):
     #     """
@@ -366,75 +433,104 @@ class DockerHandler():
 
 
 
-    def execute_script_in_docker(self, script_name: str, num_processors: int = 1):
+    async def start_job(self, script_name: str, num_processors: int = 1, env: dict = None) -> DockerJob:
         """
-        Ejecuta un script dentro de un contenedor Docker y transmite la salida.
+        Lanza un script con el backend de ejecución (por defecto, dentro de un
+        contenedor Docker) sin esperar a que termine.
         Args:
             script_name (str): El nombre del script a ejecutar (ej. "run_openfoam.sh").
-        Yields:
-            str: Una línea de la salida del script.
             num_processors (int): El número de procesadores para correr la simulación.
+            env (dict): Variables de entorno adicionales para el script.
+        Returns:
+            DockerJob: El trabajo en ejecución, cuya salida se itera con 'async for'.
         Raises:
             DockerNotInstalledError: Si el comando 'docker' no se encuentra.
-            ContainerExecutionError: Si el script de Docker falla.
+            DockerDaemonError: Si la API del Docker Engine rechaza la creación del contenedor.
         """
         self.process = None
         self.was_stopped_by_user = False
 
-        # self.container_name = f"hidrosim-{self.case_path.name}-{uuid.uuid4().hex[:8]}"
-        self.container_name = f"hidrosim-{self.case_path.name.replace(' ', '-')}-{uuid.uuid4().hex[:8]}"
-        local_script_path = Path(__file__).parent / script_name
-        script_in_container = f"/{script_name}"
+        container_name = f"hidrosim-{self.case_path.name.replace(' ', '-')}-{uuid.uuid4().hex[:8]}"
+        self.container_name = container_name
 
+        # run_foamToVTK.sh corre sobre el caso: convierte solo lo pedido y puede necesitar los tiempos
         scripts_without_0_dir = [
             'run_blockMeshDict.sh', 'run_extrudeMesh.sh',
-            'run_transform_blockMeshDict.sh', 'run_transform_UNV.sh', 'run_foamToVTK.sh'
+            'run_transform_blockMeshDict.sh', 'run_transform_UNV.sh'
         ]
 
+        use_temp_dir = script_name in scripts_without_0_dir
+        if script_name in MESH_REPLACING_SCRIPTS:
+            # La malla nueva reemplaza a la que haya quedado descompuesta
+            await asyncio.to_thread(discard_decomposed_mesh, self.case_path)
+            if script_name in MESH_IMPORTING_SCRIPTS:
+                # El pipeline de mallado ya no sabe de qué nodos sale la malla
+                await asyncio.to_thread(reset_lineage, self.case_path)
+        elif use_temp_dir and mesh_is_decomposed(self.case_path):
+            # La malla actual está solo en processor*: el script la usa (o la reconstruye) en el caso
+            use_temp_dir = False
+
         temp_dir = None
-        try:
-            if script_name in scripts_without_0_dir:
-                temp_dir = tempfile.mkdtemp()
-                system_path = self.case_path / "system"
-                if system_path.exists():
-                    shutil.copytree(system_path, Path(temp_dir) / "system")
-
-                constant_path = self.case_path / "constant"
-                if constant_path.exists():
-                    shutil.copytree(constant_path, Path(temp_dir) / "constant")
-                ruta_docker_volumen = temp_dir
-            else:
-                ruta_docker_volumen = self.case_path.as_posix()
-
-            docker_command = [
-                "docker", "run", "--name", self.container_name,
-                "-v", f"{ruta_docker_volumen}:/case",
-                "-v", f"{local_script_path.as_posix()}:{script_in_container}",
-                "--entrypoint", "bash", self.IMAGEN_SEDFOAM,
-                script_in_container, str(num_processors)
-            ]
-            
-            try:
-                self.process = subprocess.Popen(
-                    docker_command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                    text=True, bufsize=1, universal_newlines=True
-                )
-            except FileNotFoundError:
-                yield "Error: Comando 'docker' no encontrado"
-                raise DockerNotInstalledError("Docker no está instalado o no se encuentra en el PATH del sistema.")
-
-            if self.process.stdout:
-                for line in iter(self.process.stdout.readline, ''):
-                    if self.was_stopped_by_user:
-                        break
-                    yield line.strip()
-            
-            if self.process.stdout:
-                self.process.stdout.close()
-            return_code = self.process.wait()
+        if use_temp_dir:
+            temp_dir = await asyncio.to_thread(self._prepare_temp_case)
+            work_dir = temp_dir
+        else:
+            work_dir = self.case_path.as_posix()
 
+        try:
+            job = await self.backend.start(script_name, num_processors, work_dir, self.case_path,
+                                           container_name, temp_dir, env)
+        except Exception:
             if temp_dir:
-                shutil.copytree(temp_dir, self.case_path, dirs_exist_ok=True)
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        self.process = job.process
+        self.current_job = job
+        return self.current_job
+
+    def _prepare_temp_case(self) -> str:
+        """Copia 'system' y 'constant' a una carpeta temporal para los scripts de malla."""
+        temp_dir = tempfile.mkdtemp()
+        system_path = self.case_path / "system"
+        if system_path.exists():
+            shutil.copytree(system_path, Path(temp_dir) / "system")
+
+        constant_path = self.case_path / "constant"
+        if constant_path.exists():
+            shutil.copytree(constant_path, Path(temp_dir) / "constant")
+        return temp_dir
+
+    async def stream_script(self, script_name: str, num_processors: int = 1, env: dict = None):
+        """
+        Ejecuta un script dentro de un contenedor Docker y transmite la salida
+        como un iterador asíncrono.
+        Args:
+            script_name (str): El nombre del script a ejecutar (ej. "run_openfoam.sh").
+            num_processors (int): El número de procesadores para correr la simulación.
+            env (dict): Variables de entorno adicionales para el script.
+        Yields:
+            str: Una línea de la salida del script.
+        Raises:
+            DockerNotInstalledError: Si el comando 'docker' no se encuentra.
+            ContainerExecutionError: Si el script de Docker falla.
+        """
+        try:
+            job = await self.start_job(script_name, num_processors, env)
+        except DockerNotInstalledError:
+            yield "Error: Comando 'docker' no encontrado"
+            raise
+        except DockerDaemonError as e:
+            yield f"Error: {e}"
+            raise
+
+        try:
+            async for line in job:
+                if self.was_stopped_by_user:
+                    break
+                yield line
+
+            return_code = await job.wait(check=False)
 
             if self.was_stopped_by_user:
                 yield "La simulación fue detenida por el usuario."
@@ -444,22 +540,46 @@ class DockerHandler():
                 error_message = f"La ejecución de {script_name} falló con código de retorno {return_code}."
                 yield f"Error: La ejecución de {script_name} falló"
                 raise ContainerExecutionError(error_message)
-
         finally:
-            if temp_dir:
-                shutil.rmtree(temp_dir)
-            
-            if self.container_name:
-                logger.info(f"Limpiando el contenedor {self.container_name}...")
-                subprocess.run(["docker", "rm", self.container_name], check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            await job.close()
+            if self.current_job is job:
+                self.current_job = None
 
+    def execute_script_in_docker(self, script_name: str, num_processors: int = 1, env: dict = None):
+        """
+        Versión síncrona de 'stream_script': ejecuta un script dentro de un
+        contenedor Docker y transmite la salida.
+        Args:
+            script_name (str): El nombre del script a ejecutar (ej. "run_openfoam.sh").
+            num_processors (int): El número de procesadores para correr la simulación.
+            env (dict): Variables de entorno adicionales para el script.
+        Yields:
+            str: Una línea de la salida del script.
+        Raises:
+            DockerNotInstalledError: Si el comando 'docker' no se encuentra.
+            ContainerExecutionError: Si el script de Docker falla.
+        """
+        yield from iterate_async(self.stream_script(script_name, num_processors, env))
 
+    async def stop_simulation_async(self, timeout: int = 10) -> bool:
+        """
+        Detiene el contenedor en curso sin bloquear el event loop.
+        """
+        if not self.container_name:
+            logger.warning("No hay ningún nombre de contenedor registrado para detener.")
+            return False
 
+        self.was_stopped_by_user = True
+        if self.current_job and self.current_job.container_name == self.container_name:
+            return await self.current_job.cancel(timeout)
+        if not isinstance(self.backend, DockerBackend):
+            return False
+        return await stop_container(self.container_name, timeout)
 
-        
     def stop_simulation(self):
         """
         Detiene el contenedor de Docker en curso usando su nombre.
+        Este método es bloqueante; desde la GUI se usa 'stop_simulation_async'.
         """
         if self.container_name:
             logger.info(f"Intentando detener el contenedor: {self.container_name}")
@@ -489,28 +609,27 @@ class DockerHandler():
             logger.warning("No hay ningún nombre de contenedor registrado para detener.")
             return False
         
-    def is_docker_running(self) -> bool:
+    def is_docker_running(self, use_cache: bool = True) -> bool:
         """
         Verifica si el servicio de Docker está en ejecución y es accesible.
-        
+        El resultado se cachea durante DOCKER_HEALTH_TTL segundos y se refresca
+        en segundo plano.
+
+        Args:
+            use_cache (bool): Si es False, fuerza una nueva verificación.
+
         Returns:
             bool: True si Docker está corriendo y es accesible, False en caso contrario.
         """
-        try:
-            subprocess.run(
-                ["docker", "info"],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-            return True
-        except FileNotFoundError:
-            logger.warning("Comando 'docker' no encontrado. Docker puede no estar instalado o no estar en el PATH.")
-            return False
-        except subprocess.CalledProcessError:
-            logger.warning("El demonio de Docker no está corriendo o no es accesible (el comando 'docker info' falló).")
-            return False
-        
+        if not isinstance(self.backend, DockerBackend):
+            # Con OpenFOAM nativo o el backend falso no hace falta el demonio de Docker
+            return self.backend.is_available()
+
+        monitor = get_health_monitor()
+        if use_cache:
+            return monitor.is_healthy()
+        return monitor.refresh()
+
     def prepare_case_for_paraview(self):
         """
         Crea un archivo .foam en el directorio del caso para que ParaView lo reconozca.
@@ -521,6 +640,11 @@ class DockerHandler():
         """
         ruta_docker_volumen = self.case_path.as_posix()
         nombre_caso = self.case_path.name
+
+        if not isinstance(self.backend, DockerBackend):
+            # Sin contenedor, el archivo se crea directamente en el caso
+            (self.case_path / f"{nombre_caso}.foam").touch()
+            return True
         
         # El comando 'touch' crea el archivo .foam
         command = f"cd /case && touch {nombre_caso}.foam"
@@ -0,0 +1,403 @@
+import asyncio
+import http.client
+import json
+import logging
+import os
+import queue
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlencode, quote
+
+from .docker_job import DockerJob
+from .exceptions import DockerDaemonError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = "/var/run/docker.sock"
+API_VERSION = "v1.41"
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """Conexión HTTP/1.1 sobre un socket Unix."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class DockerEngineClient:
+    """
+    Cliente mínimo de la API del Docker Engine sobre el socket Unix.
+
+    Reutiliza conexiones persistentes (keep-alive) desde un pool, de modo que
+    las consultas de estado y las operaciones sobre contenedores no lanzan un
+    proceso de la CLI de Docker cada vez.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 30.0, pool_size: int = 4):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    # --- Manejo de conexiones ---
+
+    def _new_connection(self, timeout: Optional[float] = None) -> UnixHTTPConnection:
+        return UnixHTTPConnection(self.socket_path, timeout=self.timeout if timeout is None else timeout)
+
+    def _acquire(self) -> UnixHTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _release(self, conn: UnixHTTPConnection):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        """Cierra todas las conexiones del pool."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _url(self, path: str, params: Dict = None) -> str:
+        url = f"/{API_VERSION}{path}"
+        if params:
+            url += "?" + urlencode(params)
+        return url
+
+    def _request(self, method: str, path: str, params: Dict = None, body=None) -> tuple:
+        """
+        Realiza una petición reutilizando una conexión del pool.
+
+        Returns:
+            tuple: (status, cuerpo en bytes).
+
+        Raises:
+            DockerDaemonError: Si no se puede contactar al demonio.
+        """
+        headers = {"Host": "docker"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+
+        url = self._url(path, params)
+        # Un reintento: una conexión del pool puede haber sido cerrada por el demonio.
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                conn.request(method, url, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (ConnectionError, http.client.HTTPException, socket.timeout, OSError) as e:
+                conn.close()
+                if attempt == 0 and not isinstance(e, (FileNotFoundError, socket.timeout)):
+                    continue
+                raise DockerDaemonError(f"No se pudo contactar al demonio de Docker en {self.socket_path}: {e}")
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return response.status, data
+        raise DockerDaemonError(f"No se pudo contactar al demonio de Docker en {self.socket_path}.")
+
+    def _check(self, status: int, data: bytes, expected=(200,)) -> bytes:
+        if status not in expected:
+            try:
+                message = json.loads(data).get("message", data.decode(errors="replace"))
+            except (ValueError, AttributeError):
+                message = data.decode(errors="replace")
+            raise DockerDaemonError(f"Docker Engine respondió {status}: {message}")
+        return data
+
+    # --- Estado del demonio ---
+
+    def ping(self) -> bool:
+        """Devuelve True si el demonio responde a /_ping."""
+        try:
+            status, data = self._request("GET", "/_ping")
+        except DockerDaemonError:
+            return False
+        return status == 200 and data.strip() == b"OK"
+
+    def info(self) -> Dict:
+        status, data = self._request("GET", "/info")
+        return json.loads(self._check(status, data))
+
+    # --- Contenedores ---
+
+    def pull_image(self, image: str):
+        """Descarga una imagen (equivalente a 'docker pull')."""
+        name, _, tag = image.partition(":")
+        status, data = self._request("POST", "/images/create", params={"fromImage": name, "tag": tag or "latest"})
+        self._check(status, data)
+
+    def create_container(self, image: str, cmd: List[str], binds: List[str], name: str = None,
+                         entrypoint: List[str] = None, env: Dict[str, str] = None,
+                         working_dir: str = None) -> str:
+        """
+        Crea un contenedor y devuelve su id. Si la imagen no existe localmente, la descarga.
+        """
+        body = {
+            "Image": image,
+            "Cmd": cmd,
+            "AttachStdout": True,
+            "AttachStderr": True,
+            "Tty": False,
+            "HostConfig": {"Binds": binds},
+        }
+        if entrypoint is not None:
+            body["Entrypoint"] = entrypoint
+        if env:
+            body["Env"] = [f"{key}={value}" for key, value in env.items()]
+        if working_dir:
+            body["WorkingDir"] = working_dir
+        params = {"name": name} if name else None
+
+        status, data = self._request("POST", "/containers/create", params=params, body=body)
+        if status == 404:
+            logger.info(f"La imagen {image} no está disponible localmente. Descargándola...")
+            self.pull_image(image)
+            status, data = self._request("POST", "/containers/create", params=params, body=body)
+        return json.loads(self._check(status, data, (201,)))["Id"]
+
+    def start_container(self, container_id: str):
+        status, data = self._request("POST", f"/containers/{quote(container_id)}/start")
+        self._check(status, data, (204, 304))
+
+    def attach_lines(self, container_id: str) -> Iterator[str]:
+        """
+        Se adjunta a la salida del contenedor (stdout y stderr, incluyendo lo ya
+        emitido) y la devuelve línea por línea hasta que el contenedor termina.
+
+        El stream de attach toma la conexión de forma exclusiva, por lo que se usa
+        una conexión dedicada que no vuelve al pool.
+        """
+        conn = self._new_connection(timeout=None)
+        try:
+            params = {"stream": 1, "stdout": 1, "stderr": 1, "logs": 1}
+            conn.request("POST", self._url(f"/containers/{quote(container_id)}/attach", params),
+                         headers={"Host": "docker"})
+            response = conn.getresponse()
+            if response.status not in (101, 200):
+                self._check(response.status, response.read())
+            yield from _split_lines(_demultiplex(response))
+        finally:
+            conn.close()
+
+    def wait_container(self, container_id: str) -> int:
+        """Espera a que el contenedor termine y devuelve su código de salida."""
+        conn = self._new_connection(timeout=None)
+        try:
+            conn.request("POST", self._url(f"/containers/{quote(container_id)}/wait"), headers={"Host": "docker"})
+            response = conn.getresponse()
+            data = self._check(response.status, response.read())
+        finally:
+            conn.close()
+        return int(json.loads(data).get("StatusCode", -1))
+
+    def stop_container(self, container_id: str, timeout: int = 10) -> bool:
+        status, data = self._request("POST", f"/containers/{quote(container_id)}/stop", params={"t": timeout})
+        if status == 404:
+            logger.warning(f"El contenedor {container_id} no fue encontrado, puede que ya se haya detenido.")
+            return True
+        self._check(status, data, (204, 304))
+        return True
+
+    def remove_container(self, container_id: str, force: bool = False):
+        status, data = self._request("DELETE", f"/containers/{quote(container_id)}",
+                                     params={"force": int(force)})
+        if status != 404:
+            self._check(status, data, (204,))
+
+
+def _demultiplex(response) -> Iterator[bytes]:
+    """
+    Separa el stream multiplexado de Docker (cabecera de 8 bytes por trama:
+    tipo de stream, 3 bytes nulos y tamaño big-endian) en bloques de datos.
+    """
+    while True:
+        header = response.read(8)
+        if len(header) < 8:
+            return
+        _, size = struct.unpack(">BxxxL", header)
+        payload = response.read(size)
+        if not payload:
+            return
+        yield payload
+
+
+def _split_lines(chunks: Iterator[bytes]) -> Iterator[str]:
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode(errors="replace").strip()
+    if buffer:
+        yield buffer.decode(errors="replace").strip()
+
+
+class DaemonHealthMonitor:
+    """
+    Cachea el estado del demonio de Docker durante 'ttl' segundos y lo
+    refresca en segundo plano, para que la GUI no tenga que consultarlo
+    cada vez que crea o carga una simulación.
+    """
+
+    def __init__(self, check_func: Callable[[], bool], ttl: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic, background: bool = True):
+        self.check_func = check_func
+        self.ttl = ttl
+        self._clock = clock
+        self._background = background
+        self._lock = threading.Lock()
+        self._healthy = None
+        self._checked_at = None
+        self._refresher = None
+        self._stop_event = threading.Event()
+
+    def is_healthy(self) -> bool:
+        """Devuelve el estado cacheado o, si expiró, lo verifica nuevamente."""
+        with self._lock:
+            fresh = self._checked_at is not None and (self._clock() - self._checked_at) < self.ttl
+            if fresh:
+                return self._healthy
+        return self.refresh()
+
+    def refresh(self) -> bool:
+        """Fuerza una verificación y actualiza la caché."""
+        healthy = bool(self.check_func())
+        with self._lock:
+            self._healthy = healthy
+            self._checked_at = self._clock()
+        if self._background:
+            self._ensure_refresher()
+        return healthy
+
+    def invalidate(self):
+        with self._lock:
+            self._healthy = None
+            self._checked_at = None
+
+    def _ensure_refresher(self):
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._stop_event.clear()
+        self._refresher = threading.Thread(target=self._refresh_loop, name="docker-health", daemon=True)
+        self._refresher.start()
+
+    def _refresh_loop(self):
+        # Refresca un poco antes de que expire la caché, así la consulta nunca bloquea.
+        while not self._stop_event.wait(self.ttl * 0.8):
+            try:
+                healthy = bool(self.check_func())
+            except Exception as e:
+                logger.warning(f"Falló la verificación en segundo plano del demonio de Docker: {e}")
+                healthy = False
+            with self._lock:
+                self._healthy = healthy
+                self._checked_at = self._clock()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class EngineDockerJob(DockerJob):
+    """
+    DockerJob cuyo contenedor se maneja por la API del Docker Engine
+    (create, start, attach, wait y remove) en lugar de la CLI.
+    """
+
+    def __init__(self, client: DockerEngineClient, container_id: str, script_name: str,
+                 container_name: str, case_path: Path, temp_dir: Optional[str] = None):
+        super().__init__(script_name, container_name, None, case_path, temp_dir)
+        self.client = client
+        self.container_id = container_id
+
+    async def lines(self):
+        loop = asyncio.get_running_loop()
+        lines_queue = asyncio.Queue()
+
+        def pump():
+            try:
+                for line in self.client.attach_lines(self.container_id):
+                    loop.call_soon_threadsafe(lines_queue.put_nowait, line)
+            except DockerDaemonError as e:
+                loop.call_soon_threadsafe(lines_queue.put_nowait, f"Error: {e}")
+            finally:
+                loop.call_soon_threadsafe(lines_queue.put_nowait, None)
+
+        pump_future = loop.run_in_executor(None, pump)
+        while True:
+            line = await lines_queue.get()
+            if line is None:
+                break
+            yield line
+        await pump_future
+
+    async def _wait_for_exit(self) -> int:
+        return await asyncio.to_thread(self.client.wait_container, self.container_id)
+
+    async def cancel(self, timeout: int = 10) -> bool:
+        self.was_cancelled = True
+        try:
+            return await asyncio.to_thread(self.client.stop_container, self.container_id, timeout)
+        except DockerDaemonError as e:
+            logger.error(f"Error al detener el contenedor {self.container_name}: {e}")
+            return False
+
+    async def _remove_container(self):
+        try:
+            await asyncio.to_thread(self.client.remove_container, self.container_id, True)
+        except DockerDaemonError as e:
+            logger.warning(f"No se pudo eliminar el contenedor {self.container_name}: {e}")
+
+
+def docker_socket_path() -> Optional[str]:
+    """
+    Devuelve la ruta del socket del Docker Engine (DOCKER_HOST=unix://... o el
+    socket por defecto) o None si no hay un socket Unix disponible.
+    """
+    if sys.platform.startswith("win"):
+        return None
+    docker_host = os.environ.get("DOCKER_HOST", "")
+    if docker_host:
+        if not docker_host.startswith("unix://"):
+            return None
+        path = docker_host[len("unix://"):]
+    else:
+        path = DEFAULT_SOCKET_PATH
+    return path if Path(path).exists() else None
+
+
+_engine_client = None
+_engine_client_lock = threading.Lock()
+
+
+def get_engine_client() -> Optional[DockerEngineClient]:
+    """Devuelve el cliente compartido del Docker Engine, o None si no hay socket."""
+    global _engine_client
+    with _engine_client_lock:
+        if _engine_client is None:
+            path = docker_socket_path()
+            if path is None:
+                return None
+            _engine_client = DockerEngineClient(path)
+        return _engine_client
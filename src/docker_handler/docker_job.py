@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import shutil
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional
+
+from .exceptions import ContainerExecutionError
+
+logger = logging.getLogger(__name__)
+
+# Límite de tamaño de línea para el StreamReader (algunos solvers imprimen listas largas)
+STREAM_LIMIT = 2 ** 20
+
+
+async def run_docker_cli(*args: str, timeout: Optional[float] = None) -> tuple:
+    """
+    Ejecuta un comando de la CLI de Docker sin bloquear el event loop.
+
+    Returns:
+        tuple: (código de retorno, stdout, stderr) como strings.
+
+    Raises:
+        FileNotFoundError: Si el comando 'docker' no se encuentra.
+    """
+    process = await asyncio.create_subprocess_exec(
+        "docker", *args,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    return process.returncode, (stdout or b"").decode(errors="replace"), (stderr or b"").decode(errors="replace")
+
+
+async def stop_container(container_name: str, timeout: int = 10) -> bool:
+    """
+    Detiene un contenedor con 'docker stop' (SIGTERM y luego SIGKILL) sin bloquear
+    el event loop.
+
+    Returns:
+        bool: True si el contenedor se detuvo o ya no existía.
+    """
+    logger.info(f"Intentando detener el contenedor: {container_name}")
+    try:
+        return_code, _, stderr = await run_docker_cli("stop", "-t", str(timeout), container_name)
+    except FileNotFoundError:
+        logger.error("Comando 'docker' no encontrado al intentar detener el contenedor.")
+        return False
+
+    if return_code == 0:
+        logger.info(f"Contenedor {container_name} detenido exitosamente.")
+        return True
+    # Si el contenedor ya no existe (porque terminó justo antes), no es un error.
+    if "No such container" in stderr:
+        logger.warning(f"El contenedor {container_name} no fue encontrado, puede que ya se haya detenido.")
+        return True
+    logger.error(f"Error al detener el contenedor {container_name}: {stderr.strip()}")
+    return False
+
+
+class DockerJob:
+    """
+    Un script ejecutándose dentro de un contenedor Docker.
+
+    Permite iterar asíncronamente las líneas de salida, esperar a que termine
+    y cancelarlo sin bloquear, de modo que un único event loop puede manejar
+    varios contenedores en simultáneo.
+    """
+
+    def __init__(self, script_name: str, container_name: str, process: asyncio.subprocess.Process,
+                 case_path: Path, temp_dir: Optional[str] = None):
+        self.script_name = script_name
+        self.container_name = container_name
+        self.process = process
+        self.case_path = case_path
+        self.temp_dir = temp_dir
+        self.return_code = None
+        self.was_cancelled = False
+        self._closed = False
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self.lines()
+
+    async def lines(self) -> AsyncIterator[str]:
+        """Itera las líneas de salida (stdout y stderr combinados) del contenedor."""
+        if self.process.stdout is None:
+            return
+        while True:
+            raw_line = await self.process.stdout.readline()
+            if not raw_line:
+                break
+            yield raw_line.decode(errors="replace").strip()
+
+    async def wait(self, check: bool = True) -> int:
+        """
+        Espera a que el contenedor termine y devuelve su código de retorno.
+        Si el caso se montó desde una carpeta temporal, copia los resultados al caso.
+
+        Args:
+            check: Si es True, lanza ContainerExecutionError ante un código distinto
+                de cero (salvo que el trabajo haya sido cancelado).
+
+        Raises:
+            ContainerExecutionError: Si el script falla y check es True.
+        """
+        if self.return_code is None:
+            self.return_code = await self._wait_for_exit()
+            if self.temp_dir:
+                await asyncio.to_thread(shutil.copytree, self.temp_dir, self.case_path, dirs_exist_ok=True)
+
+        if check and self.return_code != 0 and not self.was_cancelled:
+            raise ContainerExecutionError(
+                f"La ejecución de {self.script_name} falló con código de retorno {self.return_code}."
+            )
+        return self.return_code
+
+    async def _wait_for_exit(self) -> int:
+        return await self.process.wait()
+
+    async def cancel(self, timeout: int = 10) -> bool:
+        """Detiene el contenedor. No bloquea el event loop mientras Docker lo detiene."""
+        self.was_cancelled = True
+        return await stop_container(self.container_name, timeout)
+
+    async def close(self) -> None:
+        """Elimina la carpeta temporal y el contenedor. Es seguro llamarlo varias veces."""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self.temp_dir:
+            await asyncio.to_thread(shutil.rmtree, self.temp_dir, True)
+
+        logger.info(f"Limpiando el contenedor {self.container_name}...")
+        await self._remove_container()
+
+    async def _remove_container(self):
+        try:
+            await run_docker_cli("rm", self.container_name)
+        except FileNotFoundError:
+            pass
+
+
+def iterate_async(async_iterator: AsyncIterator[str]) -> Iterator[str]:
+    """
+    Consume un iterador asíncrono desde código síncrono usando un event loop privado.
+    Si el consumidor abandona el generador, el iterador asíncrono se cierra igual.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                item = loop.run_until_complete(async_iterator.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        try:
+            if hasattr(async_iterator, "aclose"):
+                loop.run_until_complete(async_iterator.aclose())
+        finally:
+            loop.close()
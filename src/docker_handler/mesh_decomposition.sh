@@ -0,0 +1,29 @@
+# Funciones compartidas para mallas generadas en paralelo (se incluye con '.').
+#
+# snappyHexMesh en paralelo deja la malla solo en processor*/constant/polyMesh.
+# MESH_DECOMPOSED_FILE guarda con cuántos procesadores quedó descompuesta; la
+# malla se reconstruye recién cuando un paso serial la necesita.
+MESH_DECOMPOSED_FILE=".mesh_decomposed"
+
+# Imprime el número de procesadores de la malla descompuesta (vacío si no lo está)
+decomposed_mesh_procs() {
+    if [ -f "$MESH_DECOMPOSED_FILE" ]; then
+        cat "$MESH_DECOMPOSED_FILE"
+    fi
+}
+
+# Reconstruye en paralelo la malla descompuesta antes de un paso serial
+ensure_reconstructed_mesh() {
+    local num_procs
+    num_procs=$(decomposed_mesh_procs)
+    if [ -z "$num_procs" ]; then
+        return 0
+    fi
+    echo "Mesh is only available decomposed. Reconstructing it with $num_procs processors..."
+    mpirun -np "$num_procs" redistributePar -reconstruct -parallel -constant
+    if [ $? -ne 0 ]; then
+        echo "Error: redistributePar -reconstruct failed."
+        return 1
+    fi
+    rm -f "$MESH_DECOMPOSED_FILE"
+}
@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .dockerHandler import DockerHandler
+from src.file_handler.mesh_cache import (IMPORTED_NODE, node_signature, current_mesh_signature, has_artifact,
+                                         load_lineage, save_lineage, store_mesh_artifact, restore_mesh_artifact,
+                                         prune_artifacts)
+from src.file_handler.vtk_conversion import VTK_DIR
+
+logger = logging.getLogger(__name__)
+
+SNAPPY_INPUTS = ("system/snappyHexMeshDict", "system/meshQualityDict", "constant/triSurface", "constant/geometry")
+
+# Nodos de malla. Cada uno parte de la malla del nodo anterior (salvo los
+# nodos raíz) y la reemplaza; 'stage' agrupa las variantes de un mismo paso.
+MESH_NODES = {
+    'blockMesh': {
+        'script': "run_blockMeshDict.sh",
+        'inputs': ("system/blockMeshDict",),
+        'stage': "blockMesh",
+        'root': True,
+    },
+    'extrudeMesh': {
+        'script': "run_extrudeMesh.sh",
+        'inputs': ("system/extrudeMeshDict",),
+        'stage': "extrudeMesh",
+    },
+    'snappyHexMesh': {
+        'script': "run_snappyHexMeshDict.sh",
+        'inputs': SNAPPY_INPUTS,
+        'stage': "snappyHexMesh",
+    },
+    'snappyHexMesh_parallel': {
+        'script': "run_snappyHexMeshDict_parallel.sh",
+        'inputs': SNAPPY_INPUTS + ("system/decomposeParDict",),
+        'stage': "snappyHexMesh",
+        'parallel': True,
+    },
+}
+
+# Acciones de cada paso del plan
+ACTION_CURRENT = "current"  # El caso ya tiene la salida del nodo
+ACTION_RESTORE = "restore"  # Se copia la salida desde la caché
+ACTION_RUN = "run"
+
+
+def _entry_signature(case_path: Path, entry: Dict[str, Any], upstream: Optional[str]) -> str:
+    node = MESH_NODES[entry['node']]
+    extra = f"np={entry['num_processors']}" if node.get('parallel') else ""
+    return node_signature(entry['node'], node['inputs'], case_path, upstream, extra)
+
+
+def _mesh_chain(case_path: Path, target: str, num_processors: int) -> List[Dict[str, Any]]:
+    """
+    Nodos que producen la malla pedida: los de la malla actual hasta la etapa
+    del nodo pedido (que la reemplaza) y el nodo pedido. Un nodo raíz empieza
+    una cadena nueva.
+    """
+    chain = []
+    if not MESH_NODES[target].get('root'):
+        lineage = load_lineage(case_path)
+        stages = [MESH_NODES.get(entry['node'], {}).get('stage') for entry in lineage]
+        if MESH_NODES[target]['stage'] in stages:
+            lineage = lineage[:stages.index(MESH_NODES[target]['stage'])]
+        chain = [dict(entry) for entry in lineage]
+
+        if not chain:
+            # Malla generada fuera del pipeline: es el punto de partida
+            key = current_mesh_signature(case_path)
+            chain = [{'node': IMPORTED_NODE, 'key': key, 'num_processors': 1, 'capture': True}] if key else []
+
+    chain.append({'node': target, 'key': None, 'num_processors': num_processors})
+
+    upstream = None
+    for entry in chain:
+        if entry['node'] != IMPORTED_NODE:
+            entry['key'] = _entry_signature(case_path, entry, upstream)
+        upstream = entry['key']
+    return chain
+
+
+def plan_mesh_pipeline(case_path: Path, target: str, num_processors: int = 1) -> Dict[str, Any]:
+    """
+    Arma el plan para obtener la malla del nodo 'target'. El visor lee la malla
+    directamente, así que no hace falta convertirla a VTK.
+
+    Cada nodo se identifica por la firma de sus entradas y de la malla de la que
+    parte. Se busca el último nodo de la cadena cuya salida ya está en el caso o
+    en la caché; desde ahí solo se ejecutan los nodos siguientes. Así, cambiar
+    solo el snappyHexMeshDict restaura la malla de blockMesh sin volver a generarla.
+
+    Returns:
+        dict: 'upstream' (nodos anteriores que no se tocan) y 'steps' (nodo,
+            firma, procesadores y acción de cada paso).
+    """
+    chain = _mesh_chain(case_path, target, num_processors)
+    lineage = load_lineage(case_path)
+    current_key = lineage[-1]['key'] if lineage else None
+
+    start, action = None, ACTION_RUN
+    for index in range(len(chain) - 1, -1, -1):
+        entry = chain[index]
+        if entry.get('capture') or (entry['key'] and entry['key'] == current_key):
+            start, action = index, ACTION_CURRENT
+            break
+        if has_artifact(case_path, entry['node'], entry['key']):
+            start, action = index, ACTION_RESTORE
+            break
+
+    if start is None and chain[0]['node'] == IMPORTED_NODE:
+        # La malla de partida ya no está en la caché: se parte de la malla actual
+        logger.warning("No se encontró la malla de partida en la caché: se usa la malla actual del caso.")
+        chain = _mesh_chain_from_current(case_path, chain)
+        start, action = 0, ACTION_CURRENT
+
+    upstream, steps = [], []
+    for index, entry in enumerate(chain):
+        step = {'node': entry['node'], 'key': entry['key'], 'num_processors': entry['num_processors']}
+        if start is None or index > start:
+            step['action'] = ACTION_RUN
+        elif index == start:
+            step['action'] = action
+        else:
+            # Forma parte de la historia de la malla aunque no haga falta tocarlo
+            upstream.append(step)
+            continue
+        steps.append(step)
+
+    return {
+        'target': target,
+        'upstream': upstream,
+        'steps': steps,
+    }
+
+
+def _mesh_chain_from_current(case_path: Path, chain: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Reemplaza la malla de partida perdida por la malla actual del caso."""
+    key = current_mesh_signature(case_path)
+    chain = [{'node': IMPORTED_NODE, 'key': key, 'num_processors': 1, 'capture': True}, chain[-1]]
+    chain[-1]['key'] = _entry_signature(case_path, chain[-1], key)
+    return chain
+
+
+def is_up_to_date(plan: Dict[str, Any]) -> bool:
+    """Indica si el caso ya tiene la malla pedida."""
+    return all(step['action'] == ACTION_CURRENT for step in plan['steps'])
+
+
+def format_pipeline_plan(plan: Dict[str, Any]) -> str:
+    labels = {ACTION_CURRENT: "sin cambios", ACTION_RESTORE: "desde la caché", ACTION_RUN: "se ejecuta"}
+    return " -> ".join(f"{step['node']} ({labels[step['action']]})" for step in plan['steps'])
+
+
+async def _stream(handler: DockerHandler, script: str, num_processors: int, env: Optional[dict],
+                  on_line: Callable[[str], None]) -> None:
+    stream = handler.stream_script(script, num_processors, env)
+    try:
+        async for line in stream:
+            on_line(line)
+    except asyncio.CancelledError:
+        # Pipeline cancelado desde la GUI: se detiene el script en curso
+        await handler.stop_simulation_async()
+        await stream.aclose()
+        raise
+
+
+async def run_mesh_pipeline(case_path: Path, plan: Dict[str, Any], handler: DockerHandler,
+                            on_line: Optional[Callable[[str], None]] = None, env: dict = None) -> Dict[str, Any]:
+    """
+    Ejecuta el plan de 'plan_mesh_pipeline': restaura desde la caché o ejecuta
+    cada nodo y guarda en la caché la salida de los nodos ejecutados. Si la
+    malla cambia, se borra la carpeta VTK, que corresponde a la malla anterior.
+
+    Returns:
+        dict: 'ran' y 'skipped' con los nodos ejecutados y salteados.
+
+    Raises:
+        ContainerExecutionError: Si alguno de los scripts falla.
+    """
+    log = on_line or (lambda line: None)
+    lineage = [dict(entry) for entry in plan['upstream']]
+    ran, skipped = [], []
+
+    for step in plan['steps']:
+        entry = {'node': step['node'], 'key': step['key'], 'num_processors': step['num_processors']}
+        if step['action'] == ACTION_RUN:
+            # Hasta que termine, la malla del caso no corresponde a ningún nodo
+            save_lineage(case_path, lineage + [dict(entry, key=None)])
+            log(f">>> Malla: se ejecuta {step['node']}")
+            await _stream(handler, MESH_NODES[step['node']]['script'], step['num_processors'], env, log)
+            ran.append(step['node'])
+        elif step['action'] == ACTION_RESTORE:
+            log(f">>> Malla: {step['node']} sin cambios, se restaura desde la caché")
+            await asyncio.to_thread(restore_mesh_artifact, case_path, step['node'], step['key'])
+            skipped.append(step['node'])
+        else:
+            log(f">>> Malla: {step['node']} sin cambios")
+            skipped.append(step['node'])
+        # Toda malla de la que puede partir un nodo posterior queda en la caché
+        await asyncio.to_thread(store_mesh_artifact, case_path, step['node'], step['key'])
+        lineage.append(entry)
+        save_lineage(case_path, lineage)
+
+    if any(step['action'] != ACTION_CURRENT for step in plan['steps']):
+        # Los resultados convertidos a VTK son de la malla anterior
+        await asyncio.to_thread(shutil.rmtree, case_path / VTK_DIR, True)
+
+    keep = {}
+    for entry in lineage:
+        keep.setdefault(entry['node'], []).append(entry['key'])
+    await asyncio.to_thread(prune_artifacts, case_path, keep)
+    return {'ran': ran, 'skipped': skipped}
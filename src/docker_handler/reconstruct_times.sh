@@ -0,0 +1,64 @@
+# Funciones compartidas por los scripts paralelos (se incluye con '.').
+
+# Reconstruye los tiempos pedidos de un caso descompuesto.
+#   $1: número de procesadores
+#   $2: 'latest', 'all', 'none' o una lista de tiempos separados por coma
+reconstruct_times() {
+    local num_procs="$1"
+    local times="$2"
+    case "$times" in
+        none)
+            echo "Skipping reconstruction (RECONSTRUCT_TIMES=none)."
+            return 0
+            ;;
+        all)
+            echo "Reconstructing all times..."
+            mpirun -np "$num_procs" redistributePar -reconstruct -parallel
+            ;;
+        latest)
+            echo "Reconstructing latest time..."
+            mpirun -np "$num_procs" redistributePar -reconstruct -parallel -latestTime
+            ;;
+        *)
+            echo "Reconstructing times: $times"
+            mpirun -np "$num_procs" redistributePar -reconstruct -parallel -time "$times"
+            ;;
+    esac
+}
+
+# Tiempos que existen en los processor* (o processors<N> con collated) pero no
+# reconstruidos en el caso
+pending_times() {
+    local data_dir time
+    for data_dir in processor0 processors*; do
+        [ -d "$data_dir" ] || continue
+        for time in $(ls "$data_dir"); do
+            case "$time" in
+                *[!0-9.eE+-]*) continue ;;
+            esac
+            [ -d "$data_dir/$time" ] && [ ! -d "$time" ] && echo "$time"
+        done
+        return 0
+    done
+}
+
+# Se llama antes de borrar los processor* para volver a descomponer. Con
+# PRE_RECONSTRUCT_PROCS (procesadores de la descomposición anterior) reconstruye
+# primero todos los tiempos; si aun así quedan tiempos solo en los processor*,
+# no deja borrarlos salvo FORCE_REDECOMPOSE=1.
+prepare_redecompose() {
+    local pending
+    if [ -n "$PRE_RECONSTRUCT_PROCS" ]; then
+        echo "Reconstructing all times before re-decomposing..."
+        reconstruct_times "$PRE_RECONSTRUCT_PROCS" all || return 1
+    fi
+    pending=$(pending_times | tr '\n' ' ')
+    if [ -n "$pending" ]; then
+        if [ "$FORCE_REDECOMPOSE" != "1" ]; then
+            echo "Error: times ${pending}exist only in the processor directories."
+            echo "Reconstruct them first or set FORCE_REDECOMPOSE=1 to discard them."
+            return 1
+        fi
+        echo "Warning: discarding times that were never reconstructed: $pending"
+    fi
+}
@@ -1,12 +1,10 @@
-source /usr/lib/openfoam/openfoam2312/etc/bashrc
+source "${FOAM_BASHRC:-/usr/lib/openfoam/openfoam2312/etc/bashrc}"
 
 # Entra en el directorio del caso
-cd /case
+cd "${CASE_DIR:-/case}"
 
 # Genera la malla
 echo "Generando la malla con blockMesh..."
 blockMesh
 
-# Post-procesamiento opcional: convierte la malla a formato VTK
-echo "Convirtiendo la malla a formato VTK..."
-foamToVTK
\ No newline at end of file
+# El visor lee los patches directamente de la malla: no hace falta foamToVTK
\ No newline at end of file
@@ -1,11 +1,14 @@
 
-source /usr/lib/openfoam/openfoam2312/etc/bashrc
+source "${FOAM_BASHRC:-/usr/lib/openfoam/openfoam2312/etc/bashrc}"
 
 # Cambia al directorio del caso
-cd /case
+cd "${CASE_DIR:-/case}"
+
+. "$(dirname "$0")/mesh_decomposition.sh"
+# Los pasos seriales necesitan la malla completa
+ensure_reconstructed_mesh || exit 1
 
 # Ejecutar extrudeMesh
 extrudeMesh
 
-# Convertir la nueva malla a formato VTK para visualización
-foamToVTK -region region0
\ No newline at end of file
+# El visor lee los patches directamente de la malla: no hace falta foamToVTK
\ No newline at end of file
@@ -1,8 +1,26 @@
-source /usr/lib/openfoam/openfoam2312/etc/bashrc
+source "${FOAM_BASHRC:-/usr/lib/openfoam/openfoam2312/etc/bashrc}"
+
+# Procesadores de la conversión (más de uno para casos descompuestos)
+NUM_PROCS=${1:-1}
 
 # Cambia al directorio del caso
-cd /case
+cd "${CASE_DIR:-/case}"
+
+. "$(dirname "$0")/mesh_decomposition.sh"
+
+# Qué convertir lo arma la interfaz (patches, campos y tiempos); por defecto,
+# solo la geometría de los patches que muestra el visor
+eval "ARGS=(${FOAMTOVTK_ARGS:--region region0 -no-internal -no-fields})"
 
+# Una malla que existe solo descompuesta se convierte en paralelo, sin reconstruirla
+MESH_PROCS=$(decomposed_mesh_procs)
+if [ "$NUM_PROCS" -le 1 ] && [ -n "$MESH_PROCS" ]; then
+    NUM_PROCS=$MESH_PROCS
+fi
 
-# Convertir la nueva malla a formato VTK para visualización
-foamToVTK -region region0
\ No newline at end of file
+# Convertir la malla (y los campos pedidos) a formato VTK para visualización
+if [ "$NUM_PROCS" -gt 1 ]; then
+    mpirun -np "$NUM_PROCS" foamToVTK -parallel "${ARGS[@]}"
+else
+    foamToVTK "${ARGS[@]}"
+fi
@@ -0,0 +1,29 @@
+# Funciones compartidas para inicializar o retomar una corrida (se incluye con '.').
+#
+# RESUME_TIME: tiempo completo desde el cual retomar una corrida detenida.
+# SKIP_INIT=1: las entradas de setFields no cambiaron desde la última inicialización.
+# INIT_SIGNATURE: firma de esas entradas, que se guarda tras inicializar.
+INIT_SIGNATURE_FILE=".initialization_signature"
+INITIALIZED_FIELDS_DIR=".initialized_0"
+
+# Hace que el solver arranque desde RESUME_TIME
+resume_from() {
+    echo "Resuming from time $1. Skipping field initialization."
+    foamDictionary system/controlDict -entry startFrom -set startTime > /dev/null
+    foamDictionary system/controlDict -entry startTime -set "$1" > /dev/null
+}
+
+# Restaura '0' desde la copia guardada tras la última inicialización
+restore_initialized_fields() {
+    echo "Initial conditions unchanged. Restoring initialized fields."
+    cp -r "$INITIALIZED_FIELDS_DIR"/. 0/
+}
+
+# Guarda '0' inicializado y la firma de sus entradas
+save_initialized_fields() {
+    rm -rf "$INITIALIZED_FIELDS_DIR"
+    cp -r 0 "$INITIALIZED_FIELDS_DIR"
+    if [ -n "$INIT_SIGNATURE" ]; then
+        echo "$INIT_SIGNATURE" > "$INIT_SIGNATURE_FILE"
+    fi
+}
@@ -1,17 +1,30 @@
-source /usr/lib/openfoam/openfoam2312/etc/bashrc
+source "${FOAM_BASHRC:-/usr/lib/openfoam/openfoam2312/etc/bashrc}"
 # cd /case
 # ideasUnvToFoam malla.unv
 # foamToVTK
 
 # Cambia al directorio del caso
-cd /case
+cd "${CASE_DIR:-/case}"
+
+. "$(dirname "$0")/mesh_decomposition.sh"
+# Los pasos seriales necesitan la malla completa
+ensure_reconstructed_mesh || exit 1
 
 # blockMesh
 
+. "$(dirname "$0")/run_initialization.sh"
+
+# Al retomar, los campos salen del último tiempo completo; si las entradas de
+# setFields no cambiaron, se restauran los campos ya inicializados
+if [ -n "$RESUME_TIME" ]; then
+    resume_from "$RESUME_TIME"
+elif [ "$SKIP_INIT" = "1" ]; then
+    restore_initialized_fields
 # Check if the setFieldsDict file exists
-if [ -f "system/setFieldsDict" ]; then
+elif [ -f "system/setFieldsDict" ]; then
     echo "setFieldsDict found. Running setFields..."
-    setFields
+    setFields || exit 1
+    save_initialized_fields
 else
     echo "setFieldsDict not found. Skipping setFields."
 fi
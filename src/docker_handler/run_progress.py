@@ -0,0 +1,258 @@
+import json
+import logging
+import os
+import platform
+import re
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Expresiones regulares para las líneas relevantes del log de los solvers de OpenFOAM.
+# "Time = 0.0125" (v2312 puede añadir una 's' al final) al comienzo de cada paso de tiempo.
+TIME_RE = re.compile(r'^Time\s*=\s*([-+0-9.eE]+)s?\s*$')
+DELTA_T_RE = re.compile(r'^deltaT\s*=\s*([-+0-9.eE]+)')
+EXECUTION_TIME_RE = re.compile(r'^ExecutionTime\s*=\s*([-+0-9.eE]+)\s*s\s+ClockTime\s*=\s*([-+0-9.eE]+)\s*s')
+COURANT_RE = re.compile(r'^Courant Number mean:\s*([-+0-9.eE]+)\s+max:\s*([-+0-9.eE]+)')
+
+RUN_METADATA_FILE = "run_metadata.json"
+
+
+class RunProgress:
+    """
+    Modelo de progreso de una corrida a partir de las líneas del log del solver.
+
+    Calcula el porcentaje completado respecto de 'endTime', el throughput
+    (segundos simulados por segundo de reloj) sobre una ventana deslizante,
+    una estimación del tiempo restante y detecta ralentizaciones, como el
+    colapso de deltaT bajo paso de tiempo adaptativo (maxCo).
+    """
+
+    def __init__(self, end_time: float, start_time: float = 0.0, window: int = 20,
+                 slowdown_ratio: float = 0.2, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            end_time: Tiempo final de la simulación (endTime del controlDict).
+            start_time: Tiempo desde el cual arranca la corrida.
+            window: Cantidad de pasos de tiempo usados para suavizar throughput y ETA.
+            slowdown_ratio: Fracción de la referencia por debajo de la cual se
+                considera que hubo una ralentización.
+            clock: Función de reloj (inyectable para los tests).
+        """
+        self.end_time = float(end_time)
+        self.start_time = float(start_time)
+        self.slowdown_ratio = slowdown_ratio
+        self._clock = clock
+
+        self.current_time = self.start_time
+        self.delta_t = None
+        self.max_courant = None
+        self.execution_time = None
+        self.clock_time = None
+        self.time_steps = 0
+
+        self._wall_start = clock()
+        self._samples = deque(maxlen=max(2, window))     # (wall, sim)
+        self._delta_ts = deque(maxlen=max(2, window))
+        self._best_throughput = 0.0
+
+    def feed_line(self, line: str) -> bool:
+        """
+        Procesa una línea del log.
+
+        Returns:
+            bool: True si la línea correspondía al inicio de un nuevo paso de tiempo.
+        """
+        line = line.strip()
+
+        match = TIME_RE.match(line)
+        if match:
+            self._on_time(float(match.group(1)))
+            return True
+
+        match = DELTA_T_RE.match(line)
+        if match:
+            self.delta_t = float(match.group(1))
+            self._delta_ts.append(self.delta_t)
+            return False
+
+        match = COURANT_RE.match(line)
+        if match:
+            self.max_courant = float(match.group(2))
+            return False
+
+        match = EXECUTION_TIME_RE.match(line)
+        if match:
+            self.execution_time = float(match.group(1))
+            self.clock_time = float(match.group(2))
+        return False
+
+    def _on_time(self, sim_time: float):
+        self.current_time = sim_time
+        self.time_steps += 1
+        self._samples.append((self._clock(), sim_time))
+        throughput = self.throughput
+        if throughput is not None:
+            self._best_throughput = max(self._best_throughput, throughput)
+
+    @property
+    def fraction(self) -> float:
+        """Fracción completada en [0, 1]."""
+        span = self.end_time - self.start_time
+        if span <= 0:
+            return 1.0
+        return min(max((self.current_time - self.start_time) / span, 0.0), 1.0)
+
+    @property
+    def percent(self) -> float:
+        return 100.0 * self.fraction
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """Segundos simulados por segundo de reloj sobre la ventana deslizante."""
+        if len(self._samples) < 2:
+            return None
+        wall_0, sim_0 = self._samples[0]
+        wall_1, sim_1 = self._samples[-1]
+        if wall_1 <= wall_0:
+            return None
+        return (sim_1 - sim_0) / (wall_1 - wall_0)
+
+    @property
+    def mean_throughput(self) -> Optional[float]:
+        """Throughput promedio desde el comienzo de la corrida."""
+        elapsed = self.elapsed
+        if elapsed <= 0 or self.time_steps == 0:
+            return None
+        return (self.current_time - self.start_time) / elapsed
+
+    @property
+    def elapsed(self) -> float:
+        return self._clock() - self._wall_start
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Tiempo de reloj restante estimado con el throughput suavizado."""
+        throughput = self.throughput
+        if not throughput or throughput <= 0:
+            return None
+        return max(self.end_time - self.current_time, 0.0) / throughput
+
+    def slowdown_reasons(self) -> list:
+        """
+        Devuelve la lista de motivos de ralentización detectados (vacía si no hay).
+        """
+        reasons = []
+        if self.delta_t is not None and len(self._delta_ts) > 1:
+            reference = max(self._delta_ts)
+            if reference > 0 and self.delta_t < self.slowdown_ratio * reference:
+                reasons.append(f"deltaT colapsó a {self.delta_t:.3g} (máx. reciente {reference:.3g})")
+
+        throughput = self.throughput
+        if throughput is not None and self._best_throughput > 0:
+            if throughput < self.slowdown_ratio * self._best_throughput:
+                reasons.append(f"throughput cayó a {throughput:.3g} s/s (mejor {self._best_throughput:.3g} s/s)")
+        return reasons
+
+    @property
+    def is_slowing_down(self) -> bool:
+        return bool(self.slowdown_reasons())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado actual del progreso como diccionario serializable."""
+        return {
+            'current_time': self.current_time,
+            'end_time': self.end_time,
+            'percent': self.percent,
+            'time_steps': self.time_steps,
+            'delta_t': self.delta_t,
+            'max_courant': self.max_courant,
+            'throughput': self.throughput,
+            'mean_throughput': self.mean_throughput,
+            'eta_seconds': self.eta_seconds,
+            'elapsed_seconds': self.elapsed,
+            'execution_time': self.execution_time,
+            'clock_time': self.clock_time,
+            'slowdown': self.slowdown_reasons(),
+        }
+
+    def format_status(self) -> str:
+        """Texto corto para la barra de estado."""
+        parts = [f"t = {self.current_time:.4g} / {self.end_time:.4g} s ({self.percent:.1f}%)"]
+        throughput = self.throughput
+        if throughput is not None:
+            parts.append(f"{throughput:.3g} s sim/s")
+        eta = self.eta_seconds
+        if eta is not None:
+            parts.append(f"ETA {format_duration(eta)}")
+        reasons = self.slowdown_reasons()
+        if reasons:
+            parts.append("⚠ " + "; ".join(reasons))
+        return " | ".join(parts)
+
+
+def format_duration(seconds: float) -> str:
+    """Formatea una duración en segundos como 'HhMMmSSs'."""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m{secs:02d}s"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
+
+
+def build_run_record(progress: RunProgress, script_name: str, num_processors: int,
+                     status: str, extra: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Arma el registro de metadatos de una corrida para poder comparar el
+    throughput entre descomposiciones y máquinas.
+    """
+    record = {
+        'finished_at': datetime.now().isoformat(timespec='seconds'),
+        'script': script_name,
+        'status': status,
+        'num_processors': num_processors,
+        'host': platform.node(),
+        'cpu_count': os.cpu_count(),
+        'start_time': progress.start_time,
+        'end_time': progress.end_time,
+        'reached_time': progress.current_time,
+        'percent': progress.percent,
+        'time_steps': progress.time_steps,
+        'wall_seconds': progress.elapsed,
+        'mean_throughput': progress.mean_throughput,
+        'last_throughput': progress.throughput,
+        'execution_time': progress.execution_time,
+        'clock_time': progress.clock_time,
+        'slowdown': progress.slowdown_reasons(),
+    }
+    if extra:
+        record.update(extra)
+    return record
+
+
+def append_run_metadata(case_path: Path, record: Dict[str, Any]) -> None:
+    """
+    Agrega el registro de una corrida al archivo 'run_metadata.json' del caso.
+    """
+    metadata_path = case_path / RUN_METADATA_FILE
+    runs = []
+    if metadata_path.exists():
+        try:
+            with open(metadata_path, 'r') as f:
+                runs = json.load(f).get('runs', [])
+        except (json.JSONDecodeError, AttributeError):
+            logger.warning(f"No se pudo leer {metadata_path}, se sobrescribirá.")
+            runs = []
+
+    runs.append(record)
+    try:
+        with open(metadata_path, 'w') as f:
+            json.dump({'runs': runs}, f, indent=4)
+    except (IOError, PermissionError) as e:
+        logger.error(f"No se pudieron guardar los metadatos de la corrida en {metadata_path}: {e}")
@@ -0,0 +1,17 @@
+source "${FOAM_BASHRC:-/usr/lib/openfoam/openfoam2312/etc/bashrc}"
+
+# Reconstruye bajo demanda tiempos de un caso que quedó descompuesto.
+# Los tiempos se indican en RECONSTRUCT_TIMES ('latest', 'all' o una lista separada por comas).
+NUM_PROCS=${1:-1}
+
+# Cambia al directorio del caso
+cd "${CASE_DIR:-/case}"
+
+. "$(dirname "$0")/reconstruct_times.sh"
+reconstruct_times "$NUM_PROCS" "${RECONSTRUCT_TIMES:-latest}"
+if [ $? -ne 0 ]; then
+    echo "Error: redistributePar -reconstruct failed."
+    exit 1
+fi
+
+echo "Reconstruction finished."
@@ -1,8 +1,12 @@
-source /usr/lib/openfoam/openfoam2312/etc/bashrc
+source "${FOAM_BASHRC:-/usr/lib/openfoam/openfoam2312/etc/bashrc}"
 
 
 # Cambia al directorio del caso
-cd /case
+cd "${CASE_DIR:-/case}"
+
+. "$(dirname "$0")/mesh_decomposition.sh"
+# Los pasos seriales necesitan la malla completa
+ensure_reconstructed_mesh || exit 1
 
 # # create input file from 1D computation for funkySetFields
 # mkdir 1d_profil
@@ -11,11 +15,20 @@ cd /case
 
 # blockMesh
 
+. "$(dirname "$0")/run_initialization.sh"
+
+# Al retomar, los campos salen del último tiempo completo; si las entradas de
+# funkySetFields no cambiaron, se restauran los campos ya inicializados
+if [ -n "$RESUME_TIME" ]; then
+    resume_from "$RESUME_TIME"
+elif [ "$SKIP_INIT" = "1" ]; then
+    restore_initialized_fields
 # Check if the setFieldsDict file exists
-if [ -f "system/funkySetFieldsDict" ]; then
+elif [ -f "system/funkySetFieldsDict" ]; then
     echo "funkySetFieldsDict found. Running funkySetFields..."
     # Initialize the alpha field
-    funkySetFields -time 0
+    funkySetFields -time 0 || exit 1
+    save_initialized_fields
 else
     echo "funkySetFieldsDict not found. Skipping setFields."
 fi
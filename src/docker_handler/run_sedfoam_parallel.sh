@@ -1,17 +1,34 @@
-source /usr/lib/openfoam/openfoam2312/etc/bashrc
+source "${FOAM_BASHRC:-/usr/lib/openfoam/openfoam2312/etc/bashrc}"
 
 # Get the number of processors from the first argument
 # Default to 1 if not provided, though it should always be > 1 for this script
 NUM_PROCS=${1:-1}
 
 # Change to the case directory
-cd /case
+cd "${CASE_DIR:-/case}"
 
+. "$(dirname "$0")/mesh_decomposition.sh"
+. "$(dirname "$0")/reconstruct_times.sh"
+# setFields y la descomposición necesitan la malla completa (salvo que se reutilice la descomposición)
+if [ "$SKIP_DECOMPOSE" != "1" ]; then
+    ensure_reconstructed_mesh || exit 1
+fi
+
+. "$(dirname "$0")/run_initialization.sh"
+
+# Los processor* existentes ya tienen las condiciones iniciales: no se vuelven a inicializar
+if [ -n "$RESUME_TIME" ]; then
+    resume_from "$RESUME_TIME"
+elif [ "$SKIP_DECOMPOSE" = "1" ]; then
+    echo "Reusing existing decomposition. Skipping funkySetFields."
+elif [ "$SKIP_INIT" = "1" ]; then
+    restore_initialized_fields
 # Check if the setFieldsDict file exists
-if [ -f "system/funkySetFieldsDict" ]; then
+elif [ -f "system/funkySetFieldsDict" ]; then
     echo "funkySetFieldsDict found. Running funkySetFields..."
     # Initialize the alpha field
-    funkySetFields -time 0
+    funkySetFields -time 0 || exit 1
+    save_initialized_fields
 else
     echo "funkySetFieldsDict not found. Skipping funkySetFields."
 fi
@@ -19,20 +36,32 @@ fi
 # Check if we are actually running in parallel
 if [ "$NUM_PROCS" -gt 1 ]; then
     echo "--- Starting parallel execution with $NUM_PROCS processors. ---"
+    # El fileHandler (y FOAM_IORANKS con collated) llega por el entorno y también
+    # queda en OptimisationSwitches de controlDict para las herramientas de post-proceso
+    echo "File handler: ${FOAM_FILEHANDLER:-uncollated}${FOAM_IORANKS:+, I/O ranks $FOAM_IORANKS}"
 
-    # Decompose the domain
-    echo "Decomposing domain for parallel run..."
-    # decomposePar
-    mpirun -np "$NUM_PROCS" redistributePar -decompose -parallel
-    if [ $? -ne 0 ]; then
-        echo "Error: decomposePar failed."
-        exit 1
+    # Decompose the domain (unless the previous decomposition is still valid)
+    if [ "$SKIP_DECOMPOSE" = "1" ]; then
+        echo "Mesh and decomposition unchanged. Reusing processor directories."
+    else
+        echo "Decomposing domain for parallel run..."
+        # Los tiempos que solo existen descompuestos se perderían al borrar los processor*
+        prepare_redecompose || exit 1
+        rm -rf processor* .decomposition_signature
+        # decomposePar
+        mpirun -np "$NUM_PROCS" redistributePar -decompose -parallel
+        if [ $? -ne 0 ]; then
+            echo "Error: redistributePar -decompose failed."
+            exit 1
+        fi
+        # Firma de la malla y la descomposición, para reutilizarlas en la próxima corrida
+        if [ -n "$DECOMPOSITION_SIGNATURE" ]; then
+            echo "$DECOMPOSITION_SIGNATURE" > .decomposition_signature
+        fi
     fi
 
     # Run the solver in parallel
     echo "Running sedFoam in parallel..."
-    # Se usa -fileHandler collated para optimizar la E/S, como se recomienda para
-    # flujos de trabajo modernos y para reducir el número de archivos de salida.
     mpirun -np "$NUM_PROCS" sedFoam_rbgh -parallel 
 
     if [ $? -ne 0 ]; then
@@ -40,12 +69,11 @@ if [ "$NUM_PROCS" -gt 1 ]; then
         exit 1
     fi
 
-    # Reconstruct the case
-    echo "Reconstructing domain..."
-    # reconstructPar 
-    mpirun -np "$NUM_PROCS" redistributePar -reconstruct -parallel
+    # Reconstruct only the requested times (latest by default); the rest stay
+    # decomposed and can be reconstructed on demand with run_reconstruct.sh
+    reconstruct_times "$NUM_PROCS" "${RECONSTRUCT_TIMES:-latest}"
     if [ $? -ne 0 ]; then
-        echo "Error: reconstructPar failed."
+        echo "Error: redistributePar -reconstruct failed."
         exit 1
     fi
     
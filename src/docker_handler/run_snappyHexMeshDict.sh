@@ -1,8 +1,12 @@
 
-source /usr/lib/openfoam/openfoam2312/etc/bashrc
+source "${FOAM_BASHRC:-/usr/lib/openfoam/openfoam2312/etc/bashrc}"
 
 # Cambia al directorio del caso
-cd /case
+cd "${CASE_DIR:-/case}"
+
+. "$(dirname "$0")/mesh_decomposition.sh"
+# Los pasos seriales necesitan la malla completa
+ensure_reconstructed_mesh || exit 1
 
 snappyHexMesh -overwrite
 
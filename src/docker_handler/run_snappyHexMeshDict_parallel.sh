@@ -1,15 +1,52 @@
-source /usr/lib/openfoam/openfoam2312/etc/bashrc
+source "${FOAM_BASHRC:-/usr/lib/openfoam/openfoam2312/etc/bashrc}"
 
 # Get the number of processors from the first argument
 # Default to 1 if not provided, though it should always be > 1 for this script
 NUM_PROCS=${1:-1}
 
 # Cambia al directorio del caso
-cd /case
+cd "${CASE_DIR:-/case}"
 
-decomposePar
+. "$(dirname "$0")/mesh_decomposition.sh"
 
+echo "--- Starting parallel meshing with $NUM_PROCS processors. ---"
+
+# La malla base se descompone de nuevo: cualquier descomposición anterior queda obsoleta
+ensure_reconstructed_mesh || exit 1
+rm -rf processor* .decomposition_signature
+
+echo "Decomposing base mesh..."
+mpirun -np "$NUM_PROCS" redistributePar -decompose -parallel
+if [ $? -ne 0 ]; then
+    echo "Error: redistributePar -decompose failed."
+    exit 1
+fi
+
+echo "Running snappyHexMesh in parallel..."
 mpirun -np "$NUM_PROCS" snappyHexMesh -parallel -overwrite
+if [ $? -ne 0 ]; then
+    echo "Error: snappyHexMesh failed."
+    exit 1
+fi
+
+# Desde acá la malla nueva existe solo descompuesta
+echo "$NUM_PROCS" > "$MESH_DECOMPOSED_FILE"
+
+if [ "$CHECK_MESH" = "1" ]; then
+    echo "Running checkMesh in parallel..."
+    mpirun -np "$NUM_PROCS" checkMesh -parallel
+    if [ $? -ne 0 ]; then
+        echo "Warning: checkMesh reported problems with the mesh."
+    fi
+fi
+
+# El visor lee los patches directamente de los processor* si la malla queda
+# descompuesta: no hace falta foamToVTK
 
-reconstructParMesh -constant
+if [ "$RECONSTRUCT_MESH" = "1" ]; then
+    ensure_reconstructed_mesh || exit 1
+else
+    echo "Mesh left decomposed. It will be reconstructed when a serial step needs it."
+fi
 
+echo "--- Parallel meshing finished successfully. ---"
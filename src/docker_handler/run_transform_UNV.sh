@@ -1,10 +1,9 @@
-source /usr/lib/openfoam/openfoam2312/etc/bashrc
+source "${FOAM_BASHRC:-/usr/lib/openfoam/openfoam2312/etc/bashrc}"
 # cd /case
 # ideasUnvToFoam malla.unv
-# foamToVTK
 
 # Cambia al directorio del caso
-cd /case
+cd "${CASE_DIR:-/case}"
 
 # Asegúrate de que las carpetas existen
 mkdir -p constant/polyMesh
@@ -16,6 +15,4 @@ mv malla.unv constant/polyMesh/
 echo "Ejecutando ideasUnvToFoam..."
 ideasUnvToFoam constant/polyMesh/malla.unv
 
-# Ahora, foamToVTK se ejecutará en la raíz del caso
-echo "Ejecutando foamToVTK..."
-foamToVTK
\ No newline at end of file
+# El visor lee los patches directamente de constant/polyMesh: no hace falta foamToVTK
\ No newline at end of file
@@ -1,7 +1,7 @@
-source /usr/lib/openfoam/openfoam2312/etc/bashrc
+source "${FOAM_BASHRC:-/usr/lib/openfoam/openfoam2312/etc/bashrc}"
 
 # Entra en el directorio del caso
-cd /case
+cd "${CASE_DIR:-/case}"
 
 # Mueve el archivo blockMeshDict al directorio 'system'
 # Esto es crucial porque blockMesh lo busca allí por defecto
@@ -12,6 +12,4 @@ mv blockMeshDict system/
 echo "Generando la malla con blockMesh..."
 blockMesh
 
-# Post-procesamiento opcional: convierte la malla a formato VTK
-echo "Convirtiendo la malla a formato VTK..."
-foamToVTK
\ No newline at end of file
+# El visor lee los patches directamente de constant/polyMesh: no hace falta foamToVTK
\ No newline at end of file
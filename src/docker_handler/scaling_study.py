@@ -0,0 +1,283 @@
+import asyncio
+import json
+import logging
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .dockerHandler import DockerHandler
+from .run_progress import EXECUTION_TIME_RE, TIME_RE
+from src.file_handler.decomposition_planner import mesh_statistics, plan_decomposition, format_plan
+from src.file_handler.openfoam_models.decomposeParDict import decomposeParDict
+
+logger = logging.getLogger(__name__)
+
+# Carpeta del caso donde se corren las copias del estudio y se guardan los logs
+STUDY_DIR = "scaling_study"
+STUDY_RESULTS_FILE = "scaling_study.json"
+STUDY_CHART_FILE = "scaling_study.png"
+
+DEFAULT_STUDY_STEPS = 20
+
+# Los primeros pasos incluyen la lectura de la malla y la construcción de las
+# matrices: se descartan al medir el costo por paso.
+WARMUP_STEPS = 2
+
+# Eficiencia paralela mínima para recomendar una cantidad de núcleos: por debajo
+# se gasta más de lo que se gana agregando procesadores.
+MIN_EFFICIENCY = 0.6
+
+SERIAL_SCRIPTS = {'interFoam': "run_openfoam.sh", 'sedFoam': "run_sedfoam.sh"}
+PARALLEL_SCRIPTS = {'interFoam': "run_openfoam_parallel.sh", 'sedFoam': "run_sedfoam_parallel.sh"}
+
+
+def core_counts(max_cores: int) -> List[int]:
+    """1, 2, 4, ... hasta 'max_cores' (que se incluye aunque no sea potencia de 2)."""
+    counts = []
+    n = 1
+    while n < max_cores:
+        counts.append(n)
+        n *= 2
+    counts.append(max(1, max_cores))
+    return counts
+
+
+def step_timings(lines: Iterable[str]) -> List[Dict[str, float]]:
+    """ExecutionTime y ClockTime acumulados al final de cada paso de tiempo del log."""
+    timings = []
+    sim_time = None
+    for line in lines:
+        line = line.strip()
+        match = TIME_RE.match(line)
+        if match:
+            sim_time = float(match.group(1))
+            continue
+        match = EXECUTION_TIME_RE.match(line)
+        if match and sim_time is not None:
+            timings.append({'time': sim_time, 'execution_time': float(match.group(1)),
+                            'clock_time': float(match.group(2))})
+    return timings
+
+
+def seconds_per_step(timings: List[Dict[str, float]], warmup: int = WARMUP_STEPS) -> Optional[float]:
+    """
+    Costo medio de un paso sin los pasos de arranque. Se usa ExecutionTime
+    porque ClockTime se informa en segundos enteros.
+    """
+    if len(timings) <= warmup + 1:
+        return None
+    first, last = timings[warmup], timings[-1]
+    steps = len(timings) - 1 - warmup
+    return (last['execution_time'] - first['execution_time']) / steps
+
+
+def analyze_scaling(per_step: Dict[int, float], min_efficiency: float = MIN_EFFICIENCY) -> Dict[str, Any]:
+    """
+    Speedup y eficiencia paralela respecto de la corrida con menos núcleos.
+
+    Returns:
+        dict: 'rows' (núcleos, segundos por paso, speedup, eficiencia) y
+            'best_cores': la corrida más rápida entre las que mantienen la
+            eficiencia mínima.
+    """
+    counts = sorted(n for n, t in per_step.items() if t and t > 0)
+    if not counts:
+        return {'rows': [], 'best_cores': None}
+    base_cores = counts[0]
+    base_time = per_step[base_cores] * base_cores
+
+    rows = []
+    for n in counts:
+        speedup = base_time / per_step[n]
+        rows.append({
+            'cores': n,
+            'seconds_per_step': per_step[n],
+            'speedup': speedup,
+            'efficiency': speedup / n,
+        })
+    candidates = [row for row in rows if row['efficiency'] >= min_efficiency] or rows[:1]
+    best = min(candidates, key=lambda row: row['seconds_per_step'])
+    return {'rows': rows, 'best_cores': best['cores']}
+
+
+def _set_entry(text: str, key: str, value: str) -> str:
+    pattern = re.compile(rf'^(\s*{key}\s+)[^;]*;', re.MULTILINE)
+    if pattern.search(text):
+        return pattern.sub(lambda m: f"{m.group(1)}{value};", text, count=1)
+    return text + f"\n{key} {value};\n"
+
+
+def _get_entry(text: str, key: str, default: float) -> float:
+    match = re.search(rf'^\s*{key}\s+([-+0-9.eE]+)\s*;', text, re.MULTILINE)
+    return float(match.group(1)) if match else default
+
+
+def prepare_study_case(case_path: Path, study_case: Path, steps: int, decomposition: Dict[str, Any]) -> Path:
+    """
+    Copia la configuración, la malla y las condiciones iniciales del caso a
+    'study_case', limita la corrida a 'steps' pasos sin escribir resultados y
+    escribe la descomposición indicada.
+
+    El paso de tiempo queda fijo en el 'deltaT' del caso ('adjustTimeStep no'):
+    con el paso ajustable, 'endTime' no determina la cantidad de pasos.
+    """
+    if study_case.exists():
+        shutil.rmtree(study_case)
+    study_case.mkdir(parents=True)
+    for name in ("system", "constant", "0"):
+        if (case_path / name).is_dir():
+            shutil.copytree(case_path / name, study_case / name)
+
+    control_dict = study_case / "system" / "controlDict"
+    text = control_dict.read_text()
+    start_time = _get_entry(text, "startTime", 0.0)
+    delta_t = _get_entry(text, "deltaT", 1.0)
+    end_time = start_time + steps * delta_t
+    text = _set_entry(text, "startFrom", "startTime")
+    text = _set_entry(text, "endTime", f"{end_time:g}")
+    text = _set_entry(text, "adjustTimeStep", "no")
+    # Ninguna escritura: el intervalo se cuenta en pasos y supera los de la corrida
+    text = _set_entry(text, "writeControl", "timeStep")
+    text = _set_entry(text, "writeInterval", str(steps + 1))
+    control_dict.write_text(text)
+
+    model = decomposeParDict()
+    model.update_parameters({'numberOfSubdomains': decomposition['numberOfSubdomains'],
+                             'method': decomposition['method']})
+    model.write_file(study_case)
+    return study_case
+
+
+def decomposition_for(stats: Dict[str, Any], cores: int) -> Dict[str, Any]:
+    """Descomposición del planificador para exactamente 'cores' subdominios."""
+    return plan_decomposition(stats['n_cells'], stats['lengths'], cpu_count=cores, cells_per_core=1,
+                              single_cell_axes=stats['single_cell_axes'], quad_fraction=stats['quad_fraction'])
+
+
+async def run_scaling_study(case_path: Path, solver: str, counts: Iterable[int], steps: int = DEFAULT_STUDY_STEPS,
+                            backend=None, on_line: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Corre el caso 'steps' pasos con cada cantidad de núcleos de 'counts' (la de
+    un núcleo con el script serial, el resto con los scripts paralelos) y
+    devuelve el informe de escalabilidad.
+
+    Raises:
+        FileHandlerError: Si no se puede leer la malla del caso.
+        ContainerExecutionError: Si alguna de las corridas falla.
+    """
+    if solver not in SERIAL_SCRIPTS:
+        raise ValueError(f"Solver no soportado para el estudio de escalabilidad: {solver}")
+    stats = mesh_statistics(case_path)
+    study_dir = case_path / STUDY_DIR
+    study_dir.mkdir(exist_ok=True)
+
+    per_step = {}
+    runs = []
+    for cores in counts:
+        decomposition = decomposition_for(stats, cores)
+        cores = decomposition['numberOfSubdomains']
+        if cores in per_step:
+            continue
+        study_case = prepare_study_case(case_path, study_dir / f"np{cores}", steps, decomposition)
+        script = SERIAL_SCRIPTS[solver] if cores == 1 else PARALLEL_SCRIPTS[solver]
+        if on_line:
+            on_line(f">>> Estudio de escalabilidad: {cores} núcleo(s), {steps} pasos")
+
+        lines = []
+        handler = DockerHandler(study_case, backend=backend)
+        stream = handler.stream_script(script, cores, {"RECONSTRUCT_TIMES": "none"})
+        try:
+            async for line in stream:
+                lines.append(line)
+                if on_line:
+                    on_line(line)
+        except asyncio.CancelledError:
+            # Estudio cancelado desde la GUI: se detiene la corrida en curso
+            await handler.stop_simulation_async()
+            await stream.aclose()
+            raise
+
+        (study_dir / f"np{cores}.log").write_text("\n".join(lines) + "\n")
+        shutil.rmtree(study_case, ignore_errors=True)
+
+        timings = step_timings(lines)
+        per_step[cores] = seconds_per_step(timings)
+        runs.append({
+            'cores': cores,
+            'method': decomposition['method'][0],
+            'time_steps': len(timings),
+            'execution_time': timings[-1]['execution_time'] if timings else None,
+            'clock_time': timings[-1]['clock_time'] if timings else None,
+            'seconds_per_step': per_step[cores],
+        })
+
+    report = analyze_scaling(per_step)
+    report.update({
+        'finished_at': datetime.now().isoformat(timespec='seconds'),
+        'solver': solver,
+        'steps': steps,
+        'n_cells': stats['n_cells'],
+        'runs': runs,
+        'recommended': decomposition_for(stats, report['best_cores']) if report['best_cores'] else None,
+    })
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Tabla de texto con los resultados del estudio."""
+    lines = [f"{'Núcleos':>8} {'s/paso':>10} {'Speedup':>8} {'Eficiencia':>10}"]
+    for row in report['rows']:
+        lines.append(f"{row['cores']:>8} {row['seconds_per_step']:>10.4g} {row['speedup']:>8.2f} "
+                     f"{row['efficiency']:>10.0%}")
+    if report.get('recommended'):
+        lines.append(f"Recomendado: {format_plan(report['recommended'])}")
+    return "\n".join(lines)
+
+
+def save_report(case_path: Path, report: Dict[str, Any]) -> Optional[Path]:
+    """
+    Guarda el informe en el caso y, si matplotlib está disponible, el gráfico
+    de speedup y eficiencia.
+
+    Returns:
+        Path: Ruta del gráfico, o None si no se pudo generar.
+    """
+    with open(case_path / STUDY_RESULTS_FILE, "w") as f:
+        json.dump(report, f, indent=4, default=lambda value: value.tolist() if hasattr(value, "tolist") else str(value))
+
+    try:
+        from matplotlib.figure import Figure
+    except ImportError:
+        logger.warning("matplotlib no está instalado: no se genera el gráfico del estudio de escalabilidad.")
+        return None
+    if not report['rows']:
+        return None
+
+    cores = [row['cores'] for row in report['rows']]
+    figure = Figure(figsize=(6, 4))
+    speedup_axes = figure.add_subplot(111)
+    speedup_axes.plot(cores, [row['speedup'] for row in report['rows']], "o-", label="Speedup")
+    speedup_axes.plot(cores, cores, "--", color="gray", label="Ideal")
+    speedup_axes.set_xlabel("Núcleos")
+    speedup_axes.set_ylabel("Speedup")
+    efficiency_axes = speedup_axes.twinx()
+    efficiency_axes.plot(cores, [row['efficiency'] * 100 for row in report['rows']], "s-", color="tab:orange",
+                         label="Eficiencia")
+    efficiency_axes.set_ylabel("Eficiencia (%)")
+    efficiency_axes.set_ylim(0, 110)
+    speedup_axes.legend(loc="upper left")
+    figure.tight_layout()
+
+    chart_path = case_path / STUDY_CHART_FILE
+    figure.savefig(chart_path)
+    return chart_path
+
+
+def load_report(case_path: Path) -> Optional[Dict[str, Any]]:
+    path = case_path / STUDY_RESULTS_FILE
+    if not path.exists():
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
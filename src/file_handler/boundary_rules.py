@@ -0,0 +1,146 @@
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# Las entradas de boundaryField con el nombre entre comillas son expresiones
+# regulares ("wall.*"); las que nombran un grupo de patches (inGroups del
+# archivo boundary) se aplican a todos los patches del grupo.
+PATTERN_QUOTE = '"'
+
+_PATCH_BLOCK = re.compile(r'^\s*([A-Za-z0-9_.\-]+)\s*\n\s*\{(.*?)\}', re.MULTILINE | re.DOTALL)
+_IN_GROUPS = re.compile(r'inGroups\s+(?:List<word>\s*)?\d*\s*\(([^)]*)\)')
+
+
+def is_pattern(name: str) -> bool:
+    return len(name) >= 2 and name.startswith(PATTERN_QUOTE) and name.endswith(PATTERN_QUOTE)
+
+
+def pattern_name(regex: str) -> str:
+    """Nombre de la entrada de boundaryField para la expresión regular."""
+    return f"{PATTERN_QUOTE}{regex.strip(PATTERN_QUOTE)}{PATTERN_QUOTE}"
+
+
+def check_pattern(name: str) -> None:
+    """
+    Raises:
+        ValueError: Si la expresión regular de la entrada no es válida.
+    """
+    try:
+        re.compile(name[1:-1])
+    except re.error as e:
+        raise ValueError(f"La expresión regular {name} no es válida: {e}")
+
+
+def read_patch_groups(boundary_path: Path) -> Dict[str, List[str]]:
+    """
+    Grupos de patches ('inGroups') del archivo boundary de la malla: nombre del
+    grupo -> patches, en el orden de la malla. Los procBoundary no se cuentan.
+    """
+    if not boundary_path.is_file():
+        return {}
+    content = boundary_path.read_text(encoding='utf-8', errors='replace')
+    start, end = content.find('('), content.rfind(')')
+    if start == -1 or end == -1:
+        return {}
+
+    groups = {}
+    for patch_name, body in _PATCH_BLOCK.findall(content[start + 1:end]):
+        if patch_name.startswith("procBoundary"):
+            continue
+        match = _IN_GROUPS.search(body)
+        for group in match.group(1).split() if match else []:
+            groups.setdefault(group, []).append(patch_name)
+    return groups
+
+
+def is_rule(name: str, patch_names: Sequence[str], groups: Dict[str, List[str]]) -> bool:
+    """Indica si la entrada es una regla (patrón o grupo) y no la de un patch."""
+    return is_pattern(name) or (name in groups and name not in patch_names)
+
+
+def entry_settings(entry: dict) -> dict:
+    """La condición de borde de la entrada, sin el nombre."""
+    return {key: value for key, value in entry.items() if key != 'patchName'}
+
+
+def rule_for(patch_name: str, rules: Sequence[dict], groups: Dict[str, List[str]]) -> Optional[dict]:
+    """
+    Regla que se aplica al patch si no tiene entrada propia, con la prioridad de
+    OpenFOAM: primero los grupos y después los patrones; entre reglas del mismo
+    tipo, la última que coincide.
+    """
+    for rule in reversed(rules):
+        name = rule['patchName']
+        if not is_pattern(name) and patch_name in groups.get(name, ()):
+            return rule
+    for rule in reversed(rules):
+        name = rule['patchName']
+        if is_pattern(name) and re.fullmatch(name[1:-1], patch_name):
+            return rule
+    return None
+
+
+def split_entries(entries: Sequence[dict], patch_names: Sequence[str],
+                  groups: Dict[str, List[str]]):
+    """
+    Separa las entradas de boundaryField en las de cada patch de la malla y las
+    reglas. Las entradas de patches o grupos que ya no existen se descartan.
+
+    Returns:
+        tuple: (patch -> entrada, lista de reglas en su orden).
+    """
+    names = set(patch_names)
+    explicit, rules = {}, []
+    for entry in entries:
+        name = entry.get('patchName', '')
+        if is_rule(name, names, groups):
+            rules.append(entry)
+        elif name in names:
+            explicit[name] = entry
+    return explicit, rules
+
+
+def compact_boundary_field(entries: Sequence[dict], patch_names: Sequence[str],
+                           groups: Optional[Dict[str, List[str]]] = None) -> List[dict]:
+    """
+    Reescribe boundaryField con la menor cantidad de entradas que dan la misma
+    condición a cada patch: se quitan las entradas de patches iguales a la regla
+    que ya los cubre y los grupos cuyos patches tienen todos la misma condición
+    pasan a ser una sola entrada. Quedan primero los patches, después los grupos
+    y al final los patrones (la prioridad solo depende del orden entre reglas
+    del mismo tipo, que se conserva).
+    """
+    groups = groups or {}
+    names = set(patch_names)
+    explicit, rules = split_entries(entries, patch_names, groups)
+
+    kept = {}
+    for name in patch_names:
+        entry = explicit.get(name)
+        if entry is None:
+            continue
+        rule = rule_for(name, rules, groups)
+        if rule is None or entry_settings(rule) != entry_settings(entry):
+            kept[name] = entry
+
+    group_rules = [rule for rule in rules if not is_pattern(rule['patchName'])]
+    pattern_rules = [rule for rule in rules if is_pattern(rule['patchName'])]
+
+    # Un patch de dos grupos con entrada quedaría en manos del orden de las reglas
+    covered = {patch for rule in group_rules for patch in groups.get(rule['patchName'], ())}
+    folded = []
+    for group, members in groups.items():
+        members = [patch for patch in members if patch in names]
+        if group in names or len(members) < 2 or covered.intersection(members):
+            continue
+        if any(patch not in kept for patch in members):
+            continue
+        settings = entry_settings(kept[members[0]])
+        if any(entry_settings(kept[patch]) != settings for patch in members[1:]):
+            continue
+        folded.append({'patchName': group, **settings})
+        for patch in members:
+            del kept[patch]
+        covered.update(members)
+
+    return list(kept.values()) + group_rules + folded + pattern_rules
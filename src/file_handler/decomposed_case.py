@@ -0,0 +1,219 @@
+import hashlib
+import logging
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Archivo del caso donde los scripts paralelos guardan la firma de la última descomposición
+SIGNATURE_FILE = ".decomposition_signature"
+
+PROCESSOR_DIR_RE = re.compile(r'^processor(\d+)$')
+# Con fileHandler collated: processors<N> o, con grupos de E/S, processors<N>_<desde>-<hasta>
+COLLATED_DIR_RE = re.compile(r'^processors(\d+)(?:_(\d+)-(\d+))?$')
+
+# fileHandler de OpenFOAM
+FILE_HANDLER_UNCOLLATED = "uncollated"
+FILE_HANDLER_COLLATED = "collated"
+FILE_HANDLER_MASTER_UNCOLLATED = "masterUncollated"
+
+# Entradas del caso de las que depende la descomposición: si cambian, hay que
+# volver a descomponer (los campos de '0' se copian a cada processor*).
+SIGNATURE_INPUTS = (
+    "constant/polyMesh",
+    "0",
+    "system/decomposeParDict",
+    "system/setFieldsDict",
+    "system/funkySetFieldsDict",
+)
+
+# Marca que deja el mallado en paralelo cuando la malla existe solo en
+# processor*/constant/polyMesh (contiene el número de procesadores)
+MESH_DECOMPOSED_FILE = ".mesh_decomposed"
+
+# Modos de reconstrucción al terminar una corrida paralela
+RECONSTRUCT_LATEST = "latest"
+RECONSTRUCT_ALL = "all"
+RECONSTRUCT_NONE = "none"
+
+
+def _hash_path(digest, case_path: Path, relative: str):
+    path = case_path / relative
+    if path.is_dir():
+        files = sorted(p for p in path.rglob("*") if p.is_file())
+    elif path.is_file():
+        files = [path]
+    else:
+        return
+    for file in files:
+        digest.update(file.relative_to(case_path).as_posix().encode())
+        with open(file, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+
+
+def decomposition_signature(case_path: Path, num_processors: int,
+                            file_handler: str = FILE_HANDLER_UNCOLLATED) -> str:
+    """
+    Firma de la malla, las condiciones iniciales y la configuración de la
+    descomposición. Dos corridas con la misma firma pueden reutilizar los
+    directorios processor* existentes. El fileHandler forma parte de la firma
+    porque cambia el formato en disco de los datos descompuestos.
+    """
+    digest = hashlib.sha256(f"np={num_processors};fileHandler={file_handler}".encode())
+    for relative in SIGNATURE_INPUTS:
+        _hash_path(digest, case_path, relative)
+    return digest.hexdigest()
+
+
+def processor_dirs(case_path: Path) -> List[Path]:
+    """Directorios processorN del caso, ordenados por N."""
+    dirs = []
+    for item in case_path.iterdir() if case_path.is_dir() else []:
+        match = PROCESSOR_DIR_RE.match(item.name)
+        if match and item.is_dir():
+            dirs.append((int(match.group(1)), item))
+    return [path for _, path in sorted(dirs)]
+
+
+def collated_dirs(case_path: Path) -> List[Path]:
+    """Directorios processors<N>[_<desde>-<hasta>] escritos con fileHandler collated."""
+    dirs = []
+    for item in case_path.iterdir() if case_path.is_dir() else []:
+        match = COLLATED_DIR_RE.match(item.name)
+        if match and item.is_dir():
+            dirs.append((int(match.group(2) or 0), item))
+    return [path for _, path in sorted(dirs)]
+
+
+def decomposed_processor_count(case_path: Path) -> int:
+    """
+    Cantidad de procesadores de la descomposición existente, sea cual sea el
+    formato en disco (un processorN por rango o los processors<N> de collated).
+    """
+    dirs = processor_dirs(case_path)
+    if dirs:
+        return len(dirs)
+    counts = {int(COLLATED_DIR_RE.match(d.name).group(1)) for d in collated_dirs(case_path)}
+    return counts.pop() if len(counts) == 1 else 0
+
+
+def decomposed_data_dirs(case_path: Path) -> List[Path]:
+    """Directorios con datos descompuestos: processorN o, si no hay, los de collated."""
+    return processor_dirs(case_path) or collated_dirs(case_path)
+
+
+def stored_signature(case_path: Path) -> Optional[str]:
+    path = case_path / SIGNATURE_FILE
+    if not path.exists():
+        return None
+    return path.read_text().strip() or None
+
+
+def can_reuse_decomposition(case_path: Path, num_processors: int, signature: str) -> bool:
+    """
+    Indica si los processor* actuales corresponden a la misma malla y
+    descomposición, de modo que se puede saltear 'redistributePar -decompose'.
+    """
+    if decomposed_processor_count(case_path) != num_processors:
+        return False
+    return stored_signature(case_path) == signature
+
+
+def clear_decomposition_signature(case_path: Path) -> None:
+    (case_path / SIGNATURE_FILE).unlink(missing_ok=True)
+
+
+def mesh_is_decomposed(case_path: Path) -> bool:
+    """Indica si la malla actual del caso existe solo descompuesta (mallado en paralelo)."""
+    return (case_path / MESH_DECOMPOSED_FILE).is_file() and bool(processor_dirs(case_path))
+
+
+def mesh_boundary_file(case_path: Path) -> Path:
+    """
+    Archivo 'boundary' de la malla actual: el de constant/polyMesh o, si la malla
+    quedó descompuesta, el de processor0 (que además lista los procBoundary).
+    """
+    if mesh_is_decomposed(case_path):
+        return processor_dirs(case_path)[0] / "constant" / "polyMesh" / "boundary"
+    return case_path / "constant" / "polyMesh" / "boundary"
+
+
+def discard_decomposed_mesh(case_path: Path) -> None:
+    """Elimina una malla descompuesta que va a ser reemplazada por una malla nueva."""
+    if not (case_path / MESH_DECOMPOSED_FILE).exists():
+        return
+    logger.info("Se descarta la malla descompuesta anterior.")
+    for path in processor_dirs(case_path) + collated_dirs(case_path):
+        shutil.rmtree(path, ignore_errors=True)
+    (case_path / MESH_DECOMPOSED_FILE).unlink(missing_ok=True)
+    clear_decomposition_signature(case_path)
+
+
+def list_time_directories(path: Path) -> List[str]:
+    """Nombres de las carpetas de tiempo (numéricas) de 'path', ordenadas por tiempo."""
+    times = []
+    for item in path.iterdir() if path.is_dir() else []:
+        if not item.is_dir():
+            continue
+        try:
+            times.append((float(item.name), item.name))
+        except ValueError:
+            continue
+    return [name for _, name in sorted(times)]
+
+
+def decomposed_times(case_path: Path) -> List[str]:
+    """Tiempos escritos por la corrida paralela (según processor0 o el primer processors<N>)."""
+    dirs = decomposed_data_dirs(case_path)
+    return list_time_directories(dirs[0]) if dirs else []
+
+
+def reconstructed_times(case_path: Path) -> List[str]:
+    return list_time_directories(case_path)
+
+
+def pending_reconstruction(case_path: Path) -> List[str]:
+    """Tiempos que existen descompuestos pero todavía no fueron reconstruidos."""
+    reconstructed = {float(t) for t in reconstructed_times(case_path)}
+    return [t for t in decomposed_times(case_path) if float(t) not in reconstructed]
+
+
+def reconstruct_times_argument(times: Iterable[str]) -> str:
+    """Valor de RECONSTRUCT_TIMES para una lista explícita de tiempos."""
+    return ",".join(str(t) for t in times)
+
+
+def io_ranks_argument(io_ranks: Iterable[int]) -> str:
+    """Valor de FOAM_IORANKS para una lista de rangos, p. ej. '(0 8 16)'."""
+    return "(" + " ".join(str(rank) for rank in io_ranks) + ")"
+
+
+def parallel_run_env(case_path: Path, num_processors: int, keep_decomposed: bool = True,
+                     reconstruct: str = RECONSTRUCT_LATEST,
+                     file_handler: str = FILE_HANDLER_UNCOLLATED,
+                     io_ranks: Optional[Iterable[int]] = None) -> Dict[str, str]:
+    """
+    Variables de entorno para los scripts paralelos:
+
+    - DECOMPOSITION_SIGNATURE: firma que el script guarda tras descomponer.
+    - SKIP_DECOMPOSE=1 si los processor* existentes se pueden reutilizar.
+    - RECONSTRUCT_TIMES: 'latest', 'all', 'none' o una lista de tiempos separados por coma.
+    - FOAM_FILEHANDLER: fileHandler con el que se ejecutan todas las herramientas.
+    - FOAM_IORANKS: rangos que escriben en disco con collated (si hay grupos de E/S).
+    """
+    signature = decomposition_signature(case_path, num_processors, file_handler)
+    env = {
+        "DECOMPOSITION_SIGNATURE": signature,
+        "RECONSTRUCT_TIMES": reconstruct,
+        "FOAM_FILEHANDLER": file_handler,
+    }
+    io_ranks = list(io_ranks or [])
+    if io_ranks:
+        env["FOAM_IORANKS"] = io_ranks_argument(io_ranks)
+    if keep_decomposed and can_reuse_decomposition(case_path, num_processors, signature):
+        logger.info("La malla y la descomposición no cambiaron: se reutilizan los directorios processor*.")
+        env["SKIP_DECOMPOSE"] = "1"
+    return env
@@ -0,0 +1,180 @@
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .exceptions import FileHandlerError
+from .poly_mesh import read_points, read_cell_count, quad_face_fraction
+
+logger = logging.getLogger(__name__)
+
+# Celdas por núcleo buscadas: por debajo de ~10-20k celdas la comunicación
+# entre procesadores domina y agregar núcleos deja de acelerar la corrida.
+DEFAULT_CELLS_PER_CORE = 20000
+
+# Por debajo de esta fracción de caras cuadriláteras la malla se considera no
+# estructurada (snappyHexMesh, tetraedros) y se recomienda scotch.
+STRUCTURED_QUAD_FRACTION = 0.95
+
+# Relación de aspecto máxima de un subdominio para usar un método geométrico;
+# por encima (p. ej. 7 subdominios en tajadas) scotch reparte mejor.
+MAX_SUBDOMAIN_ASPECT = 4.0
+
+AXES = ('x', 'y', 'z')
+
+
+def _factorizations(n: int) -> List[Tuple[int, int, int]]:
+    """Todas las ternas (nx, ny, nz) cuyo producto es n."""
+    result = []
+    for nx in range(1, n + 1):
+        if n % nx:
+            continue
+        rest = n // nx
+        for ny in range(1, rest + 1):
+            if rest % ny == 0:
+                result.append((nx, ny, rest // ny))
+    return result
+
+
+def interface_area(divisions: Tuple[int, int, int], lengths: np.ndarray) -> float:
+    """
+    Área total de las interfaces entre subdominios al cortar la caja envolvente
+    en 'divisions': cada corte en x agrega un plano de área Ly*Lz, etc.
+    """
+    lx, ly, lz = lengths
+    nx, ny, nz = divisions
+    return (nx - 1) * ly * lz + (ny - 1) * lx * lz + (nz - 1) * lx * ly
+
+
+def best_divisions(n: int, lengths: np.ndarray, fixed_axes: Tuple[bool, bool, bool] = (False, False, False)
+                   ) -> Tuple[int, int, int]:
+    """
+    Factoriza n en (nx, ny, nz) minimizando el área de interfaz. Las direcciones
+    marcadas en 'fixed_axes' (p. ej. la dirección vacía de un caso 2D) no se dividen.
+    """
+    candidates = [d for d in _factorizations(n)
+                  if all(d[i] == 1 for i in range(3) if fixed_axes[i])]
+    if not candidates:
+        return (n, 1, 1)
+    # Desempate: subdominios lo más cúbicos posible
+    return min(candidates, key=lambda d: (interface_area(d, lengths), subdomain_aspect(d, lengths, fixed_axes)))
+
+
+def subdomain_aspect(divisions: Tuple[int, int, int], lengths: np.ndarray,
+                     fixed_axes: Tuple[bool, bool, bool] = (False, False, False)) -> float:
+    """Relación entre el lado más largo y el más corto de un subdominio."""
+    sides = [lengths[i] / divisions[i] for i in range(3) if not fixed_axes[i] and lengths[i] > 0]
+    if not sides:
+        return 1.0
+    return max(sides) / min(sides)
+
+
+def mesh_statistics(case_path: Path) -> Dict[str, Any]:
+    """
+    Lee de constant/polyMesh la cantidad de celdas, la caja envolvente, las
+    direcciones de una sola celda de espesor y la fracción de caras cuadriláteras.
+
+    Raises:
+        FileHandlerError: Si la malla no existe o no se puede leer.
+    """
+    poly_mesh_dir = case_path / "constant" / "polyMesh"
+    points = read_points(poly_mesh_dir)
+    if points.size == 0:
+        raise FileHandlerError(f"La malla en {poly_mesh_dir} no tiene puntos.")
+
+    bounds_min = points.min(axis=0)
+    bounds_max = points.max(axis=0)
+    # Una dirección con solo dos coordenadas distintas tiene una celda de espesor (caso 2D)
+    single_cell = tuple(bool(np.unique(np.round(points[:, i], 12)).size <= 2) for i in range(3))
+
+    return {
+        'n_cells': read_cell_count(poly_mesh_dir),
+        'bounds_min': bounds_min,
+        'bounds_max': bounds_max,
+        'lengths': bounds_max - bounds_min,
+        'single_cell_axes': single_cell,
+        'quad_fraction': quad_face_fraction(poly_mesh_dir),
+    }
+
+
+def plan_decomposition(n_cells: int, lengths, cpu_count: Optional[int] = None,
+                       cells_per_core: int = DEFAULT_CELLS_PER_CORE,
+                       single_cell_axes: Tuple[bool, bool, bool] = (False, False, False),
+                       quad_fraction: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Recomienda una descomposición del dominio.
+
+    La cantidad de subdominios sale del objetivo de celdas por núcleo, limitada
+    por los núcleos disponibles. Para mallas estructuradas se usa 'simple'
+    (cortes en una dirección) o 'hierarchical', con 'n' factorizado para
+    minimizar el área de interfaz; para mallas no estructuradas o cuando los
+    subdominios quedarían en tajadas muy delgadas, 'scotch'.
+
+    Returns:
+        dict: Con 'numberOfSubdomains' y 'method' en el formato del modelo
+            decomposeParDict, más 'divisions', 'interface_area',
+            'cells_per_subdomain' y un texto 'reason'.
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    lengths = np.asarray(lengths, dtype=float)
+
+    n_sub = int(round(n_cells / float(cells_per_core))) if cells_per_core > 0 else cpu_count
+    n_sub = max(1, min(n_sub, cpu_count))
+
+    divisions = best_divisions(n_sub, lengths, single_cell_axes)
+    area = interface_area(divisions, lengths)
+    aspect = subdomain_aspect(divisions, lengths, single_cell_axes)
+    n_vector = dict(zip(AXES, divisions))
+
+    if quad_fraction is not None and quad_fraction < STRUCTURED_QUAD_FRACTION:
+        method = ['scotch', {}]
+        reason = f"malla no estructurada ({quad_fraction:.0%} de caras cuadriláteras)"
+    elif n_sub > 1 and aspect > MAX_SUBDOMAIN_ASPECT:
+        method = ['scotch', {}]
+        reason = f"la mejor división geométrica {divisions} deja subdominios con relación de aspecto {aspect:.1f}"
+    elif sum(d > 1 for d in divisions) <= 1:
+        method = ['simple', {'n': n_vector, 'delta': 0.001}]
+        reason = "malla estructurada: cortes en una sola dirección"
+    else:
+        method = ['hierarchical', {'n': n_vector, 'order': 'xyz', 'delta': 0.001}]
+        reason = "malla estructurada: cortes en varias direcciones"
+
+    return {
+        'numberOfSubdomains': n_sub,
+        'method': method,
+        'divisions': divisions,
+        'interface_area': area,
+        'cells_per_subdomain': n_cells / n_sub,
+        'reason': reason,
+    }
+
+
+def plan_for_case(case_path: Path, cpu_count: Optional[int] = None,
+                  cells_per_core: int = DEFAULT_CELLS_PER_CORE) -> Dict[str, Any]:
+    """Lee la malla del caso y devuelve la descomposición recomendada."""
+    stats = mesh_statistics(case_path)
+    plan = plan_decomposition(stats['n_cells'], stats['lengths'], cpu_count, cells_per_core,
+                              stats['single_cell_axes'], stats['quad_fraction'])
+    plan['n_cells'] = stats['n_cells']
+    logger.info(f"Descomposición recomendada para {case_path.name}: {format_plan(plan)}")
+    return plan
+
+
+def apply_plan(decompose_par_dict, plan: Dict[str, Any]) -> None:
+    """Escribe la recomendación en el modelo decomposeParDict."""
+    decompose_par_dict.update_parameters({
+        'numberOfSubdomains': plan['numberOfSubdomains'],
+        'method': plan['method'],
+    })
+
+
+def format_plan(plan: Dict[str, Any]) -> str:
+    """Resumen legible de la recomendación."""
+    method_name = plan['method'][0]
+    text = f"{plan['numberOfSubdomains']} subdominios, método {method_name}"
+    if method_name in ('simple', 'hierarchical'):
+        text += " n ({} {} {})".format(*plan['divisions'])
+    text += f" (~{plan['cells_per_subdomain']:.0f} celdas por subdominio; {plan['reason']})"
+    return text
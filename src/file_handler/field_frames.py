@@ -0,0 +1,200 @@
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pyvista as pv
+from vtkmodules.vtkFiltersCore import vtkAppendPolyData
+
+from .decomposed_case import processor_dirs
+from .foam_reader import _open_reader, mesh_source_files, PATCH_PREFIX, INTERNAL_MESH, BOUNDARY_BLOCK
+from .vtk_cache import CACHE_DIR, FRAME_KIND, fingerprint, entry_path, read_polydata, write_polydata, prune_cache
+
+logger = logging.getLogger(__name__)
+
+# Arreglos de celdas de un cuadro: el valor del campo (la magnitud si es un
+# vector) y el patch de cada celda (SLICE_PATCH_ID para el corte)
+FIELD_ARRAY = "field"
+PATCH_ID_ARRAY = "patch_id"
+SLICE_PATCH_ID = -1
+
+SLICE_AXES = ("x", "y", "z")
+
+# Campos que se muestran primero si el caso los tiene
+PREFERRED_FIELDS = ("alpha.water", "alpha.a", "U", "p_rgh", "p")
+
+DEFAULT_FRAME_CACHE_MB = 512
+
+
+def case_times(case_path: Path) -> List[str]:
+    """Tiempos escritos del caso (reconstruidos o, si la malla está descompuesta, de los processor*)."""
+    reader = _open_reader(case_path)
+    names = reader.GetTimeNames()
+    return [names.GetValue(i) for i in range(names.GetNumberOfValues())] if names else []
+
+
+def case_fields(case_path: Path) -> List[str]:
+    """Campos de celdas del caso, con los de PREFERRED_FIELDS primero."""
+    reader = _open_reader(case_path)
+    names = sorted(reader.GetCellArrayName(i) for i in range(reader.GetNumberOfCellArrays()))
+    preferred = [name for name in PREFERRED_FIELDS if name in names]
+    return preferred + [name for name in names if name not in preferred]
+
+
+def frame_key(time: str, field: str, slice_axis: Optional[str] = None) -> Tuple[str, str, Optional[str]]:
+    return (time, field, slice_axis)
+
+
+def _scalar_values(values: np.ndarray) -> np.ndarray:
+    """Los vectores y tensores se muestran por su magnitud."""
+    values = np.asarray(values)
+    if values.ndim > 1:
+        values = np.linalg.norm(values, axis=1)
+    return values.astype(np.float32)
+
+
+def _frame_surface(mesh, field: str, patch_id: int) -> pv.PolyData:
+    surface = mesh if isinstance(mesh, pv.PolyData) else mesh.extract_surface()
+    values = surface.cell_data[field] if field in surface.cell_data else np.full(surface.n_cells, np.nan)
+    surface = surface.copy(deep=False)
+    surface.clear_data()
+    surface.cell_data[FIELD_ARRAY] = _scalar_values(values)
+    surface.cell_data[PATCH_ID_ARRAY] = np.full(surface.n_cells, patch_id, dtype=np.int32)
+    return surface
+
+
+class FieldFrameReader:
+    """
+    Lee cuadros (un campo en un tiempo) de un caso. El lector de VTK conserva la
+    malla entre tiempos si no cambia, así que conviene reutilizar la misma
+    instancia para todos los cuadros; no es seguro compartirla entre hilos.
+    Los cuadros leídos se guardan en la caché de VTK del caso.
+    """
+
+    def __init__(self, case_path: Path, use_cache: bool = True):
+        self.case_path = case_path
+        self.use_cache = use_cache
+        self.cache_root = case_path / CACHE_DIR
+        self.mesh_files = mesh_source_files(case_path)
+        self.reader = _open_reader(case_path)
+        names = [self.reader.GetPatchArrayName(i) for i in range(self.reader.GetNumberOfPatchArrays())]
+        # Índice de cada patch en el orden de la malla (el mismo que usa el visor)
+        self.patch_ids = {name[len(PATCH_PREFIX):]: patch_id
+                          for patch_id, name in enumerate(n for n in names if n.startswith(PATCH_PREFIX))}
+        for name in names:
+            self.reader.SetPatchArrayStatus(name, int(name.startswith(PATCH_PREFIX)))
+
+    def _field_files(self, time: str, field: str) -> List[Path]:
+        roots = [self.case_path] + processor_dirs(self.case_path)
+        return [root / time / name for root in roots for name in (field, f"{field}.gz")]
+
+    def read_frame(self, time: str, field: str, slice_axis: Optional[str] = None) -> pv.PolyData:
+        """
+        Superficie de los patches (y, si se pide, el corte de la malla interna
+        por su centro, normal al eje 'slice_axis') con el campo en FIELD_ARRAY.
+        """
+        if not self.use_cache:
+            return self._read_frame(time, field, slice_axis)
+        key = fingerprint(self.mesh_files + self._field_files(time, field), f"{time}|{field}|{slice_axis}")
+        entry = entry_path(self.cache_root, FRAME_KIND, key, ".vtp")
+        frame = read_polydata(entry)
+        if frame is None:
+            frame = self._read_frame(time, field, slice_axis)
+            if frame.n_cells:
+                try:
+                    write_polydata(frame, entry)
+                    prune_cache(self.cache_root)
+                except OSError as e:
+                    logger.warning(f"No se pudo guardar el cuadro en la caché de VTK: {e}")
+        return frame
+
+    def _read_frame(self, time: str, field: str, slice_axis: Optional[str] = None) -> pv.PolyData:
+        self.reader.DisableAllCellArrays()
+        self.reader.SetCellArrayStatus(field, 1)
+        self.reader.SetPatchArrayStatus(INTERNAL_MESH, int(slice_axis is not None))
+        self.reader.UpdateTimeStep(float(time))
+        output = pv.wrap(self.reader.GetOutput())
+
+        append = vtkAppendPolyData()
+        if BOUNDARY_BLOCK in output.keys():
+            boundary = output[BOUNDARY_BLOCK]
+            for name in boundary.keys():
+                mesh = boundary[name]
+                if mesh is not None and mesh.n_cells:
+                    append.AddInputData(_frame_surface(mesh, field, self.patch_ids.get(name, SLICE_PATCH_ID)))
+        if slice_axis is not None and INTERNAL_MESH in output.keys():
+            internal = output[INTERNAL_MESH]
+            if isinstance(internal, pv.MultiBlock):
+                internal = internal.combine()
+            section = internal.slice(normal=slice_axis, origin=internal.center)
+            if section.n_cells:
+                append.AddInputData(_frame_surface(section, field, SLICE_PATCH_ID))
+        if append.GetNumberOfInputConnections(0) == 0:
+            return pv.PolyData()
+        append.Update()
+        return pv.wrap(append.GetOutput())
+
+
+def frame_range(frame: pv.PolyData) -> Optional[Tuple[float, float]]:
+    """Mínimo y máximo del campo en el cuadro (sin NaN), o None si no tiene valores."""
+    if FIELD_ARRAY not in frame.cell_data:
+        return None
+    values = frame.cell_data[FIELD_ARRAY]
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return None
+    return float(values.min()), float(values.max())
+
+
+class FrameCache:
+    """
+    Caché LRU de cuadros limitada por memoria. Se usa desde los hilos que leen
+    los cuadros y desde la GUI, así que todas las operaciones toman un lock.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_FRAME_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._frames = OrderedDict()  # clave -> (cuadro, bytes)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def frame_size(frame: Any) -> int:
+        # actual_memory_size está en KiB
+        return int(frame.actual_memory_size) * 1024
+
+    def get(self, key: Hashable):
+        """Cuadro guardado (pasa a ser el más reciente) o None."""
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is None:
+                return None
+            self._frames.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, frame: Any) -> None:
+        """Guarda el cuadro y descarta los menos usados hasta entrar en el límite (siempre queda el último)."""
+        size = self.frame_size(frame)
+        with self._lock:
+            if key in self._frames:
+                self.nbytes -= self._frames.pop(key)[1]
+            self._frames[key] = (frame, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes and len(self._frames) > 1:
+                _, (_, evicted) = self._frames.popitem(last=False)
+                self.nbytes -= evicted
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._frames
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._frames)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self.nbytes = 0
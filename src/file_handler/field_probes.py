@@ -0,0 +1,213 @@
+import csv
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pyvista as pv
+from vtkmodules.vtkCommonDataModel import vtkStaticCellLocator
+from vtkmodules.vtkFiltersCore import vtkProbeFilter
+
+from .exceptions import FileHandlerError
+from .foam_reader import _open_reader, mesh_source_files, INTERNAL_MESH
+from .field_frames import case_times
+from .vtk_cache import fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Arreglo con el índice de cada celda en la malla interna indexada
+CELL_ID_ARRAY = "cell_id"
+
+# Puntos en los que se muestrea una línea
+LINE_RESOLUTION = 200
+
+# Índices espaciales que se conservan en memoria (uno por malla)
+MAX_CACHED_INDEXES = 2
+
+_indexes = OrderedDict()  # (caso, firma de la malla) -> MeshIndex
+_indexes_lock = threading.Lock()
+
+
+def _internal_blocks(output) -> List[pv.DataSet]:
+    """Bloques de la malla interna (uno por processor* si el caso se lee descompuesto)."""
+    if INTERNAL_MESH not in output.keys():
+        return []
+    internal = output[INTERNAL_MESH]
+    if not isinstance(internal, pv.MultiBlock):
+        return [internal]
+    return [block for block in internal.recursive_iterator() if block is not None and block.n_cells]
+
+
+class MeshIndex:
+    """
+    Malla interna del caso con un localizador de celdas. Se arma una vez por
+    malla (ver 'mesh_index'): ubicar puntos después es una sola pasada en C++.
+    """
+
+    def __init__(self, case_path: Path):
+        reader = _open_reader(case_path)
+        for i in range(reader.GetNumberOfPatchArrays()):
+            name = reader.GetPatchArrayName(i)
+            reader.SetPatchArrayStatus(name, int(name == INTERNAL_MESH))
+        reader.Update()
+        blocks = _internal_blocks(pv.wrap(reader.GetOutput()))
+        if not blocks:
+            raise FileHandlerError(f"No se pudo leer la malla interna de {case_path}")
+        # Las celdas quedan en el orden de los bloques: el mismo de los campos leídos
+        self.mesh = blocks[0].copy(deep=False) if len(blocks) == 1 else pv.MultiBlock(blocks).combine()
+        self.mesh.clear_data()
+        self.mesh.cell_data[CELL_ID_ARRAY] = np.arange(self.mesh.n_cells)
+        self.locator = vtkStaticCellLocator()
+        self.locator.SetDataSet(self.mesh)
+        self.locator.BuildLocator()
+        self._lock = threading.Lock()
+
+    def locate(self, points: np.ndarray) -> np.ndarray:
+        """Celda que contiene cada punto, o -1 si el punto está fuera de la malla."""
+        probe = vtkProbeFilter()
+        probe.SetInputData(pv.PolyData(np.asarray(points, dtype=float).reshape(-1, 3)))
+        probe.SetSourceData(self.mesh)
+        probe.PassCellArraysOff()
+        if hasattr(probe, "SetCellLocator"):
+            probe.SetCellLocator(self.locator)
+        else:
+            from vtkmodules.vtkCommonDataModel import vtkCellLocatorStrategy
+            strategy = vtkCellLocatorStrategy()
+            strategy.SetCellLocator(self.locator)
+            probe.SetFindCellStrategy(strategy)
+        # El localizador no se modifica, pero el filtro lo inicializa al usarlo
+        with self._lock:
+            probe.Update()
+        output = pv.wrap(probe.GetOutput())
+        cell_ids = np.asarray(output.point_data[CELL_ID_ARRAY], dtype=np.int64)
+        valid = np.asarray(output.point_data[probe.GetValidPointMaskArrayName()], dtype=bool)
+        return np.where(valid, cell_ids, -1)
+
+
+def mesh_index(case_path: Path) -> MeshIndex:
+    """Índice espacial de la malla del caso, guardado mientras la malla no cambie."""
+    key = (str(Path(case_path).resolve()), fingerprint(mesh_source_files(case_path)))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    index = MeshIndex(case_path)
+    with _indexes_lock:
+        _indexes[key] = index
+        while len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def line_points(start: Sequence[float], end: Sequence[float], resolution: int = LINE_RESOLUTION) -> np.ndarray:
+    return np.linspace(np.asarray(start, dtype=float), np.asarray(end, dtype=float), max(2, resolution))
+
+
+class ProbeSampler:
+    """
+    Muestrea campos de un caso en puntos o a lo largo de una línea, en todos
+    los tiempos. Los puntos se ubican una vez con el índice de la malla; en cada
+    tiempo se lee solo el campo pedido de la malla interna y los valores salen
+    indexando el arreglo de celdas. No es seguro compartirlo entre hilos.
+    """
+
+    def __init__(self, case_path: Path):
+        self.case_path = Path(case_path)
+        self.index = mesh_index(self.case_path)
+        self.reader = _open_reader(self.case_path)
+        for i in range(self.reader.GetNumberOfPatchArrays()):
+            name = self.reader.GetPatchArrayName(i)
+            self.reader.SetPatchArrayStatus(name, int(name == INTERNAL_MESH))
+
+    def cell_values(self, time: str, field: str) -> np.ndarray:
+        """Valores del campo en todas las celdas de la malla interna, en el orden del índice."""
+        self.reader.DisableAllCellArrays()
+        self.reader.SetCellArrayStatus(field, 1)
+        self.reader.UpdateTimeStep(float(time))
+        blocks = _internal_blocks(pv.wrap(self.reader.GetOutput()))
+        if not blocks or any(field not in block.cell_data for block in blocks):
+            raise FileHandlerError(f"No se encontró {field} en t = {time}")
+        return np.concatenate([np.asarray(block.cell_data[field]) for block in blocks])
+
+    def sample(self, points: Sequence[Sequence[float]], field: str,
+               times: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Valores del campo en los puntos (el de la celda que contiene cada punto)
+        en cada tiempo. Los puntos fuera de la malla quedan en NaN.
+
+        Returns:
+            dict: 'field', 'points' (n, 3), 'times', 'values' (tiempos, n) o
+                (tiempos, n, componentes) si el campo es un vector.
+
+        Raises:
+            FileHandlerError: Si ningún punto está dentro de la malla o el campo
+                no existe en algún tiempo.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        cell_ids = self.index.locate(points)
+        inside = cell_ids >= 0
+        if not inside.any():
+            raise FileHandlerError("Los puntos están fuera de la malla")
+        times = list(case_times(self.case_path) if times is None else times)
+
+        series = []
+        for time in times:
+            values = self.cell_values(time, field)
+            sampled = np.full((len(points),) + values.shape[1:], np.nan)
+            sampled[inside] = values[cell_ids[inside]]
+            series.append(sampled)
+        return {'field': field, 'points': points, 'times': times, 'values': np.array(series)}
+
+    def sample_line(self, start: Sequence[float], end: Sequence[float], field: str,
+                    resolution: int = LINE_RESOLUTION, times: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Como 'sample', en puntos equiespaciados de 'start' a 'end'; agrega 'distance' desde 'start'."""
+        points = line_points(start, end, resolution)
+        samples = self.sample(points, field, times)
+        samples['distance'] = np.linalg.norm(points - points[0], axis=1)
+        return samples
+
+
+def line_integral(samples: Dict[str, Any]) -> np.ndarray:
+    """
+    Integral del campo a lo largo de la línea en cada tiempo (los tramos fuera
+    de la malla no suman). Con alpha.water en una línea vertical es la altura
+    de la superficie libre sobre el inicio de la línea.
+    """
+    values = np.nan_to_num(np.asarray(samples['values'], dtype=float))
+    if values.ndim > 2:
+        values = np.linalg.norm(values, axis=2)
+    distance = samples['distance']
+    # Regla del trapecio, vectorizada sobre los tiempos
+    return ((values[:, 1:] + values[:, :-1]) * np.diff(distance) / 2).sum(axis=1)
+
+
+def _value_columns(field: str, values: np.ndarray) -> List[str]:
+    if values.ndim <= 2:
+        return [field]
+    components = "xyz" if values.shape[2] == 3 else [str(i) for i in range(values.shape[2])]
+    return [f"{field}_{component}" for component in components]
+
+
+def write_samples_csv(samples: Dict[str, Any], path: Path) -> Path:
+    """
+    Guarda las muestras en formato largo: una fila por tiempo y punto, con sus
+    coordenadas (y la distancia si es una línea) y el valor de cada componente.
+    """
+    values = np.asarray(samples['values'])
+    distance = samples.get('distance')
+    header = ["time", "point", "x", "y", "z"] + (["distance"] if distance is not None else [])
+    header += _value_columns(samples['field'], values)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for t, time in enumerate(samples['times']):
+            for p, point in enumerate(samples['points']):
+                row = [time, p, *(f"{c:.6g}" for c in point)]
+                if distance is not None:
+                    row.append(f"{distance[p]:.6g}")
+                row += [f"{v:.6g}" for v in np.atleast_1d(values[t, p])]
+                writer.writerow(row)
+    return Path(path)
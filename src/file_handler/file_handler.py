@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Dict, Any
 
 from .exceptions import FileHandlerError, ParameterError, TemplateError
+from .boundary_rules import compact_boundary_field
 from .openfoam_models.foam_file import FoamFile
 from .openfoam_models.U import U
 from .openfoam_models.controlDict import controlDict
@@ -246,11 +247,17 @@ class FileHandler:
         
         return [default_option_name, default_value]
 
-    def initialize_parameters_from_schema(self, patch_names: list[str]):
+    def initialize_parameters_from_schema(self, patch_names: list[str], patch_groups: dict = None):
         """
         Iterates through all foam files and their parameters, initializing complex
         types like 'patches' and 'choice_with_options' with default values based
         on their schemas.
+
+        Args:
+            patch_names: Patches of the mesh.
+            patch_groups: Patch groups of the mesh ('inGroups' of the boundary file).
+                Groups whose patches all get the same default condition are written
+                as a single boundaryField entry.
         """
         for foam_file in self.files.values():
             params_schema = foam_file.get_editable_parameters()
@@ -277,7 +284,8 @@ class FileHandler:
                                     patch_data[param['name']] = param['default']
                         new_boundary_field.append(patch_data)
                     
-                    new_params_to_update[param_name] = new_boundary_field
+                    new_params_to_update[param_name] = compact_boundary_field(new_boundary_field, patch_names,
+                                                                             patch_groups)
 
                 # Initialize 'choice_with_options' parameters if they are not already set
                 elif param_type == 'choice_with_options' and not current_value and not param_props.get('optional'):
@@ -418,6 +426,17 @@ class FileHandler:
         except KeyError as e:
             print(f"Error: La clave {e} no se encontró en el JSON.")
 
+    def get_parallel_io_settings(self, num_processors: int) -> tuple:
+        """
+        Devuelve el fileHandler configurado en controlDict y los rangos de E/S
+        para 'num_processors' procesadores.
+        """
+        control_dict = self.files.get('controlDict')
+        if control_dict is None:
+            return 'uncollated', []
+        return (getattr(control_dict, 'fileHandler', None) or 'uncollated',
+                control_dict.get_io_ranks(num_processors))
+
     def get_solver(self) -> str:
         json_path = self.case_path / self.JSON_PARAMS_FILE
         if not json_path.exists():
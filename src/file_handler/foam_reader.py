@@ -0,0 +1,152 @@
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pyvista as pv
+from vtkmodules.vtkIOParallel import vtkPOpenFOAMReader
+
+from .decomposed_case import mesh_is_decomposed, mesh_boundary_file, processor_dirs, pending_reconstruction
+from .exceptions import FileHandlerError
+from .vtk_cache import (CACHE_DIR, BOUNDARY_KIND, fingerprint, entry_path, read_blocks, write_blocks,
+                        prune_cache)
+
+logger = logging.getLogger(__name__)
+
+# Archivo vacío que identifica el caso para el lector de OpenFOAM de VTK (y para ParaView)
+FOAM_FILE_SUFFIX = ".foam"
+
+# Casos del lector
+CASE_DECOMPOSED = 0
+CASE_RECONSTRUCTED = 1
+
+PATCH_PREFIX = "patch/"
+INTERNAL_MESH = "internalMesh"
+BOUNDARY_BLOCK = "boundary"
+
+MESH_FILES = ("points", "faces", "owner", "neighbour", "boundary")
+
+
+def has_poly_mesh(case_path: Path) -> bool:
+    """Indica si el caso tiene una malla de OpenFOAM, reconstruida o descompuesta."""
+    return mesh_boundary_file(case_path).is_file()
+
+
+def mesh_modified_time(case_path: Path) -> float:
+    """Última modificación de los archivos de la malla actual (para validar cachés derivadas)."""
+    poly_mesh = mesh_boundary_file(case_path).parent
+    times = [path.stat().st_mtime for name in MESH_FILES
+             for path in (poly_mesh / name, poly_mesh / f"{name}.gz") if path.is_file()]
+    return max(times, default=0.0)
+
+
+def foam_file(case_path: Path) -> Path:
+    """Crea (si no existe) el archivo <caso>.foam con el que se abre el caso."""
+    path = case_path / f"{case_path.name}{FOAM_FILE_SUFFIX}"
+    if not path.exists():
+        path.touch()
+    return path
+
+
+def _reads_decomposed(case_path: Path) -> bool:
+    """
+    El caso se lee de los processor* si la malla solo existe descompuesta o si
+    hay tiempos que todavía no se reconstruyeron.
+    """
+    if mesh_is_decomposed(case_path) or pending_reconstruction(case_path):
+        return True
+    return not (case_path / "constant" / "polyMesh").is_dir() and bool(processor_dirs(case_path))
+
+
+def mesh_source_files(case_path: Path) -> List[Path]:
+    """Archivos de la malla que lee el lector (los de los processor* si el caso se lee descompuesto)."""
+    if _reads_decomposed(case_path):
+        dirs = [p / "constant" / "polyMesh" for p in processor_dirs(case_path)]
+    else:
+        dirs = [case_path / "constant" / "polyMesh"]
+    return [directory / file for directory in dirs for name in MESH_FILES for file in (name, f"{name}.gz")]
+
+
+def _open_reader(case_path: Path) -> vtkPOpenFOAMReader:
+    if not has_poly_mesh(case_path):
+        raise FileHandlerError(f"El caso no tiene malla: {case_path}")
+    reader = vtkPOpenFOAMReader()
+    reader.SetFileName(str(foam_file(case_path)))
+    reader.SetCaseType(CASE_DECOMPOSED if _reads_decomposed(case_path) else CASE_RECONSTRUCTED)
+    # Solo la geometría: sin campos, sin interpolar a los puntos y sin partículas
+    reader.CreateCellToPointOff()
+    reader.UpdateInformation()
+    reader.DisableAllCellArrays()
+    reader.DisableAllPointArrays()
+    reader.DisableAllLagrangianArrays()
+    return reader
+
+
+def boundary_patch_names(case_path: Path) -> List[str]:
+    """Patches de la malla según el lector (sin los procBoundary de la malla descompuesta)."""
+    reader = _open_reader(case_path)
+    names = [reader.GetPatchArrayName(i) for i in range(reader.GetNumberOfPatchArrays())]
+    return [name[len(PATCH_PREFIX):] for name in names if name.startswith(PATCH_PREFIX)]
+
+
+def read_boundary_patches(case_path: Path, patches: Optional[Iterable[str]] = None,
+                          use_cache: bool = True) -> Dict[str, pv.PolyData]:
+    """
+    Lee la superficie de los patches directamente de la malla de OpenFOAM, sin
+    pasar por foamToVTK. Si la malla solo existe descompuesta, se unen los
+    patches de todos los processor*. La lectura se guarda en la caché de VTK
+    del caso; mientras la malla no cambie, se lee de ahí.
+
+    Args:
+        patches: Patches a leer (None para todos).
+        use_cache: Usar la caché de VTK del caso.
+
+    Returns:
+        dict: Nombre del patch -> superficie, en el orden de la malla. Los
+            patches sin caras no se incluyen.
+
+    Raises:
+        FileHandlerError: Si el caso no tiene malla o no se puede leer.
+    """
+    if not use_cache:
+        return _read_boundary(case_path, patches)
+
+    cache_root = case_path / CACHE_DIR
+    entry = entry_path(cache_root, BOUNDARY_KIND, fingerprint(mesh_source_files(case_path)))
+    surfaces = read_blocks(entry)
+    if surfaces is None:
+        # Se guardan todos los patches: los pedidos siguientes salen de la caché
+        surfaces = _read_boundary(case_path)
+        if surfaces:
+            try:
+                write_blocks(surfaces, entry)
+                prune_cache(cache_root)
+            except OSError as e:
+                logger.warning(f"No se pudo guardar la geometría en la caché de VTK: {e}")
+    if patches is not None:
+        wanted = set(patches)
+        surfaces = {name: surface for name, surface in surfaces.items() if name in wanted}
+    return surfaces
+
+
+def _read_boundary(case_path: Path, patches: Optional[Iterable[str]] = None) -> Dict[str, pv.PolyData]:
+    reader = _open_reader(case_path)
+    wanted = None if patches is None else set(patches)
+    for i in range(reader.GetNumberOfPatchArrays()):
+        name = reader.GetPatchArrayName(i)
+        enabled = name.startswith(PATCH_PREFIX) and (wanted is None or name[len(PATCH_PREFIX):] in wanted)
+        reader.SetPatchArrayStatus(name, int(enabled))
+    reader.Update()
+
+    output = pv.wrap(reader.GetOutput())
+    if output is None or BOUNDARY_BLOCK not in output.keys():
+        if wanted is None or wanted:
+            logger.warning(f"No se leyeron patches de la malla de {case_path}")
+        return {}
+    boundary = output[BOUNDARY_BLOCK]
+    surfaces = {}
+    for name in boundary.keys():
+        surface = boundary[name]
+        if surface is None or surface.n_cells == 0:
+            continue
+        surfaces[name] = surface if isinstance(surface, pv.PolyData) else surface.extract_surface()
+    return surfaces
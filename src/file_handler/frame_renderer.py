@@ -0,0 +1,287 @@
+import argparse
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyvista as pv
+from PIL import Image
+
+from .exceptions import FileHandlerError
+from .field_frames import FieldFrameReader, case_times, case_fields, frame_range, FIELD_ARRAY, SLICE_AXES
+
+logger = logging.getLogger(__name__)
+
+# Posiciones de cámara de pyvista: isométrica o mirando un plano de frente
+CAMERA_PRESETS = ("iso", "xy", "xz", "yz", "yx", "zx", "zy")
+DEFAULT_CAMERA = "iso"
+
+# Salidas: animación (GIF o MP4) o una grilla de imágenes
+OUTPUT_FORMATS = ("gif", "mp4", "grid")
+
+RENDERS_DIR = "renders"
+FRAMES_DIR = "frames"
+
+DEFAULT_WINDOW_SIZE = (1280, 720)
+DEFAULT_FPS = 10
+DEFAULT_GRID_COLUMNS = 3
+MAX_GRID_IMAGES = 12
+
+
+def add_results_mesh(plotter: pv.Plotter, mesh: pv.PolyData, field: str, pickable: bool = False, **kwargs: Any):
+    """
+    Agrega la malla de un cuadro coloreada por FIELD_ARRAY, como en el visor:
+    por celda, las celdas sin valor en gris y la barra de colores con el campo.
+    """
+    return plotter.add_mesh(mesh, scalars=FIELD_ARRAY, preference='cell', pickable=pickable, nan_color="gray",
+                            scalar_bar_args={'title': field}, **kwargs)
+
+
+def _check_camera(preset: str) -> None:
+    if preset not in CAMERA_PRESETS:
+        raise FileHandlerError(f"Cámara desconocida: {preset} (opciones: {', '.join(CAMERA_PRESETS)})")
+
+
+def set_camera(plotter: pv.Plotter, preset: str = DEFAULT_CAMERA, zoom: float = 1.0) -> None:
+    """Orienta la cámara según el preset y la ajusta a lo que hay en la escena."""
+    _check_camera(preset)
+    plotter.camera_position = preset
+    plotter.reset_camera(render=False)
+    if zoom != 1.0:
+        plotter.camera.zoom(zoom)
+
+
+def _file_name(field: str) -> str:
+    return field.replace("/", "_")
+
+
+def select_times(times: Sequence[str], start: Optional[float] = None, end: Optional[float] = None,
+                 stride: int = 1) -> List[str]:
+    """Tiempos entre 'start' y 'end' (inclusive), tomando uno de cada 'stride'."""
+    selected = [time for time in times
+                if (start is None or float(time) >= start) and (end is None or float(time) <= end)]
+    return selected[::max(1, stride)]
+
+
+def _chunks(items: Sequence[Any], count: int) -> List[List[Any]]:
+    """Divide en 'count' tramos consecutivos: cada proceso reutiliza la malla entre sus tiempos."""
+    size = math.ceil(len(items) / max(1, count))
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+
+def _chunk_range(job: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """Rango del campo en los cuadros de un tramo."""
+    # Los cuadros leídos quedan en la caché de VTK del caso: el render los relee de ahí
+    reader = FieldFrameReader(job['case_path'])
+    ranges = [frame_range(reader.read_frame(time, job['field'], job['slice_axis'])) for _, time in job['frames']]
+    ranges = [values for values in ranges if values]
+    if not ranges:
+        return None
+    return min(low for low, _ in ranges), max(high for _, high in ranges)
+
+
+def _render_chunk(job: Dict[str, Any]) -> List[str]:
+    """Renderiza fuera de pantalla los cuadros de un tramo con un único plotter."""
+    reader = FieldFrameReader(job['case_path'])
+    plotter = pv.Plotter(off_screen=True, window_size=job['window_size'])
+    mesh = pv.PolyData()
+    actor, paths = None, []
+    try:
+        for index, time in job['frames']:
+            frame = reader.read_frame(time, job['field'], job['slice_axis'])
+            if frame.n_cells == 0:
+                continue
+            mesh.shallow_copy(frame)
+            mesh.Modified()
+            if actor is None:
+                actor = add_results_mesh(plotter, mesh, job['field'], clim=job['clim'], render=False)
+                # Todos los procesos parten de la misma geometría: la cámara coincide
+                set_camera(plotter, job['camera'], job['zoom'])
+            plotter.add_text(f"t = {time}", position="upper_left", font_size=12, name="time")
+            path = Path(job['frame_dir']) / f"{_file_name(job['field'])}_{index:04d}.png"
+            plotter.screenshot(str(path))
+            paths.append(str(path))
+    finally:
+        plotter.close()
+    return paths
+
+
+def render_frames(case_path: Path, field: str, output_dir: Path, times: Optional[Sequence[str]] = None,
+                  camera: str = DEFAULT_CAMERA, zoom: float = 1.0, slice_axis: Optional[str] = None,
+                  clim: Optional[Tuple[float, float]] = None, window_size: Tuple[int, int] = DEFAULT_WINDOW_SIZE,
+                  workers: Optional[int] = None) -> List[Path]:
+    """
+    Renderiza sin pantalla un PNG por tiempo con el campo sobre los patches (y
+    el corte, si se pide), repartiendo los tiempos entre varios procesos.
+
+    Args:
+        times: Tiempos a renderizar (None para todos los del caso).
+        clim: Rango de colores; si no se indica, el rango del campo en todos
+            los tiempos, para que los colores no cambien entre cuadros.
+        workers: Procesos de render (por defecto, uno por núcleo).
+
+    Returns:
+        list: Rutas de las imágenes, en el orden de los tiempos.
+
+    Raises:
+        FileHandlerError: Si el caso no tiene el campo o los tiempos pedidos.
+    """
+    case_path = Path(case_path)
+    if field not in case_fields(case_path):
+        raise FileHandlerError(f"El caso no tiene el campo {field}")
+    if slice_axis is not None and slice_axis not in SLICE_AXES:
+        raise FileHandlerError(f"Eje de corte desconocido: {slice_axis}")
+    _check_camera(camera)
+    times = list(case_times(case_path) if times is None else times)
+    if not times:
+        raise FileHandlerError(f"No hay tiempos para renderizar en {case_path}")
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(times)))
+    frame_dir = Path(output_dir) / FRAMES_DIR
+    jobs = [{'case_path': case_path, 'frames': chunk, 'field': field, 'slice_axis': slice_axis,
+             'camera': camera, 'zoom': zoom, 'window_size': tuple(window_size), 'frame_dir': str(frame_dir)}
+            for chunk in _chunks(list(enumerate(times)), workers)]
+    pool = None
+    if len(jobs) > 1:
+        # 'spawn': los procesos no heredan el contexto de OpenGL ni el estado de Qt del padre
+        pool = ProcessPoolExecutor(max_workers=len(jobs), mp_context=multiprocessing.get_context("spawn"))
+    run = pool.map if pool else map
+    try:
+        if clim is None:
+            ranges = [values for values in run(_chunk_range, jobs) if values]
+            clim = (min(low for low, _ in ranges), max(high for _, high in ranges)) if ranges else None
+
+        shutil.rmtree(frame_dir, ignore_errors=True)
+        frame_dir.mkdir(parents=True)
+        for job in jobs:
+            job['clim'] = clim
+        return [Path(path) for paths in run(_render_chunk, jobs) for path in paths]
+    finally:
+        if pool:
+            pool.shutdown()
+
+
+def write_gif(frames: Sequence[Path], path: Path, fps: int = DEFAULT_FPS) -> Path:
+    images = [Image.open(frame).convert("RGB") for frame in frames]
+    images[0].save(path, save_all=True, append_images=images[1:], duration=int(1000 / fps), loop=0)
+    return path
+
+
+def write_mp4(frames: Sequence[Path], path: Path, fps: int = DEFAULT_FPS) -> Path:
+    """Arma el video con el ffmpeg del sistema (H.264, reproducible en cualquier navegador)."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise FileHandlerError("No se encontró ffmpeg: instálelo para generar MP4 o use el formato GIF.")
+    # ffmpeg lee la secuencia numerada sin huecos: se le pasa la lista de cuadros
+    listing = path.with_suffix(".txt")
+    listing.write_text("".join(f"file '{Path(frame).resolve().as_posix()}'\nduration {1 / fps}\n"
+                               for frame in frames))
+    command = [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", str(listing),
+               "-r", str(fps), "-c:v", "libx264", "-pix_fmt", "yuv420p",
+               # H.264 con yuv420p necesita dimensiones pares
+               "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", str(path)]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+    finally:
+        listing.unlink(missing_ok=True)
+    if result.returncode != 0:
+        raise FileHandlerError(f"ffmpeg no pudo generar {path}: {result.stderr.strip()}")
+    return path
+
+
+def write_grid(frames: Sequence[Path], path: Path, columns: int = DEFAULT_GRID_COLUMNS,
+               max_images: int = MAX_GRID_IMAGES) -> Path:
+    """Grilla con a lo sumo 'max_images' cuadros repartidos uniformemente entre los tiempos."""
+    if len(frames) > max_images:
+        picks = np.linspace(0, len(frames) - 1, max_images).round().astype(int)
+        frames = [frames[i] for i in picks]
+    images = [Image.open(frame).convert("RGB") for frame in frames]
+    width, height = images[0].size
+    columns = max(1, min(columns, len(images)))
+    rows = math.ceil(len(images) / columns)
+    grid = Image.new("RGB", (columns * width, rows * height), "white")
+    for number, image in enumerate(images):
+        grid.paste(image, ((number % columns) * width, (number // columns) * height))
+    grid.save(path)
+    return path
+
+
+def render_results(case_path: Path, field: str, output_format: str = "gif", output_dir: Optional[Path] = None,
+                   start: Optional[float] = None, end: Optional[float] = None, stride: int = 1,
+                   fps: int = DEFAULT_FPS, columns: int = DEFAULT_GRID_COLUMNS, **render_options: Any) -> Path:
+    """
+    Renderiza los tiempos de 'start' a 'end' y arma la animación o la grilla.
+    Las opciones restantes (cámara, zoom, corte, rango, tamaño y procesos) se
+    pasan a 'render_frames'.
+
+    Returns:
+        Path: Ruta del GIF, el MP4 o la grilla (en <caso>/renders si no se
+            indica 'output_dir'); los cuadros quedan en su carpeta 'frames'.
+
+    Raises:
+        FileHandlerError: Si el formato no existe, no hay tiempos en el rango o
+            no se pudo generar la salida.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise FileHandlerError(f"Formato desconocido: {output_format} (opciones: {', '.join(OUTPUT_FORMATS)})")
+    case_path = Path(case_path)
+    output_dir = Path(output_dir) if output_dir else case_path / RENDERS_DIR
+    times = select_times(case_times(case_path), start, end, stride)
+    if not times:
+        raise FileHandlerError(f"No hay tiempos entre {start} y {end} en {case_path}")
+
+    frames = render_frames(case_path, field, output_dir, times, **render_options)
+    if not frames:
+        raise FileHandlerError(f"No se renderizó ningún cuadro de {field}")
+    name = _file_name(field)
+    if output_format == "gif":
+        return write_gif(frames, output_dir / f"{name}.gif", fps)
+    if output_format == "mp4":
+        return write_mp4(frames, output_dir / f"{name}.mp4", fps)
+    return write_grid(frames, output_dir / f"{name}_grid.png", columns)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Renderiza sin pantalla los resultados de un caso de OpenFOAM.")
+    parser.add_argument("case", type=Path, help="Carpeta del caso")
+    parser.add_argument("--field", help="Campo a mostrar (por defecto, el primero del caso)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="gif", dest="output_format")
+    parser.add_argument("--output", type=Path, help=f"Carpeta de salida (por defecto, <caso>/{RENDERS_DIR})")
+    parser.add_argument("--camera", choices=CAMERA_PRESETS, default=DEFAULT_CAMERA)
+    parser.add_argument("--zoom", type=float, default=1.0)
+    parser.add_argument("--slice", choices=SLICE_AXES, help="Eje normal al corte de la malla interna")
+    parser.add_argument("--start", type=float, help="Primer tiempo")
+    parser.add_argument("--end", type=float, help="Último tiempo")
+    parser.add_argument("--stride", type=int, default=1, help="Renderizar uno de cada N tiempos")
+    parser.add_argument("--clim", type=float, nargs=2, metavar=("MIN", "MAX"), help="Rango de colores fijo")
+    parser.add_argument("--size", type=int, nargs=2, metavar=("ANCHO", "ALTO"), default=DEFAULT_WINDOW_SIZE)
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS)
+    parser.add_argument("--columns", type=int, default=DEFAULT_GRID_COLUMNS, help="Columnas de la grilla")
+    parser.add_argument("--workers", type=int, help="Procesos de render (por defecto, uno por núcleo)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        field = args.field or next(iter(case_fields(args.case)), None)
+        if field is None:
+            raise FileHandlerError(f"El caso no tiene resultados: {args.case}")
+        output = render_results(args.case, field, args.output_format, args.output, args.start, args.end,
+                                args.stride, args.fps, args.columns, camera=args.camera, zoom=args.zoom,
+                                slice_axis=args.slice, clim=tuple(args.clim) if args.clim else None,
+                                window_size=tuple(args.size), workers=args.workers)
+    except FileHandlerError as e:
+        logger.error(str(e))
+        return 1
+    logger.info(f"Salida generada: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
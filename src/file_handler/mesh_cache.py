@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .decomposed_case import (_hash_path, processor_dirs, discard_decomposed_mesh, mesh_is_decomposed,
+                              MESH_DECOMPOSED_FILE)
+
+logger = logging.getLogger(__name__)
+
+# Caché de artefactos de malla del caso: <CACHE_DIR>/<nodo>/<firma>/
+CACHE_DIR = ".mesh_cache"
+
+# Nodos que produjeron la malla actual del caso, en orden, con sus firmas
+LINEAGE_FILE = "lineage.json"
+
+# Artefactos que se conservan por nodo (además de los de la malla actual)
+MAX_ARTIFACTS_PER_NODE = 3
+
+POLY_MESH = "constant/polyMesh"
+
+# Malla que no generó el pipeline (UNV importado o blockMeshDict transformado al
+# crear el caso): no se puede volver a generar, pero se guarda para poder
+# restaurarla como punto de partida de los nodos siguientes.
+IMPORTED_NODE = "imported"
+
+
+def _cache_root(case_path: Path) -> Path:
+    return case_path / CACHE_DIR
+
+
+def artifact_path(case_path: Path, node: str, key: str) -> Path:
+    return _cache_root(case_path) / node / key
+
+
+def has_artifact(case_path: Path, node: str, key: str) -> bool:
+    return artifact_path(case_path, node, key).is_dir()
+
+
+def node_signature(node: str, inputs, case_path: Path, upstream: Optional[str] = None, extra: str = "") -> str:
+    """
+    Firma de un nodo: su nombre, la firma del nodo anterior (la malla de la que
+    parte) y el contenido de sus entradas (diccionarios, STL, etc.).
+    """
+    digest = hashlib.sha256(f"node={node};upstream={upstream or ''};{extra}".encode())
+    for relative in inputs:
+        _hash_path(digest, case_path, relative)
+    return digest.hexdigest()
+
+
+def current_mesh_signature(case_path: Path) -> Optional[str]:
+    """Firma del contenido de la malla actual (reconstruida o descompuesta), o None si no hay malla."""
+    relatives = [POLY_MESH] if (case_path / POLY_MESH).is_dir() else []
+    if mesh_is_decomposed(case_path):
+        relatives += [f"{p.name}/{POLY_MESH}" for p in processor_dirs(case_path)]
+    if not relatives:
+        return None
+    return node_signature(IMPORTED_NODE, relatives, case_path)
+
+
+def load_lineage(case_path: Path) -> List[Dict[str, str]]:
+    path = _cache_root(case_path) / LINEAGE_FILE
+    if not path.exists():
+        return []
+    try:
+        with open(path, "r") as f:
+            return json.load(f).get("mesh", [])
+    except (json.JSONDecodeError, IOError, AttributeError) as e:
+        logger.warning(f"No se pudo leer {path}: {e}. Se considera la malla actual como importada.")
+        return []
+
+
+def save_lineage(case_path: Path, lineage: List[Dict[str, str]]) -> None:
+    root = _cache_root(case_path)
+    root.mkdir(exist_ok=True)
+    with open(root / LINEAGE_FILE, "w") as f:
+        json.dump({"mesh": lineage}, f, indent=2)
+
+
+def reset_lineage(case_path: Path) -> None:
+    """
+    Olvida cómo se generó la malla actual. Se llama cuando un script fuera del
+    pipeline reemplaza la malla; los artefactos guardados se conservan.
+    """
+    (_cache_root(case_path) / LINEAGE_FILE).unlink(missing_ok=True)
+
+
+def _copy_mesh(source_root: Path, target_root: Path, decomposed_procs: List[str]) -> None:
+    if (source_root / POLY_MESH).is_dir():
+        shutil.copytree(source_root / POLY_MESH, target_root / POLY_MESH)
+    for name in decomposed_procs:
+        shutil.copytree(source_root / name / POLY_MESH, target_root / name / POLY_MESH)
+
+
+def store_mesh_artifact(case_path: Path, node: str, key: str) -> Path:
+    """
+    Guarda la malla actual del caso como artefacto del nodo: constant/polyMesh
+    y, si la malla quedó descompuesta, los polyMesh de cada processor*.
+    """
+    target = artifact_path(case_path, node, key)
+    if target.exists():
+        return target
+    staging = target.with_name(f"{key}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    decomposed = [p.name for p in processor_dirs(case_path)] if mesh_is_decomposed(case_path) else []
+    _copy_mesh(case_path, staging, decomposed)
+    if decomposed:
+        shutil.copy2(case_path / MESH_DECOMPOSED_FILE, staging / MESH_DECOMPOSED_FILE)
+    # El renombre deja el artefacto completo o ninguno si se interrumpe la copia
+    staging.rename(target)
+    return target
+
+
+def restore_mesh_artifact(case_path: Path, node: str, key: str) -> None:
+    """Reemplaza la malla del caso por la guardada para el nodo."""
+    source = artifact_path(case_path, node, key)
+    discard_decomposed_mesh(case_path)
+    shutil.rmtree(case_path / POLY_MESH, ignore_errors=True)
+
+    decomposed = []
+    if (source / MESH_DECOMPOSED_FILE).exists():
+        decomposed = sorted(p.name for p in source.iterdir() if p.is_dir() and p.name.startswith("processor"))
+    _copy_mesh(source, case_path, decomposed)
+    if decomposed:
+        shutil.copy2(source / MESH_DECOMPOSED_FILE, case_path / MESH_DECOMPOSED_FILE)
+
+
+def prune_artifacts(case_path: Path, keep: Dict[str, Any] = None,
+                    max_per_node: int = MAX_ARTIFACTS_PER_NODE) -> None:
+    """
+    Elimina los artefactos más viejos de cada nodo, salvo los de 'keep'
+    (nodo -> firmas en uso).
+    """
+    keep = keep or {}
+    root = _cache_root(case_path)
+    for node_dir in root.iterdir() if root.is_dir() else []:
+        if not node_dir.is_dir():
+            continue
+        in_use = set(keep.get(node_dir.name, ()))
+        artifacts = sorted((p for p in node_dir.iterdir() if p.is_dir() and p.name not in in_use),
+                           key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in artifacts[max(0, max_per_node - len(in_use)):]:
+            shutil.rmtree(stale, ignore_errors=True)
@@ -30,6 +30,11 @@ class controlDict(FoamFile):
         self.writePrecision = 6
         self.functions = 'damBreakOpenFoam'
 
+        # E/S en paralelo (OptimisationSwitches del caso)
+        self.fileHandler = 'uncollated'
+        self.maxThreadFileBufferSize = None
+        self.ioRanks = None
+
         # Valores para parámetros opcionales
         self.timeFormat = None
         self.timePrecision = None
@@ -57,6 +62,8 @@ class controlDict(FoamFile):
             'timeFormat': self.timeFormat,
             'timePrecision': self.timePrecision,
             'functions': self.functions,
+            'fileHandler': self.fileHandler,
+            'maxThreadFileBufferSize': self.maxThreadFileBufferSize,
             'customContent': self.customContent
         }
         content = template.render(context)
@@ -92,6 +99,15 @@ class controlDict(FoamFile):
 
             setattr(self, key, value)
 
+    def get_io_ranks(self, num_processors: int) -> list:
+        """
+        Rangos que escriben en disco con el fileHandler collated: el primero de
+        cada grupo de 'ioRanks' procesadores. Vacío si escribe solo el master.
+        """
+        if not self.ioRanks or self.fileHandler != 'collated':
+            return []
+        return list(range(0, num_processors, self.ioRanks))
+
     def write_file(self, case_path: Path): 
         output_dir = case_path / self.folder
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -260,6 +276,35 @@ class controlDict(FoamFile):
                 'required': True if self.adjustTimeStep else False,
                 'group': 'Control de Tiempo'
             },
+
+            # --- E/S en paralelo ---
+            'fileHandler': {
+                'label': 'Manejo de archivos (fileHandler)',
+                'tooltip': '"collated" escribe un único archivo por campo en processors<N> en lugar de uno por procesador; recomendado con muchos procesadores o discos de red.',
+                'type': 'choice',
+                'options': ['uncollated', 'collated', 'masterUncollated'],
+                'current': self.fileHandler,
+                'group': 'E/S en paralelo'
+            },
+            'ioRanks': {
+                'label': 'Procesadores por grupo de E/S (ioRanks)',
+                'tooltip': 'Con "collated", el primer procesador de cada grupo de este tamaño escribe los datos del grupo (ej: 8 ranks escriben en processors<N>_0-7, processors<N>_8-15, ...).',
+                'type': 'int',
+                'default': 8,
+                'min': 1,
+                'optional': True,
+                'current': self.ioRanks,
+                'group': 'E/S en paralelo'
+            },
+            'maxThreadFileBufferSize': {
+                'label': 'Buffer de escritura en hilo (bytes)',
+                'tooltip': 'Tamaño del buffer para escribir en un hilo aparte con "collated" (0 desactiva el hilo).',
+                'type': 'float',
+                'default': 2e9,
+                'optional': True,
+                'current': self.maxThreadFileBufferSize,
+                'group': 'E/S en paralelo'
+            },
             'functions': {
                 'label': 'Contenido adicional', 
                 'tooltip': 'Usar si se seleccionó un template, sino seleccionar "Ninguno" y utilizar el contenido de experto.',
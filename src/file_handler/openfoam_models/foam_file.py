@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Dict, Any
 
+from ..boundary_rules import is_pattern, check_pattern
+
 class FoamFile(ABC):
     """Abstract base class for all OpenFOAM configuration files."""
 
@@ -187,6 +189,9 @@ class FoamFile(ABC):
 
                 if not isinstance(patch_name, str):
                     raise ValueError(f"El nombre del patch ('patchName') en '{param_label}' no es un string.")
+
+                if is_pattern(patch_name):
+                    check_pattern(patch_name)
                 
                 patch_type = patch.get('type')
                 if patch_type is None:
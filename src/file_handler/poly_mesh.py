@@ -0,0 +1,128 @@
+import gzip
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .exceptions import FileHandlerError
+
+# Cabecera FoamFile y nota que OpenFOAM escribe en 'owner'
+HEADER_RE = re.compile(rb'FoamFile\s*\{(.*?)\}', re.DOTALL)
+HEADER_ENTRY_RE = re.compile(r'(\w+)\s+("[^"]*"|[^;]+);')
+NOTE_COUNT_RE = re.compile(r'(nPoints|nCells|nFaces|nInternalFaces)\s*:\s*(\d+)')
+LIST_START_RE = re.compile(rb'(\d+)\s*\(')
+
+
+def poly_mesh_file(poly_mesh_dir: Path, name: str) -> Path:
+    """Devuelve la ruta de un archivo de polyMesh, comprimido (.gz) o no."""
+    path = poly_mesh_dir / name
+    if path.exists():
+        return path
+    gz_path = poly_mesh_dir / f"{name}.gz"
+    if gz_path.exists():
+        return gz_path
+    raise FileHandlerError(f"No se encontró '{name}' en {poly_mesh_dir}")
+
+
+def _read_bytes(path: Path) -> bytes:
+    if path.suffix == ".gz":
+        with gzip.open(path, "rb") as f:
+            return f.read()
+    return path.read_bytes()
+
+
+def read_header(data: bytes) -> Tuple[Dict[str, str], int]:
+    """
+    Lee la cabecera FoamFile.
+
+    Returns:
+        tuple: (entradas de la cabecera, posición donde termina la cabecera).
+    """
+    match = HEADER_RE.search(data)
+    if not match:
+        return {}, 0
+    text = match.group(1).decode(errors="replace")
+    entries = {key: value.strip().strip('"') for key, value in HEADER_ENTRY_RE.findall(text)}
+    return entries, match.end()
+
+
+def _sizes_from_arch(header: Dict[str, str]) -> Tuple[int, int]:
+    """Tamaño en bytes de label y scalar según la entrada 'arch' de la cabecera."""
+    arch = header.get("arch", "")
+    label = re.search(r'label=(\d+)', arch)
+    scalar = re.search(r'scalar=(\d+)', arch)
+    return (int(label.group(1)) // 8 if label else 4), (int(scalar.group(1)) // 8 if scalar else 8)
+
+
+def _read_list(path: Path, kind: str, width: int = 1) -> np.ndarray:
+    """
+    Lee la primera lista de un archivo de polyMesh (ascii o binario).
+
+    Args:
+        kind: 'label' o 'scalar'.
+        width: Componentes por elemento (3 para los puntos).
+    """
+    data = _read_bytes(path)
+    header, offset = read_header(data)
+    match = LIST_START_RE.search(data, offset)
+    if not match:
+        raise FileHandlerError(f"No se pudo leer la lista de {path}")
+    count = int(match.group(1))
+    start = match.end()
+
+    if header.get("format", "ascii") == "binary":
+        label_size, scalar_size = _sizes_from_arch(header)
+        if kind == "label":
+            dtype = np.int64 if label_size == 8 else np.int32
+        else:
+            dtype = np.float32 if scalar_size == 4 else np.float64
+        values = np.frombuffer(data, dtype=dtype, count=count * width, offset=start)
+    else:
+        end = data.rfind(b")")
+        text = data[start:end].replace(b"(", b" ").replace(b")", b" ")
+        values = np.array(text.split(), dtype=np.float64 if kind == "scalar" else np.int64)[:count * width]
+
+    return values.reshape(-1, width) if width > 1 else values
+
+
+def read_points(poly_mesh_dir: Path) -> np.ndarray:
+    """Devuelve los puntos de la malla como un arreglo (N, 3)."""
+    return _read_list(poly_mesh_file(poly_mesh_dir, "points"), "scalar", width=3)
+
+
+def read_cell_count(poly_mesh_dir: Path) -> int:
+    """
+    Cantidad de celdas de la malla. Se toma de la nota que OpenFOAM escribe en
+    la cabecera de 'owner' y, si no está, del mayor índice de 'owner'.
+    """
+    owner_path = poly_mesh_file(poly_mesh_dir, "owner")
+    header, _ = read_header(_read_bytes(owner_path))
+    counts = dict(NOTE_COUNT_RE.findall(header.get("note", "")))
+    if "nCells" in counts:
+        return int(counts["nCells"])
+    owner = _read_list(owner_path, "label")
+    return int(owner.max()) + 1 if owner.size else 0
+
+
+def quad_face_fraction(poly_mesh_dir: Path) -> Optional[float]:
+    """
+    Fracción de caras con cuatro vértices: cerca de 1 para mallas hexaédricas
+    estructuradas (blockMesh), menor para mallas de snappyHexMesh o tetraédricas.
+    """
+    try:
+        faces_path = poly_mesh_file(poly_mesh_dir, "faces")
+    except FileHandlerError:
+        return None
+    data = _read_bytes(faces_path)
+    header, offset = read_header(data)
+
+    if header.get("format", "ascii") == "binary":
+        # faceCompactList: primero los offsets (N+1) y luego los vértices
+        offsets = _read_list(faces_path, "label")
+        sizes = np.diff(offsets)
+    else:
+        sizes = np.array([int(n) for n in re.findall(rb'(?m)^\s*(\d+)\(', data[offset:])])
+    if sizes.size == 0:
+        return None
+    return float(np.count_nonzero(sizes == 4)) / sizes.size
@@ -0,0 +1,108 @@
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .decomposed_case import _hash_path, list_time_directories, processor_dirs
+
+logger = logging.getLogger(__name__)
+
+# Firma de las entradas de la inicialización (setFields/funkySetFields) ya aplicada
+INIT_SIGNATURE_FILE = ".initialization_signature"
+
+# Copia de '0' tal como quedó después de inicializar los campos
+INITIALIZED_FIELDS_DIR = ".initialized_0"
+
+# Entradas de las que depende la inicialización: los campos de '0' que escribe
+# la interfaz, la malla y los diccionarios de setFields/funkySetFields.
+INIT_INPUTS = (
+    "constant/polyMesh",
+    "0",
+    "system/setFieldsDict",
+    "system/funkySetFieldsDict",
+)
+
+
+def initialization_signature(case_path: Path) -> str:
+    """
+    Firma de las entradas de la inicialización. Se calcula con '0' tal como lo
+    escribe la interfaz, antes de que setFields lo modifique.
+    """
+    digest = hashlib.sha256()
+    for relative in INIT_INPUTS:
+        _hash_path(digest, case_path, relative)
+    return digest.hexdigest()
+
+
+def stored_initialization_signature(case_path: Path) -> Optional[str]:
+    path = case_path / INIT_SIGNATURE_FILE
+    if not path.exists():
+        return None
+    return path.read_text().strip() or None
+
+
+def can_reuse_initialization(case_path: Path, signature: str) -> bool:
+    """Indica si los campos inicializados guardados corresponden a las entradas actuales."""
+    return (case_path / INITIALIZED_FIELDS_DIR).is_dir() and stored_initialization_signature(case_path) == signature
+
+
+def field_names(case_path: Path) -> List[str]:
+    """Campos del caso según '0' (sin copias de respaldo como '.orig')."""
+    initial = case_path / "0"
+    if not initial.is_dir():
+        return []
+    return sorted(p.name for p in initial.iterdir()
+                  if p.is_file() and not p.name.startswith(".") and not p.name.endswith(".orig"))
+
+
+def _is_complete(time_dir: Path, fields: List[str]) -> bool:
+    """Un tiempo está completo si todos los campos se escribieron (y no quedaron vacíos)."""
+    for name in fields:
+        path = time_dir / name
+        if not path.is_file():
+            path = time_dir / f"{name}.gz"
+        if not path.is_file() or path.stat().st_size == 0:
+            return False
+    return True
+
+
+def latest_complete_time(case_path: Path, start_time: float = 0.0, decomposed: bool = False) -> Optional[str]:
+    """
+    Último tiempo posterior a 'start_time' con todos los campos escritos, desde
+    el cual se puede retomar una corrida interrumpida. Un tiempo a medio
+    escribir (la corrida se detuvo mientras escribía) se saltea.
+
+    Args:
+        decomposed: Buscar en los processor* (el tiempo debe estar completo en todos).
+    """
+    fields = field_names(case_path)
+    if not fields:
+        return None
+    roots = processor_dirs(case_path) if decomposed else [case_path]
+    if not roots:
+        return None
+
+    for time in reversed(list_time_directories(roots[0])):
+        if float(time) <= start_time:
+            break
+        if all(_is_complete(root / time, fields) for root in roots):
+            return time
+    return None
+
+
+def restart_env(case_path: Path, resume_time: Optional[str] = None) -> Dict[str, str]:
+    """
+    Variables de entorno para los scripts de corrida:
+
+    - RESUME_TIME: tiempo desde el cual retomar (se saltea la inicialización).
+    - INIT_SIGNATURE: firma que el script guarda tras inicializar los campos.
+    - SKIP_INIT=1 si las entradas no cambiaron y basta con restaurar los campos inicializados.
+    """
+    signature = initialization_signature(case_path)
+    env = {"INIT_SIGNATURE": signature}
+    if resume_time is not None:
+        env["RESUME_TIME"] = str(resume_time)
+    elif can_reuse_initialization(case_path, signature):
+        logger.info("Las condiciones iniciales no cambiaron: se restauran los campos ya inicializados.")
+        env["SKIP_INIT"] = "1"
+    return env
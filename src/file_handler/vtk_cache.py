@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import pyvista as pv
+from vtkmodules.vtkIOXML import vtkXMLPolyDataReader, vtkXMLPolyDataWriter
+
+logger = logging.getLogger(__name__)
+
+# Caché de la geometría y los campos que lee el visor, en XML binario
+# comprimido (.vtp): leerlo es mucho más rápido que volver a parsear la malla
+# de OpenFOAM o los .vtk legacy de foamToVTK, y los arreglos pasan directo del
+# lector de VTK a NumPy sin copias. Cada entrada se identifica por la huella de
+# los archivos de los que sale.
+CACHE_DIR = ".vtk_cache"
+
+# Tipos de entrada: patches de la malla, cuadros de resultados y archivos VTK
+BOUNDARY_KIND = "boundary"
+FRAME_KIND = "frames"
+FILE_KIND = "files"
+
+# Índice de una entrada de varios patches (nombre del patch -> archivo)
+BLOCKS_INDEX = "blocks.json"
+
+MAX_CACHE_MB = 2048
+
+
+def fingerprint(paths: Iterable[Path], extra: str = "") -> str:
+    """
+    Huella de los archivos de origen: ruta, tamaño y fecha de modificación de
+    cada uno. No se lee el contenido para que abrir un caso grande siga siendo
+    rápido; cualquier escritura de OpenFOAM cambia la fecha o el tamaño.
+    """
+    digest = hashlib.sha256(extra.encode())
+    for path in sorted(Path(p) for p in paths):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        digest.update(f"{path.as_posix()}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+def entry_path(cache_root: Path, kind: str, key: str, suffix: str = "") -> Path:
+    return Path(cache_root) / kind / f"{key}{suffix}"
+
+
+def _staging_path(target: Path) -> Path:
+    # Nombre único por hilo: varios lectores pueden escribir en la caché a la vez
+    return target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def write_polydata(mesh: pv.PolyData, path: Path) -> None:
+    """Guarda la malla en XML binario comprimido con LZ4 (rápido de descomprimir)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = _staging_path(path)
+    writer = vtkXMLPolyDataWriter()
+    writer.SetInputData(mesh)
+    writer.SetFileName(str(staging))
+    writer.SetDataModeToAppended()
+    writer.EncodeAppendedDataOff()
+    writer.SetCompressorTypeToLZ4()
+    if not writer.Write():
+        staging.unlink(missing_ok=True)
+        raise OSError(f"No se pudo escribir {path}")
+    # El renombre deja la entrada completa o ninguna
+    os.replace(staging, path)
+
+
+def read_polydata(path: Path) -> Optional[pv.PolyData]:
+    """Lee una entrada de la caché, o None si no existe o está dañada."""
+    if not path.is_file():
+        return None
+    reader = vtkXMLPolyDataReader()
+    reader.SetFileName(str(path))
+    reader.Update()
+    if reader.GetErrorCode():
+        logger.warning(f"Entrada dañada en la caché de VTK: {path}")
+        return None
+    _touch(path)
+    return pv.wrap(reader.GetOutput())
+
+
+def write_blocks(blocks: Dict[str, pv.PolyData], path: Path) -> None:
+    """Guarda varios patches en una carpeta: un .vtp por patch y el índice con el orden."""
+    staging = _staging_path(path)
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    index = []
+    for number, (name, mesh) in enumerate(blocks.items()):
+        file_name = f"{number}.vtp"
+        write_polydata(mesh, staging / file_name)
+        index.append([name, file_name])
+    with open(staging / BLOCKS_INDEX, "w") as f:
+        json.dump(index, f)
+    shutil.rmtree(path, ignore_errors=True)
+    staging.rename(path)
+
+
+def read_blocks(path: Path) -> Optional[Dict[str, pv.PolyData]]:
+    """Lee los patches guardados con 'write_blocks', o None si la entrada no existe o está incompleta."""
+    try:
+        with open(path / BLOCKS_INDEX, "r") as f:
+            index = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    blocks = {}
+    for name, file_name in index:
+        mesh = read_polydata(path / file_name)
+        if mesh is None:
+            return None
+        blocks[name] = mesh
+    _touch(path)
+    return blocks
+
+
+def _touch(path: Path) -> None:
+    """Marca la entrada como usada (la poda descarta primero las menos usadas)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _entry_size(path: Path) -> int:
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return path.stat().st_size
+
+
+def prune_cache(cache_root: Path, max_bytes: int = MAX_CACHE_MB * 1024 * 1024) -> None:
+    """Elimina las entradas usadas hace más tiempo hasta que la caché entre en 'max_bytes'."""
+    entries = []
+    for kind_dir in Path(cache_root).iterdir() if Path(cache_root).is_dir() else []:
+        for entry in kind_dir.iterdir() if kind_dir.is_dir() else []:
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, _entry_size(entry), entry))
+            except OSError:
+                continue
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries, key=lambda item: item[0]):
+        if total <= max_bytes:
+            break
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            entry.unlink(missing_ok=True)
+        total -= size
+
+
+def read_vtk_file(filepath: str) -> pv.DataSet:
+    """
+    Lee un archivo de la carpeta VTK. Los .vtk legacy (texto) se convierten una
+    vez a .vtp comprimido en la caché de su carpeta y se leen de ahí.
+    """
+    if not filepath.endswith(".vtk"):
+        return pv.read(filepath)
+    path = Path(filepath)
+    cache_root = path.parent / CACHE_DIR
+    entry = entry_path(cache_root, FILE_KIND, fingerprint([path]), ".vtp")
+    mesh = read_polydata(entry)
+    if mesh is not None:
+        return mesh
+    mesh = pv.read(filepath)
+    surface = mesh if isinstance(mesh, pv.PolyData) else mesh.extract_surface()
+    try:
+        write_polydata(surface, entry)
+        prune_cache(cache_root)
+    except OSError as e:
+        logger.warning(f"No se pudo guardar {filepath} en la caché de VTK: {e}")
+    return surface
@@ -0,0 +1,158 @@
+import json
+import logging
+import re
+import shlex
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .decomposed_case import (decomposed_times, reconstructed_times,
+                              mesh_is_decomposed, decomposed_processor_count)
+
+logger = logging.getLogger(__name__)
+
+VTK_DIR = "VTK"
+
+# Tiempos ya convertidos por cada combinación de opciones de foamToVTK
+CONVERSION_MANIFEST = ".conversion_manifest.json"
+
+# Salida de foamToVTK: VTK/<caso>_<índice de tiempo>/boundary/<patch>.vtp
+TIME_OUTPUT_RE = re.compile(r'^.+_(\d+)$')
+
+DEFAULT_REGION = "region0"
+
+
+def available_times(case_path: Path) -> List[str]:
+    """Tiempos del caso, reconstruidos o que existen solo en los processor*."""
+    times = {float(t): t for t in decomposed_times(case_path)}
+    times.update({float(t): t for t in reconstructed_times(case_path)})
+    return [times[key] for key in sorted(times)]
+
+
+def boundary_vtk_dir(case_path: Path) -> Optional[Path]:
+    """
+    Carpeta 'boundary' del primer tiempo convertido (la geometría que muestra el
+    visor), sin depender del nombre del caso dentro del contenedor.
+    """
+    candidates = []
+    vtk_path = case_path / VTK_DIR
+    for item in vtk_path.iterdir() if vtk_path.is_dir() else []:
+        match = TIME_OUTPUT_RE.match(item.name)
+        if match and (item / "boundary").is_dir():
+            candidates.append((int(match.group(1)), item / "boundary"))
+    return min(candidates)[1] if candidates else None
+
+
+def _word_list(names: Iterable[str]) -> str:
+    """Lista de OpenFOAM para opciones como -patches o -fields: '(inlet outlet)'."""
+    return "(" + " ".join(names) + ")"
+
+
+def build_foamtovtk_args(patches: Optional[Iterable[str]] = None, fields: Optional[Iterable[str]] = None,
+                         times: Optional[Iterable[str]] = None, include_internal: bool = False,
+                         region: str = DEFAULT_REGION) -> List[str]:
+    """
+    Argumentos de foamToVTK para convertir solo lo que se necesita.
+
+    Args:
+        patches: Patches a convertir (None para todos).
+        fields: Campos a convertir (None o vacío para convertir solo la malla).
+        times: Tiempos a convertir (None para los que elija foamToVTK).
+        include_internal: Si se convierte también la malla interna.
+    """
+    args = ["-region", region]
+    if not include_internal:
+        args.append("-no-internal")
+    if patches:
+        args += ["-patches", _word_list(patches)]
+    if fields:
+        args += ["-fields", _word_list(fields)]
+    else:
+        args.append("-no-fields")
+    if times:
+        args += ["-time", ",".join(times)]
+    return args
+
+
+def _load_manifest(case_path: Path) -> Dict[str, List[str]]:
+    path = case_path / VTK_DIR / CONVERSION_MANIFEST
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        logger.warning(f"No se pudo leer {path}: {e}. Se vuelven a convertir todos los tiempos.")
+        return {}
+
+
+def converted_times(case_path: Path, key: str) -> List[str]:
+    """Tiempos ya convertidos con las opciones identificadas por 'key'."""
+    return _load_manifest(case_path).get(key, [])
+
+
+def plan_conversion(case_path: Path, patches: Optional[Iterable[str]] = None,
+                    fields: Optional[Iterable[str]] = None, times: Optional[Iterable[str]] = None,
+                    include_internal: bool = False, new_times_only: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Arma un pedido de conversión a VTK.
+
+    Sin campos se convierte solo la geometría del primer tiempo, que es lo que
+    usa el visor. Con campos se convierten los tiempos indicados (o todos) y,
+    con 'new_times_only', se saltean los que ya se convirtieron con las mismas
+    opciones. Si los tiempos existen descompuestos y no reconstruidos, o la
+    malla solo existe descompuesta, la conversión corre en paralelo.
+
+    Returns:
+        dict: Con 'args', 'times', 'key', 'num_processors' y 'geometry_only', o
+            None si no queda nada por convertir.
+    """
+    patches = sorted(patches) if patches else None
+    fields = sorted(fields) if fields else None
+    all_times = available_times(case_path)
+
+    if times is not None:
+        selected = [t for t in all_times if float(t) in {float(x) for x in times}]
+    elif fields:
+        selected = all_times
+    else:
+        selected = all_times[:1]
+
+    key = shlex.join(build_foamtovtk_args(patches, fields, None, include_internal))
+    if new_times_only and fields:
+        done = {float(t) for t in converted_times(case_path, key)}
+        selected = [t for t in selected if float(t) not in done]
+        if not selected:
+            return None
+
+    on_processors = set(decomposed_times(case_path))
+    reconstructed = set(reconstructed_times(case_path))
+    num_processors = 1
+    if on_processors and all(t in on_processors for t in selected):
+        if mesh_is_decomposed(case_path) or any(t not in reconstructed for t in selected):
+            num_processors = decomposed_processor_count(case_path)
+
+    return {
+        'args': build_foamtovtk_args(patches, fields, selected, include_internal),
+        'times': selected,
+        'key': key,
+        'num_processors': num_processors,
+        'geometry_only': not fields,
+    }
+
+
+def foamtovtk_env(plan: Dict[str, Any]) -> Dict[str, str]:
+    """Variables de entorno para run_foamToVTK.sh."""
+    return {"FOAMTOVTK_ARGS": shlex.join(plan['args'])}
+
+
+def record_conversion(case_path: Path, plan: Dict[str, Any]) -> None:
+    """Registra los tiempos convertidos, para que la próxima conversión incremental los saltee."""
+    vtk_path = case_path / VTK_DIR
+    if not vtk_path.is_dir():
+        return
+    manifest = _load_manifest(case_path)
+    done = {float(t): t for t in manifest.get(plan['key'], [])}
+    done.update({float(t): t for t in plan['times']})
+    manifest[plan['key']] = [done[t] for t in sorted(done)]
+    with open(vtk_path / CONVERSION_MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
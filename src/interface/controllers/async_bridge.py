@@ -0,0 +1,152 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from PySide6.QtCore import QObject, Signal
+
+
+class AsyncioBridge(QObject):
+    """
+    Puente entre Qt y asyncio.
+
+    Mantiene un único event loop de asyncio corriendo en un hilo propio. La GUI
+    le envía corrutinas con 'submit' (que no bloquea) y recibe los resultados a
+    través de señales de Qt, que se encolan automáticamente hacia el hilo de la GUI.
+    Así un solo loop maneja todos los contenedores sin un hilo por trabajo.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="asyncio-bridge", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine) -> Future:
+        """Agenda una corrutina en el loop del puente y devuelve un Future thread-safe."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def shutdown(self, timeout: float = 2.0):
+        """Cancela las tareas pendientes y detiene el loop."""
+        if not self.loop.is_running():
+            return
+
+        async def _cancel_pending():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            self.submit(_cancel_pending()).result(timeout)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+
+
+class AsyncScriptRunner(QObject):
+    """
+    Ejecuta un script del DockerHandler en el loop del puente y reenvía su
+    salida a la GUI mediante señales.
+    """
+    finished = Signal(bool, str)  # (éxito, nombre del script)
+    log_received = Signal(str)
+    progress_updated = Signal(str)  # Texto de estado con progreso, throughput y ETA
+
+    def __init__(self, bridge: AsyncioBridge, docker_handler, script_name: str, num_processors: int = 1,
+                 progress=None, env: dict = None, parent=None):
+        super().__init__(parent)
+        self.bridge = bridge
+        self.docker_handler = docker_handler
+        self.script_name = script_name
+        self.num_processors = num_processors
+        self.progress = progress
+        self.env = env
+        self.future = None
+
+    def start(self) -> Future:
+        """Lanza la ejecución sin bloquear la GUI."""
+        self.future = self.bridge.submit(self._consume())
+        return self.future
+
+    def stop(self) -> Future:
+        """Pide al contenedor que se detenga sin bloquear la GUI."""
+        return self.bridge.submit(self.docker_handler.stop_simulation_async())
+
+    async def _consume(self):
+        try:
+            async for line in self.docker_handler.stream_script(self.script_name, self.num_processors, self.env):
+                self.log_received.emit(line)
+                # El parseo del log se hace en el hilo del loop para no cargar al hilo de la GUI
+                if self.progress and self.progress.feed_line(line):
+                    self.progress_updated.emit(self.progress.format_status())
+            self.finished.emit(True, self.script_name)
+        except asyncio.CancelledError:
+            self.finished.emit(False, self.script_name)
+            raise
+        except Exception as e:
+            # Se capturan las excepciones y se emite una señal para que
+            # el hilo principal las maneje.
+            self.log_received.emit(f"Error during Docker execution: {e}")
+            self.finished.emit(False, self.script_name)
+
+
+class AsyncTaskRunner(QObject):
+    """
+    Ejecuta una corrutina arbitraria (p. ej. un estudio con varias corridas) en
+    el loop del puente y reenvía su resultado a la GUI mediante señales.
+    """
+    finished = Signal(bool, object)  # (éxito, resultado de la corrutina o None)
+    log_received = Signal(str)
+
+    def __init__(self, bridge: AsyncioBridge, coroutine_factory, name: str, docker_handler=None, parent=None):
+        """
+        Args:
+            coroutine_factory: Función que recibe el callback de log y devuelve la corrutina.
+            name: Nombre del trabajo, equivalente al 'script_name' de AsyncScriptRunner.
+            docker_handler: DockerHandler en el que se marca la detención pedida
+                por el usuario ('was_stopped_by_user'), como en AsyncScriptRunner.
+        """
+        super().__init__(parent)
+        self.bridge = bridge
+        self.docker_handler = docker_handler
+        self.coroutine_factory = coroutine_factory
+        self.script_name = name
+        self.future = None
+        self._task = None
+
+    def start(self) -> Future:
+        """Lanza la ejecución sin bloquear la GUI."""
+        self.future = self.bridge.submit(self._run())
+        return self.future
+
+    def stop(self) -> Future:
+        """
+        Cancela la corrutina; los contenedores en curso se cierran al propagarse
+        la cancelación. El Future se completa cuando la corrutina terminó.
+        """
+        return self.bridge.submit(self._cancel())
+
+    async def _cancel(self):
+        if self._task and not self._task.done():
+            # Se marca antes de cancelar para que 'finished' se informe como detención y no como falla
+            if self.docker_handler:
+                self.docker_handler.was_stopped_by_user = True
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self):
+        self._task = asyncio.current_task()
+        try:
+            result = await self.coroutine_factory(self.log_received.emit)
+            self.finished.emit(True, result)
+        except asyncio.CancelledError:
+            self.finished.emit(False, None)
+            raise
+        except Exception as e:
+            self.log_received.emit(f"Error during {self.script_name}: {e}")
+            self.finished.emit(False, None)
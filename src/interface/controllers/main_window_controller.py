@@ -7,20 +7,38 @@ import subprocess
 from PySide6.QtWidgets import QMessageBox
 import re
 
-from PySide6.QtWidgets import (QMainWindow, QDialog, QMessageBox, QVBoxLayout, QFileDialog, QPlainTextEdit, QToolTip)
-from PySide6.QtCore import QUrl, QTimer,  QObject, QThread, Signal, QRunnable, Slot
+from PySide6.QtWidgets import (QMainWindow, QDialog, QMessageBox, QVBoxLayout, QFileDialog, QPlainTextEdit, QToolTip,
+                               QInputDialog)
+from PySide6.QtCore import QUrl, QTimer, QRunnable, Slot
 from PySide6.QtUiTools import QUiLoader
 from PySide6.QtGui import QDesktopServices, QKeySequence, QCursor, QAction
 import json 
 
-from src.config import RUTA_LOCAL, create_dir
+from src.config import RUTA_LOCAL, create_dir, load_execution_config
 from src.docker_handler.dockerHandler import DockerHandler
+from src.docker_handler.run_progress import RunProgress, build_run_record, append_run_metadata
+from src.docker_handler.mesh_pipeline import (MESH_NODES, plan_mesh_pipeline, run_mesh_pipeline, is_up_to_date,
+                                              format_pipeline_plan)
+from src.docker_handler.scaling_study import (run_scaling_study, core_counts, save_report, format_report,
+                                              DEFAULT_STUDY_STEPS)
 from src.file_handler.file_handler import FileHandler
+from src.file_handler.exceptions import FileHandlerError
+from src.file_handler.decomposition_planner import plan_for_case, apply_plan, format_plan
+from src.file_handler.decomposed_case import (parallel_run_env, pending_reconstruction,
+                                              decomposed_processor_count, clear_decomposition_signature,
+                                              io_ranks_argument, mesh_is_decomposed, mesh_boundary_file)
+from src.file_handler.run_restart import latest_complete_time, restart_env
+from src.file_handler.vtk_conversion import (plan_conversion, foamtovtk_env, record_conversion, boundary_vtk_dir,
+                                             available_times)
+from src.file_handler.foam_reader import has_poly_mesh
+from src.file_handler.boundary_rules import read_patch_groups
 
 from .widget_geometria import GeometryView
+from .async_bridge import AsyncioBridge, AsyncScriptRunner, AsyncTaskRunner
 from .simulation_wizard_controller import SimulationWizardController
 # from .parallel_wizard_controller import ParallelWizardController
 from .file_browser_manager import FileBrowserManager
+from src.interface.widgets.helpers import ScalingStudyDialog
 from .parameter_editor_manager import ParameterEditorManager
 
 # --- Constantes ---
@@ -28,31 +46,8 @@ APP_NAME = "Simulador Hidrosedimentológico"
 DOCUMENTATION_URL = "https://github.com/JupaaF/Proyecto_Final"
 DEFAULT_WINDOW_TITLE = f"{APP_NAME} by Marti and Jupa"
 
-class DockerWorker(QObject):
-    """
-    Worker thread for executing Docker commands in the background.
-    """
-    finished = Signal(bool, str)  # Signal to indicate completion (success, script_name)
-    log_received = Signal(str)
-
-    def __init__(self, docker_handler: DockerHandler, script_name: str, num_processors: int = 1):
-        super().__init__()
-        self.docker_handler = docker_handler
-        self.script_name = script_name
-        self.num_processors = num_processors
-
-    @Slot()
-    def run(self):
-        """Executes the Docker script and emits the finished signal."""
-        try:
-            for line in self.docker_handler.execute_script_in_docker(self.script_name, self.num_processors):
-                self.log_received.emit(line)
-            self.finished.emit(True, self.script_name)
-        except Exception as e:
-            # It's important to catch exceptions in the thread and emit a signal
-            # so the main thread can handle them.
-            self.log_received.emit(f"Error during Docker execution: {e}")
-            self.finished.emit(False, self.script_name)
+# Scripts que ejecutan un solver y cuyo log permite seguir el progreso de la corrida
+SOLVER_SCRIPTS = ["run_openfoam.sh", "run_openfoam_parallel.sh", "run_sedfoam.sh", "run_sedfoam_parallel.sh"]
 
 class MainWindowController(QMainWindow):
     def __init__(self):
@@ -68,6 +63,13 @@ class MainWindowController(QMainWindow):
         self.parameter_editor_manager = None ## Controlador
         self.visualizer = None
         self.is_running_task = False
+        self.run_progress = None
+        self.run_num_processors = 1
+        self.worker = None
+        self.background_runners = []  # Trabajos en segundo plano (p. ej. reconstrucciones bajo demanda)
+        self.pending_vtk_conversion = None  # Pedido de foamToVTK en curso
+        # Un único event loop de asyncio maneja todos los contenedores
+        self.async_bridge = AsyncioBridge(self)
 
     def _initialize_app(self):
         """Inicializa la configuración básica de la aplicación."""
@@ -114,6 +116,9 @@ class MainWindowController(QMainWindow):
         actions = {
             self.ui.actionEjecutar_Simulacion: (self.execute_simulation, "Ejecuta la simulación con la configuración actual."),
             self.ui.actionEjecutar_Simulacion_en_Paralelo: (self.execute_parallel_simulation, "Ejecuta la simulación en paralelo con el número de procesadores definido en system/decomposeParDict"),
+            self.ui.actionReconstruir_Tiempos: (self.reconstruct_times_action, "Reconstruye en segundo plano tiempos de una corrida paralela que quedaron descompuestos."),
+            self.ui.actionPlanificar_Descomposicion: (self.plan_decomposition_action, "Recomienda una descomposición del dominio según la malla y los núcleos disponibles, y la guarda en system/decomposeParDict."),
+            self.ui.actionEstudio_Escalabilidad: (self.scaling_study_action, "Corre unos pocos pasos con 1, 2, 4, ... núcleos y recomienda la cantidad de subdominios según el speedup y la eficiencia."),
             self.ui.actionLimpiar_Resultados: (self.clean_simulation_results, "Elimina las carpetas con resultados de la simulación, conservando la configuración inicial."),
             self.ui.actionDetener_Simulacion: (self.stop_simulation, "Detiene la simulación o proceso en curso."),
             self.ui.actionVisualizarEnParaview: (self.launch_paraview_action, "Crear archivo ParaView para visualizar el caso."),
@@ -121,6 +126,7 @@ class MainWindowController(QMainWindow):
             self.ui.actionSnappyHexMesh: (self.open_new_SnappyHexMesh_dialog, "Genera una malla alrededor de una geometría compleja con snappyHexMesh."),
             self.ui.actionSnappyHexMesh_en_Paralelo: (self.open_new_SnappyHexMesh_parallel_dialog, "Genera una malla con snappyHexMesh en paralelo con el número de procesadores definido en system/decomposeParDict."),
             self.ui.actionActualizar_Malla: (self.reload_geometry, "Actualiza la visualización de la geometría actual."),
+            self.ui.actionConvertir_Resultados_VTK: (self.convert_results_action, "Convierte a VTK solo los campos, patches y tiempos elegidos, salteando los tiempos ya convertidos."),
             self.ui.actionReiniciar_Malla: (self.execute_blockMesh, "Regenera la geometría base a partir de blockMeshDict."),
             self.ui.actionDocumentacion: (self.open_documentation, "Abre la documentación del proyecto."),
             self.ui.actionNueva_Simulacion: (self.open_new_simulation_wizard, "Abre el asistente para crear una nueva simulación."),
@@ -157,6 +163,8 @@ class MainWindowController(QMainWindow):
 
         deleted_folders = []
         error_folders = []
+        # Si la malla quedó descompuesta tras mallar en paralelo, los processor* son la única copia
+        keep_processor_dirs = mesh_is_decomposed(case_path)
 
         for item in case_path.iterdir():
             if item.is_dir():
@@ -168,7 +176,8 @@ class MainWindowController(QMainWindow):
                 except ValueError:
                     is_numeric = False
 
-                if (is_numeric and item.name != "0") or "process" in item.name or item.name == "postProcessing":
+                is_processor_dir = "process" in item.name and not keep_processor_dirs
+                if (is_numeric and item.name != "0") or is_processor_dir or item.name == "postProcessing":
                     try:
                         shutil.rmtree(item)
                         deleted_folders.append(item.name)
@@ -176,6 +185,11 @@ class MainWindowController(QMainWindow):
                         error_folders.append(item.name)
                         print(f"Error deleting folder {item.name}: {e}")
 
+        if keep_processor_dirs:
+            self._append_log("La malla está descompuesta: se conservan los directorios processor*.")
+        else:
+            clear_decomposition_signature(case_path)
+
         if deleted_folders:
             QMessageBox.information(self, "Limpieza Exitosa",
                                     f"Se eliminaron las siguientes carpetas de resultados:\n\n"
@@ -277,18 +291,19 @@ class MainWindowController(QMainWindow):
                 #TODO: CAMBIAAAAAAR LOGICA PARA QUE SE EJECUTE ACÁ UN BLOCKMESH
                 # self._check_mesh_and_visualize()
                  # Check for mesh and geometry
+                case_has_mesh = has_poly_mesh(self.file_handler.get_case_path())
                 vtk_path = self.file_handler.get_case_path() / "VTK"
                 block_mesh_dict_system_path = self.file_handler.get_case_path() / "system" / "blockMeshDict"
                 block_mesh_dict_case_path = self.file_handler.get_case_path() / "blockMeshDict"
 
-                if vtk_path.is_dir():
+                if case_has_mesh or vtk_path.is_dir():
                     self._check_mesh_and_visualize()
                 # elif block_mesh_dict_system_path.is_file():
                 #     pass
                 elif block_mesh_dict_case_path.is_file():
                     pass
                 else:
-                    QMessageBox.warning(self, "Geometría Faltante", "No se encontró la geometría del caso. Por favor, asegúrese de que la carpeta VTK o el archivo blockMeshDict existan.")
+                    QMessageBox.warning(self, "Geometría Faltante", "No se encontró la geometría del caso. Por favor, asegúrese de que la malla (constant/polyMesh), la carpeta VTK o el archivo blockMeshDict existan.")
 
 
                 self.file_handler.load_all_parameters_from_json() # Load parameters from the JSON
@@ -344,7 +359,7 @@ class MainWindowController(QMainWindow):
                     shutil.copy(source_path, destination_path)
                     QMessageBox.information(self, "Éxito", f"El archivo '{source_path.name}' se ha copiado a la carpeta 'system' como 'extrudeMeshDict'.")
                     # Ejecutar extrudeMesh en Docker
-                    self._run_docker_script_in_thread("run_extrudeMesh.sh")
+                    self._run_mesh_pipeline('extrudeMesh')
 
                 except Exception as e:
                     QMessageBox.critical(self, "Error de Copia", f"No se pudo copiar el archivo: {e}")
@@ -373,16 +388,8 @@ class MainWindowController(QMainWindow):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            # Eliminar la carpeta VTK si existe
-            vtk_path = self.file_handler.get_case_path() / 'VTK'
-            if vtk_path.is_dir():
-                try:
-                    shutil.rmtree(vtk_path)
-                    self._append_log(f"Directorio VTK eliminado: {vtk_path}")
-                except OSError as e:
-                    QMessageBox.critical(self, "Error de Borrado", f"No se pudo eliminar la carpeta VTK: {e}")
-                    return
-            self._run_docker_script_in_thread("run_blockMeshDict.sh")
+            # El pipeline reemplaza la carpeta VTK con la geometría de la malla nueva
+            self._run_mesh_pipeline('blockMesh')
     
     def open_new_SnappyHexMesh_dialog(self):
         """
@@ -415,7 +422,7 @@ class MainWindowController(QMainWindow):
                     shutil.copy(source_path, destination_path)
                     QMessageBox.information(self, "Éxito", f"El archivo '{source_path.name}' se ha copiado a la carpeta 'system' como 'snappyHexMeshDict'.")
                     # Ejecutar snappyHexMesh en Docker
-                    self._run_docker_script_in_thread("run_snappyHexMeshDict.sh")
+                    self._run_mesh_pipeline('snappyHexMesh')
 
                 except Exception as e:
                     QMessageBox.critical(self, "Error de Copia", f"No se pudo copiar el archivo: {e}")
@@ -453,27 +460,103 @@ class MainWindowController(QMainWindow):
                     QMessageBox.information(self, "Éxito", f"El archivo '{source_path.name}' se ha copiado a la carpeta 'system' como 'snappyHexMeshDict'.")
                     # Ejecutar snappyHexMesh en Docker en paralelo
                     num_processors = self.file_handler.get_number_of_processors()
-                    self._run_docker_script_in_thread("run_snappyHexMeshDict_parallel.sh",num_processors)
+                    parallel_config = load_execution_config()["parallel"]
+                    env = {
+                        "CHECK_MESH": "1" if parallel_config.get("check_mesh") else "0",
+                        "RECONSTRUCT_MESH": "1" if parallel_config.get("reconstruct_mesh") else "0",
+                    }
+                    self._run_mesh_pipeline('snappyHexMesh_parallel', num_processors, env)
 
                 except Exception as e:
                     QMessageBox.critical(self, "Error de Copia", f"No se pudo copiar el archivo: {e}")
 
+    def _run_mesh_pipeline(self, target: str, num_processors: int = 1, env: dict = None):
+        """
+        Genera la malla del nodo 'target' con el pipeline de mallado: los nodos
+        cuyas entradas no cambiaron se saltean o se restauran desde la caché.
+        """
+        case_path = self.file_handler.get_case_path()
+        plan = plan_mesh_pipeline(case_path, target, num_processors)
+        if is_up_to_date(plan):
+            self._append_log(f">>> Malla sin cambios: {format_pipeline_plan(plan)}")
+            QMessageBox.information(self, "Malla Actualizada", "La malla ya está actualizada: no hay pasos para ejecutar.")
+            return
+
+        self.ui.logPlainTextEdit.clear()
+        self._append_log(f">>> Pipeline de mallado: {format_pipeline_plan(plan)}")
+        self._set_ui_interactive(False)
+        self.is_running_task = True
+        self.run_progress = None
+
+        docker_handler = self.docker_handler
+        self.worker = AsyncTaskRunner(
+            self.async_bridge,
+            lambda on_line: run_mesh_pipeline(case_path, plan, docker_handler, on_line, env),
+            MESH_NODES[target]['script'], docker_handler)
+        self.worker.log_received.connect(self._append_log)
+        self.worker.finished.connect(self._on_mesh_pipeline_finished)
+        self.worker.start()
+
+    def _on_mesh_pipeline_finished(self, success: bool, result):
+        if success and result:
+            self._append_log(f">>> Nodos ejecutados: {', '.join(result['ran']) or 'ninguno'}; "
+                             f"salteados: {', '.join(result['skipped']) or 'ninguno'}")
+        self._on_docker_script_finished(success, self.worker.script_name)
+
     def reload_geometry(self):
         """
-        Recargar la malla ejecutando un foamToVTK 
+        Recargar la geometría del visor leyendo directamente la malla del caso
         """
         if not self.file_handler:
             QMessageBox.warning(self, "Acción Requerida", "Por favor, cargue o cree una simulación primero.")
             return
 
-        # Verificar si la malla existe (directorio VTK)
-        vtk_path = self.file_handler.get_case_path() / "VTK"
-        if not vtk_path.is_dir():
+        # Verificar si la malla existe (reconstruida o descompuesta)
+        if not has_poly_mesh(self.file_handler.get_case_path()):
             QMessageBox.warning(self, "Malla no Encontrada", "No se ha generado una malla para el caso actual. Por favor, genere la malla primero.")
             return
-        
-        #Ejecutar foamToVTK
-        self._run_docker_script_in_thread("run_foamToVTK.sh")
+
+        self._check_mesh_and_visualize()
+
+    def convert_results_action(self):
+        """Pide qué campos y tiempos convertir a VTK y lanza una conversión selectiva."""
+        if not self.file_handler:
+            QMessageBox.warning(self, "Acción Requerida", "Por favor, cargue o cree una simulación primero.")
+            return
+
+        case_path = self.file_handler.get_case_path()
+        times = available_times(case_path)
+        if not times:
+            QMessageBox.information(self, "Convertir a VTK", "El caso no tiene tiempos para convertir.")
+            return
+
+        initial_fields = case_path / "0"
+        field_names = sorted(p.name for p in initial_fields.iterdir() if p.is_file()) if initial_fields.is_dir() else []
+        fields, ok = QInputDialog.getText(self, "Convertir a VTK", "Campos a convertir (separados por comas):",
+                                          text=", ".join(field_names))
+        fields = [name.strip() for name in fields.split(",") if name.strip()]
+        if not ok or not fields:
+            return
+
+        modes = ["Solo tiempos nuevos", "Último tiempo", "Todos los tiempos"]
+        mode, ok = QInputDialog.getItem(self, "Convertir a VTK", "Tiempos a convertir:", modes, 0, False)
+        if not ok:
+            return
+
+        # Con patches seleccionados en el visor se convierten solo esos
+        patches = self.visualizer.get_selected_patches() if self.visualizer else None
+        plan = plan_conversion(case_path, patches=patches or None, fields=fields,
+                               times=[times[-1]] if mode == modes[1] else None,
+                               new_times_only=mode == modes[0])
+        if plan is None:
+            QMessageBox.information(self, "Convertir a VTK", "Todos los tiempos ya fueron convertidos con estas opciones.")
+            return
+        self._run_vtk_conversion(plan)
+
+    def _run_vtk_conversion(self, plan: dict):
+        self.pending_vtk_conversion = plan
+        self._append_log(f">>> foamToVTK {' '.join(plan['args'])}")
+        self._run_docker_script_in_thread("run_foamToVTK.sh", plan['num_processors'], foamtovtk_env(plan))
  
     def execute_parallel_simulation(self):
         """Ejecutar una simulación en paralelo."""
@@ -498,16 +581,207 @@ class MainWindowController(QMainWindow):
         QMessageBox.information(self, "Información", f"Configuración paralela guardada. Ejecutando en paralelo.")
 
         num_processors = self.file_handler.get_number_of_processors()
+
+        # Se firma el caso recién escrito para saber si los processor* se pueden reutilizar
+        parallel_config = load_execution_config()["parallel"]
+        file_handler_name, io_ranks = self.file_handler.get_parallel_io_settings(num_processors)
+        env = parallel_run_env(self.file_handler.get_case_path(), num_processors,
+                               keep_decomposed=parallel_config.get("keep_decomposed", True),
+                               reconstruct=parallel_config.get("reconstruct", "latest"),
+                               file_handler=file_handler_name, io_ranks=io_ranks)
+
+        # Volver a descomponer borra los processor*: los tiempos sin reconstruir se perderían
+        if env.get("SKIP_DECOMPOSE") != "1" and not self._confirm_redecompose(env):
+            return
+
+        # Con la descomposición reutilizable se retoma desde los processor*; si no, desde los tiempos reconstruidos
+        proceed, resume_time = self._choose_start_point(decomposed=env.get("SKIP_DECOMPOSE") == "1")
+        if not proceed:
+            return
+        env.update(restart_env(self.file_handler.get_case_path(), resume_time))
         
         solver = self.file_handler.get_solver()
         #Acá está la logica de si usar OpenFOAM o SedFOAM segun el template!!!!!!!!!!!!!:
         if solver == 'interFoam':
-            self._run_docker_script_in_thread("run_openfoam_parallel.sh", num_processors)
+            self._run_docker_script_in_thread("run_openfoam_parallel.sh", num_processors, env)
         elif solver == 'sedFoam':
-            self._run_docker_script_in_thread("run_sedfoam_parallel.sh", num_processors)
+            self._run_docker_script_in_thread("run_sedfoam_parallel.sh", num_processors, env)
       
       
 
+    def plan_decomposition_action(self):
+        """Calcula la descomposición recomendada y la escribe en decomposeParDict."""
+        if not self.file_handler:
+            QMessageBox.warning(self, "Acción Requerida", "Por favor, cargue o cree una simulación primero.")
+            return
+
+        decompose_par_dict = self.file_handler.files.get("decomposeParDict")
+        if decompose_par_dict is None:
+            QMessageBox.warning(self, "Descomposición", "El caso actual no tiene un archivo decomposeParDict.")
+            return
+
+        # Se guardan primero los cambios del editor para no pisarlos al refrescarlo
+        if self.parameter_editor_manager and not self.parameter_editor_manager.save_parameters():
+            return
+
+        case_path = self.file_handler.get_case_path()
+        try:
+            plan = plan_for_case(case_path)
+        except FileHandlerError as e:
+            QMessageBox.warning(self, "Descomposición", f"No se pudo leer la malla del caso: {e}")
+            return
+
+        self._apply_decomposition(plan)
+        QMessageBox.information(self, "Descomposición", f"Se aplicó la descomposición recomendada para {plan['n_cells']} celdas:\n{format_plan(plan)}")
+
+    def _apply_decomposition(self, plan: dict):
+        """Escribe una descomposición en decomposeParDict y refresca el editor si la muestra."""
+        case_path = self.file_handler.get_case_path()
+        decompose_par_dict = self.file_handler.files["decomposeParDict"]
+        apply_plan(decompose_par_dict, plan)
+        decompose_par_dict.write_file(case_path)
+        self.file_handler.save_all_parameters_to_json()
+
+        editor = self.parameter_editor_manager
+        if editor and editor.current_file_path and editor.current_file_path.name == "decomposeParDict":
+            file_path = editor.current_file_path
+            editor.current_file_path = None
+            editor.open_parameters_view(file_path)
+
+        self._append_log(f">>> Descomposición aplicada: {format_plan(plan)}")
+
+    def scaling_study_action(self):
+        """
+        Corre el caso unos pocos pasos con distintas cantidades de núcleos y
+        muestra speedup, eficiencia y la descomposición recomendada.
+        """
+        if not self.file_handler:
+            QMessageBox.warning(self, "Acción Requerida", "Por favor, cargue o cree una simulación primero.")
+            return
+        if "decomposeParDict" not in self.file_handler.files:
+            QMessageBox.warning(self, "Estudio de Escalabilidad", "El caso actual no tiene un archivo decomposeParDict.")
+            return
+        if self.is_running_task:
+            QMessageBox.warning(self, "Estudio de Escalabilidad", "Espere a que termine la ejecución en curso.")
+            return
+
+        case_path = self.file_handler.get_case_path()
+        docker_handler = DockerHandler(case_path)
+        if not docker_handler.is_docker_running():
+            QMessageBox.critical(self, "Docker Status", "El servicio de Docker no está en ejecución. Por favor, inicie Docker Desktop.")
+            return
+
+        max_cores, ok = QInputDialog.getInt(self, "Estudio de Escalabilidad", "Cantidad máxima de núcleos:",
+                                            os.cpu_count() or 1, 1, 1024)
+        if not ok:
+            return
+        steps, ok = QInputDialog.getInt(self, "Estudio de Escalabilidad", "Pasos de tiempo por corrida:",
+                                        DEFAULT_STUDY_STEPS, 5, 10000)
+        if not ok:
+            return
+
+        if self.parameter_editor_manager and not self.parameter_editor_manager.save_parameters():
+            return
+        self.file_handler.write_files()
+        self.file_handler.save_all_parameters_to_json()
+
+        solver = self.file_handler.get_solver()
+        counts = core_counts(max_cores)
+        self.ui.logPlainTextEdit.clear()
+        self._set_ui_interactive(False)
+        self.is_running_task = True
+        self.docker_handler = docker_handler
+
+        self.worker = AsyncTaskRunner(
+            self.async_bridge,
+            lambda on_line: run_scaling_study(case_path, solver, counts, steps, on_line=on_line),
+            "scaling_study", docker_handler)
+        self.worker.log_received.connect(self._append_log)
+        self.worker.finished.connect(self._on_scaling_study_finished)
+        self.ui.statusbar.showMessage(f"Estudio de escalabilidad con {', '.join(map(str, counts))} núcleos...")
+        self.worker.start()
+
+    def _on_scaling_study_finished(self, success: bool, report):
+        self.is_running_task = False
+        self._set_ui_interactive(True)
+        if self.docker_handler and self.docker_handler.was_stopped_by_user:
+            QMessageBox.information(self, "Estudio Detenido", "El estudio de escalabilidad fue detenido por el usuario.")
+            self.docker_handler.was_stopped_by_user = False
+            return
+        if not success or not report:
+            QMessageBox.critical(self, "Estudio de Escalabilidad", "El estudio no pudo completarse. Revisa los logs para más detalles.")
+            return
+
+        case_path = self.file_handler.get_case_path()
+        chart_path = save_report(case_path, report)
+        summary = format_report(report)
+        self._append_log(summary)
+        self.ui.statusbar.showMessage("Estudio de escalabilidad finalizado.")
+
+        dialog = ScalingStudyDialog(report, summary.splitlines()[-1] if report.get('recommended') else "",
+                                    chart_path, self)
+        if dialog.exec() == QDialog.Accepted and report.get('recommended'):
+            self._apply_decomposition(report['recommended'])
+
+    def reconstruct_times_action(self):
+        """Pide qué tiempos reconstruir y los reconstruye en segundo plano."""
+        if not self.file_handler:
+            QMessageBox.warning(self, "Acción Requerida", "Por favor, cargue o cree una simulación primero.")
+            return
+
+        case_path = self.file_handler.get_case_path()
+        pending = pending_reconstruction(case_path)
+        if not pending:
+            QMessageBox.information(self, "Reconstrucción", "No hay tiempos descompuestos pendientes de reconstruir.")
+            return
+
+        times, ok = QInputDialog.getText(
+            self, "Reconstruir Tiempos",
+            f"Tiempos pendientes: {', '.join(pending)}\n"
+            "Ingrese 'latest', 'all' o una lista de tiempos separados por comas:",
+            text=pending[-1])
+        if ok and times.strip():
+            self.request_reconstruction(times.strip())
+
+    def request_reconstruction(self, times: str):
+        """
+        Reconstruye tiempos de un caso descompuesto sin bloquear la GUI ni la
+        ejecución de otros scripts. 'times' es 'latest', 'all' o una lista de
+        tiempos separados por comas.
+        """
+        if not self.file_handler:
+            return
+        if self.is_running_task and self.worker and self.worker.script_name.endswith("_parallel.sh"):
+            QMessageBox.warning(self, "Reconstrucción", "Espere a que termine la corrida paralela para reconstruir.")
+            return
+
+        case_path = self.file_handler.get_case_path()
+        num_processors = decomposed_processor_count(case_path)
+        if not num_processors:
+            QMessageBox.information(self, "Reconstrucción", "El caso no tiene directorios processor* para reconstruir.")
+            return
+
+        # Un DockerHandler propio para no interferir con el trabajo principal
+        file_handler_name, io_ranks = self.file_handler.get_parallel_io_settings(num_processors)
+        env = {"RECONSTRUCT_TIMES": times, "FOAM_FILEHANDLER": file_handler_name}
+        if io_ranks:
+            env["FOAM_IORANKS"] = io_ranks_argument(io_ranks)
+        runner = AsyncScriptRunner(self.async_bridge, DockerHandler(case_path), "run_reconstruct.sh",
+                                   num_processors, env=env)
+        runner.log_received.connect(lambda line: self._append_log(f"[reconstrucción] {line}"))
+        runner.finished.connect(lambda success, _: self._on_reconstruction_finished(runner, times, success))
+        self.background_runners.append(runner)
+        self.ui.statusbar.showMessage(f"Reconstruyendo tiempos ({times}) en segundo plano...")
+        runner.start()
+
+    def _on_reconstruction_finished(self, runner, times: str, success: bool):
+        if runner in self.background_runners:
+            self.background_runners.remove(runner)
+        if success:
+            self.ui.statusbar.showMessage(f"Reconstrucción de tiempos ({times}) finalizada.")
+        else:
+            self.ui.statusbar.showMessage(f"Falló la reconstrucción de tiempos ({times}). Revise el log.")
+
     def _initialize_file_handler(self, case_name: str, template: str = None,file_names:list = None):
         """Inicializa el manejador de archivos para el caso."""
         self.file_handler = FileHandler(RUTA_LOCAL / case_name, template=template,file_names=file_names)
@@ -523,7 +797,8 @@ class MainWindowController(QMainWindow):
         self.file_browser_manager.file_clicked.connect(self.open_parameters_view)
         self.ui.fileBrowserDock.setWidget(self.file_browser_manager.get_widget())
 
-        self.parameter_editor_manager = ParameterEditorManager(self.ui.parameterEditorScrollArea, self.file_handler, self._get_patch_names)
+        self.parameter_editor_manager = ParameterEditorManager(self.ui.parameterEditorScrollArea, self.file_handler,
+                                                               self._get_patch_names, self._get_patch_groups)
 
     def _setup_case_environment(self, mesh_file_path: Path):
         """Copia la geometría, inicializa Docker transforma la malla según el tipo de archivo 
@@ -541,9 +816,13 @@ class MainWindowController(QMainWindow):
             self._run_docker_script_in_thread("run_transform_blockMeshDict.sh")
 
     def _check_mesh_and_visualize(self):
-        """Verifica si la malla existe y la visualiza."""
-        vtk_path = self.file_handler.get_case_path() / "VTK" / "case_0" / "boundary"
-        if vtk_path.exists():
+        """
+        Verifica si la malla existe y la visualiza. Los patches se leen de la
+        malla de OpenFOAM; la carpeta VTK solo se usa si el caso no tiene malla.
+        """
+        case_path = self.file_handler.get_case_path()
+        vtk_path = case_path if has_poly_mesh(case_path) else boundary_vtk_dir(case_path)
+        if vtk_path:
             self.show_geometry_visualizer(vtk_path)
 
         else:
@@ -596,54 +875,166 @@ class MainWindowController(QMainWindow):
                 self.file_handler.write_files()
                 self.file_handler.save_all_parameters_to_json()
 
+        proceed, resume_time = self._choose_start_point()
+        if not proceed:
+            return
+        env = restart_env(self.file_handler.get_case_path(), resume_time)
+
         solver = self.file_handler.get_solver()
         #Acá está la logica de si usar OpenFOAM o SedFOAM segun el template!!!!!!!!!!!!!:
         if solver == 'interFoam':
-            self._run_docker_script_in_thread("run_openfoam.sh")
+            self._run_docker_script_in_thread("run_openfoam.sh", env=env)
         elif solver == 'sedFoam':
-            self._run_docker_script_in_thread("run_sedfoam.sh")
+            self._run_docker_script_in_thread("run_sedfoam.sh", env=env)
+
+    def _confirm_redecompose(self, env: dict) -> bool:
+        """
+        Si hay tiempos que solo existen en los processor*, pregunta si
+        reconstruirlos antes de volver a descomponer o descartarlos, y agrega
+        al entorno de la corrida la opción elegida.
+
+        Returns:
+            bool: False si el usuario canceló la corrida.
+        """
+        case_path = self.file_handler.get_case_path()
+        pending = pending_reconstruction(case_path)
+        if not pending:
+            return True
+
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Warning)
+        box.setWindowTitle("Tiempos sin Reconstruir")
+        box.setText(f"La corrida vuelve a descomponer el caso y los tiempos {', '.join(pending)} "
+                    "solo existen en los directorios processor*.\n"
+                    "¿Desea reconstruirlos antes de continuar o descartarlos?")
+        reconstruct_button = box.addButton("Reconstruir y continuar", QMessageBox.AcceptRole)
+        discard_button = box.addButton("Descartarlos", QMessageBox.DestructiveRole)
+        box.addButton(QMessageBox.Cancel)
+        box.setDefaultButton(reconstruct_button)
+        box.exec()
+
+        if box.clickedButton() == reconstruct_button:
+            env["PRE_RECONSTRUCT_PROCS"] = str(decomposed_processor_count(case_path))
+            return True
+        if box.clickedButton() == discard_button:
+            env["FORCE_REDECOMPOSE"] = "1"
+            return True
+        return False
 
-    def _run_docker_script_in_thread(self, script_name: str, num_processors: int = 1):
+    def _choose_start_point(self, decomposed: bool = False) -> tuple:
+        """
+        Si hay resultados de una corrida anterior, muestra desde qué tiempo se
+        puede retomar y pregunta si continuar desde ahí o empezar de nuevo.
+
+        Returns:
+            tuple: (continuar con la ejecución, tiempo desde el cual retomar o None).
+        """
+        control_dict = self.file_handler.files.get('controlDict')
+        start_time = float(control_dict.startTime) if control_dict is not None else 0.0
+        resume_time = latest_complete_time(self.file_handler.get_case_path(), start_time, decomposed)
+        if resume_time is None:
+            return True, None
+
+        box = QMessageBox(self)
+        box.setWindowTitle("Retomar Simulación")
+        box.setText(f"Se encontraron resultados completos hasta t = {resume_time}.\n"
+                    "¿Desea continuar la corrida desde ese tiempo o comenzar desde el inicio?")
+        resume_button = box.addButton(f"Continuar desde t = {resume_time}", QMessageBox.AcceptRole)
+        restart_button = box.addButton("Comenzar desde el inicio", QMessageBox.DestructiveRole)
+        box.addButton(QMessageBox.Cancel)
+        box.exec()
+
+        if box.clickedButton() == resume_button:
+            return True, resume_time
+        if box.clickedButton() == restart_button:
+            return True, None
+        return False, None
+
+    def _run_docker_script_in_thread(self, script_name: str, num_processors: int = 1, env: dict = None):
         """
-        Runs a Docker script in a separate thread to avoid freezing the GUI.
+        Runs a Docker script on the asyncio bridge loop to avoid freezing the GUI.
         """
         self.ui.logPlainTextEdit.clear()
         self._set_ui_interactive(False)
         self.is_running_task = True
-        
-        self.thread = QThread()
-        # self.worker = DockerWorker(self.docker_handler, script_name)
-        self.worker = DockerWorker(self.docker_handler, script_name, num_processors)
-        self.worker.moveToThread(self.thread)
 
-        self.thread.started.connect(self.worker.run)
+        self.run_progress = self._create_run_progress(script_name, env)
+        self.run_num_processors = num_processors
+        
+        self.worker = AsyncScriptRunner(self.async_bridge, self.docker_handler, script_name,
+                                        num_processors, self.run_progress, env)
         self.worker.log_received.connect(self._append_log)
+        self.worker.progress_updated.connect(self._show_run_progress)
         self.worker.finished.connect(self._on_docker_script_finished)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-
-        self.thread.start()
+        self.worker.start()
 
     @Slot(str)
     def _append_log(self, log_line: str):
         """Appends a line of text to the log viewer."""
         self.ui.logPlainTextEdit.appendPlainText(log_line)
 
+    def _create_run_progress(self, script_name: str, env: dict = None):
+        """
+        Crea el modelo de progreso para los scripts de solver, usando el
+        startTime (o el tiempo desde el que se retoma) y endTime del
+        controlDict. Devuelve None para el resto.
+        """
+        if script_name not in SOLVER_SCRIPTS or not self.file_handler:
+            return None
+        control_dict = self.file_handler.files.get('controlDict')
+        if control_dict is None:
+            return None
+        start_time = float((env or {}).get("RESUME_TIME", control_dict.startTime))
+        return RunProgress(end_time=control_dict.endTime, start_time=start_time)
+
+    @Slot(str)
+    def _show_run_progress(self, status_text: str):
+        """Muestra el progreso de la corrida en la barra de estado."""
+        self.ui.statusbar.showMessage(status_text)
+
+    def _save_run_metadata(self, success: bool, script_name: str):
+        """Guarda las estadísticas de la corrida en el run_metadata.json del caso."""
+        if not self.run_progress or not self.file_handler:
+            return
+        if self.docker_handler and self.docker_handler.was_stopped_by_user:
+            status = "stopped"
+        else:
+            status = "success" if success else "failed"
+
+        decompose = self.file_handler.files.get('decomposeParDict')
+        extra = {}
+        if decompose is not None and self.run_num_processors > 1:
+            extra['decomposition_method'] = decompose.method[0]
+        record = build_run_record(self.run_progress, script_name, self.run_num_processors, status, extra)
+        append_run_metadata(self.file_handler.get_case_path(), record)
+
+        summary = f"Corrida finalizada ({status}): {self.run_progress.format_status()}"
+        self.ui.statusbar.showMessage(summary)
+        self.run_progress = None
+
     def _on_docker_script_finished(self, success: bool, script_name: str):
         """Handles the completion of a Docker script execution."""
         self.is_running_task = False
         self._set_ui_interactive(True) # Restore UI interaction
+        self._save_run_metadata(success, script_name)
+        conversion = self.pending_vtk_conversion if script_name == "run_foamToVTK.sh" else None
+        self.pending_vtk_conversion = None
 
         if self.docker_handler and self.docker_handler.was_stopped_by_user:
             QMessageBox.information(self, "Simulación Detenida", f"La ejecución del script '{script_name}' fue detenida por el usuario.")
             self.docker_handler.was_stopped_by_user = False # Reset flag
         elif success:
             QMessageBox.information(self, "Ejecución de Docker", f"El script '{script_name}' se ejecutó correctamente.")
-            if script_name in ["run_transform_UNV.sh", "run_transform_blockMeshDict.sh", "run_extrudeMesh.sh", "run_blockMeshDict.sh", "run_foamToVTK.sh"]:
+            if conversion:
+                record_conversion(self.file_handler.get_case_path(), conversion)
+                if not conversion['geometry_only']:
+                    # Solo se convirtieron resultados: la geometría y los parámetros no cambian
+                    return
+            if script_name in ["run_transform_UNV.sh", "run_transform_blockMeshDict.sh", "run_extrudeMesh.sh", "run_blockMeshDict.sh", "run_foamToVTK.sh",
+                               "run_snappyHexMeshDict.sh", "run_snappyHexMeshDict_parallel.sh"]:
                 patch_names = self._get_patch_names()
                 if patch_names:
-                    self.file_handler.initialize_parameters_from_schema(patch_names)
+                    self.file_handler.initialize_parameters_from_schema(patch_names, self._get_patch_groups())
                 self.file_handler.create_case_files()
                 QTimer.singleShot(100, self._check_mesh_and_visualize)
             # No special action needed for "run_openfoam.sh" on success, message is sufficient
@@ -665,6 +1056,8 @@ class MainWindowController(QMainWindow):
         self.ui.actionSnappyHexMesh.setEnabled(enabled)
         self.ui.actionSnappyHexMesh_en_Paralelo.setEnabled(enabled)
         self.ui.actionActualizar_Malla.setEnabled(enabled)
+        self.ui.actionConvertir_Resultados_VTK.setEnabled(enabled)
+        self.ui.actionEstudio_Escalabilidad.setEnabled(enabled)
         
         # The "Stop" action is the opposite: enabled only when a task is running
         self.ui.actionDetener_Simulacion.setEnabled(not enabled)
@@ -677,8 +1070,9 @@ class MainWindowController(QMainWindow):
         """
         Stops the currently running Docker simulation.
         """
-        if self.is_running_task and self.docker_handler:
-            self.docker_handler.stop_simulation()
+        if self.is_running_task and self.docker_handler and self.worker:
+            # 'docker stop' puede tardar varios segundos: se ejecuta en el loop del puente
+            self.worker.stop()
             self._append_log(">>> Solicitud para detener la simulación enviada...")
         else:
             QMessageBox.warning(self, "Detener Simulación", "No hay ninguna simulación en ejecución para detener.")
@@ -713,7 +1107,8 @@ class MainWindowController(QMainWindow):
         if not self.file_handler:
             return []
 
-        boundary_path = self.file_handler.get_case_path() / "constant" / "polyMesh" / "boundary"
+        # Tras mallar en paralelo la malla puede existir solo en processor*
+        boundary_path = mesh_boundary_file(self.file_handler.get_case_path())
         if not boundary_path.is_file():
             return []
         try:
@@ -730,23 +1125,44 @@ class MainWindowController(QMainWindow):
 
             # Find all words that are at the beginning of a line and are followed by a '{' on the next line.
             patch_names = re.findall(r'^\s*([a-zA-Z0-9_.-]+)\s*\n\s*\{', content, re.MULTILINE)
-            return patch_names
+            # Los patches entre procesadores no son condiciones de borde del caso
+            return [name for name in patch_names if not name.startswith("procBoundary")]
         except Exception as e:
             print(f"Error parsing boundary file: {e}")
             return []
 
 
+    def _get_patch_groups(self) -> dict:
+        """Obtiene los grupos de patches ('inGroups') del directorio boundary."""
+        if not self.file_handler:
+            return {}
+        return read_patch_groups(mesh_boundary_file(self.file_handler.get_case_path()))
+
     def show_geometry_visualizer(self, geom_file_path: Path):
-        while self.vtk_layout.count():
-            item = self.vtk_layout.takeAt(0)
-            if widget := item.widget():
-                widget.deleteLater()
-        
-        self.visualizer = GeometryView(geom_file_path)
+        """
+        Crea o actualiza el visualizador de geometría. Si ya existe, se recarga
+        la malla en el mismo visor (sin crear otro contexto de OpenGL): solo se
+        leen los patches que cambiaron y se conservan la cámara y la selección.
+        """
+        if self.visualizer:
+            self.visualizer.load_and_plot_mesh(geom_file_path)
+            return
+
+        # load_execution_config completa las claves que falten con DEFAULT_EXECUTION_CONFIG
+        viewer_config = load_execution_config()["viewer"]
+        self.visualizer = GeometryView(geom_file_path,
+                                       hover_pick_hz=viewer_config["hover_pick_hz"],
+                                       hover_on_idle=viewer_config["hover_on_idle"],
+                                       hardware_picking=viewer_config["hardware_picking"],
+                                       frame_time_overlay=viewer_config["frame_time_overlay"],
+                                       lod_triangle_budget=viewer_config["lod_triangle_budget"],
+                                       lod_threshold=viewer_config["lod_threshold"],
+                                       playback_fps=viewer_config["playback_fps"],
+                                       frame_cache_mb=viewer_config["frame_cache_mb"],
+                                       prefetch_frames=viewer_config["prefetch_frames"])
         self.visualizer.patch_selection_changed.connect(self.on_patch_selection_changed)
         self.visualizer.deselect_all_patches_requested.connect(self.on_deselect_all_patches_requested)
         self.vtk_layout.addWidget(self.visualizer)
-        """Crea o actualiza el visualizador de geometría."""
 
     def on_patch_selection_changed(self, patch_name: str, is_selected: bool):
         if self.parameter_editor_manager:
@@ -804,6 +1220,15 @@ class MainWindowController(QMainWindow):
             event.ignore()
         else:
             # Si el usuario eligió guardar o descartar, permite que la ventana se cierre.
+            if self.is_running_task and self.worker:
+                # Se espera a que el contenedor se detenga para no dejarlo huérfano al salir
+                try:
+                    self.worker.stop().result(timeout=15)
+                except Exception as e:
+                    print(f"No se pudo detener el contenedor al salir: {e}")
+            if self.visualizer:
+                self.visualizer.cancel_loading()
+            self.async_bridge.shutdown()
             event.accept()
 
          
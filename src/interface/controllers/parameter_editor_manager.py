@@ -1,3 +1,5 @@
+import copy
+from collections import OrderedDict
 from pathlib import Path
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QMessageBox, QScrollArea, QApplication)
@@ -7,38 +9,57 @@ from ..widgets.widget_factory import WidgetFactory
 from ..widgets.parameter_widgets.patches_widget import PatchesWidget
 from ..widgets.parameter_container_widget import ParameterContainerWidget
 
+# Paneles de edición que se conservan armados (uno por archivo)
+MAX_CACHED_PANELS = 8
+
+
+def _current_values(parameters_schema: dict) -> dict:
+    """Valores actuales del modelo, para saber si un panel guardado sigue al día."""
+    return {name: copy.deepcopy(props.get('current')) for name, props in parameters_schema.items()}
+
+
 class ParameterEditorManager:
     """
     Gestiona la creación y actualización de la interfaz de usuario para la edición de parámetros.
     Delega la mayor parte de la lógica a un ParameterContainerWidget.
+    Los paneles armados se guardan en una caché LRU por archivo: volver a un
+    archivo muestra su panel sin reconstruirlo, mientras el modelo y los
+    patches de la malla sigan siendo los mismos con los que se armó.
     """
-    def __init__(self, scroll_area: QScrollArea, file_handler, get_vtk_patch_names_func):
+    def __init__(self, scroll_area: QScrollArea, file_handler, get_vtk_patch_names_func, get_patch_groups_func=None):
         """
         Inicializa el gestor del editor de parámetros.
         """
         self.scroll_area = scroll_area
         self.file_handler = file_handler
+        self.get_vtk_patch_names = get_vtk_patch_names_func
+        self.get_patch_groups = get_patch_groups_func
 
         self.current_file_path = None
         self.main_container = None
         self.patches_widget_instance = None
 
+        # archivo -> {'container', 'patches_widget', 'values'}
+        self.panels = OrderedDict()
+        self.panel_mesh_patches = None
+
         self._setup_highlight_colors()
         self.widget_factory = WidgetFactory(
             get_vtk_patch_names_func=get_vtk_patch_names_func,
-            highlight_colors=self.highlight_colors
+            highlight_colors=self.highlight_colors,
+            get_patch_groups_func=get_patch_groups_func
         )
 
     def open_parameters_view(self, file_path: Path):
         """
-        Crea y muestra la vista del editor de parámetros para un archivo específico.
+        Muestra la vista del editor de parámetros para un archivo específico.
+        Reutiliza el panel guardado del archivo si sigue al día con el modelo;
+        si no, lo crea.
         """
         if self.current_file_path and not self.save_parameters():
             return
 
         self.current_file_path = file_path
-        self.main_container = None
-        self.patches_widget_instance = None
 
         if self.scroll_area.parentWidget() and self.scroll_area.parentWidget().parentWidget():
             dock_widget = self.scroll_area.parentWidget().parentWidget()
@@ -46,32 +67,76 @@ class ParameterEditorManager:
 
         # Obtener todos los parámetros del archivo
         all_params_schema = self.file_handler.get_editable_parameters(file_path)
-        
+        values = _current_values(all_params_schema)
+
+        # Los paneles con condiciones de borde dependen de los patches (y grupos) de la malla
+        mesh_patches = (list(self.get_vtk_patch_names()) if self.get_vtk_patch_names else [],
+                        self.get_patch_groups() if self.get_patch_groups else {})
+        if mesh_patches != self.panel_mesh_patches:
+            self.clear_cache()
+            self.panel_mesh_patches = mesh_patches
+
+        panel = self.panels.get(file_path)
+        if panel is not None and panel['values'] != values:
+            # El modelo cambió por fuera del editor: el panel se vuelve a armar
+            self._evict(file_path)
+            panel = None
+        if panel is None:
+            panel = self._build_panel(all_params_schema, values)
+            self.panels[file_path] = panel
+            while len(self.panels) > MAX_CACHED_PANELS:
+                self._evict(next(iter(self.panels)))
+        self.panels.move_to_end(file_path)
+
+        self.main_container = panel['container']
+        self.patches_widget_instance = panel['patches_widget']
+        if self.patches_widget_instance:
+            self.patches_widget_instance.deselect_all_highlights()
+
+        # Sacar el panel anterior del scroll area sin destruirlo (queda en la caché)
+        if self.scroll_area.widget() is not self.main_container:
+            self.scroll_area.takeWidget()
+            self.scroll_area.setWidget(self.main_container)
+        self.scroll_area.setMinimumWidth(self.main_container.sizeHint().width() + 40)
+
+    def _build_panel(self, all_params_schema: dict, values: dict) -> dict:
         # Crear el contenedor principal que manejará todos los parámetros
-        self.main_container = ParameterContainerWidget(all_params_schema, self.widget_factory)
+        container = ParameterContainerWidget(all_params_schema, self.widget_factory)
 
         # Buscar si se creó un PatchesWidget para delegar el resaltado
-        widgets_map = self.main_container.get_all_widgets()
-        for widget, props in widgets_map.values():
+        patches_widget = None
+        for widget, props in container.get_all_widgets().values():
             if isinstance(widget, PatchesWidget):
-                self.patches_widget_instance = widget
+                patches_widget = widget
                 break
 
-        # Limpiar el widget anterior del scroll area y establecer el nuevo
-        if self.scroll_area.widget():
-            self.scroll_area.widget().deleteLater()
-        
-        self.scroll_area.setWidget(self.main_container)
-        self.scroll_area.setMinimumWidth(self.main_container.sizeHint().width() + 40)
+        return {'container': container, 'patches_widget': patches_widget, 'values': values}
+
+    def _evict(self, file_path: Path):
+        panel = self.panels.pop(file_path, None)
+        if panel is None:
+            return
+        if self.scroll_area.widget() is panel['container']:
+            self.scroll_area.takeWidget()
+        panel['container'].deleteLater()
+
+    def clear_cache(self):
+        """
+        Descarta los paneles guardados (por ejemplo, si cambiaron los patches
+        de la malla). El panel que se está mostrando también se descarta.
+        """
+        for file_path in list(self.panels):
+            self._evict(file_path)
 
     def close(self):
         """
         Cierra el editor de parámetros actual, limpiando la UI y el estado.
         """
-        # Limpiar el widget del scroll area
+        # Limpiar el widget del scroll area y los paneles guardados
+        self.clear_cache()
         if self.scroll_area.widget():
-            self.scroll_area.widget().deleteLater()
-            self.scroll_area.setWidget(None) # Asegurarse de que no haya widget colgando
+            self.scroll_area.takeWidget().deleteLater()
+        self.panel_mesh_patches = None
 
         # Resetear el título del dock
         if self.scroll_area.parentWidget() and self.scroll_area.parentWidget().parentWidget():
@@ -106,7 +171,12 @@ class ParameterEditorManager:
 
             if new_params:
                 self.file_handler.modify_parameters(self.current_file_path, new_params)
-            
+
+            # El panel guardado queda al día con el modelo
+            panel = self.panels.get(self.current_file_path)
+            if panel is not None:
+                panel['values'] = _current_values(self.file_handler.get_editable_parameters(self.current_file_path))
+
             return True
 
         except ValueError as e:
@@ -1,18 +1,472 @@
 import sys
 import os
 import random
-from PySide6.QtCore import Signal
+import bisect
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from PySide6.QtCore import Signal, QObject, QTimer, Qt
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QVBoxLayout, QPushButton, QWidget, QLabel, QHBoxLayout, QScrollArea, QCheckBox
+    QApplication, QMainWindow, QVBoxLayout, QPushButton, QWidget, QLabel, QHBoxLayout, QScrollArea, QCheckBox,
+    QProgressBar, QComboBox, QSlider
 )
+import numpy as np
 import pyvista as pv
 from pyvistaqt import QtInteractor
-from vtkmodules.vtkRenderingCore import vtkPropPicker
+from vtkmodules.vtkCommonCore import vtkLookupTable, reference
+from vtkmodules.vtkCommonDataModel import vtkStaticCellLocator
+from vtkmodules.vtkFiltersCore import vtkAppendPolyData
+from vtkmodules.vtkRenderingCore import vtkCellPicker
+try:
+    # Picking por z-buffer (VTK >= 9.2)
+    from vtkmodules.vtkRenderingCore import vtkHardwarePicker
+except ImportError:
+    vtkHardwarePicker = None
+
+from src.file_handler.foam_reader import (has_poly_mesh, boundary_patch_names, read_boundary_patches,
+                                         mesh_modified_time, mesh_source_files)
+from src.file_handler.vtk_cache import read_vtk_file, fingerprint
+from src.file_handler.field_frames import (FieldFrameReader, FrameCache, case_times, case_fields, frame_key,
+                                           frame_range, SLICE_AXES, DEFAULT_FRAME_CACHE_MB)
+from src.file_handler.frame_renderer import add_results_mesh, set_camera, DEFAULT_CAMERA
+from src.file_handler.field_probes import ProbeSampler
+from src.interface.widgets.helpers import ProbePlotDialog
+
+# Hilos para leer los patches: la lectura y el parseo de VTK corren en C++ sin el GIL
+MAX_LOADER_THREADS = min(8, os.cpu_count() or 1)
+
+# Intervalo mínimo entre renders mientras se agregan patches (ms)
+PROGRESSIVE_RENDER_INTERVAL_MS = 100
+
+# Arreglo de celdas de la malla unificada con el índice del patch de cada celda
+PATCH_ID_ARRAY = "patch_id"
+
+SELECTED_COLOR = (1, 1, 0)   # Amarillo para los patches seleccionados
+HOVER_COLOR = (1, 0.5, 0)    # Naranja para hover
+
+# Frecuencia máxima del picking por hover (picks por segundo)
+HOVER_PICK_HZ = 30
+
+# Cuadros promediados en el contador de tiempo por cuadro
+FRAME_TIME_WINDOW = 60
+
+# Nivel de detalle: mientras se mueve la cámara se dibuja una versión diezmada
+# de la malla con a lo sumo LOD_TRIANGLE_BUDGET triángulos, si la malla
+# completa supera LOD_THRESHOLD triángulos.
+LOD_TRIANGLE_BUDGET = 300_000
+LOD_THRESHOLD = 1_000_000
+
+# Patches con menos triángulos que esto no se diezman (perderían la forma)
+LOD_MIN_PATCH_TRIANGLES = 200
+
+# Reproducción de resultados: cuadros por segundo y cuadros que se leen por
+# adelantado (también es la cantidad de hilos de lectura, hasta MAX_LOADER_THREADS)
+PLAYBACK_FPS = 10
+PREFETCH_FRAMES = 4
+
+# Herramientas del clic izquierdo en modo resultados: sonda en un punto o línea
+# entre dos puntos (los valores se muestran a lo largo del tiempo)
+TOOL_SELECT = "select"
+TOOL_PROBE = "probe"
+TOOL_LINE = "line"
+
+# Radio del marcador de la sonda, relativo al tamaño de la malla
+PROBE_MARKER_SCALE = 0.005
+
+# Carpeta con las versiones diezmadas: junto a los archivos VTK de los patches
+# o, si se lee la malla de OpenFOAM, en la raíz del caso
+LOD_CACHE_DIR = ".lod"
+
+
+def prepare_patch(mesh, patch_id):
+    """
+    Superficie del patch lista para la malla unificada: sin los arreglos de
+    OpenFOAM y con el índice del patch en cada celda.
+    """
+    surface = mesh if isinstance(mesh, pv.PolyData) else mesh.extract_surface()
+    surface = surface.copy(deep=False)
+    surface.clear_data()
+    surface.cell_data[PATCH_ID_ARRAY] = np.full(surface.n_cells, patch_id, dtype=np.int32)
+    return surface
+
+
+def triangle_count(surface):
+    """Triángulos de la superficie una vez triangulada (un polígono de k vértices da k-2)."""
+    polys = surface.GetPolys()
+    return polys.GetNumberOfConnectivityIds() - 2 * polys.GetNumberOfCells()
+
+
+def lod_reduction(total_triangles, budget):
+    """Fracción de triángulos a eliminar para entrar en el presupuesto (0 si ya entra)."""
+    if budget <= 0 or total_triangles <= budget:
+        return 0.0
+    return round(1.0 - budget / total_triangles, 3)
+
+
+def proxy_cache_path(cache_dir, patch_name, reduction):
+    """Archivo de la caché de nivel de detalle para un patch y una reducción."""
+    return os.path.join(cache_dir, f"{patch_name}.r{int(reduction * 1000)}.vtp")
+
+
+def build_proxy(surface, reduction, patch_id):
+    """Versión diezmada del patch, con el índice del patch en cada celda."""
+    triangles = surface.triangulate()
+    if reduction > 0 and triangles.n_cells >= LOD_MIN_PATCH_TRIANGLES:
+        triangles = triangles.decimate(reduction)
+    return prepare_patch(triangles, patch_id)
+
+
+def load_cached_proxy(cache_path, source_mtime, patch_id):
+    """Versión diezmada guardada, o None si no existe o es más vieja que el origen del patch."""
+    if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < source_mtime:
+        return None
+    try:
+        return prepare_patch(pv.read(cache_path), patch_id)
+    except Exception:
+        return None  # Caché dañada: se vuelve a generar
+
+
+def build_and_cache_proxy(surface, reduction, patch_id, cache_path):
+    """Genera la versión diezmada del patch y la guarda en la caché."""
+    proxy = build_proxy(surface, reduction, patch_id)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        proxy.save(cache_path)
+    except OSError as e:
+        print(f"No se pudo guardar la caché de nivel de detalle {cache_path}: {e}")
+    return proxy
+
+
+def load_or_build_proxy(filepath, reduction, patch_id):
+    """
+    Lee la versión diezmada desde la caché o la genera y la guarda. La caché es
+    válida si es más nueva que el archivo del patch.
+    """
+    folder, file = os.path.split(filepath)
+    patch_name, _ = os.path.splitext(file)
+    cache_path = proxy_cache_path(os.path.join(folder, LOD_CACHE_DIR), patch_name, reduction)
+    proxy = load_cached_proxy(cache_path, os.path.getmtime(filepath), patch_id)
+    if proxy is None:
+        proxy = build_and_cache_proxy(read_vtk_file(filepath), reduction, patch_id, cache_path)
+    return proxy
+
+
+def merge_patches(surfaces):
+    """Une las superficies de los patches en un único PolyData."""
+    append = vtkAppendPolyData()
+    for surface in surfaces:
+        append.AddInputData(surface)
+    append.Update()
+    return pv.wrap(append.GetOutput())
+
+
+def display_ray(renderer, x, y):
+    """Extremos (planos cercano y lejano) del rayo de la cámara que pasa por el punto de pantalla."""
+    points = []
+    for z in (0.0, 1.0):
+        renderer.SetDisplayPoint(x, y, z)
+        renderer.DisplayToWorld()
+        wx, wy, wz, w = renderer.GetWorldPoint()
+        points.append((wx / w, wy / w, wz / w))
+    return points
+
+
+def file_signature(filepath):
+    """Tamaño y fecha de modificación del archivo de un patch (para saber si cambió)."""
+    stat = os.stat(filepath)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def same_surface(a, b):
+    """Indica si dos superficies tienen los mismos puntos y las mismas caras."""
+    return (a.n_points == b.n_points and a.n_cells == b.n_cells and
+            np.array_equal(a.points, b.points) and np.array_equal(a.faces, b.faces))
+
+
+def find_patch_files(base_folder):
+    """Archivos .vtk/.vtp de la carpeta, ordenados por nombre de patch."""
+    patch_files = []
+    for root, dirs, files in os.walk(base_folder):
+        # Las carpetas ocultas (p. ej. la caché de nivel de detalle) no tienen patches
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for file in files:
+            if file.endswith((".vtk", ".vtp")):
+                patch_name, _ = os.path.splitext(file) # <-----  DEFINE CUAL ES EL PATCH NAME
+                patch_files.append((patch_name, os.path.join(root, file)))
+    return sorted(patch_files)
+
+
+class PatchLoader(QObject):
+    """
+    Lee los patches en un pool de hilos y entrega cada malla a la GUI con una
+    señal apenas termina de leerse. Las señales emitidas desde los hilos del
+    pool se encolan hacia el hilo de la GUI.
+    """
+    patch_loaded = Signal(str, object)  # (nombre del patch, pv.PolyData preparado con 'prepare_patch')
+    patch_failed = Signal(str, str)     # (ruta, error)
+    finished = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=MAX_LOADER_THREADS, thread_name_prefix="patch-loader")
+        self._cancelled = threading.Event()
+        self._futures = []
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def start(self, patch_files, patch_ids):
+        """Lee los archivos (nombre, ruta); 'patch_ids' da el índice de cada patch en la malla unificada."""
+        self._pending = len(patch_files)
+        if not patch_files:
+            self.finished.emit()
+            return
+        self._futures = [self._executor.submit(self._read, name, path, patch_ids[name])
+                         for name, path in patch_files]
+
+    def start_case(self, case_path, patch_names):
+        """Lee todos los patches de la malla de OpenFOAM en una sola lectura."""
+        self._pending = 1
+        self._futures = [self._executor.submit(self._read_case, case_path, patch_names)]
+
+    def _read(self, patch_name, filepath, patch_id):
+        try:
+            if self._cancelled.is_set():
+                return
+            try:
+                mesh = prepare_patch(read_vtk_file(filepath), patch_id)
+            except Exception as e:
+                self.patch_failed.emit(filepath, str(e))
+                return
+            if not self._cancelled.is_set():
+                self.patch_loaded.emit(patch_name, mesh)
+        finally:
+            self._task_done()
+
+    def _read_case(self, case_path, patch_names):
+        try:
+            if self._cancelled.is_set():
+                return
+            try:
+                surfaces = read_boundary_patches(Path(case_path), patch_names)
+            except Exception as e:
+                self.patch_failed.emit(str(case_path), str(e))
+                return
+            for patch_id, patch_name in enumerate(patch_names):
+                if self._cancelled.is_set():
+                    return
+                # Los patches sin caras (p. ej. un patch vacío) no se dibujan
+                if patch_name in surfaces:
+                    self.patch_loaded.emit(patch_name, prepare_patch(surfaces[patch_name], patch_id))
+        finally:
+            self._task_done()
+
+    def _task_done(self):
+        with self._lock:
+            self._pending -= 1
+            done = self._pending == 0
+        if done and not self._cancelled.is_set():
+            self.finished.emit()
+
+    def cancel(self):
+        """Descarta las lecturas pendientes; las que están en curso terminan sin entregar su malla."""
+        self._cancelled.set()
+        for future in self._futures:
+            future.cancel()
+        self.close()
+
+    def close(self):
+        """Libera los hilos del pool sin esperar a los que siguen leyendo."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+
+class ProxyBuilder(QObject):
+    """
+    Genera (o lee de la caché) las versiones diezmadas de los patches en un pool
+    de hilos y entrega la malla unificada de baja resolución.
+    """
+    proxy_ready = Signal(object)  # pv.PolyData con PATCH_ID_ARRAY
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=MAX_LOADER_THREADS, thread_name_prefix="lod-builder")
+        self._cancelled = threading.Event()
+
+    def start(self, patch_files, reduction):
+        futures = [self._executor.submit(load_or_build_proxy, path, reduction, patch_id)
+                   for patch_id, (name, path) in enumerate(patch_files)]
+        # La unión también corre fuera del hilo de la GUI
+        threading.Thread(target=self._merge, args=(futures,), name="lod-merge", daemon=True).start()
+
+    def start_case(self, case_path, patch_names, reduction):
+        """Como 'start', pero los patches que no están en la caché se leen de la malla de OpenFOAM."""
+        threading.Thread(target=self._build_case, args=(Path(case_path), patch_names, reduction),
+                         name="lod-merge", daemon=True).start()
+
+    def _build_case(self, case_path, patch_names, reduction):
+        try:
+            self._build_case_proxies(case_path, patch_names, reduction)
+        except RuntimeError:
+            # El pool se cerró porque se canceló la carga
+            if not self._cancelled.is_set():
+                raise
+
+    def _build_case_proxies(self, case_path, patch_names, reduction):
+        cache_dir = str(case_path / LOD_CACHE_DIR)
+        source_mtime = mesh_modified_time(case_path)
+        cached = [self._executor.submit(load_cached_proxy, proxy_cache_path(cache_dir, name, reduction),
+                                        source_mtime, patch_id)
+                  for patch_id, name in enumerate(patch_names)]
+        proxies, missing = [], []
+        for patch_id, (name, future) in enumerate(zip(patch_names, cached)):
+            try:
+                proxy = future.result()
+            except Exception:
+                proxy = None
+            if proxy is None:
+                missing.append((patch_id, name))
+            elif proxy.n_cells:
+                proxies.append(proxy)
+        if self._cancelled.is_set():
+            return
+
+        futures = []
+        if missing:
+            # Una sola lectura de la malla para todos los patches que faltan
+            try:
+                surfaces = read_boundary_patches(case_path, [name for _, name in missing])
+            except Exception as e:
+                print(f"Error generando el nivel de detalle: {e}")
+                surfaces = {}
+            futures = [self._executor.submit(build_and_cache_proxy, surfaces[name], reduction, patch_id,
+                                             proxy_cache_path(cache_dir, name, reduction))
+                       for patch_id, name in missing if name in surfaces]
+        self._merge(futures, proxies)
+
+    def _merge(self, futures, proxies=None):
+        proxies = list(proxies or [])
+        for future in futures:
+            try:
+                proxy = future.result()
+            except Exception as e:
+                if self._cancelled.is_set():
+                    return
+                print(f"Error generando el nivel de detalle: {e}")
+                continue
+            if self._cancelled.is_set():
+                return
+            if proxy.n_cells:
+                proxies.append(proxy)
+        self._executor.shutdown(wait=False)
+        if proxies and not self._cancelled.is_set():
+            self.proxy_ready.emit(merge_patches(proxies))
+
+    def cancel(self):
+        self._cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FramePrefetcher(QObject):
+    """
+    Lee cuadros de resultados en un pool de hilos y los guarda en la caché LRU.
+    Cada hilo tiene su propio lector, que conserva la malla entre tiempos.
+    """
+    frame_ready = Signal(object, object)  # (clave del cuadro, pv.PolyData con FIELD_ARRAY)
+    frame_failed = Signal(object, str)    # (clave del cuadro, error)
+
+    def __init__(self, case_path, cache, workers, parent=None):
+        super().__init__(parent)
+        self.case_path = Path(case_path)
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="frame-loader")
+        self._local = threading.local()
+        self._pending = {}  # clave -> future
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def request(self, keys):
+        """
+        Pide los cuadros en orden de prioridad. Los pedidos anteriores que todavía
+        no empezaron y ya no están en 'keys' se descartan (p. ej. al saltar con la barra).
+        """
+        with self._lock:
+            for key, future in list(self._pending.items()):
+                if key not in keys and future.cancel():
+                    del self._pending[key]
+            for key in keys:
+                if key not in self._pending and key not in self.cache:
+                    self._pending[key] = self._executor.submit(self._load, key)
+
+    def _load(self, key):
+        try:
+            if self._cancelled.is_set():
+                return
+            reader = getattr(self._local, "reader", None)
+            if reader is None:
+                reader = self._local.reader = FieldFrameReader(self.case_path)
+            frame = reader.read_frame(*key)
+            self.cache.put(key, frame)
+        except Exception as e:
+            if not self._cancelled.is_set():
+                self.frame_failed.emit(key, str(e))
+            return
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+        if not self._cancelled.is_set():
+            self.frame_ready.emit(key, frame)
+
+    def cancel(self):
+        self._cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ProbeWorker(QObject):
+    """Muestrea un campo en un punto o una línea en todos los tiempos, en un hilo aparte."""
+    finished = Signal(object)  # muestras de ProbeSampler
+    failed = Signal(str)
+
+    def start(self, case_path, field, points):
+        """Un punto muestrea ese punto; dos puntos, la línea entre ellos."""
+        threading.Thread(target=self._run, args=(Path(case_path), field, points),
+                         name="probe", daemon=True).start()
+
+    def _run(self, case_path, field, points):
+        try:
+            sampler = ProbeSampler(case_path)
+            if len(points) == 1:
+                samples = sampler.sample(points, field)
+            else:
+                samples = sampler.sample_line(points[0], points[1], field)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(samples)
+
 
 class GeometryView(QWidget):
     patch_selection_changed = Signal(str, bool)
     deselect_all_patches_requested = Signal()
-    def __init__(self, filePath, parent=None):
+    def __init__(self, filePath, parent=None, hover_pick_hz=HOVER_PICK_HZ, hover_on_idle=False,
+                 hardware_picking=False, frame_time_overlay=False, lod_triangle_budget=LOD_TRIANGLE_BUDGET,
+                 lod_threshold=LOD_THRESHOLD, playback_fps=PLAYBACK_FPS, frame_cache_mb=DEFAULT_FRAME_CACHE_MB,
+                 prefetch_frames=PREFETCH_FRAMES):
+        """
+        Args:
+            hover_pick_hz: Picks por segundo como máximo al mover el mouse.
+            hover_on_idle: Hacer el pick de hover recién cuando el mouse se detiene.
+            hardware_picking: Usar el z-buffer para el hover en lugar del localizador de celdas.
+            frame_time_overlay: Mostrar el tiempo por cuadro (modo depuración).
+            lod_triangle_budget: Triángulos de la versión diezmada que se dibuja al mover la cámara (0 la desactiva).
+            lod_threshold: Triángulos de la malla completa a partir de los cuales se usa la versión diezmada.
+            playback_fps: Cuadros por segundo al reproducir los resultados.
+            frame_cache_mb: Memoria máxima de los cuadros de resultados guardados.
+            prefetch_frames: Cuadros que se leen por adelantado al mostrar un tiempo.
+        """
         super().__init__(parent)
         self.setGeometry(100, 100, 1280, 800)
 
@@ -44,22 +498,142 @@ class GeometryView(QWidget):
         self.info_label = QLabel("Selecciona un patch con el mouse")
         viewer_container.addWidget(self.info_label)
 
-        # Widget para mostrar la escena 3D
+        # Resultados: un campo sobre los patches (y un corte) a lo largo del tiempo
+        results_bar = QHBoxLayout()
+        self.results_checkbox = QCheckBox("Resultados")
+        self.results_checkbox.setEnabled(False)
+        self.results_checkbox.toggled.connect(self.set_results_mode)
+        self.field_combo = QComboBox()
+        self.field_combo.currentIndexChanged.connect(self._on_results_source_changed)
+        self.slice_combo = QComboBox()
+        self.slice_combo.addItem("Sin corte", None)
+        for axis in SLICE_AXES:
+            self.slice_combo.addItem(f"Corte {axis.upper()}", axis)
+        self.slice_combo.currentIndexChanged.connect(self._on_results_source_changed)
+        self.play_button = QPushButton("▶")
+        self.play_button.clicked.connect(self.toggle_playback)
+        self.time_slider = QSlider(Qt.Horizontal)
+        self.time_slider.valueChanged.connect(self.show_time)
+        self.time_label = QLabel()
+        self.tool_combo = QComboBox()
+        self.tool_combo.addItem("Seleccionar", TOOL_SELECT)
+        self.tool_combo.addItem("Sonda", TOOL_PROBE)
+        self.tool_combo.addItem("Línea", TOOL_LINE)
+        self.tool_combo.setToolTip("Clic izquierdo: sonda en un punto o línea entre dos puntos, a lo largo del tiempo")
+        self.tool_combo.currentIndexChanged.connect(lambda index: self._clear_probe())
+        for widget in (self.results_checkbox, self.field_combo, self.slice_combo, self.play_button):
+            results_bar.addWidget(widget)
+        results_bar.addWidget(self.time_slider, 1)
+        results_bar.addWidget(self.time_label)
+        results_bar.addWidget(self.tool_combo)
+        viewer_container.addLayout(results_bar)
+
+        # Progreso de la carga de patches (se oculta al terminar)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFormat("Cargando patches: %v/%m")
+        self.progress_bar.hide()
+        viewer_container.addWidget(self.progress_bar)
+
+        # Widget para mostrar la escena 3D. Se crea una sola vez: al recargar la
+        # malla o cambiar de caso se actualizan los datos de la misma escena.
         self.plotter = QtInteractor(self)
         viewer_container.addWidget(self.plotter.interactor)
+        self.plotter.add_axes()
+        self.plotter.set_background('white')
 
         # ---- Estructuras auxiliares ----
         self.original_colors = {}       # {patch_name: (r,g,b)}
         self.selected_patches = set()   # Parches seleccionados
-        self.actors = {}                # {patch_name: vtkActor}
+        self.hidden_patches = set()     # Parches ocultos desde el panel lateral
+        self.patch_ids = {}             # {patch_name: índice en la tabla de colores}
+        self.patch_names = []           # Índice del patch -> nombre
         self.checkboxes = {}            # {patch_name: QCheckBox}
         self.hovered_patch = None       # Último patch resaltado por hover
+        self.loader = None              # Lectura en curso de los patches
 
-        # Picker de VTK para clic y hover
-        self.picker = vtkPropPicker()
+        # Todos los patches van en una sola malla (un solo actor y una sola
+        # llamada de dibujo); cada celda guarda su patch en PATCH_ID_ARRAY y los
+        # colores, la selección y la visibilidad se resuelven en la tabla de colores.
+        self.patch_meshes = {}          # {patch_name: superficie con PATCH_ID_ARRAY}
+        self.mesh_dirty = False         # Hay patches que todavía no se unieron a la malla
+        self.merged_mesh = None
+        self.patch_actor = None
+        self.lookup_table = vtkLookupTable()
+
+        # Nivel de detalle: actor de baja resolución que reemplaza al completo
+        # mientras se interactúa con la cámara
+        self.lod_triangle_budget = lod_triangle_budget
+        self.lod_threshold = lod_threshold
+        self.patch_files = []
+        self.case_path = None           # Caso de OpenFOAM si los patches se leen de la malla
+
+        # Origen de la malla mostrada y firmas de lo leído: al recargar la misma
+        # carpeta solo se leen los patches cuyos archivos cambiaron
+        self.source_path = None
+        self.mesh_signature = None      # Firma de la malla del caso
+        self.patch_signatures = {}      # {patch_name: firma del archivo VTK}
+        self.pending_signatures = None  # Firmas de la lectura en curso (se guardan al terminar)
+        self.reset_camera_on_load = True
+        self.proxy_builder = None
+        self.proxy_actor = None
+
+        # Resultados: los cuadros (campo, tiempo y corte) se guardan en una caché
+        # LRU limitada por memoria y los siguientes se leen en segundo plano
+        self.results_mode = False
+        self.result_times = []
+        self.frame_index = 0
+        self.frame_cache = FrameCache(frame_cache_mb * 1024 * 1024)
+        self.frame_prefetcher = None
+        self.prefetch_frames = prefetch_frames
+        self.results_mesh = None
+        self.results_actor = None
+        self.field_range = None        # Rango de colores, se amplía con cada cuadro mostrado
+
+        # Sondas: puntos marcados con la herramienta actual y muestreo en curso
+        self.point_picker = vtkCellPicker()
+        self.point_picker.SetTolerance(0.0005)
+        self.probe_points = []
+        self.probe_worker = None
+        self.probe_dialogs = []
+        self.play_timer = QTimer(self)
+        self.play_timer.setInterval(max(1, int(1000 / max(playback_fps, 1))))
+        self.play_timer.timeout.connect(self._on_play_tick)
+        self._set_results_controls_enabled(False)
+
+        # Los renders durante la carga se agrupan para no redibujar por cada patch
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(PROGRESSIVE_RENDER_INTERVAL_MS)
+        self.render_timer.timeout.connect(self._flush_loaded_patches)
+
+        # Pick para clic y hover: la celda indica el patch en O(1). El rayo se
+        # interseca con un localizador de celdas de la malla sin los patches
+        # ocultos (que no tapan a los de atrás); se reconstruye recién en el
+        # primer pick después de que cambia la malla o la visibilidad.
+        self.pick_mesh = None
+        self.cell_locator = None
+        self.hover_picker = vtkHardwarePicker() if hardware_picking and vtkHardwarePicker else None
+
+        # El hover se procesa como máximo 'hover_pick_hz' veces por segundo (o
+        # cuando el mouse se detiene) y con la última posición del mouse.
+        self.hover_on_idle = hover_on_idle
+        self.hover_position = None
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.setInterval(max(1, int(1000 / max(hover_pick_hz, 1))))
+        self.hover_timer.timeout.connect(self._update_hover)
+
+        # Contador de tiempo por cuadro (depuración)
+        self.frame_times = deque(maxlen=FRAME_TIME_WINDOW)
+        self.frame_start = None
+        self.frame_count = 0
+        self.pick_count = 0
+        self.frame_text = None
+        if frame_time_overlay:
+            self._enable_frame_time_overlay()
 
         # ---- Cargar la malla ----
-        self.load_and_plot_mesh(filePath)      # <--------- CARPETA DONDE ESTAN LOS VTK    
+        self.load_and_plot_mesh(filePath)      # <--------- CASO O CARPETA DONDE ESTAN LOS VTK
 
         # Inicializamos el interactor
         self.plotter.interactor.Initialize()
@@ -68,65 +642,549 @@ class GeometryView(QWidget):
         self.enable_patch_selection()
         self.enable_hover_preview()
 
+        # Nivel de detalle: se alterna entre los actores al mover la cámara
+        self.plotter.iren.add_observer("StartInteractionEvent", lambda obj, event: self._use_proxy(True))
+        self.plotter.iren.add_observer("EndInteractionEvent", lambda obj, event: self._use_proxy(False))
+
     def load_and_plot_mesh(self, base_folder):
         """
-        Recorre la carpeta indicada, carga los archivos .vtk o .vtp correspondientes a los patches,
-        y los añade a la escena con colores aleatorios.
+        Lee en segundo plano los patches de un caso de OpenFOAM (directamente de
+        constant/polyMesh o de los processor*) o, si la carpeta no es un caso,
+        sus archivos .vtk o .vtp. Cada patch se añade a la malla unificada con
+        un color aleatorio apenas termina de leerse.
+
+        Si el visor ya muestra la misma carpeta, la malla se actualiza en el
+        lugar: solo se leen los patches que cambiaron (ninguno si la malla del
+        caso es la misma), se quitan los que ya no existen y se conservan la
+        cámara, la selección, la visibilidad y los colores.
         """
+        self.cancel_loading()
+        if self.results_mode:
+            # Los cuadros mostrados son de la malla anterior
+            self.results_checkbox.setChecked(False)
+
         if not os.path.isdir(base_folder):
             print(f"Carpeta no encontrada: {base_folder}")
             return
+        base_folder = Path(base_folder)
+        if base_folder != self.source_path:
+            # Otra carpeta: no se conserva nada de la anterior
+            self._set_patch_names([])
+            self.mesh_signature, self.patch_signatures = None, {}
+            self.source_path = base_folder
+        self.reset_camera_on_load = not self.patch_meshes
 
-        for root, dirs, files in os.walk(base_folder):
-            for file in files:
-                if file.endswith((".vtk", ".vtp")):
-                    filepath = os.path.join(root, file)
-                    patch_name, _ = os.path.splitext(file) # <-----  DEFINE CUAL ES EL PATCH NAME
-                    try:
-                        # Leer el mesh VTK con PyVista
-                        mesh = pv.read(filepath)
-                        # Genera color aleatorio
-                        color = (random.random(), random.random(), random.random())
-                        self.original_colors[patch_name] = color
-
-                        # Agregar al plotter
-                        actor = self.plotter.add_mesh(mesh, color=color, name=patch_name, pickable=True)
-                        # Guarda referencia
-                        self.actors[patch_name] = actor
-
-                        # Crear checkbox para mostrar/ocultar en el panel lateral
-                        checkbox = QCheckBox(patch_name)
-                        checkbox.setChecked(True)
-                        checkbox.stateChanged.connect(lambda state, name=patch_name: self.toggle_patch_visibility(name, state))
-                        self.sidebar_layout.addWidget(checkbox)
-                        self.checkboxes[patch_name] = checkbox
-
-                    except Exception as e:
-                        print(f"Error leyendo {filepath}: {e}")
+        self.patch_files, self.case_path = [], None
+        read_case, changed_files = False, []
+        if has_poly_mesh(base_folder):
+            self.case_path = base_folder
+            self.pending_signatures = fingerprint(mesh_source_files(self.case_path))
+            self._set_patch_names(boundary_patch_names(self.case_path))
+            read_case = self.pending_signatures != self.mesh_signature
+            # La malla se lee de una vez: no hay avance por patch
+            self.progress_bar.setRange(0, 0)
+        else:
+            self.patch_files = find_patch_files(base_folder)
+            self._set_patch_names([name for name, _ in self.patch_files])
+            self.pending_signatures = {name: file_signature(path) for name, path in self.patch_files}
+            changed_files = [(name, path) for name, path in self.patch_files
+                             if name not in self.patch_meshes
+                             or self.patch_signatures.get(name) != self.pending_signatures[name]]
+            self.progress_bar.setRange(0, len(changed_files))
 
-        self.plotter.add_axes()
-        self.plotter.set_background('white')
-        self.plotter.camera_position = 'iso'
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(read_case or bool(changed_files))
+        self.results_checkbox.setEnabled(self.case_path is not None)
+
+        self.loader = PatchLoader(self)
+        self.loader.patch_loaded.connect(self._add_patch)
+        self.loader.patch_failed.connect(self._on_patch_failed)
+        self.loader.finished.connect(self._on_loading_finished)
+        if read_case:
+            self.loader.start_case(self.case_path, self.patch_names)
+        else:
+            # Sin nada que leer termina enseguida (solo se quitan los patches borrados)
+            self.loader.start(changed_files, self.patch_ids)
+
+    def _set_patch_names(self, names):
+        """
+        Fija los patches de la malla: quita los que ya no existen (con su
+        checkbox, su selección y su color) y renumera los que siguen si cambió
+        su posición.
+        """
+        for name in (set(self.patch_names) | set(self.patch_meshes)) - set(names):
+            if self.patch_meshes.pop(name, None) is not None:
+                self.mesh_dirty = True
+            checkbox = self.checkboxes.pop(name, None)
+            if checkbox is not None:
+                self.sidebar_layout.removeWidget(checkbox)
+                checkbox.deleteLater()
+            self.original_colors.pop(name, None)
+            self.hidden_patches.discard(name)
+            if name in self.selected_patches:
+                self.selected_patches.discard(name)
+                self.patch_selection_changed.emit(name, False)
+            if self.hovered_patch == name:
+                self.hovered_patch = None
+
+        self.patch_names = list(names)
+        self.patch_ids = {name: patch_id for patch_id, name in enumerate(self.patch_names)}
+        for name, surface in self.patch_meshes.items():
+            if surface.cell_data[PATCH_ID_ARRAY][0] != self.patch_ids[name]:
+                self.patch_meshes[name] = prepare_patch(surface, self.patch_ids[name])
+                self.mesh_dirty = True
+        self._setup_lookup_table()
+
+    def _setup_lookup_table(self):
+        """Una entrada por patch: el índice del patch es el valor del arreglo de celdas."""
+        n_patches = max(1, len(self.patch_names))
+        self.lookup_table.SetNumberOfTableValues(n_patches)
+        # Rango centrado en los enteros para que el patch i caiga en la entrada i
+        self.lookup_table.SetTableRange(-0.5, n_patches - 0.5)
+        for name in self.patch_names:
+            # Los patches que ya se mostraban conservan su color
+            if name not in self.original_colors:
+                self.original_colors[name] = (random.random(), random.random(), random.random())
+            self._update_patch_color(name)
+
+    def _update_patch_color(self, patch_name):
+        """Color del patch en la tabla según su estado (oculto, seleccionado, hover o normal)."""
+        patch_id = self.patch_ids.get(patch_name)
+        if patch_id is None:
+            return
+        if patch_name in self.selected_patches:
+            color = SELECTED_COLOR
+        elif patch_name == self.hovered_patch:
+            color = HOVER_COLOR
+        else:
+            color = self.original_colors[patch_name]
+        alpha = 0.0 if patch_name in self.hidden_patches else 1.0
+        self.lookup_table.SetTableValue(patch_id, *color, alpha)
+        self.lookup_table.Modified()
+
+    def cancel_loading(self):
+        """Cancela la lectura de patches y de resultados en curso (p. ej. al cambiar de caso)."""
+        self.play_timer.stop()
+        if self.frame_prefetcher:
+            self.frame_prefetcher.cancel()
+            self.frame_prefetcher = None
+        if self.loader:
+            self.loader.cancel()
+            self.loader = None
+        if self.proxy_builder:
+            self.proxy_builder.cancel()
+            self.proxy_builder = None
+        self.render_timer.stop()
+        self.progress_bar.hide()
+
+    def _add_patch(self, patch_name, surface):
+        """Guarda un patch recién leído para unirlo a la malla y agrega su checkbox en orden alfabético."""
+        if self.loader is None or self.loader is not self.sender():
+            return
+        if surface.n_cells == 0:
+            print(f"Error agregando el patch {patch_name}: la malla no tiene celdas")
+            self._advance_progress()
+            return
+        previous = self.patch_meshes.get(patch_name)
+        if previous is None or not same_surface(previous, surface):
+            self.patch_meshes[patch_name] = surface
+            self.mesh_dirty = True
+
+        if patch_name not in self.checkboxes:
+            # Crear checkbox para mostrar/ocultar en el panel lateral
+            checkbox = QCheckBox(patch_name)
+            checkbox.setChecked(True)
+            checkbox.stateChanged.connect(lambda state, name=patch_name: self.toggle_patch_visibility(name, state))
+            names = sorted(self.checkboxes)
+            # Las dos primeras posiciones son la etiqueta y el botón de deselección
+            self.sidebar_layout.insertWidget(2 + bisect.bisect(names, patch_name), checkbox)
+            self.checkboxes[patch_name] = checkbox
+
+        self._advance_progress()
+        if self.mesh_dirty and not self.render_timer.isActive():
+            self.render_timer.start()
+
+    def _flush_loaded_patches(self):
+        """Vuelve a unir la malla si cambiaron sus patches y redibuja."""
+        if not self.mesh_dirty:
+            return
+        self.mesh_dirty = False
+        surfaces = [self.patch_meshes[name] for name in self.patch_names if name in self.patch_meshes]
+        merged = merge_patches(surfaces) if surfaces else pv.PolyData()
+
+        if self.patch_actor is None:
+            if not surfaces:
+                return
+            self.merged_mesh = merged
+            self.patch_actor = self.plotter.add_mesh(self.merged_mesh, name="patches", pickable=True,
+                                                     scalars=PATCH_ID_ARRAY, preference='cell',
+                                                     show_scalar_bar=False, render=False)
+            mapper = self.patch_actor.GetMapper()
+            mapper.SetLookupTable(self.lookup_table)
+            mapper.UseLookupTableScalarRangeOn()
+            self.plotter.reset_camera(render=False)
+        else:
+            # Se actualiza la malla del actor existente en lugar de crear otro
+            self.merged_mesh.shallow_copy(merged)
+            self.merged_mesh.Modified()
+        self.cell_locator = None
+        # La versión diezmada es de la malla anterior; los cuadros de resultados también
+        self._remove_proxy()
+        self.frame_cache.clear()
+        self.plotter.render()
+
+    def _on_patch_failed(self, filepath, error):
+        if self.loader is None or self.loader is not self.sender():
+            return
+        print(f"Error leyendo {filepath}: {error}")
+        self._advance_progress()
+
+    def _advance_progress(self):
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
+
+    def _on_loading_finished(self):
+        if self.loader is None or self.loader is not self.sender():
+            return
+        self.loader.close()
+        self.loader = None
+        self.progress_bar.hide()
+        self.render_timer.stop()
+        self._flush_loaded_patches()
+        if self.case_path:
+            self.mesh_signature = self.pending_signatures
+        else:
+            self.patch_signatures = self.pending_signatures
+        if self.reset_camera_on_load:
+            set_camera(self.plotter, DEFAULT_CAMERA)
+        self.plotter.render()
+        if self.proxy_actor is None:
+            self._start_level_of_detail()
+
+    def _start_level_of_detail(self):
+        """Genera en segundo plano la versión diezmada si la malla completa es grande."""
+        if self.merged_mesh is None or self.lod_triangle_budget <= 0:
+            return
+        total = triangle_count(self.merged_mesh)
+        if total <= max(self.lod_threshold, self.lod_triangle_budget):
+            return
+        reduction = lod_reduction(total, self.lod_triangle_budget)
+        self.proxy_builder = ProxyBuilder(self)
+        self.proxy_builder.proxy_ready.connect(self._on_proxy_ready)
+        if self.case_path:
+            self.proxy_builder.start_case(self.case_path, self.patch_names, reduction)
+        else:
+            self.proxy_builder.start(self.patch_files, reduction)
+
+    def _on_proxy_ready(self, proxy):
+        if self.proxy_builder is None or self.proxy_builder is not self.sender():
+            return
+        self.proxy_builder = None
+        self.proxy_actor = self.plotter.add_mesh(proxy, name="patches_lod", pickable=False,
+                                                 scalars=PATCH_ID_ARRAY, preference='cell',
+                                                 show_scalar_bar=False, render=False)
+        mapper = self.proxy_actor.GetMapper()
+        # Misma tabla de colores: la selección, el hover y la visibilidad se ven igual
+        mapper.SetLookupTable(self.lookup_table)
+        mapper.UseLookupTableScalarRangeOn()
+        self.proxy_actor.VisibilityOff()
+
+    def _remove_proxy(self):
+        if self.proxy_actor is not None:
+            self.plotter.remove_actor(self.proxy_actor, render=False)
+            self.proxy_actor = None
+
+    def _use_proxy(self, moving):
+        """Dibuja la versión diezmada mientras se mueve la cámara y la completa al quedar quieta."""
+        if self.proxy_actor is None or self.patch_actor is None or self.results_mode:
+            return
+        self.proxy_actor.SetVisibility(moving)
+        self.patch_actor.SetVisibility(not moving)
+        if not moving:
+            self.plotter.render()
 
     def toggle_patch_visibility(self, patch_name, state):
         """Muestra u oculta un patch según el estado del checkbox."""
-        actor = self.actors.get(patch_name)
-        if actor:
-            actor.SetVisibility(state == 2)  # 2 = Checked
-            self.plotter.render()
+        if patch_name not in self.patch_ids:
+            return
+        if state == 2:  # 2 = Checked
+            self.hidden_patches.discard(patch_name)
+        else:
+            self.hidden_patches.add(patch_name)
+        self.cell_locator = None
+        self._update_patch_color(patch_name)
+        if self.results_mode:
+            self.show_time(self.frame_index)
+        self.plotter.render()
+
+    # ---- Resultados ----
+
+    def _set_results_controls_enabled(self, enabled):
+        for widget in (self.field_combo, self.slice_combo, self.play_button, self.time_slider, self.tool_combo):
+            widget.setEnabled(enabled)
+        if not enabled:
+            self.tool_combo.setCurrentIndex(0)
+
+    def set_results_mode(self, enabled):
+        """Alterna entre la geometría (patches para seleccionar) y los resultados del caso."""
+        if enabled == self.results_mode:
+            return
+        if enabled and not self._start_results():
+            self.results_checkbox.setChecked(False)
+            return
+        if not enabled:
+            self._stop_results()
+        for actor in (self.patch_actor, self.proxy_actor):
+            if actor is not None:
+                actor.SetVisibility(not enabled)
+        self.plotter.render()
+
+    def _start_results(self):
+        try:
+            times = case_times(self.case_path)
+            fields = case_fields(self.case_path)
+        except Exception as e:
+            print(f"Error leyendo los resultados del caso: {e}")
+            return False
+        if not times or not fields:
+            self.info_label.setText("El caso no tiene resultados para mostrar")
+            return False
+
+        self.result_times = times
+        self.frame_cache.clear()
+        self.frame_prefetcher = FramePrefetcher(self.case_path, self.frame_cache,
+                                                min(self.prefetch_frames, MAX_LOADER_THREADS), self)
+        self.frame_prefetcher.frame_ready.connect(self._on_frame_ready)
+        self.frame_prefetcher.frame_failed.connect(self._on_frame_failed)
+
+        self.field_combo.blockSignals(True)
+        self.field_combo.clear()
+        self.field_combo.addItems(fields)
+        self.field_combo.blockSignals(False)
+        self.time_slider.blockSignals(True)
+        self.time_slider.setRange(0, len(times) - 1)
+        self.time_slider.setValue(min(self.frame_index, len(times) - 1))
+        self.time_slider.blockSignals(False)
+
+        self.results_mode = True
+        self._set_results_controls_enabled(True)
+        self.show_time(self.time_slider.value())
+        return True
+
+    def _stop_results(self):
+        self.results_mode = False
+        self.play_timer.stop()
+        self.play_button.setText("▶")
+        if self.frame_prefetcher:
+            self.frame_prefetcher.cancel()
+            self.frame_prefetcher = None
+        self._remove_results_actor()
+        self._clear_probe()
+        self.probe_worker = None
+        self._set_results_controls_enabled(False)
+
+    def _remove_results_actor(self):
+        if self.results_actor is not None:
+            # También quita su barra de colores
+            self.plotter.remove_actor(self.results_actor, render=False)
+        self.results_actor = None
+        self.results_mesh = None
+        self.field_range = None
+
+    def _on_results_source_changed(self):
+        """Otro campo u otro corte: los colores y el actor se arman de nuevo."""
+        if not self.results_mode:
+            return
+        self._remove_results_actor()
+        self.show_time(self.frame_index)
+
+    def _frame_key(self, index):
+        return frame_key(self.result_times[index], self.field_combo.currentText(), self.slice_combo.currentData())
+
+    def show_time(self, index):
+        """
+        Muestra el tiempo 'index' si su cuadro está en la caché (si no, se muestra
+        al terminar de leerse) y pide por adelantado los siguientes.
+        """
+        if not self.results_mode or not self.result_times:
+            return
+        self.frame_index = index
+        self.time_label.setText(f"t = {self.result_times[index]}")
+        frame = self.frame_cache.get(self._frame_key(index))
+        if frame is not None:
+            self._display_frame(frame)
+        self._prefetch(index)
+
+    def _prefetch(self, index):
+        count = len(self.result_times)
+        keys = [self._frame_key((index + offset) % count) for offset in range(min(count, self.prefetch_frames + 1))]
+        self.frame_prefetcher.request(keys)
+
+    def _on_frame_ready(self, key, frame):
+        if self.frame_prefetcher is None or self.frame_prefetcher is not self.sender():
+            return
+        if key == self._frame_key(self.frame_index):
+            self._display_frame(frame)
+
+    def _on_frame_failed(self, key, error):
+        if self.frame_prefetcher is None or self.frame_prefetcher is not self.sender():
+            return
+        print(f"Error leyendo {key[1]} en t = {key[0]}: {error}")
+        if self.play_timer.isActive():
+            # El cuadro que se espera no va a llegar
+            self.toggle_playback()
+
+    def _display_frame(self, frame):
+        """Muestra el cuadro actualizando la malla del actor de resultados."""
+        hidden = [self.patch_ids[name] for name in self.hidden_patches if name in self.patch_ids]
+        if hidden:
+            frame = frame.remove_cells(np.isin(frame.cell_data[PATCH_ID_ARRAY], hidden), inplace=False)
+        if frame.n_cells == 0:
+            return
+
+        values = frame_range(frame)
+        if values:
+            low, high = self.field_range or values
+            # El rango solo se amplía: los colores no saltan de un tiempo a otro
+            self.field_range = (min(low, values[0]), max(high, values[1]))
+        if self.results_actor is None:
+            # Copia propia: los cuadros de la caché no se modifican
+            self.results_mesh = pv.PolyData()
+            self.results_mesh.shallow_copy(frame)
+            # Se puede pickear para ubicar las sondas
+            self.results_actor = add_results_mesh(self.plotter, self.results_mesh, self.field_combo.currentText(),
+                                                  name="results", pickable=True, render=False)
+        else:
+            self.results_mesh.shallow_copy(frame)
+            self.results_mesh.Modified()
+        if self.field_range:
+            self.results_actor.GetMapper().SetScalarRange(*self.field_range)
+        self.plotter.render()
+
+    def toggle_playback(self):
+        if self.play_timer.isActive():
+            self.play_timer.stop()
+            self.play_button.setText("▶")
+        else:
+            self.play_timer.start()
+            self.play_button.setText("⏸")
+
+    def _on_play_tick(self):
+        """Avanza un tiempo si su cuadro ya se leyó; si no, espera sin saltearlo."""
+        if not self.result_times:
+            return
+        next_index = (self.frame_index + 1) % len(self.result_times)
+        if self._frame_key(next_index) in self.frame_cache:
+            self.time_slider.setValue(next_index)
+        else:
+            self._prefetch(next_index)
+
+    # ---- Sondas ----
+
+    def _add_probe_point(self, x, y):
+        """
+        Marca el punto de la superficie bajo el mouse. La sonda muestrea con un
+        punto; la línea, al marcar el segundo.
+        """
+        if not self.point_picker.Pick(x, y, 0, self.plotter.renderer) or self.point_picker.GetActor() is None:
+            return
+        point = self.point_picker.GetPickPosition()
+        needed = 1 if self.tool_combo.currentData() == TOOL_PROBE else 2
+        if len(self.probe_points) >= needed:
+            self._clear_probe()
+        self.probe_points.append(point)
+
+        radius = PROBE_MARKER_SCALE * (self.merged_mesh.length if self.merged_mesh is not None else 1.0)
+        self.plotter.add_mesh(pv.Sphere(radius=radius, center=point), color="red", pickable=False,
+                              name=f"probe_point_{len(self.probe_points)}", render=False)
+        if len(self.probe_points) == 2:
+            self.plotter.add_mesh(pv.Line(*self.probe_points), color="red", line_width=3, pickable=False,
+                                  name="probe_line", render=False)
+        self.plotter.render()
+        if len(self.probe_points) == needed:
+            self._start_probe(list(self.probe_points))
+
+    def _clear_probe(self):
+        """Quita los marcadores de la sonda anterior."""
+        for name in ("probe_point_1", "probe_point_2", "probe_line"):
+            self.plotter.remove_actor(name, render=False)
+        self.probe_points = []
+        self.plotter.render()
+
+    def _start_probe(self, points):
+        field = self.field_combo.currentText()
+        self.info_label.setText(f"Muestreando {field} en todos los tiempos...")
+        self.probe_worker = ProbeWorker(self)
+        self.probe_worker.finished.connect(self._on_probe_finished)
+        self.probe_worker.failed.connect(self._on_probe_failed)
+        self.probe_worker.start(self.case_path, field, points)
+
+    def _on_probe_finished(self, samples):
+        if self.probe_worker is None or self.probe_worker is not self.sender():
+            return
+        self.probe_worker = None
+        self.info_label.setText("Selecciona un patch con el mouse")
+        # No modal: se pueden comparar varias sondas
+        dialog = ProbePlotDialog(samples, self)
+        dialog.finished.connect(lambda result, dialog=dialog: self.probe_dialogs.remove(dialog))
+        self.probe_dialogs.append(dialog)
+        dialog.show()
+
+    def _on_probe_failed(self, error):
+        if self.probe_worker is None or self.probe_worker is not self.sender():
+            return
+        self.probe_worker = None
+        self.info_label.setText(f"No se pudo muestrear: {error}")
+
+    def _pick_patch(self, x, y, picker=None):
+        """Patch visible bajo la posición de pantalla indicada, o None."""
+        # En modo resultados los patches no se muestran ni se seleccionan
+        if self.patch_actor is None or self.results_mode:
+            return None
+        self.pick_count += 1
+        if picker is not None:
+            # El z-buffer también ve los patches ocultos: si el primero que
+            # encuentra está oculto, se busca detrás con el localizador
+            if not picker.Pick(x, y, 0, self.plotter.renderer) or picker.GetActor() is not self.patch_actor:
+                return None
+            patch_name = self._cell_patch(self.merged_mesh, picker.GetCellId())
+            if patch_name not in self.hidden_patches:
+                return patch_name
+        return self._locator_pick(x, y)
+
+    def _locator_pick(self, x, y):
+        """Primer patch visible que atraviesa el rayo de la cámara, o None."""
+        if self.cell_locator is None:
+            hidden = [self.patch_ids[name] for name in self.hidden_patches if name in self.patch_ids]
+            self.pick_mesh = self.merged_mesh
+            if hidden:
+                self.pick_mesh = self.merged_mesh.remove_cells(
+                    np.isin(self.merged_mesh.cell_data[PATCH_ID_ARRAY], hidden), inplace=False)
+            self.cell_locator = vtkStaticCellLocator()
+            self.cell_locator.SetDataSet(self.pick_mesh)
+            if self.pick_mesh.n_cells:
+                self.cell_locator.BuildLocator()
+        if self.pick_mesh.n_cells == 0:
+            return None
+
+        start, end = display_ray(self.plotter.renderer, x, y)
+        t, sub_id, cell_id = reference(0.0), reference(0), reference(-1)
+        if not self.cell_locator.IntersectWithLine(start, end, 0.0, t, [0.0] * 3, [0.0] * 3, sub_id, cell_id):
+            return None
+        return self._cell_patch(self.pick_mesh, cell_id.get())
+
+    def _cell_patch(self, mesh, cell_id):
+        if cell_id < 0 or cell_id >= mesh.n_cells:
+            return None
+        return self.patch_names[int(mesh.cell_data[PATCH_ID_ARRAY][cell_id])]
 
     def enable_patch_selection(self):
         """Selecciona/deselecciona patches completos con clic izquierdo."""
         def on_left_click(obj, event):
             click_pos = self.plotter.interactor.GetEventPosition()
-            self.picker.Pick(click_pos[0], click_pos[1], 0, self.plotter.renderer)
-
-            actor = self.picker.GetActor()
-            if actor is None:
+            if self.results_mode and self.tool_combo.currentData() != TOOL_SELECT:
+                self._add_probe_point(*click_pos)
                 return
-
-            # Buscar patch por actor
-            patch_name = next((name for name, act in self.actors.items() if act == actor), None)
+            patch_name = self._pick_patch(click_pos[0], click_pos[1])
             
             # El usuario toca con un click para seleccionar al patch,
             #  y con otro click lo deselecciona:
@@ -134,15 +1192,13 @@ class GeometryView(QWidget):
             if patch_name:
                 if patch_name in self.selected_patches: # Si está seleccionado 
                     # Restaurar color original
-                    actor.GetProperty().SetColor(self.original_colors[patch_name])
                     self.selected_patches.remove(patch_name)
                     self.patch_selection_changed.emit(patch_name, False)
                 else:
                     # Resaltar en amarillo
-                    actor.GetProperty().SetColor(1, 1, 0)
-                    # Agregar a selected_patches
                     self.selected_patches.add(patch_name)
                     self.patch_selection_changed.emit(patch_name, True)
+                self._update_patch_color(patch_name)
 
                 # Actualiza el QLabel con la lista de patches seleccionados:
                 seleccionados = ", ".join(self.selected_patches) if self.selected_patches else "ninguno"
@@ -153,38 +1209,72 @@ class GeometryView(QWidget):
         self.plotter.iren.add_observer("LeftButtonPressEvent", on_left_click)
 
     def enable_hover_preview(self):
-        """Resalta temporalmente un patch cuando el mouse pasa por encima."""
+        """
+        Resalta temporalmente un patch cuando el mouse pasa por encima. El
+        movimiento solo guarda la posición; el pick se hace con el temporizador
+        de hover y se redibuja solo si cambia el patch resaltado.
+        """
         def on_mouse_move(obj, event):
-            pos = self.plotter.interactor.GetEventPosition()
-            self.picker.Pick(pos[0], pos[1], 0, self.plotter.renderer)
-            actor = self.picker.GetActor()
+            self.hover_position = self.plotter.interactor.GetEventPosition()
+            if self.hover_on_idle:
+                # Se reinicia en cada movimiento: dispara cuando el mouse se detiene
+                self.hover_timer.start()
+            elif not self.hover_timer.isActive():
+                self.hover_timer.start()
 
-            # Si ya había un patch resaltado, restaurarlo (si no está seleccionado)
-            if self.hovered_patch and self.hovered_patch not in self.selected_patches:
-                self.actors[self.hovered_patch].GetProperty().SetColor(self.original_colors[self.hovered_patch])
-                self.hovered_patch = None
+        # Conecta evento de movimiento:
+        self.plotter.iren.add_observer("MouseMoveEvent", on_mouse_move)
 
-            if actor:
-                patch_name = next((name for name, act in self.actors.items() if act == actor), None)
-                if patch_name and patch_name not in self.selected_patches:
-                    actor.GetProperty().SetColor(1, 0.5, 0)  # Naranja para hover
-                    self.hovered_patch = patch_name
+    def _update_hover(self):
+        if self.hover_position is None:
+            return
+        # Mientras se rota o desplaza la cámara no se resalta nada
+        if QApplication.mouseButtons() != Qt.NoButton:
+            return
+        patch_name = self._pick_patch(*self.hover_position, picker=self.hover_picker)
+        if patch_name == self.hovered_patch:
+            return
 
-            self.plotter.render()
+        # Si ya había un patch resaltado, restaurarlo (si no está seleccionado)
+        previous, self.hovered_patch = self.hovered_patch, patch_name
+        if previous:
+            self._update_patch_color(previous)
+        if patch_name:
+            self._update_patch_color(patch_name)
 
-        # Conecta evento de movimiento:
-        self.plotter.iren.add_observer("MouseMoveEvent", on_mouse_move)
+        self.plotter.render()
+
+    def _enable_frame_time_overlay(self):
+        """Muestra el tiempo del último cuadro, el promedio y la cantidad de picks."""
+        self.frame_text = self.plotter.add_text("", position=(10, 10), font_size=8, color='black',
+                                                name='frame_time')
+        self.plotter.ren_win.AddObserver("StartEvent", self._on_render_start)
+        self.plotter.ren_win.AddObserver("EndEvent", self._on_render_end)
+
+    def _on_render_start(self, obj, event):
+        self.frame_start = time.perf_counter()
+        # El texto muestra los cuadros anteriores: actualizarlo no pide otro render
+        if self.frame_times:
+            last = self.frame_times[-1]
+            average = sum(self.frame_times) / len(self.frame_times)
+            self.frame_text.SetInput(f"Cuadro: {last:.1f} ms | media: {average:.1f} ms | "
+                                     f"cuadros: {self.frame_count} | picks: {self.pick_count}")
+
+    def _on_render_end(self, obj, event):
+        if self.frame_start is not None:
+            self.frame_times.append((time.perf_counter() - self.frame_start) * 1000)
+            self.frame_count += 1
+            self.frame_start = None
     
     def deselect_all_patches(self):
         """Deselecciona todos los patches seleccionados."""
-        for patch_name in list(self.selected_patches):  # Usamos list() para crear una copia
-            actor = self.actors.get(patch_name)
-            if actor:
-                # Restaurar color original
-                actor.GetProperty().SetColor(self.original_colors[patch_name])
+        selected = list(self.selected_patches)  # Usamos list() para crear una copia
         
         # Limpiar el conjunto de seleccionados
         self.selected_patches.clear()
+        for patch_name in selected:
+            # Restaurar color original
+            self._update_patch_color(patch_name)
         self.deselect_all_patches_requested.emit()
         
         # Actualizar el label
@@ -1,8 +1,13 @@
 from PySide6.QtWidgets import (QComboBox, QDialog, QVBoxLayout, QCheckBox,
-                               QDialogButtonBox, QDoubleSpinBox,QSpinBox,QPlainTextEdit)
+                               QDialogButtonBox, QDoubleSpinBox,QSpinBox,QPlainTextEdit,
+                               QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox)
+from PySide6.QtGui import QPixmap
 from PySide6.QtGui import QIntValidator, QDoubleValidator
 
 from PySide6.QtGui import QIntValidator, QDoubleValidator, QValidator
+import numpy as np
+
+from src.file_handler.field_probes import line_integral, write_samples_csv
 
 
 class FloatValidator(QValidator):
@@ -96,6 +101,130 @@ class OptionalParametersDialog(QDialog):
         return [name for name, checkbox in self.checkboxes.items() if checkbox.isChecked()]
 
 
+class ScalingStudyDialog(QDialog):
+    """
+    Muestra la tabla y el gráfico de un estudio de escalabilidad. Aceptar el
+    diálogo aplica la descomposición recomendada.
+    """
+    def __init__(self, report: dict, summary: str = "", chart_path=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Estudio de Escalabilidad")
+        layout = QVBoxLayout(self)
+
+        headers = ["Núcleos", "s/paso", "Speedup", "Eficiencia"]
+        table = QTableWidget(len(report['rows']), len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        for i, row in enumerate(report['rows']):
+            values = [str(row['cores']), f"{row['seconds_per_step']:.4g}",
+                      f"{row['speedup']:.2f}", f"{row['efficiency']:.0%}"]
+            for j, value in enumerate(values):
+                table.setItem(i, j, QTableWidgetItem(value))
+        layout.addWidget(table)
+
+        if chart_path:
+            chart = QLabel()
+            chart.setPixmap(QPixmap(str(chart_path)))
+            layout.addWidget(chart)
+        if summary:
+            layout.addWidget(QLabel(summary))
+
+        # Aplicar solo tiene sentido si hay una recomendación
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        if report.get('recommended'):
+            button_box.addButton("Aplicar descomposición recomendada", QDialogButtonBox.AcceptRole)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+
+class ProbePlotDialog(QDialog):
+    """
+    Muestra los valores de una sonda a lo largo del tiempo o, si es una línea,
+    los perfiles en algunos tiempos y la integral sobre la línea en cada tiempo.
+    Las muestras se pueden exportar como CSV.
+    """
+    # Perfiles que se dibujan como máximo (repartidos entre los tiempos)
+    MAX_PROFILES = 6
+
+    def __init__(self, samples: dict, parent=None):
+        super().__init__(parent)
+        self.samples = samples
+        is_line = 'distance' in samples
+        self.setWindowTitle(f"{'Línea' if is_line else 'Sonda'}: {samples['field']}")
+        layout = QVBoxLayout(self)
+
+        point = samples['points'][0]
+        summary = f"Punto ({point[0]:.4g}, {point[1]:.4g}, {point[2]:.4g})"
+        if is_line:
+            end = samples['points'][-1]
+            summary = f"Línea de ({point[0]:.4g}, {point[1]:.4g}, {point[2]:.4g}) a ({end[0]:.4g}, {end[1]:.4g}, {end[2]:.4g})"
+        layout.addWidget(QLabel(f"{summary}, {len(samples['times'])} tiempos"))
+
+        try:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+        except ImportError:
+            layout.addWidget(QLabel("matplotlib no está instalado: solo se pueden exportar los valores."))
+        else:
+            figure = Figure(figsize=(7, 6 if is_line else 4))
+            if is_line:
+                self._plot_line(figure)
+            else:
+                self._plot_probe(figure)
+            figure.tight_layout()
+            layout.addWidget(FigureCanvasQTAgg(figure))
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.addButton("Exportar CSV...", QDialogButtonBox.ActionRole).clicked.connect(self.export_csv)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def _components(self, values):
+        """(etiqueta, valores) de cada componente; los escalares tienen una sola."""
+        if values.ndim == 1:
+            return [(self.samples['field'], values)]
+        return [(f"{self.samples['field']}_{axis}", values[:, i]) for i, axis in enumerate("xyz"[:values.shape[1]])]
+
+    def _plot_probe(self, figure):
+        times = [float(time) for time in self.samples['times']]
+        axes = figure.add_subplot(111)
+        for label, values in self._components(self.samples['values'][:, 0]):
+            axes.plot(times, values, label=label)
+        axes.set_xlabel("Tiempo")
+        axes.set_ylabel(self.samples['field'])
+        axes.legend()
+
+    def _plot_line(self, figure):
+        times = self.samples['times']
+        values = self.samples['values']
+        profile_axes = figure.add_subplot(211)
+        picks = sorted(set(np.linspace(0, len(times) - 1, min(len(times), self.MAX_PROFILES)).round().astype(int)))
+        for index in picks:
+            profile = values[index] if values.ndim == 2 else np.linalg.norm(values[index], axis=1)
+            profile_axes.plot(self.samples['distance'], profile, label=f"t = {times[index]}")
+        profile_axes.set_xlabel("Distancia")
+        profile_axes.set_ylabel(self.samples['field'] if values.ndim == 2 else f"|{self.samples['field']}|")
+        profile_axes.legend(fontsize="small")
+
+        # Con alpha.water en una línea vertical es la altura de la superficie libre
+        integral_axes = figure.add_subplot(212)
+        integral_axes.plot([float(time) for time in times], line_integral(self.samples))
+        integral_axes.set_xlabel("Tiempo")
+        integral_axes.set_ylabel(f"Integral de {self.samples['field']}")
+
+    def export_csv(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar Muestras", f"{self.samples['field']}.csv",
+                                              "CSV (*.csv)")
+        if not path:
+            return
+        try:
+            write_samples_csv(self.samples, path)
+        except OSError as e:
+            QMessageBox.critical(self, "Exportar Muestras", f"No se pudo guardar {path}: {e}")
+
+
 class StrictIntValidator(QIntValidator):
     """
     Un validador de enteros que considera los valores fuera de rango como
@@ -14,6 +14,10 @@ class IntWidget(BaseParameterWidget):
         if current_value is None:
             current_value = self.param_props.get('default',0)
         self.spinbox = NoScrollSpinBox()
+        if 'min' in self.param_props:
+            self.spinbox.setMinimum(self.param_props['min'])
+        if 'max' in self.param_props:
+            self.spinbox.setMaximum(self.param_props['max'])
         self.spinbox.setValue(current_value)
         
         layout = QHBoxLayout()
@@ -1,161 +1,572 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QFormLayout, QLabel,
-                               QGroupBox)
-from PySide6.QtGui import QFont
+import copy
+
+from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, QLineEdit, QPushButton, QTableView,
+                               QHeaderView, QAbstractItemView, QStyledItemDelegate, QMessageBox, QInputDialog)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PySide6.QtGui import QColor, QFont
 from .base_widget import BaseParameterWidget
 from ..helpers import NoScrollComboBox
 from ..parameter_container_widget import ParameterContainerWidget
+from src.file_handler.boundary_rules import (is_pattern, pattern_name, check_pattern, rule_for, split_entries,
+                                             entry_settings, compact_boundary_field)
+
+# Filas visibles de la tabla antes de que tenga su propio scroll
+VISIBLE_ROWS = 12
+
+# Largo máximo del resumen de parámetros que se muestra en la tabla
+SUMMARY_MAX_CHARS = 80
+
+
+def _format_value(value) -> str:
+    if isinstance(value, dict) and {'x', 'y', 'z'} <= set(value):
+        return f"({value['x']} {value['y']} {value['z']})"
+    return " ".join(str(value).split())
+
+
+class PatchTableModel(QAbstractTableModel):
+    """
+    Modelo de las condiciones de borde: primero una fila por regla (patrón
+    "wall.*" o grupo de patches) y después una fila por patch. Un patch sin
+    entrada propia toma la condición de la regla que lo cubre; al editarlo pasa
+    a tener su propia entrada. Los valores se guardan como las entradas que
+    devuelve 'PatchesWidget.get_value', así que solo hace falta crear widgets
+    para la fila que se está editando.
+    """
+    NAME_COLUMN, RULE_COLUMN, TYPE_COLUMN, PARAMETERS_COLUMN = range(4)
+    HEADERS = ("Patch", "Regla", "Tipo", "Parámetros")
+
+    def __init__(self, type_options: list, default_type: str = None, parent=None):
+        super().__init__(parent)
+        self.type_options = type_options
+        self.default_type = default_type
+        self.type_labels = {opt.get('name'): opt.get('label', opt.get('name')) for opt in type_options}
+        self.groups = {}
+        self.rules = []          # entradas de las reglas, en su orden
+        self.patch_names = []
+        self.patch_rows = {}     # patchName -> índice entre los patches
+        self.overrides = {}      # patchName -> entrada propia del patch
+        self.resolved = {}       # patchName -> regla que lo cubre (o None)
+        self.highlights = {}     # patchName -> color
+
+    def load(self, patch_names: list, current_patches: list, groups: dict = None):
+        """
+        Carga las reglas y una fila por patch de la malla con los valores de
+        'current_patches'. Los patches sin entrada ni regla toman el tipo por defecto.
+        """
+        self.beginResetModel()
+        self.groups = groups or {}
+        self.patch_names = list(patch_names)
+        self.patch_rows = {name: i for i, name in enumerate(self.patch_names)}
+        explicit, rules = split_entries(current_patches or [], self.patch_names, self.groups)
+        self.rules = [self.patch_with_type(rule, rule.get('type', self.default_type)) for rule in rules]
+        self._resolve()
+        self.overrides = {}
+        for name in self.patch_names:
+            data = explicit.get(name)
+            if data is None and self.resolved[name] is None:
+                data = {'patchName': name}
+            if data is not None:
+                self.overrides[name] = self.patch_with_type(data, data.get('type', self.default_type))
+        self.highlights = {name: color for name, color in self.highlights.items() if name in self.patch_rows}
+        self.endResetModel()
+
+    def _resolve(self):
+        self.resolved = {name: rule_for(name, self.rules, self.groups) for name in self.patch_names}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rules) + len(self.patch_names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() == self.TYPE_COLUMN:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def is_rule_row(self, row: int) -> bool:
+        return row < len(self.rules)
+
+    def patch_name(self, row: int) -> str:
+        return self.patch_names[row - len(self.rules)]
+
+    def patch_row(self, patch_name: str):
+        index = self.patch_rows.get(patch_name)
+        return None if index is None else len(self.rules) + index
+
+    def rule_of(self, row: int):
+        """Regla que cubre el patch de la fila (None para las filas de reglas)."""
+        return None if self.is_rule_row(row) else self.resolved.get(self.patch_name(row))
+
+    def is_inherited(self, row: int) -> bool:
+        """Indica si el patch de la fila toma la condición de una regla."""
+        return not self.is_rule_row(row) and self.patch_name(row) not in self.overrides
+
+    def entry(self, row: int) -> dict:
+        """Entrada que define la condición de la fila (la de la regla si el patch la hereda)."""
+        if self.is_rule_row(row):
+            return self.rules[row]
+        name = self.patch_name(row)
+        return self.overrides.get(name) or {**self.resolved[name], 'patchName': name}
+
+    def rule_label(self, rule: dict) -> str:
+        name = rule['patchName']
+        return name if is_pattern(name) else f"{name} (grupo)"
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        entry = self.entry(row)
+
+        if role == Qt.DisplayRole:
+            if column == self.NAME_COLUMN:
+                return self.rule_label(entry) if self.is_rule_row(row) else entry['patchName']
+            if column == self.RULE_COLUMN:
+                return self._rule_text(row)
+            if column == self.TYPE_COLUMN:
+                return self.type_labels.get(entry.get('type'), entry.get('type'))
+            return self.parameters_summary(entry)
+        if role == Qt.EditRole and column == self.TYPE_COLUMN:
+            return entry.get('type')
+        if role == Qt.ToolTipRole and column == self.PARAMETERS_COLUMN:
+            return "\n".join(f"{name}: {_format_value(value)}" for name, value in self._parameters(entry).items())
+        if role == Qt.ToolTipRole and column == self.NAME_COLUMN and self.is_rule_row(row):
+            return ", ".join(self.covered_patches(row))
+        if role == Qt.FontRole and (self.is_rule_row(row) or self.is_inherited(row)):
+            font = QFont()
+            font.setBold(self.is_rule_row(row))
+            font.setItalic(not self.is_rule_row(row))
+            return font
+        if role == Qt.BackgroundRole and not self.is_rule_row(row) and entry['patchName'] in self.highlights:
+            return QColor(self.highlights[entry['patchName']])
+        return None
+
+    def _rule_text(self, row: int) -> str:
+        if self.is_rule_row(row):
+            count = len(self.covered_patches(row))
+            return f"{count} patch" if count == 1 else f"{count} patches"
+        rule = self.rule_of(row)
+        if rule is None:
+            return ""
+        return rule['patchName'] if self.is_inherited(row) else f"anula {rule['patchName']}"
+
+    def covered_patches(self, row: int) -> list:
+        """Patches que toman la condición de la regla de la fila."""
+        rule = self.rules[row]
+        return [name for name in self.patch_names if self.resolved[name] is rule and name not in self.overrides]
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole or index.column() != self.TYPE_COLUMN:
+            return False
+        row = index.row()
+        entry = self.entry(row)
+        if value == entry.get('type'):
+            return False
+        self._set_entry(row, self.patch_with_type(entry, value))
+        if self.is_rule_row(row):
+            # Cambian también los patches que heredan la regla
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.PARAMETERS_COLUMN))
+        else:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, self.PARAMETERS_COLUMN))
+        return True
+
+    def _set_entry(self, row: int, entry: dict):
+        if self.is_rule_row(row):
+            # Las filas de los patches comparan la regla por identidad
+            previous = self.rules[row]
+            self.rules[row] = entry
+            self.resolved = {name: entry if rule is previous else rule for name, rule in self.resolved.items()}
+        else:
+            self.overrides[self.patch_name(row)] = entry
+
+    @staticmethod
+    def _parameters(patch: dict) -> dict:
+        return {name: value for name, value in patch.items() if name not in ('patchName', 'type')}
+
+    def parameters_summary(self, patch: dict) -> str:
+        summary = ", ".join(f"{name}={_format_value(value)}" for name, value in self._parameters(patch).items())
+        if len(summary) > SUMMARY_MAX_CHARS:
+            summary = summary[:SUMMARY_MAX_CHARS - 1] + "…"
+        return summary
+
+    def parameters_schema(self, type_name: str) -> list:
+        return next((opt.get('parameters', []) for opt in self.type_options if opt.get('name') == type_name), [])
+
+    def patch_with_type(self, data: dict, type_name: str) -> dict:
+        """
+        Valores del patch con el tipo 'type_name': los parámetros del tipo toman
+        el valor de 'data' si lo tiene y, si no son opcionales, el por defecto.
+        """
+        patch = {'patchName': data['patchName'], 'type': type_name}
+        for param_props in self.parameters_schema(type_name):
+            name = param_props.get('name')
+            if data.get(name) is not None:
+                patch[name] = data[name]
+            elif not param_props.get('optional', False) and param_props.get('default') is not None:
+                patch[name] = copy.deepcopy(param_props.get('default'))
+        return patch
+
+    def set_parameters(self, row: int, values: dict):
+        """
+        Reemplaza los parámetros de la fila (el nombre y el tipo no cambian). Un
+        patch que hereda una regla pasa a tener entrada propia solo si los
+        valores son distintos de los de la regla.
+        """
+        entry = self.entry(row)
+        if self.is_inherited(row) and self._parameters(entry) == values:
+            return
+        self._set_entry(row, {'patchName': entry['patchName'], 'type': entry.get('type'), **values})
+        first = 0 if self.is_rule_row(row) else row
+        last = self.rowCount() - 1 if self.is_rule_row(row) else row
+        # Sin EditRole: el tipo no cambia
+        self.dataChanged.emit(self.index(first, 0), self.index(last, self.PARAMETERS_COLUMN),
+                              [Qt.DisplayRole, Qt.ToolTipRole, Qt.FontRole])
+
+    def add_rule(self, name: str) -> int:
+        """
+        Agrega una regla para un grupo de patches o una expresión regular. La
+        regla toma la condición más común entre los patches que cubre, y esos
+        patches dejan de tener entrada propia si tienen esa misma condición.
+
+        Returns:
+            int: Fila de la regla.
+
+        Raises:
+            ValueError: Si el nombre no es un grupo ni una expresión válida, o
+                si ya hay una regla con ese nombre.
+        """
+        name = name.strip()
+        if name in self.patch_rows and name not in self.groups:
+            raise ValueError(f"'{name}' es un patch: su condición se edita en su fila.")
+        if name not in self.groups:
+            name = pattern_name(name)
+            check_pattern(name)
+        if any(rule['patchName'] == name for rule in self.rules):
+            raise ValueError(f"Ya hay una regla para {name}.")
+
+        self.beginResetModel()
+        rule = {'patchName': name}
+        self.rules.append(rule)
+        self._resolve()
+        covered = [patch for patch in self.patch_names if self.resolved[patch] is rule]
+        settings = [entry_settings(self.overrides[patch]) for patch in covered if patch in self.overrides]
+        common = max(settings, key=settings.count) if settings else {'type': self.default_type}
+        self.rules[-1] = self.patch_with_type({'patchName': name, **common}, common.get('type', self.default_type))
+        self._resolve()
+        for patch in covered:
+            if patch in self.overrides and entry_settings(self.overrides[patch]) == entry_settings(self.rules[-1]):
+                del self.overrides[patch]
+        self.endResetModel()
+        return len(self.rules) - 1
+
+    def can_remove(self, row: int) -> bool:
+        """Se pueden quitar las reglas y las entradas propias de patches cubiertos por una regla."""
+        return self.is_rule_row(row) or (not self.is_inherited(row) and self.rule_of(row) is not None)
+
+    def remove_row(self, row: int):
+        """
+        Quita la regla de la fila (sus patches conservan la condición con una
+        entrada propia) o la entrada propia del patch, que vuelve a su regla.
+        """
+        if not self.can_remove(row):
+            return
+        self.beginResetModel()
+        if self.is_rule_row(row):
+            rule = self.rules.pop(row)
+            for name in self.patch_names:
+                if self.resolved[name] is rule and name not in self.overrides:
+                    self.overrides[name] = {**rule, 'patchName': name}
+            self._resolve()
+        else:
+            del self.overrides[self.patch_name(row)]
+        self.endResetModel()
+
+    def entries(self) -> list:
+        """Entradas de boundaryField: las de los patches y las reglas, compactadas."""
+        entries = [self.overrides[name] for name in self.patch_names if name in self.overrides] + self.rules
+        return [dict(entry) for entry in compact_boundary_field(entries, self.patch_names, self.groups)]
+
+    def set_highlight(self, patch_name: str, color):
+        """Colorea (o, con color None, descolorea) la fila del patch."""
+        row = self.patch_row(patch_name)
+        if row is None:
+            return
+        if color is None:
+            self.highlights.pop(patch_name, None)
+        else:
+            self.highlights[patch_name] = color
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1), [Qt.BackgroundRole])
+
+    def clear_highlights(self):
+        names = list(self.highlights)
+        self.highlights.clear()
+        for name in names:
+            row = self.patch_row(name)
+            self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1), [Qt.BackgroundRole])
+
+
+class PatchTypeDelegate(QStyledItemDelegate):
+    """
+    Editor de la columna 'Tipo': un ComboBox que se crea solo mientras se
+    edita la celda y que aplica el cambio apenas se elige una opción.
+    """
+    def __init__(self, type_options: list, before_commit=None, parent=None):
+        super().__init__(parent)
+        self.type_options = type_options
+        # Se llama antes de cambiar el tipo (para guardar lo editado en el detalle)
+        self.before_commit = before_commit
+
+    def createEditor(self, parent, option, index):
+        combo = NoScrollComboBox(parent)
+        for type_option in self.type_options:
+            combo.addItem(type_option.get('label'), type_option.get('name'))
+        combo.activated.connect(lambda _index, editor=combo: self._commit(editor))
+        return combo
+
+    def _commit(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
+    def setEditorData(self, editor, index):
+        position = editor.findData(index.data(Qt.EditRole))
+        if position != -1:
+            editor.setCurrentIndex(position)
+
+    def setModelData(self, editor, model, index):
+        if self.before_commit:
+            self.before_commit()
+        model.setData(index, editor.currentData(), Qt.EditRole)
+
 
 class PatchesWidget(BaseParameterWidget):
     """
     Widget para editar las condiciones de borde de los 'patches'.
+    Muestra una tabla con las reglas (patrones y grupos de patches) y una fila
+    por patch; los parámetros de la fila actual se editan en un panel debajo,
+    que se crea al elegir la fila.
     """
-    def __init__(self, param_props: dict, widget_factory, get_vtk_patch_names_func, highlight_colors: list):
+    def __init__(self, param_props: dict, widget_factory, get_vtk_patch_names_func, highlight_colors: list,
+                 get_patch_groups_func=None):
         self.widget_factory = widget_factory
         self.get_vtk_patch_names = get_vtk_patch_names_func
+        self.get_patch_groups = get_patch_groups_func
         self.highlight_colors = highlight_colors
 
-        self.patch_groupboxes = {}
-        self.patch_widgets_map = {}
-        self.highlighted_patches = {}
+        self.detail_container = None
+        self.detail_row = None
 
         super().__init__(param_props)
 
     def setup_ui(self):
         """
-        Crea un GroupBox para cada patch con sus parámetros editables.
+        Crea la tabla de patches, el filtro por nombre, los botones de reglas y
+        el panel de detalle.
         """
         container_layout = QVBoxLayout(self)
         container_layout.setContentsMargins(0, 0, 0, 0)
 
-        patch_names = self.get_vtk_patch_names()
-        current_patches_map = {p.get('patchName'): p for p in self.param_props.get('current', [])}
         self.schema = self.param_props.get('schema', {})
         self.type_options = self.schema.get('type', {}).get('options', [])
 
-        for patch_name in patch_names:
-            patch_data = current_patches_map.get(patch_name, {})
-
-            patch_groupbox = QGroupBox()
-            self.patch_groupboxes[patch_name] = patch_groupbox
-            group_layout = QVBoxLayout(patch_groupbox)
-
-            patch_name_label = QLabel(patch_name)
-            font = QFont()
-            font.setBold(True)
-            patch_name_label.setFont(font)
-            group_layout.addWidget(patch_name_label)
-
-            # Layout que contendrá el ComboBox y el ParameterContainer
-            patch_content_layout = QVBoxLayout()
-            group_layout.addLayout(patch_content_layout)
-
-            type_combo = NoScrollComboBox()
-            for option in self.type_options:
-                type_combo.addItem(option.get('label'), option.get('name'))
-
-            # Usar un FormLayout para el ComboBox para mantener la alineación
-            combo_form_layout = QFormLayout()
-            combo_form_layout.addRow("Tipo:", type_combo)
-            patch_content_layout.addLayout(combo_form_layout)
-
-            self.patch_widgets_map[patch_name] = {'type_combo': type_combo, 'container': None}
-
-            update_func = self._make_update_params_func(patch_name, patch_content_layout, type_combo, patch_data)
-            type_combo.currentIndexChanged.connect(update_func)
-
-            initial_type = patch_data.get('type', self.schema.get('type', {}).get('default'))
-            if initial_type:
-                index = type_combo.findData(initial_type)
-                if index != -1:
-                    type_combo.setCurrentIndex(index)
-
-            update_func(type_combo.currentIndex())
-
-            container_layout.addWidget(patch_groupbox)
-
-    def _make_update_params_func(self, patch_name, layout, combo, data):
-        def update_value_input_visibility(index):
-            # Limpiar container anterior
-            if self.patch_widgets_map[patch_name].get('container'):
-                self.patch_widgets_map[patch_name]['container'].deleteLater()
-                self.patch_widgets_map[patch_name]['container'] = None
-
-            selected_type_name = combo.itemData(index)
-            parameters_schema_list = next(
-                (opt.get('parameters', []) for opt in self.type_options if opt.get('name') == selected_type_name),
-                []
-            )
+        self.model = PatchTableModel(self.type_options, self.schema.get('type', {}).get('default'), self)
+        self.model.load(self.get_vtk_patch_names(), self.param_props.get('current', []),
+                        self.get_patch_groups() if self.get_patch_groups else {})
+
+        tools_layout = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filtrar patches...")
+        self.filter_edit.setClearButtonEnabled(True)
+        tools_layout.addWidget(self.filter_edit)
+        self.add_rule_button = QPushButton("Agregar regla...")
+        self.add_rule_button.setToolTip("Una condición para todos los patches de un grupo o que coinciden "
+                                        "con una expresión regular (por ejemplo wall.*)")
+        self.add_rule_button.clicked.connect(self._add_rule)
+        tools_layout.addWidget(self.add_rule_button)
+        self.remove_button = QPushButton("Quitar")
+        self.remove_button.setToolTip("Quita la regla seleccionada (sus patches conservan la condición) o la "
+                                      "condición propia del patch seleccionado, que vuelve a tomar la de su regla")
+        self.remove_button.setEnabled(False)
+        self.remove_button.clicked.connect(self._remove_current_row)
+        tools_layout.addWidget(self.remove_button)
+        container_layout.addLayout(tools_layout)
+
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.proxy_model.setFilterKeyColumn(PatchTableModel.NAME_COLUMN)
+        self.proxy_model.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.filter_edit.textChanged.connect(self.proxy_model.setFilterFixedString)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy_model)
+        self.table.setItemDelegateForColumn(PatchTableModel.TYPE_COLUMN,
+                                            PatchTypeDelegate(self.type_options, self._commit_detail, self.table))
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked
+                                   | QAbstractItemView.EditKeyPressed)
+        self.table.setWordWrap(False)
+        self.table.verticalHeader().hide()
+        # Filas de alto fijo: la vista no mide el contenido de cada fila
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(PatchTableModel.NAME_COLUMN, QHeaderView.Interactive)
+        header.setSectionResizeMode(PatchTableModel.RULE_COLUMN, QHeaderView.Interactive)
+        header.setSectionResizeMode(PatchTableModel.TYPE_COLUMN, QHeaderView.Interactive)
+        header.setStretchLastSection(True)
+        header.resizeSection(PatchTableModel.TYPE_COLUMN, 170)
+        row_height = self.table.verticalHeader().defaultSectionSize()
+        visible_rows = min(max(self.model.rowCount(), 1), VISIBLE_ROWS)
+        self.table.setFixedHeight(header.sizeHint().height() + row_height * visible_rows + 2 * self.table.frameWidth())
+        container_layout.addWidget(self.table)
+
+        self.detail_groupbox = QGroupBox()
+        self.detail_layout = QVBoxLayout(self.detail_groupbox)
+        self.detail_placeholder = QLabel("Seleccione un patch para editar sus parámetros.")
+        self.detail_layout.addWidget(self.detail_placeholder)
+        container_layout.addWidget(self.detail_groupbox)
+
+        self.table.selectionModel().currentRowChanged.connect(self._on_current_row_changed)
+        self.model.dataChanged.connect(self._on_model_data_changed)
+
+        if self.model.rowCount():
+            self.table.selectRow(0)
+
+    def _on_current_row_changed(self, current, previous):
+        try:
+            self._commit_detail()
+        except ValueError as e:
+            QMessageBox.warning(self, "Valor Inválido", f"No se guardaron los cambios del patch: {e}")
+        self._show_detail(self.proxy_model.mapToSource(current).row() if current.isValid() else None)
+
+    def _add_rule(self):
+        name, ok = QInputDialog.getItem(self, "Agregar regla", "Grupo de patches o expresión regular:",
+                                        list(self.model.groups), 0, True)
+        if not ok or not name.strip():
+            return
+        try:
+            self._commit_detail()
+        except ValueError as e:
+            QMessageBox.warning(self, "Valor Inválido", f"No se guardaron los cambios del patch: {e}")
+            return
+        self._show_detail(None)
+        try:
+            row = self.model.add_rule(name)
+        except ValueError as e:
+            QMessageBox.warning(self, "Regla Inválida", str(e))
+            return
+        self._select_source_row(row)
 
-            # Preparar schema para el container, inyectando valores actuales
-            parameters_schema_dict = {}
-            for param_props in parameters_schema_list:
-                param_name_key = param_props.get('name')
-                new_props = param_props.copy()
+    def _remove_current_row(self):
+        if self.detail_row is None:
+            return
+        row = self.detail_row
+        try:
+            self._commit_detail()
+        except ValueError as e:
+            QMessageBox.warning(self, "Valor Inválido", f"No se guardaron los cambios del patch: {e}")
+            return
+        self._show_detail(None)
+        self.model.remove_row(row)
+
+    def _select_source_row(self, row: int):
+        index = self.proxy_model.mapFromSource(self.model.index(row, 0))
+        if index.isValid():
+            self.table.selectRow(index.row())
+            self.table.scrollTo(index)
+
+    def _on_model_data_changed(self, top_left, bottom_right, roles=()):
+        # Al cambiar el tipo del patch en edición, el panel pasa a los parámetros del tipo nuevo
+        if roles and Qt.EditRole not in roles:
+            return
+        if (self.detail_row is not None and top_left.row() <= self.detail_row <= bottom_right.row()
+                and top_left.column() <= PatchTableModel.TYPE_COLUMN <= bottom_right.column()):
+            self._show_detail(self.detail_row)
+
+    def _show_detail(self, row):
+        """Crea el panel con los parámetros de la fila (y descarta el anterior)."""
+        if self.detail_container:
+            self.detail_container.deleteLater()
+            self.detail_container = None
+        self.detail_row = row
+        self.remove_button.setEnabled(row is not None and self.model.can_remove(row))
+
+        if row is None:
+            self.detail_groupbox.setTitle("")
+            self.detail_placeholder.show()
+            return
+        self.detail_placeholder.hide()
+
+        patch = self.model.entry(row)
+        type_label = self.model.type_labels.get(patch.get('type'), '')
+        if self.model.is_rule_row(row):
+            title = f"Regla {self.model.rule_label(patch)} ({type_label})"
+        elif self.model.is_inherited(row):
+            title = f"{patch['patchName']} ({type_label}, de la regla {self.model.rule_of(row)['patchName']})"
+        else:
+            title = f"{patch['patchName']} ({type_label})"
+        self.detail_groupbox.setTitle(title)
 
-                current_value = data.get(param_name_key)
-                is_optional = param_props.get('optional', False)
+        # Preparar schema para el container, inyectando valores actuales
+        parameters_schema_dict = {}
+        for param_props in self.model.parameters_schema(patch.get('type')):
+            param_name_key = param_props.get('name')
+            new_props = param_props.copy()
 
-                if current_value is not None:
-                    new_props['current'] = current_value
-                elif not is_optional:
-                    new_props['current'] = param_props.get('default')
+            current_value = patch.get(param_name_key)
+            if current_value is not None:
+                new_props['current'] = current_value
+            elif not param_props.get('optional', False):
+                new_props['current'] = param_props.get('default')
 
-                parameters_schema_dict[param_name_key] = new_props
+            parameters_schema_dict[param_name_key] = new_props
 
-            container = ParameterContainerWidget(parameters_schema_dict, self.widget_factory)
-            self.patch_widgets_map[patch_name]['container'] = container
-            layout.addWidget(container)
+        self.detail_container = ParameterContainerWidget(parameters_schema_dict, self.widget_factory)
+        self.detail_layout.addWidget(self.detail_container)
 
-        return update_value_input_visibility
+    def _commit_detail(self):
+        """Guarda en el modelo los valores del panel de detalle."""
+        if self.detail_container is None or self.detail_row is None:
+            return
+        self.model.set_parameters(self.detail_row, self.detail_container.get_values())
 
     def get_value(self):
         """
-        Recopila y devuelve la configuración de todos los patches.
+        Recopila y devuelve la configuración de todos los patches: las reglas
+        y las entradas de los patches que no toman la condición de una regla.
         """
-        patches = []
-        for patch_name, widgets in self.patch_widgets_map.items():
-            selected_type_name = widgets['type_combo'].currentData()
-            patch_data = {'patchName': patch_name, 'type': selected_type_name}
-
-            container = widgets.get('container')
-            if container:
-                sub_params = container.get_values()
-                patch_data.update(sub_params)
-
-            patches.append(patch_data)
-        return patches
+        self._commit_detail()
+        return self.model.entries()
 
     def highlight_patch_group(self, patch_name: str, is_selected: bool):
         """
-        Resalta o des-resalta el GroupBox de un patch específico.
+        Resalta o des-resalta la fila de un patch específico.
         """
-        groupbox = self.patch_groupboxes.get(patch_name)
-        if not groupbox:
+        row = self.model.patch_row(patch_name)
+        if row is None:
             return
 
         if is_selected:
-            used_colors = {p['color'] for p in self.highlighted_patches.values()}
+            used_colors = set(self.model.highlights.values())
             available_colors = [c for c in self.highlight_colors if c not in used_colors]
 
-            color = available_colors[0] if available_colors else self.highlight_colors[0]
+            color = available_colors[0] if available_colors else (self.highlight_colors or ["#E6E6FA"])[0]
+            self.model.set_highlight(patch_name, color)
 
-            self.highlighted_patches[patch_name] = {
-                'color': color,
-                'original_style': groupbox.styleSheet()
-            }
-            groupbox.setStyleSheet(f"QGroupBox {{ background-color: {color}; border: 1px solid #A9A9A9; margin-top: 10px;}} QGroupBox::title {{ subcontrol-origin: margin; subcontrol-position: top center; padding: 0 3px; }}")
+            index = self.proxy_model.mapFromSource(self.model.index(row, 0))
+            if index.isValid():
+                self.table.scrollTo(index)
         else:
-            if patch_name in self.highlighted_patches:
-                original_style = self.highlighted_patches[patch_name]['original_style']
-                groupbox.setStyleSheet(original_style)
-                del self.highlighted_patches[patch_name]
+            self.model.set_highlight(patch_name, None)
 
     def deselect_all_highlights(self):
         """
         Quita el resaltado de todos los patches.
         """
-        for patch_name, data in self.highlighted_patches.items():
-            groupbox = self.patch_groupboxes.get(patch_name)
-            if groupbox:
-                groupbox.setStyleSheet(data['original_style'])
-        self.highlighted_patches.clear()
+        self.model.clear_highlights()
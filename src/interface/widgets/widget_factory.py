@@ -11,7 +11,7 @@ class WidgetFactory:
     """
     Fábrica para crear los widgets de parámetros apropiados según el tipo de parámetro.
     """
-    def __init__(self, get_vtk_patch_names_func=None, highlight_colors=None):
+    def __init__(self, get_vtk_patch_names_func=None, highlight_colors=None, get_patch_groups_func=None):
         """
         Inicializa la fábrica de widgets.
 
@@ -20,8 +20,11 @@ class WidgetFactory:
                                                            Requerido para PatchesWidget.
             highlight_colors (list, optional): Lista de colores para resaltar patches.
                                                Requerido para PatchesWidget.
+            get_patch_groups_func (callable, optional): Función para obtener los grupos de patches
+                                                        de la malla (para las reglas por grupo).
         """
         self.get_vtk_patch_names_func = get_vtk_patch_names_func
+        self.get_patch_groups_func = get_patch_groups_func
         self.highlight_colors = highlight_colors if highlight_colors is not None else []
 
         self.widget_map = {
@@ -58,7 +61,8 @@ class WidgetFactory:
             return PatchesWidget(param_props,
                                  widget_factory=self,
                                  get_vtk_patch_names_func=self.get_vtk_patch_names_func,
-                                 highlight_colors=self.highlight_colors)
+                                 highlight_colors=self.highlight_colors,
+                                 get_patch_groups_func=self.get_patch_groups_func)
 
         # Creación de widgets simples
         return widget_class(param_props)
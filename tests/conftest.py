@@ -0,0 +1,47 @@
+import pytest
+import sys
+import os
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.docker_handler import dockerHandler, backends
+from src.config import BACKEND_ENV_VAR
+from tests.foam_cases import write_row_mesh, HEADER, FIELD
+
+
+@pytest.fixture(autouse=True)
+def docker_cli_only(monkeypatch):
+    """
+    Fuerza el backend Docker por CLI (que los tests simulan) aunque la máquina
+    tenga otro backend configurado o el socket del Docker Engine, y descarta el
+    estado cacheado del demonio.
+    """
+    monkeypatch.setenv(BACKEND_ENV_VAR, "docker")
+    monkeypatch.setattr(dockerHandler, "get_engine_client", lambda: None)
+    monkeypatch.setattr(backends, "get_engine_client", lambda: None)
+    dockerHandler.reset_health_cache()
+    yield
+    dockerHandler.reset_health_cache()
+
+
+@pytest.fixture
+def case_path(tmp_path: Path) -> Path:
+    """
+    Dos celdas con alpha.water y U escritos en tres tiempos. Los módulos que
+    necesitan otro caso definen su propio 'case_path'.
+    """
+    case_path = tmp_path / "case"
+    (case_path / "system").mkdir(parents=True)
+    (case_path / "system" / "controlDict").write_text(HEADER.format(cls="dictionary", obj="controlDict"))
+    write_row_mesh(case_path / "constant" / "polyMesh", 0, 2,
+                   [("inlet", "left", "patch", ""), ("outlet", "right", "patch", ""), ("walls", "walls", "wall", "")])
+    for step, time in enumerate(("0", "0.5", "1")):
+        (case_path / time).mkdir()
+        (case_path / time / "alpha.water").write_text(
+            HEADER.format(cls="volScalarField", obj="alpha.water") +
+            FIELD.format(kind="scalar", values=f"{step} {step + 1}", inlet=step))
+        (case_path / time / "U").write_text(
+            HEADER.format(cls="volVectorField", obj="U") +
+            FIELD.format(kind="vector", values=f"({3 * step} {4 * step} 0) (0 0 0)", inlet="(0 0 0)"))
+    return case_path
@@ -0,0 +1,71 @@
+"""Casos de OpenFOAM mínimos compartidos por los tests de lectura de mallas y resultados."""
+from pathlib import Path
+
+
+HEADER = """FoamFile
+{{
+    version     2.0;
+    format      ascii;
+    class       {cls};
+    object      {obj};
+}}
+"""
+
+
+def write_foam_list(path: Path, cls: str, items) -> None:
+    path.write_text(HEADER.format(cls=cls, obj=path.name) + f"\n{len(items)}\n(\n" + "\n".join(items) + "\n)\n")
+
+
+def write_row_mesh(poly_mesh: Path, x0: int, n_cells: int, patches) -> None:
+    """
+    Escribe una fila de 'n_cells' hexaedros unitarios a lo largo de x.
+
+    Args:
+        patches: (nombre, lado, tipo, entradas extra) de cada patch; el lado es
+            'left', 'right', 'walls' o None para un patch sin caras.
+    """
+    poly_mesh.mkdir(parents=True)
+    point = lambda ix, iy, iz: ix * 4 + iy * 2 + iz
+    points = [f"({x0 + ix} {iy} {iz})" for ix in range(n_cells + 1) for iy in (0, 1) for iz in (0, 1)]
+
+    faces = [[point(c + 1, 0, 0), point(c + 1, 1, 0), point(c + 1, 1, 1), point(c + 1, 0, 1)] for c in range(n_cells - 1)]
+    owner = list(range(n_cells - 1))
+    neighbour = list(range(1, n_cells))
+    walls = []
+    for c in range(n_cells):
+        walls += [[point(c, 0, 0), point(c + 1, 0, 0), point(c + 1, 0, 1), point(c, 0, 1)],
+                  [point(c, 1, 0), point(c, 1, 1), point(c + 1, 1, 1), point(c + 1, 1, 0)],
+                  [point(c, 0, 0), point(c, 1, 0), point(c + 1, 1, 0), point(c + 1, 0, 0)],
+                  [point(c, 0, 1), point(c + 1, 0, 1), point(c + 1, 1, 1), point(c, 1, 1)]]
+    sides = {
+        'left': ([[point(0, 0, 0), point(0, 0, 1), point(0, 1, 1), point(0, 1, 0)]], [0]),
+        'right': ([[point(n_cells, 0, 0), point(n_cells, 1, 0), point(n_cells, 1, 1), point(n_cells, 0, 1)]],
+                  [n_cells - 1]),
+        'walls': (walls, [c for c in range(n_cells) for _ in range(4)]),
+        None: ([], []),
+    }
+
+    entries = []
+    for name, side, patch_type, extra in patches:
+        side_faces, side_owner = sides[side]
+        entries.append(f"{name}\n{{\n    type {patch_type};\n    nFaces {len(side_faces)};\n"
+                       f"    startFace {len(faces)};\n{extra}}}")
+        faces += side_faces
+        owner += side_owner
+
+    write_foam_list(poly_mesh / "points", "vectorField", points)
+    write_foam_list(poly_mesh / "faces", "faceList", ["4(" + " ".join(map(str, f)) + ")" for f in faces])
+    write_foam_list(poly_mesh / "owner", "labelList", [str(o) for o in owner])
+    write_foam_list(poly_mesh / "neighbour", "labelList", [str(n) for n in neighbour])
+    write_foam_list(poly_mesh / "boundary", "polyBoundaryMesh", entries)
+
+
+FIELD = """dimensions [0 0 0 0 0 0 0];
+internalField nonuniform List<{kind}> 2({values});
+boundaryField
+{{
+    inlet {{ type fixedValue; value uniform {inlet}; }}
+    outlet {{ type zeroGradient; }}
+    walls {{ type zeroGradient; }}
+}}
+"""
@@ -0,0 +1,127 @@
+import pytest
+import json
+import logging
+import sys
+import os
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import load_execution_config, BACKEND_ENV_VAR
+from src.docker_handler.backends import create_backend, DockerBackend, NativeBackend, FakeBackend
+from src.docker_handler.dockerHandler import DockerHandler
+from src.docker_handler.exceptions import DockerHandlerError
+from src.file_handler.decomposed_case import mesh_is_decomposed, mesh_boundary_file
+
+
+@pytest.fixture
+def case_path(tmp_path: Path) -> Path:
+    case_path = tmp_path / "test_case"
+    (case_path / "system").mkdir(parents=True)
+    (case_path / "constant").mkdir()
+    (case_path / "0").mkdir()
+    (case_path / "0" / "U").write_text("internalField uniform (0 0 0);")
+    (case_path / "system" / "controlDict").write_text("endTime         0.01;\nwriteInterval   0.005;\n")
+    return case_path
+
+
+def test_execution_config_merges_defaults_and_env(tmp_path, monkeypatch):
+    config_path = tmp_path / "execution_config.json"
+    config_path.write_text(json.dumps({"backend": "native", "native": {"openfoam_bashrc": "/opt/of/bashrc"}}))
+
+    monkeypatch.delenv(BACKEND_ENV_VAR)
+    config = load_execution_config(config_path)
+    assert config["backend"] == "native"
+    assert config["native"]["openfoam_bashrc"] == "/opt/of/bashrc"
+    assert config["docker"]["image"] == "cbonamy/sedfoam_2312_ubuntu"
+    assert isinstance(create_backend(config), NativeBackend)
+
+    monkeypatch.setenv(BACKEND_ENV_VAR, "fake")
+    assert isinstance(create_backend(load_execution_config(config_path)), FakeBackend)
+
+
+def test_default_and_unknown_backends(tmp_path):
+    assert isinstance(DockerHandler(tmp_path).backend, DockerBackend)
+    with pytest.raises(DockerHandlerError):
+        create_backend({"backend": "slurm"})
+
+
+def test_unknown_backend_options_are_ignored(caplog):
+    with caplog.at_level(logging.WARNING):
+        backend = create_backend({"backend": "docker", "docker": {"imag": "otra/imagen"}})
+    assert isinstance(backend, DockerBackend)
+    assert backend.image == "cbonamy/sedfoam_2312_ubuntu"
+    assert "imag" in caplog.text
+
+
+def test_fake_backend_emits_solver_log_and_time_directories(case_path):
+    """The fake backend drives the whole pipeline without OpenFOAM."""
+    handler = DockerHandler(case_path, backend=FakeBackend(steps_per_second=0, delta_t=0.001))
+    assert handler.is_docker_running() is True
+
+    lines = list(handler.execute_script_in_docker("run_openfoam.sh"))
+
+    assert sum(line.startswith("Time = ") for line in lines) == 10
+    assert lines[-1] == "End"
+    assert (case_path / "0.005" / "U").exists()
+    assert (case_path / "0.01" / "U").exists()
+
+
+def test_native_backend_runs_script_without_container(case_path, tmp_path):
+    """The native backend sources the configured bashrc and runs in the case directory."""
+    bashrc = tmp_path / "bashrc"
+    bashrc.write_text('interFoam() { echo "interFoam in $(basename $PWD)"; }\n')
+    handler = DockerHandler(case_path, backend=NativeBackend(str(bashrc)))
+
+    assert handler.is_docker_running() is True
+    assert handler.prepare_case_for_paraview() is True
+    assert (case_path / "test_case.foam").exists()
+
+    lines = list(handler.execute_script_in_docker("run_openfoam.sh"))
+    assert lines == ["setFieldsDict not found. Skipping setFields.", "interFoam in test_case"]
+
+
+FAKE_OPENFOAM = """
+mpirun() { shift 2; "$@"; }
+redistributePar() {
+    echo "redistributePar $*"
+    case "$*" in *-decompose*) mkdir -p processor0/constant/polyMesh processor1/constant/polyMesh ;; esac
+}
+snappyHexMesh() { echo "snappyHexMesh $*"; }
+foamToVTK() { echo "foamToVTK $*"; mkdir -p VTK/test_case_0/boundary; }
+blockMesh() { echo "blockMesh"; }
+interFoam() { echo "interFoam"; }
+"""
+
+
+def test_parallel_meshing_reconstructs_only_for_serial_steps(case_path, tmp_path):
+    bashrc = tmp_path / "bashrc"
+    bashrc.write_text(FAKE_OPENFOAM)
+    handler = DockerHandler(case_path, backend=NativeBackend(str(bashrc)))
+
+    lines = list(handler.execute_script_in_docker("run_snappyHexMeshDict_parallel.sh", 2))
+    assert "redistributePar -decompose -parallel" in lines
+    assert "snappyHexMesh -parallel -overwrite" in lines
+    assert not any(line.startswith("foamToVTK") for line in lines)
+    assert not any("-reconstruct" in line for line in lines)
+    assert mesh_is_decomposed(case_path)
+    assert mesh_boundary_file(case_path) == case_path / "processor0" / "constant" / "polyMesh" / "boundary"
+
+    # La visualización usa la malla descompuesta; la corrida serial la reconstruye
+    lines = list(handler.execute_script_in_docker("run_foamToVTK.sh"))
+    assert lines == ["foamToVTK -parallel -region region0 -no-internal -no-fields"]
+    lines = list(handler.execute_script_in_docker("run_openfoam.sh"))
+    assert "redistributePar -reconstruct -parallel -constant" in lines
+    assert lines[-1] == "interFoam"
+    assert not mesh_is_decomposed(case_path)
+
+
+def test_new_base_mesh_discards_decomposed_mesh(case_path, tmp_path):
+    bashrc = tmp_path / "bashrc"
+    bashrc.write_text(FAKE_OPENFOAM)
+    handler = DockerHandler(case_path, backend=NativeBackend(str(bashrc)))
+    list(handler.execute_script_in_docker("run_snappyHexMeshDict_parallel.sh", 2))
+
+    list(handler.execute_script_in_docker("run_blockMeshDict.sh"))
+    assert not mesh_is_decomposed(case_path)
+    assert not (case_path / "processor0").exists()
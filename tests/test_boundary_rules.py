@@ -0,0 +1,98 @@
+import pytest
+import sys
+import os
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.file_handler.boundary_rules import (read_patch_groups, rule_for, compact_boundary_field, is_pattern,
+                                             pattern_name)
+from src.file_handler.openfoam_models.U import U
+
+BOUNDARY = """
+FoamFile
+{
+    format      ascii;
+    class       polyBoundaryMesh;
+    object      boundary;
+}
+
+4
+(
+    inlet
+    {
+        type            patch;
+        nFaces          10;
+        startFace       100;
+    }
+    hull_1
+    {
+        type            wall;
+        inGroups        List<word> 2(wall hull);
+        nFaces          10;
+        startFace       110;
+    }
+    hull_2
+    {
+        type            wall;
+        inGroups        2(wall hull);
+        nFaces          10;
+        startFace       120;
+    }
+    procBoundary0to1
+    {
+        type            processor;
+        inGroups        List<word> 1(processor);
+        nFaces          5;
+        startFace       130;
+    }
+)
+"""
+
+PATCHES = ["inlet", "hull_1", "hull_2"]
+GROUPS = {"wall": ["hull_1", "hull_2"], "hull": ["hull_1", "hull_2"]}
+
+
+def test_read_patch_groups(tmp_path: Path):
+    boundary_path = tmp_path / "boundary"
+    boundary_path.write_text(BOUNDARY)
+    assert read_patch_groups(boundary_path) == GROUPS
+    assert read_patch_groups(tmp_path / "missing") == {}
+
+
+def test_rule_for_follows_openfoam_precedence():
+    rules = [{'patchName': '".*"', 'type': 'zeroGradient'},
+             {'patchName': 'wall', 'type': 'noSlip'},
+             {'patchName': '"in.*"', 'type': 'fixedValue'}]
+    # Los grupos tienen prioridad sobre los patrones; entre patrones, el último
+    assert rule_for("hull_1", rules, GROUPS)['type'] == 'noSlip'
+    assert rule_for("inlet", rules, GROUPS)['type'] == 'fixedValue'
+    assert rule_for("outlet", rules, GROUPS)['type'] == 'zeroGradient'
+    assert rule_for("outlet", rules[1:], GROUPS) is None
+    assert is_pattern(pattern_name("wall.*")) and not is_pattern("wall")
+
+
+def test_compact_drops_redundant_entries_and_folds_groups():
+    entries = [{'patchName': 'inlet', 'type': 'fixedValue', 'value': {'x': 1, 'y': 0, 'z': 0}},
+               {'patchName': 'hull_1', 'type': 'noSlip'},
+               {'patchName': 'hull_2', 'type': 'noSlip'},
+               {'patchName': 'old_patch', 'type': 'slip'}]
+    compact = compact_boundary_field(entries, PATCHES, GROUPS)
+    assert compact == [entries[0], {'patchName': 'wall', 'type': 'noSlip'}]
+
+    # Una entrada igual a la regla que ya cubre al patch sobra
+    entries = [{'patchName': 'hull_1', 'type': 'slip'}, {'patchName': 'hull_2', 'type': 'noSlip'},
+               {'patchName': '"hull_.*"', 'type': 'slip'}]
+    assert compact_boundary_field(entries, ["hull_1", "hull_2"]) == entries[1:]
+
+
+def test_pattern_entries_are_rendered_and_validated():
+    u = U()
+    u.update_parameters({'boundaryField': [{'patchName': '"(inlet|outlet).*"', 'type': 'zeroGradient'},
+                                           {'patchName': 'wall', 'type': 'noSlip'}]})
+    content = u._get_string()
+    assert '"(inlet|outlet).*"' in content
+    assert "wall\n" in content
+
+    with pytest.raises(ValueError, match="expresión regular"):
+        u.update_parameters({'boundaryField': [{'patchName': '"wall[.*"', 'type': 'noSlip'}]})
@@ -0,0 +1,94 @@
+import pytest
+import sys
+import os
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.file_handler.decomposed_case import (decomposition_signature, can_reuse_decomposition, parallel_run_env,
+                                              pending_reconstruction, decomposed_times, decomposed_processor_count,
+                                              SIGNATURE_FILE)
+from src.file_handler.openfoam_models.controlDict import controlDict
+
+
+@pytest.fixture
+def case_path(tmp_path: Path) -> Path:
+    case_path = tmp_path / "case"
+    (case_path / "constant" / "polyMesh").mkdir(parents=True)
+    (case_path / "constant" / "polyMesh" / "points").write_text("8 ( ... )")
+    (case_path / "0").mkdir()
+    (case_path / "0" / "alpha.water").write_text("internalField uniform 0;")
+    (case_path / "system").mkdir()
+    (case_path / "system" / "decomposeParDict").write_text("numberOfSubdomains 2;")
+    return case_path
+
+
+def decompose(case_path: Path, num_processors: int, times=("0",)):
+    """Simula lo que deja el script paralelo tras descomponer y correr."""
+    for i in range(num_processors):
+        for time in times:
+            (case_path / f"processor{i}" / time).mkdir(parents=True, exist_ok=True)
+    (case_path / SIGNATURE_FILE).write_text(decomposition_signature(case_path, num_processors) + "\n")
+
+
+def test_signature_tracks_mesh_fields_and_processor_count(case_path):
+    signature = decomposition_signature(case_path, 2)
+    assert decomposition_signature(case_path, 2) == signature
+    assert decomposition_signature(case_path, 4) != signature
+
+    (case_path / "0" / "alpha.water").write_text("internalField uniform 1;")
+    assert decomposition_signature(case_path, 2) != signature
+
+
+def test_decomposition_is_reused_only_when_unchanged(case_path):
+    assert "SKIP_DECOMPOSE" not in parallel_run_env(case_path, 2)
+
+    decompose(case_path, 2)
+    env = parallel_run_env(case_path, 2)
+    assert env["SKIP_DECOMPOSE"] == "1"
+    assert env["RECONSTRUCT_TIMES"] == "latest"
+    assert "SKIP_DECOMPOSE" not in parallel_run_env(case_path, 2, keep_decomposed=False)
+
+    # Otra cantidad de procesadores o una malla distinta obligan a descomponer de nuevo
+    assert not can_reuse_decomposition(case_path, 4, decomposition_signature(case_path, 4))
+    (case_path / "constant" / "polyMesh" / "points").write_text("9 ( ... )")
+    assert "SKIP_DECOMPOSE" not in parallel_run_env(case_path, 2)
+
+
+def test_pending_reconstruction_lists_decomposed_only_times(case_path):
+    decompose(case_path, 2, times=("0", "0.5", "1", "1.5"))
+    (case_path / "1.5").mkdir()
+
+    assert decomposed_times(case_path) == ["0", "0.5", "1", "1.5"]
+    assert pending_reconstruction(case_path) == ["0.5", "1"]
+
+
+def test_collated_layout_is_detected_and_reused(case_path):
+    # fileHandler collated con grupos de E/S de 2 procesadores
+    for group in ("processors4_0-1", "processors4_2-3"):
+        for time in ("0", "0.5"):
+            (case_path / group / time).mkdir(parents=True)
+    signature = decomposition_signature(case_path, 4, "collated")
+    (case_path / SIGNATURE_FILE).write_text(signature)
+
+    assert decomposed_processor_count(case_path) == 4
+    assert decomposed_times(case_path) == ["0", "0.5"]
+    assert pending_reconstruction(case_path) == ["0.5"]
+
+    env = parallel_run_env(case_path, 4, file_handler="collated", io_ranks=[0, 2])
+    assert env["SKIP_DECOMPOSE"] == "1"
+    assert env["FOAM_FILEHANDLER"] == "collated"
+    assert env["FOAM_IORANKS"] == "(0 2)"
+    # Cambiar el fileHandler cambia el formato en disco: hay que descomponer de nuevo
+    assert "SKIP_DECOMPOSE" not in parallel_run_env(case_path, 4)
+
+
+def test_control_dict_writes_io_switches():
+    control_dict = controlDict()
+    assert control_dict.get_io_ranks(8) == []
+
+    control_dict.update_parameters({'fileHandler': 'collated', 'ioRanks': 4, 'maxThreadFileBufferSize': 0})
+    content = control_dict._get_string()
+    assert "fileHandler     collated;" in content
+    assert "maxThreadFileBufferSize 0" in content
+    assert control_dict.get_io_ranks(8) == [0, 4]
@@ -0,0 +1,95 @@
+import pytest
+import sys
+import os
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.file_handler.decomposition_planner import (plan_decomposition, plan_for_case, apply_plan,
+                                                    best_divisions, mesh_statistics)
+from src.file_handler.openfoam_models.decomposeParDict import decomposeParDict
+from src.file_handler.exceptions import FileHandlerError
+
+HEADER = """FoamFile
+{{
+    version     2.0;
+    format      ascii;
+    class       {cls};
+    note        "{note}";
+    object      {obj};
+}}
+"""
+
+
+def write_box_mesh(case_path: Path, cells=(10, 10, 10), size=(1.0, 1.0, 1.0), face_sizes=None):
+    """Escribe una malla mínima en ascii: puntos de una grilla, owner con nota y caras."""
+    poly_mesh = case_path / "constant" / "polyMesh"
+    poly_mesh.mkdir(parents=True)
+    axes = [np.linspace(0.0, size[i], cells[i] + 1) for i in range(3)]
+    points = np.array(np.meshgrid(*axes, indexing="ij")).reshape(3, -1).T
+    n_cells = int(np.prod(cells))
+
+    lines = [f"({x:g} {y:g} {z:g})" for x, y, z in points]
+    (poly_mesh / "points").write_text(
+        HEADER.format(cls="vectorField", note="", obj="points") + f"\n{len(points)}\n(\n" + "\n".join(lines) + "\n)\n")
+    (poly_mesh / "owner").write_text(
+        HEADER.format(cls="labelList", note=f"nPoints:{len(points)}  nCells:{n_cells}  nFaces:6  nInternalFaces:0",
+                      obj="owner") + "\n6\n(\n0\n0\n0\n0\n0\n0\n)\n")
+    face_sizes = face_sizes or [4] * 6
+    faces = ["{}({})".format(n, " ".join(["0"] * n)) for n in face_sizes]
+    (poly_mesh / "faces").write_text(
+        HEADER.format(cls="faceList", note="", obj="faces") + f"\n{len(faces)}\n(\n" + "\n".join(faces) + "\n)\n")
+
+
+def test_divisions_minimize_interface_area():
+    # Canal largo: conviene cortar solo a lo largo
+    assert best_divisions(4, np.array([10.0, 1.0, 1.0])) == (4, 1, 1)
+    # Cubo: conviene cortar en dos direcciones
+    assert sorted(best_divisions(4, np.array([1.0, 1.0, 1.0]))) == [1, 2, 2]
+    # Caso 2D (z de una celda): nunca se divide z
+    assert best_divisions(8, np.array([1.0, 1.0, 1.0]), (False, False, True))[2] == 1
+
+
+def test_subdomain_count_follows_cells_per_core_and_cpu_limit():
+    plan = plan_decomposition(200000, [10.0, 1.0, 1.0], cpu_count=16, cells_per_core=50000)
+    assert plan['numberOfSubdomains'] == 4
+    assert plan['method'] == ['simple', {'n': {'x': 4, 'y': 1, 'z': 1}, 'delta': 0.001}]
+
+    plan = plan_decomposition(10 ** 7, [1.0, 1.0, 1.0], cpu_count=8, cells_per_core=50000)
+    assert plan['numberOfSubdomains'] == 8
+    assert plan['method'][0] == 'hierarchical'
+    assert plan['divisions'] == (2, 2, 2)
+
+    assert plan_decomposition(1000, [1.0, 1.0, 1.0], cpu_count=8)['numberOfSubdomains'] == 1
+
+
+def test_scotch_for_unstructured_or_slab_decompositions():
+    assert plan_decomposition(10 ** 6, [1, 1, 1], cpu_count=4, quad_fraction=0.6)['method'] == ['scotch', {}]
+    # 7 subdominios en un cubo solo admiten tajadas (7 1 1)
+    assert plan_decomposition(7 * 50000, [1, 1, 1], cpu_count=7, cells_per_core=50000)['method'][0] == 'scotch'
+
+
+def test_plan_for_case_reads_poly_mesh_and_applies_to_model(tmp_path):
+    write_box_mesh(tmp_path, cells=(40, 10, 1), size=(4.0, 1.0, 0.1))
+
+    stats = mesh_statistics(tmp_path)
+    assert stats['n_cells'] == 400
+    assert stats['single_cell_axes'] == (False, False, True)
+    assert stats['lengths'] == pytest.approx([4.0, 1.0, 0.1])
+    assert stats['quad_fraction'] == 1.0
+
+    plan = plan_for_case(tmp_path, cpu_count=4, cells_per_core=100)
+    assert plan['numberOfSubdomains'] == 4
+    assert plan['divisions'] == (4, 1, 1)
+
+    model = decomposeParDict()
+    apply_plan(model, plan)
+    assert model.numberOfSubdomains == 4
+    assert "n               (4 1 1);" in model._get_string()
+
+
+def test_plan_for_case_without_mesh(tmp_path):
+    with pytest.raises(FileHandlerError):
+        plan_for_case(tmp_path)
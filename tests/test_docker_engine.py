@@ -0,0 +1,165 @@
+import pytest
+import asyncio
+import json
+import struct
+import sys
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.docker_handler.docker_engine import DockerEngineClient, DaemonHealthMonitor, EngineDockerJob
+from src.docker_handler.exceptions import DockerDaemonError
+
+
+class FakeEngineHandler(BaseHTTPRequestHandler):
+    """Responde como el Docker Engine a las rutas que usa el cliente."""
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.server.requests.append(("GET", self.path))
+        if self.path.endswith("/_ping"):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"OK")
+        else:
+            self._send_json(404, {"message": "not found"})
+
+    def do_DELETE(self):
+        self.server.requests.append(("DELETE", self.path))
+        self._send_json(204)
+
+    def do_POST(self):
+        self.server.requests.append(("POST", self.path))
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        path = self.path.split("?")[0]
+
+        if path.endswith("/containers/create"):
+            self.server.created.append(body)
+            self._send_json(201, {"Id": "abc123"})
+        elif path.endswith("/start") or path.endswith("/stop"):
+            self._send_json(204)
+        elif path.endswith("/wait"):
+            self._send_json(200, {"StatusCode": 3})
+        elif path.endswith("/attach"):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/vnd.docker.raw-stream")
+            self.end_headers()
+            # Tramas multiplexadas; una línea queda partida entre dos tramas
+            for stream, chunk in ((1, b"Time = 0.1\nTime = 0."), (2, b"2\nEnd")):
+                self.wfile.write(struct.pack(">BxxxL", stream, len(chunk)) + chunk)
+            self.close_connection = True
+        else:
+            self._send_json(404, {"message": "not found"})
+
+
+@pytest.fixture
+def fake_engine():
+    directory = tempfile.mkdtemp()
+    socket_path = os.path.join(directory, "docker.sock")
+    server = socketserver.ThreadingUnixStreamServer(socket_path, FakeEngineHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.requests = []
+    server.created = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, socket_path
+    server.shutdown()
+    server.server_close()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_requests_reuse_a_persistent_connection(fake_engine):
+    """Several API calls go over a single keep-alive connection."""
+    server, socket_path = fake_engine
+    client = DockerEngineClient(socket_path)
+
+    assert client.ping() is True
+    container_id = client.create_container("image", ["/run.sh", "2"], ["/case:/case"], name="job", entrypoint=["bash"])
+    client.start_container(container_id)
+    client.stop_container(container_id)
+    client.remove_container(container_id, force=True)
+    assert client.ping() is True
+
+    assert container_id == "abc123"
+    assert server.connections == 1
+    assert server.created[0]["Entrypoint"] == ["bash"]
+    assert server.created[0]["HostConfig"]["Binds"] == ["/case:/case"]
+    client.close()
+
+
+def test_attach_demultiplexes_lines_and_wait_returns_status(fake_engine):
+    server, socket_path = fake_engine
+    client = DockerEngineClient(socket_path)
+
+    assert list(client.attach_lines("abc123")) == ["Time = 0.1", "Time = 0.2", "End"]
+    assert client.wait_container("abc123") == 3
+
+
+def test_ping_is_false_without_daemon(tmp_path):
+    client = DockerEngineClient(str(tmp_path / "missing.sock"))
+    assert client.ping() is False
+    with pytest.raises(DockerDaemonError):
+        client.info()
+
+
+def test_health_monitor_caches_until_ttl_expires():
+    now = [0.0]
+    checks = []
+
+    def check():
+        checks.append(now[0])
+        return True
+
+    monitor = DaemonHealthMonitor(check, ttl=30, clock=lambda: now[0], background=False)
+    assert monitor.is_healthy() is True
+    now[0] = 10
+    assert monitor.is_healthy() is True
+    assert checks == [0.0]
+
+    now[0] = 31
+    assert monitor.is_healthy() is True
+    assert checks == [0.0, 31]
+
+    monitor.invalidate()
+    monitor.is_healthy()
+    assert len(checks) == 3
+
+
+def test_engine_job_streams_output_and_exit_code(fake_engine, tmp_path):
+    """EngineDockerJob exposes the same async interface as the CLI-based DockerJob."""
+    server, socket_path = fake_engine
+    job = EngineDockerJob(DockerEngineClient(socket_path), "abc123", "run_openfoam.sh", "job", tmp_path)
+
+    async def consume():
+        lines = [line async for line in job]
+        return_code = await job.wait(check=False)
+        await job.close()
+        return lines, return_code
+
+    lines, return_code = asyncio.run(consume())
+    assert lines == ["Time = 0.1", "Time = 0.2", "End"]
+    assert return_code == 3
+    assert server.requests[-1][0] == "DELETE"
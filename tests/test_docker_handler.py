@@ -137,6 +137,7 @@ import pytest
 from pathlib import Path
 import sys
 import os
+import asyncio
 import subprocess
 from unittest.mock import patch, MagicMock
 
@@ -180,6 +181,18 @@ def test_is_docker_running_not_found(mock_run, docker_handler: DockerHandler):
     assert docker_handler.is_docker_running() is False
     mock_run.assert_called_once()
 
+@patch('src.docker_handler.dockerHandler.subprocess.run')
+def test_is_docker_running_is_cached(mock_run, docker_handler: DockerHandler):
+    """Repeated health checks reuse the cached state until forced."""
+    mock_run.return_value = None
+    assert docker_handler.is_docker_running() is True
+    assert DockerHandler(docker_handler.case_path).is_docker_running() is True
+    mock_run.assert_called_once()
+
+    mock_run.side_effect = subprocess.CalledProcessError(1, "docker info")
+    assert docker_handler.is_docker_running(use_cache=False) is False
+    assert mock_run.call_count == 2
+
 @patch('src.docker_handler.dockerHandler.subprocess.run')
 def test_prepare_case_for_paraview_success(mock_run, docker_handler: DockerHandler):
     """Test prepare_case_for_paraview succeeds."""
@@ -203,56 +216,114 @@ def test_prepare_case_for_paraview_not_found(mock_run, docker_handler: DockerHan
         docker_handler.prepare_case_for_paraview()
     mock_run.assert_called_once()
 
-@patch('src.docker_handler.dockerHandler.subprocess.run')
-@patch('src.docker_handler.dockerHandler.subprocess.Popen')
-def test_execute_script_in_docker_success(mock_popen, mock_run, docker_handler: DockerHandler):
+class FakeStream:
+    """StreamReader falso que devuelve las líneas indicadas."""
+    def __init__(self, lines):
+        self._lines = [line.encode() + b"\n" for line in lines]
+
+    async def readline(self):
+        return self._lines.pop(0) if self._lines else b""
+
+class FakeProcess:
+    """Proceso asyncio falso."""
+    def __init__(self, lines=(), return_code=0):
+        self.stdout = FakeStream(lines)
+        self.returncode = return_code
+
+    async def wait(self):
+        return self.returncode
+
+    async def communicate(self):
+        return b"", b""
+
+def fake_docker(run_lines=(), run_return_code=0, calls=None):
+    """Crea un reemplazo de asyncio.create_subprocess_exec que simula la CLI de Docker."""
+    async def _create_subprocess_exec(*args, **kwargs):
+        if calls is not None:
+            calls.append(args)
+        if args[1] == "run":
+            return FakeProcess(run_lines, run_return_code)
+        return FakeProcess()
+    return _create_subprocess_exec
+
+def test_execute_script_in_docker_success(docker_handler: DockerHandler):
     """Test execute_script_in_docker succeeds and yields correct output."""
-    mock_process = MagicMock()
-    mock_process.stdout.readline.side_effect = ['line 1', 'line 2', '']
-    mock_process.wait.return_value = 0
-    mock_popen.return_value = mock_process
-
-    script_name = "test_script.sh"
-    output = list(docker_handler.execute_script_in_docker(script_name))
+    calls = []
+    with patch('asyncio.create_subprocess_exec', side_effect=fake_docker(['line 1', 'line 2'], 0, calls)):
+        output = list(docker_handler.execute_script_in_docker("test_script.sh"))
 
     assert output == ["line 1", "line 2"]
-    mock_popen.assert_called_once()
-    mock_run.assert_called_once() # For `docker rm`
+    assert [c[1] for c in calls] == ["run", "rm"]  # `docker run` y luego `docker rm`
 
-@patch('src.docker_handler.dockerHandler.subprocess.run')
-@patch('src.docker_handler.dockerHandler.subprocess.Popen')
-def test_execute_script_in_docker_failure(mock_popen, mock_run, docker_handler: DockerHandler):
+def test_execute_script_passes_environment_and_scripts_dir(docker_handler: DockerHandler):
+    """Extra environment variables reach the container and the scripts folder is mounted."""
+    calls = []
+    with patch('asyncio.create_subprocess_exec', side_effect=fake_docker(['ok'], 0, calls)):
+        list(docker_handler.execute_script_in_docker("run_openfoam_parallel.sh", 4, {"SKIP_DECOMPOSE": "1"}))
+
+    run_args = calls[0]
+    assert run_args[run_args.index("-e") + 1] == "SKIP_DECOMPOSE=1"
+    assert run_args[-2:] == ("/scripts/run_openfoam_parallel.sh", "4")
+
+def test_execute_script_in_docker_failure(docker_handler: DockerHandler):
     """Test execute_script_in_docker yields an error and raises ContainerExecutionError on script failure."""
-    mock_process = MagicMock()
-    mock_process.stdout.readline.side_effect = ['some output', '']
-    mock_process.wait.return_value = 1
-    mock_popen.return_value = mock_process
+    calls = []
+    with patch('asyncio.create_subprocess_exec', side_effect=fake_docker(['some output'], 1, calls)):
+        generator = docker_handler.execute_script_in_docker("failing_script.sh")
 
-    script_name = "failing_script.sh"
-    generator = docker_handler.execute_script_in_docker(script_name)
+        assert next(generator) == 'some output'
+        assert 'Error: La ejecución de failing_script.sh falló' in next(generator)
 
-    assert next(generator) == 'some output'
-    assert 'Error: La ejecución de failing_script.sh falló' in next(generator)
+        with pytest.raises(ContainerExecutionError):
+            list(generator)
 
-    with pytest.raises(ContainerExecutionError):
-        list(generator)
-    
-    mock_popen.assert_called_once()
-    mock_run.assert_called_once() # For `docker rm`
+    assert [c[1] for c in calls] == ["run", "rm"]
 
-@patch('src.docker_handler.dockerHandler.subprocess.run')
-@patch('src.docker_handler.dockerHandler.subprocess.Popen')
-def test_execute_script_in_docker_not_found(mock_popen, mock_run, docker_handler: DockerHandler):
+def test_execute_script_in_docker_not_found(docker_handler: DockerHandler):
     """Test execute_script_in_docker yields an error and raises DockerNotInstalledError."""
-    mock_popen.side_effect = FileNotFoundError
+    with patch('asyncio.create_subprocess_exec', side_effect=FileNotFoundError):
+        generator = docker_handler.execute_script_in_docker("any_script.sh")
 
-    script_name = "any_script.sh"
-    generator = docker_handler.execute_script_in_docker(script_name)
+        assert "Error: Comando 'docker' no encontrado" in next(generator)
 
-    assert "Error: Comando 'docker' no encontrado" in next(generator)
+        with pytest.raises(DockerNotInstalledError):
+            list(generator)
 
-    with pytest.raises(DockerNotInstalledError):
-        list(generator)
-    
-    mock_popen.assert_called_once()
-    mock_run.assert_called_once() # For `docker rm`
\ No newline at end of file
+def test_async_job_api_runs_concurrently(tmp_path: Path):
+    """Several jobs can be driven by one event loop: start, iterate output and await completion."""
+    handlers = []
+    for name in ("case_a", "case_b"):
+        case_path = tmp_path / name
+        case_path.mkdir()
+        handlers.append(DockerHandler(case_path))
+
+    async def run_job(handler):
+        job = await handler.start_job("run_openfoam.sh")
+        lines = [line async for line in job]
+        return_code = await job.wait()
+        await job.close()
+        return lines, return_code
+
+    async def main():
+        return await asyncio.gather(*(run_job(h) for h in handlers))
+
+    with patch('asyncio.create_subprocess_exec', side_effect=fake_docker(['Time = 0.1', 'End'], 0)):
+        results = asyncio.run(main())
+
+    assert results == [(['Time = 0.1', 'End'], 0), (['Time = 0.1', 'End'], 0)]
+
+def test_stop_simulation_async_cancels_current_job(docker_handler: DockerHandler):
+    """stop_simulation_async issues `docker stop` without blocking and flags the job as cancelled."""
+    calls = []
+
+    async def main():
+        job = await docker_handler.start_job("run_openfoam.sh")
+        stopped = await docker_handler.stop_simulation_async()
+        return job, stopped
+
+    with patch('asyncio.create_subprocess_exec', side_effect=fake_docker([], 137, calls)):
+        job, stopped = asyncio.run(main())
+
+    assert stopped is True
+    assert job.was_cancelled and docker_handler.was_stopped_by_user
+    assert calls[-1][1:3] == ("stop", "-t")
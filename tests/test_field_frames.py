@@ -0,0 +1,46 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.file_handler.field_frames import (FieldFrameReader, FrameCache, case_times, case_fields, frame_range,
+                                           FIELD_ARRAY, PATCH_ID_ARRAY, SLICE_PATCH_ID)
+
+
+class FakeFrame:
+    def __init__(self, kib):
+        self.actual_memory_size = kib
+
+
+def test_frames_color_patches_and_slice_by_field(case_path):
+    assert case_times(case_path) == ["0", "0.5", "1"]
+    assert case_fields(case_path) == ["alpha.water", "U"]
+
+    reader = FieldFrameReader(case_path)
+    frame = reader.read_frame("0.5", "alpha.water")
+    patch_ids = list(frame.cell_data[PATCH_ID_ARRAY])
+    assert patch_ids == [0, 1] + [2] * 8
+    # El outlet (zeroGradient) toma el valor de la celda vecina
+    assert list(frame.cell_data[FIELD_ARRAY][:2]) == [1.0, 2.0]
+    assert frame_range(frame) == (1.0, 2.0)
+
+    # El mismo lector sirve para otros tiempos; los vectores se muestran por su magnitud
+    frame = reader.read_frame("1", "U", slice_axis="x")
+    assert SLICE_PATCH_ID in frame.cell_data[PATCH_ID_ARRAY]
+    assert frame_range(frame) == (0.0, 10.0)
+
+
+def test_cache_evicts_least_recently_used_frames():
+    cache = FrameCache(max_bytes=3 * 1024)
+    for key in "abc":
+        cache.put(key, FakeFrame(1))
+    assert cache.get("a") is not None  # 'a' pasa a ser el más reciente
+
+    cache.put("d", FakeFrame(1))
+    assert "b" not in cache
+    assert all(key in cache for key in "acd")
+    assert cache.nbytes == 3 * 1024
+
+    # Un cuadro más grande que el límite desplaza a todos los demás, pero se guarda
+    cache.put("e", FakeFrame(10))
+    assert len(cache) == 1 and "e" in cache
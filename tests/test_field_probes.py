@@ -0,0 +1,67 @@
+import pytest
+import sys
+import os
+import csv
+import shutil
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.file_handler.field_probes import ProbeSampler, mesh_index, line_integral, write_samples_csv
+from src.file_handler.decomposed_case import MESH_DECOMPOSED_FILE
+from src.file_handler.exceptions import FileHandlerError
+from tests.foam_cases import write_row_mesh, HEADER, FIELD
+
+
+def test_probe_and_line_over_time(case_path, tmp_path):
+    sampler = ProbeSampler(case_path)
+    # El índice de la malla se arma una sola vez
+    assert mesh_index(case_path) is sampler.index
+
+    probe = sampler.sample([(0.5, 0.5, 0.5), (1.5, 0.5, 0.5), (5, 0.5, 0.5)], "alpha.water")
+    assert probe['times'] == ["0", "0.5", "1"]
+    assert probe['values'][:, :2].tolist() == [[0, 1], [1, 2], [2, 3]]
+    # Fuera de la malla
+    assert np.isnan(probe['values'][:, 2]).all()
+
+    velocity = sampler.sample([(0.5, 0.5, 0.5)], "U", times=["1"])
+    assert velocity['values'].shape == (1, 1, 3)
+    assert velocity['values'][0, 0].tolist() == [6, 8, 0]
+
+    # Integral a lo largo de las dos celdas (de largo 1): la suma de sus valores
+    line = sampler.sample_line((0, 0.5, 0.5), (2, 0.5, 0.5), "alpha.water", resolution=401)
+    assert line_integral(line) == pytest.approx([1, 3, 5], abs=0.01)
+
+    line = sampler.sample_line((0, 0.5, 0.5), (2, 0.5, 0.5), "alpha.water", resolution=5)
+    assert line['distance'].tolist() == [0, 0.5, 1, 1.5, 2]
+
+    path = write_samples_csv(line, tmp_path / "line.csv")
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["time", "point", "x", "y", "z", "distance", "alpha.water"]
+    assert len(rows) == 1 + 3 * 5
+    assert rows[-1] == ["1", "4", "2", "0.5", "0.5", "2", "3"]
+
+    with pytest.raises(FileHandlerError):
+        sampler.sample([(5, 5, 5)], "alpha.water")
+
+
+def test_decomposed_case_is_sampled_from_processors(case_path):
+    shutil.rmtree(case_path / "constant" / "polyMesh")
+    (case_path / MESH_DECOMPOSED_FILE).write_text("2\n")
+    processor = "    myProcNo {};\n    neighbProcNo {};\n"
+    for i, (x0, inlet, outlet, side) in enumerate([(0, "left", None, "right"), (1, None, "right", "left")]):
+        root = case_path / f"processor{i}"
+        write_row_mesh(root / "constant" / "polyMesh", x0, 1,
+                       [("inlet", inlet, "patch", ""), ("outlet", outlet, "patch", ""),
+                        ("walls", "walls", "wall", ""),
+                        (f"procBoundary{i}to{1 - i}", side, "processor", processor.format(i, 1 - i))])
+        (root / "1").mkdir()
+        (root / "1" / "alpha.water").write_text(
+            HEADER.format(cls="volScalarField", obj="alpha.water") +
+            # Una celda por processor
+            FIELD.format(kind="scalar", values=f"{10 + i}", inlet=0).replace(" 2(", " 1("))
+
+    probe = ProbeSampler(case_path).sample([(0.5, 0.5, 0.5), (1.5, 0.5, 0.5)], "alpha.water", times=["1"])
+    assert probe['values'].tolist() == [[10, 11]]
@@ -383,6 +383,14 @@ def test_initialize_parameters_from_schema(file_handler: FileHandler):
     assert internal_field[0] == 'uniform'
     assert 'value' in internal_field[1]
 
+def test_initialize_parameters_from_schema_with_patch_groups(file_handler: FileHandler):
+    """Test that groups whose patches share the default condition become one entry."""
+    patch_names = ["inlet", "hull_1", "hull_2"]
+    file_handler.initialize_parameters_from_schema(patch_names, {"wall": ["hull_1", "hull_2"]})
+
+    boundary_field = file_handler.files['U'].get_editable_parameters()['boundaryField']['current']
+    assert boundary_field == [{'patchName': 'inlet', 'type': 'noSlip'}, {'patchName': 'wall', 'type': 'noSlip'}]
+
 def test_get_solver_and_processors(file_handler: FileHandler):
     """Test that get_solver and get_number_of_processors return correct values from JSON."""
     case_path = file_handler.get_case_path()
@@ -0,0 +1,66 @@
+import pytest
+import sys
+import os
+import shutil
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.file_handler.foam_reader import has_poly_mesh, boundary_patch_names, read_boundary_patches
+from src.file_handler.decomposed_case import MESH_DECOMPOSED_FILE
+from src.file_handler.exceptions import FileHandlerError
+from tests.foam_cases import write_row_mesh, HEADER
+
+
+@pytest.fixture
+def case_path(tmp_path: Path) -> Path:
+    """Dos celdas con inlet, outlet y walls, reconstruidas y descompuestas en dos processor*."""
+    case_path = tmp_path / "case"
+    (case_path / "system").mkdir(parents=True)
+    (case_path / "system" / "controlDict").write_text(HEADER.format(cls="dictionary", obj="controlDict"))
+    (case_path / "0").mkdir()
+    write_row_mesh(case_path / "constant" / "polyMesh", 0, 2,
+                   [("inlet", "left", "patch", ""), ("outlet", "right", "patch", ""), ("walls", "walls", "wall", "")])
+
+    processor = "    myProcNo {};\n    neighbProcNo {};\n"
+    write_row_mesh(case_path / "processor0" / "constant" / "polyMesh", 0, 1,
+                   [("inlet", "left", "patch", ""), ("outlet", None, "patch", ""), ("walls", "walls", "wall", ""),
+                    ("procBoundary0to1", "right", "processor", processor.format(0, 1))])
+    write_row_mesh(case_path / "processor1" / "constant" / "polyMesh", 1, 1,
+                   [("inlet", None, "patch", ""), ("outlet", "right", "patch", ""), ("walls", "walls", "wall", ""),
+                    ("procBoundary1to0", "left", "processor", processor.format(1, 0))])
+    for i in range(2):
+        (case_path / f"processor{i}" / "0").mkdir()
+    return case_path
+
+
+def test_reads_patches_from_reconstructed_mesh(case_path):
+    assert has_poly_mesh(case_path)
+    assert boundary_patch_names(case_path) == ["inlet", "outlet", "walls"]
+
+    surfaces = read_boundary_patches(case_path)
+    assert list(surfaces) == ["inlet", "outlet", "walls"]
+    assert [surfaces[name].n_cells for name in surfaces] == [1, 1, 8]
+    assert surfaces["outlet"].bounds[0] == pytest.approx(2.0)
+    # Solo la geometría: ningún campo
+    assert not surfaces["walls"].cell_data.keys()
+
+    assert list(read_boundary_patches(case_path, ["walls"])) == ["walls"]
+
+
+def test_mesh_only_decomposed_is_read_from_processors(case_path):
+    shutil.rmtree(case_path / "constant" / "polyMesh")
+    (case_path / MESH_DECOMPOSED_FILE).write_text("2\n")
+    assert has_poly_mesh(case_path)
+
+    surfaces = read_boundary_patches(case_path)
+    # Los procBoundary no son patches del caso
+    assert list(surfaces) == ["inlet", "outlet", "walls"]
+    assert surfaces["walls"].n_cells == 8
+    assert surfaces["outlet"].bounds[0] == pytest.approx(2.0)
+
+
+def test_case_without_mesh(tmp_path):
+    assert not has_poly_mesh(tmp_path)
+    with pytest.raises(FileHandlerError):
+        read_boundary_patches(tmp_path)
@@ -0,0 +1,48 @@
+import pytest
+import sys
+import os
+
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.file_handler.frame_renderer import (render_results, render_frames, select_times, write_mp4, FRAMES_DIR,
+                                            RENDERS_DIR)
+from src.file_handler.exceptions import FileHandlerError
+
+
+def test_select_times_by_range_and_stride():
+    times = ["0", "0.5", "1", "1.5", "2"]
+    assert select_times(times) == times
+    assert select_times(times, start=0.5, end=1.5) == ["0.5", "1", "1.5"]
+    assert select_times(times, start=0.5, stride=2) == ["0.5", "1.5"]
+
+
+def test_renders_image_grid_without_display(case_path):
+    output = render_results(case_path, "alpha.water", "grid", start=0.5, columns=2, window_size=(160, 120),
+                            workers=1)
+    assert output == case_path / RENDERS_DIR / "alpha.water_grid.png"
+    frames = sorted((case_path / RENDERS_DIR / FRAMES_DIR).iterdir())
+    assert [frame.name for frame in frames] == ["alpha.water_0000.png", "alpha.water_0001.png"]
+    # Dos tiempos en dos columnas
+    assert Image.open(output).size == (320, 120)
+
+    with pytest.raises(FileHandlerError):
+        render_results(case_path, "k", "grid")
+    with pytest.raises(FileHandlerError):
+        render_results(case_path, "alpha.water", "grid", start=5)
+
+
+def test_frames_split_between_processes_match_serial_render(case_path, tmp_path):
+    serial = render_frames(case_path, "alpha.water", tmp_path / "serial", window_size=(160, 120), workers=1)
+    parallel = render_frames(case_path, "alpha.water", tmp_path / "parallel", window_size=(160, 120), workers=2)
+    # Los cuadros quedan en el orden de los tiempos y con el mismo rango de colores
+    assert [frame.name for frame in parallel] == [frame.name for frame in serial]
+    for serial_frame, parallel_frame in zip(serial, parallel):
+        assert Image.open(parallel_frame).tobytes() == Image.open(serial_frame).tobytes()
+
+
+def test_mp4_requires_ffmpeg(tmp_path, monkeypatch):
+    monkeypatch.setattr("shutil.which", lambda name: None)
+    with pytest.raises(FileHandlerError):
+        write_mp4([tmp_path / "frame.png"], tmp_path / "video.mp4")
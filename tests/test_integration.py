@@ -82,9 +82,7 @@ class TestIntegration:
         cd_params = new_handler.get_editable_parameters(cd_path)
         assert cd_params['endTime']['current'] == 5.0
 
-    @patch("subprocess.Popen")
-    @patch("subprocess.run")
-    def test_docker_simulation_workflow(self, mock_run, mock_popen, setup_case):
+    def test_docker_simulation_workflow(self, setup_case):
         """
         Integration Test: FileHandler -> Docker Execution (Mocked)
         Verifies that the DockerHandler correctly constructs the command based on the case.
@@ -96,28 +94,47 @@ class TestIntegration:
         # Initialize DockerHandler
         docker_handler = DockerHandler(case_path=setup_case)
 
-        # Mock Popen context manager for execute_script_in_docker
-        process_mock = MagicMock()
-        process_mock.stdout.readline.side_effect = ["Starting simulation...", "Running...", ""]
-        process_mock.wait.return_value = 0
-        mock_popen.return_value = process_mock
+        # Mock the asyncio subprocess used by execute_script_in_docker
+        class FakeStdout:
+            def __init__(self, lines):
+                self.lines = [line.encode() + b"\n" for line in lines]
+
+            async def readline(self):
+                return self.lines.pop(0) if self.lines else b""
+
+        docker_calls = []
+
+        async def fake_create_subprocess_exec(*args, **kwargs):
+            docker_calls.append(args)
+            process_mock = MagicMock()
+            process_mock.stdout = FakeStdout(["Starting simulation...", "Running..."] if args[1] == "run" else [])
+
+            async def wait():
+                return 0
+
+            async def communicate():
+                return b"", b""
+
+            process_mock.wait = wait
+            process_mock.communicate = communicate
+            return process_mock
 
         # Run a script (e.g., run_openfoam.sh)
         script_name = "run_openfoam.sh"
-        generator = docker_handler.execute_script_in_docker(script_name, num_processors=4)
+        with patch("asyncio.create_subprocess_exec", side_effect=fake_create_subprocess_exec):
+            generator = docker_handler.execute_script_in_docker(script_name, num_processors=4)
 
-        # Consume the generator
-        output = list(generator)
+            # Consume the generator
+            output = list(generator)
 
         assert "Starting simulation..." in output
         assert "Running..." in output
 
-        # Verify Popen was called with correct arguments
-        assert mock_popen.called
-        args, kwargs = mock_popen.call_args
+        # Verify the container was started with correct arguments
+        assert docker_calls
 
-        # args[0] is the command list
-        cmd_list = args[0]
+        # The first call is the command list of `docker run`
+        cmd_list = docker_calls[0]
         assert cmd_list[0] == "docker"
         assert cmd_list[1] == "run"
 
@@ -126,7 +143,7 @@ class TestIntegration:
         assert any(expected_vol in arg for arg in cmd_list)
 
         # Check script name in container
-        assert f"/{script_name}" in cmd_list
+        assert f"/scripts/{script_name}" in cmd_list
 
         # Check num processors passed as argument
         assert cmd_list[-1] == "4"
@@ -0,0 +1,88 @@
+import pytest
+import asyncio
+import sys
+import os
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.docker_handler.backends import NativeBackend
+from src.docker_handler.dockerHandler import DockerHandler
+from src.docker_handler.mesh_pipeline import (plan_mesh_pipeline, run_mesh_pipeline, is_up_to_date,
+                                              ACTION_CURRENT, ACTION_RESTORE, ACTION_RUN)
+from src.file_handler.mesh_cache import reset_lineage, load_lineage, IMPORTED_NODE
+
+# Cada herramienta deja en 'points' qué diccionarios se aplicaron a la malla
+FAKE_MESHING = """
+blockMesh() { echo "blockMesh"; mkdir -p constant/polyMesh; cat system/blockMeshDict > constant/polyMesh/points; }
+snappyHexMesh() { echo "snappyHexMesh $*"; cat system/snappyHexMeshDict >> constant/polyMesh/points; }
+"""
+
+
+@pytest.fixture
+def handler(tmp_path: Path) -> DockerHandler:
+    case_path = tmp_path / "case"
+    (case_path / "system").mkdir(parents=True)
+    (case_path / "constant").mkdir()
+    (case_path / "system" / "blockMeshDict").write_text("block\n")
+    (case_path / "system" / "snappyHexMeshDict").write_text("snappy-1\n")
+    bashrc = tmp_path / "bashrc"
+    bashrc.write_text(FAKE_MESHING)
+    return DockerHandler(case_path, backend=NativeBackend(str(bashrc)))
+
+
+def run(handler, target):
+    lines = []
+    plan = plan_mesh_pipeline(handler.case_path, target)
+    result = asyncio.run(run_mesh_pipeline(handler.case_path, plan, handler, lines.append))
+    return plan, result, lines
+
+
+def points(handler):
+    return (handler.case_path / "constant" / "polyMesh" / "points").read_text()
+
+
+def test_snappy_change_does_not_rerun_block_mesh(handler):
+    _, result, _ = run(handler, 'blockMesh')
+    assert result['ran'] == ['blockMesh']
+
+    plan, result, _ = run(handler, 'snappyHexMesh')
+    assert [(s['node'], s['action']) for s in plan['steps']] == [('blockMesh', ACTION_CURRENT), ('snappyHexMesh', ACTION_RUN)]
+    assert points(handler) == "block\nsnappy-1\n"
+
+    # Solo cambia el snappyHexMeshDict: la malla de blockMesh sale de la caché
+    (handler.case_path / "system" / "snappyHexMeshDict").write_text("snappy-2\n")
+    (handler.case_path / "VTK" / "case_0").mkdir(parents=True)
+    plan, result, lines = run(handler, 'snappyHexMesh')
+    assert [(s['node'], s['action']) for s in plan['steps']] == [('blockMesh', ACTION_RESTORE), ('snappyHexMesh', ACTION_RUN)]
+    assert "blockMesh" not in lines
+    assert points(handler) == "block\nsnappy-2\n"
+    # Los resultados convertidos a VTK eran de la malla anterior
+    assert not (handler.case_path / "VTK").exists()
+
+    # Volver a la configuración anterior restaura la malla sin ejecutar nada
+    (handler.case_path / "system" / "snappyHexMeshDict").write_text("snappy-1\n")
+    plan, result, _ = run(handler, 'snappyHexMesh')
+    assert result['ran'] == []
+    assert points(handler) == "block\nsnappy-1\n"
+    assert is_up_to_date(plan_mesh_pipeline(handler.case_path, 'snappyHexMesh'))
+
+    # blockMeshDict nuevo: se vuelve a generar toda la cadena
+    (handler.case_path / "system" / "blockMeshDict").write_text("block-2\n")
+    plan = plan_mesh_pipeline(handler.case_path, 'snappyHexMesh')
+    assert [(s['node'], s['action']) for s in plan['steps']] == [('blockMesh', ACTION_RUN), ('snappyHexMesh', ACTION_RUN)]
+
+
+def test_mesh_from_outside_the_pipeline_is_the_starting_point(handler):
+    run(handler, 'blockMesh')
+    reset_lineage(handler.case_path)
+    (handler.case_path / "constant" / "polyMesh" / "points").write_text("imported\n")
+
+    plan, result, _ = run(handler, 'snappyHexMesh')
+    assert [(s['node'], s['action']) for s in plan['steps']] == [(IMPORTED_NODE, ACTION_CURRENT), ('snappyHexMesh', ACTION_RUN)]
+    assert points(handler) == "imported\nsnappy-1\n"
+
+    (handler.case_path / "system" / "snappyHexMeshDict").write_text("snappy-2\n")
+    run(handler, 'snappyHexMesh')
+    assert points(handler) == "imported\nsnappy-2\n"
+    assert [entry['node'] for entry in load_lineage(handler.case_path)] == [IMPORTED_NODE, 'snappyHexMesh']
@@ -0,0 +1,84 @@
+import pytest
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.docker_handler.run_progress import RunProgress, build_run_record, append_run_metadata, format_duration
+
+
+class FakeClock:
+    """Reloj controlable para simular el paso del tiempo de pared."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def feed_step(progress, clock, sim_time, delta_t, wall_step=1.0):
+    clock.now += wall_step
+    progress.feed_line(f"Courant Number mean: 0.01 max: 0.5")
+    progress.feed_line(f"deltaT = {delta_t}")
+    return progress.feed_line(f"Time = {sim_time}")
+
+
+def test_percent_throughput_and_eta():
+    """Percent, smoothed throughput and ETA follow the parsed simulation time."""
+    clock = FakeClock()
+    progress = RunProgress(end_time=1.0, clock=clock, window=5)
+
+    for i in range(1, 6):
+        assert feed_step(progress, clock, 0.01 * i, 0.01) is True
+
+    assert progress.current_time == pytest.approx(0.05)
+    assert progress.percent == pytest.approx(5.0)
+    assert progress.throughput == pytest.approx(0.01)
+    assert progress.eta_seconds == pytest.approx(95.0)
+    assert progress.max_courant == pytest.approx(0.5)
+    assert not progress.is_slowing_down
+
+
+def test_time_line_with_unit_suffix_and_execution_time():
+    """Accepts the 'Time = 0.1s' format and parses ExecutionTime/ClockTime."""
+    progress = RunProgress(end_time=1.0, clock=FakeClock())
+    assert progress.feed_line("Time = 0.1s") is True
+    assert progress.feed_line("ExecutionTime = 1.25 s  ClockTime = 2 s") is False
+    assert progress.current_time == pytest.approx(0.1)
+    assert progress.execution_time == pytest.approx(1.25)
+    assert progress.clock_time == pytest.approx(2.0)
+
+
+def test_delta_t_collapse_is_flagged():
+    """A deltaT collapse under adaptive time stepping is reported as a slowdown."""
+    clock = FakeClock()
+    progress = RunProgress(end_time=1.0, clock=clock, window=10)
+    for i in range(1, 5):
+        feed_step(progress, clock, 0.01 * i, 0.01)
+    feed_step(progress, clock, 0.0401, 0.0001)
+
+    reasons = progress.slowdown_reasons()
+    assert any("deltaT" in reason for reason in reasons)
+    assert "⚠" in progress.format_status()
+
+
+def test_run_metadata_is_appended(tmp_path):
+    """Each finished run is appended to run_metadata.json."""
+    clock = FakeClock()
+    progress = RunProgress(end_time=1.0, clock=clock)
+    feed_step(progress, clock, 0.5, 0.01)
+
+    append_run_metadata(tmp_path, build_run_record(progress, "run_openfoam.sh", 1, "success"))
+    append_run_metadata(tmp_path, build_run_record(progress, "run_openfoam_parallel.sh", 4, "stopped"))
+
+    data = json.loads((tmp_path / "run_metadata.json").read_text())
+    assert [run['num_processors'] for run in data['runs']] == [1, 4]
+    assert data['runs'][0]['reached_time'] == pytest.approx(0.5)
+    assert data['runs'][1]['status'] == "stopped"
+
+
+def test_format_duration():
+    assert format_duration(5) == "5s"
+    assert format_duration(125) == "2m05s"
+    assert format_duration(3725) == "1h02m05s"
@@ -0,0 +1,84 @@
+import pytest
+import sys
+import os
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.docker_handler.backends import NativeBackend
+from src.docker_handler.dockerHandler import DockerHandler
+from src.file_handler.run_restart import latest_complete_time, restart_env, INITIALIZED_FIELDS_DIR
+
+FAKE_OPENFOAM = """
+setFields() { echo "setFields"; echo "internalField nonuniform List<scalar> 2(0 1);" > 0/alpha.water; }
+foamDictionary() { echo "foamDictionary $*"; }
+interFoam() { echo "interFoam"; }
+"""
+
+
+@pytest.fixture
+def case_path(tmp_path: Path) -> Path:
+    case_path = tmp_path / "case"
+    (case_path / "0").mkdir(parents=True)
+    (case_path / "system").mkdir()
+    (case_path / "0" / "U").write_text("internalField uniform (0 0 0);")
+    (case_path / "0" / "alpha.water").write_text("internalField uniform 0;")
+    (case_path / "0" / "alpha.water.orig").write_text("internalField uniform 0;")
+    (case_path / "system" / "setFieldsDict").write_text("regions ();")
+    return case_path
+
+
+def write_time(root: Path, time: str, fields=("U", "alpha.water")):
+    (root / time).mkdir(parents=True)
+    for name in fields:
+        (root / time / name).write_text("internalField uniform 0;")
+
+
+def test_latest_complete_time_skips_partial_writes(case_path):
+    assert latest_complete_time(case_path) is None
+    write_time(case_path, "0.5")
+    write_time(case_path, "1")
+    # La corrida se detuvo mientras escribía t = 1.5
+    write_time(case_path, "1.5", fields=("U",))
+
+    assert latest_complete_time(case_path) == "1"
+    assert latest_complete_time(case_path, start_time=1.0) is None
+
+    for i in range(2):
+        write_time(case_path / f"processor{i}", "2")
+    (case_path / "processor1" / "2" / "alpha.water").write_text("")
+    assert latest_complete_time(case_path, decomposed=True) is None
+
+
+def test_initialization_runs_only_when_inputs_change(case_path, tmp_path):
+    bashrc = tmp_path / "bashrc"
+    bashrc.write_text(FAKE_OPENFOAM)
+    handler = DockerHandler(case_path, backend=NativeBackend(str(bashrc)))
+
+    lines = list(handler.execute_script_in_docker("run_openfoam.sh", env=restart_env(case_path)))
+    assert lines == ["setFieldsDict found. Running setFields...", "setFields", "interFoam"]
+    assert (case_path / INITIALIZED_FIELDS_DIR / "alpha.water").exists()
+
+    # La interfaz vuelve a escribir '0' igual que antes: se restauran los campos inicializados
+    (case_path / "0" / "alpha.water").write_text("internalField uniform 0;")
+    env = restart_env(case_path)
+    assert env["SKIP_INIT"] == "1"
+    lines = list(handler.execute_script_in_docker("run_openfoam.sh", env=env))
+    assert lines == ["Initial conditions unchanged. Restoring initialized fields.", "interFoam"]
+    assert "nonuniform" in (case_path / "0" / "alpha.water").read_text()
+
+    # Un cambio en setFieldsDict obliga a inicializar de nuevo
+    (case_path / "0" / "alpha.water").write_text("internalField uniform 0;")
+    (case_path / "system" / "setFieldsDict").write_text("regions ( boxToCell {} );")
+    assert "SKIP_INIT" not in restart_env(case_path)
+
+
+def test_resume_skips_initialization(case_path, tmp_path):
+    bashrc = tmp_path / "bashrc"
+    bashrc.write_text(FAKE_OPENFOAM)
+    handler = DockerHandler(case_path, backend=NativeBackend(str(bashrc)))
+    write_time(case_path, "0.5")
+
+    env = restart_env(case_path, latest_complete_time(case_path))
+    lines = list(handler.execute_script_in_docker("run_openfoam.sh", env=env))
+    assert lines == ["Resuming from time 0.5. Skipping field initialization.", "interFoam"]
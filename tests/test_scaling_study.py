@@ -0,0 +1,95 @@
+import pytest
+import asyncio
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.docker_handler.backends import FakeBackend
+from src.docker_handler.scaling_study import (core_counts, step_timings, seconds_per_step, analyze_scaling,
+                                              prepare_study_case, run_scaling_study, save_report,
+                                              STUDY_RESULTS_FILE, STUDY_DIR)
+from tests.test_decomposition_planner import write_box_mesh
+
+
+def solver_log(step_cost: float, steps: int = 6, startup: float = 1.0):
+    lines = []
+    for step in range(1, steps + 1):
+        lines += [f"Time = {step * 0.001:g}", "", f"ExecutionTime = {startup + step * step_cost:.4g} s  ClockTime = {int(startup + step * step_cost)} s"]
+    return lines
+
+
+def test_core_counts_and_step_timings():
+    assert core_counts(1) == [1]
+    assert core_counts(8) == [1, 2, 4, 8]
+    assert core_counts(6) == [1, 2, 4, 6]
+
+    timings = step_timings(solver_log(0.5))
+    assert len(timings) == 6
+    assert timings[0] == {'time': 0.001, 'execution_time': 1.5, 'clock_time': 1.0}
+    # Sin los pasos de arranque
+    assert seconds_per_step(timings) == pytest.approx(0.5)
+    assert seconds_per_step(timings[:2]) is None
+
+
+def test_best_core_count_keeps_minimum_efficiency():
+    report = analyze_scaling({1: 1.0, 2: 0.52, 4: 0.3, 8: 0.25})
+    assert [round(row['speedup'], 2) for row in report['rows']] == [1.0, 1.92, 3.33, 4.0]
+    assert report['rows'][3]['efficiency'] == pytest.approx(0.5)
+    # 8 núcleos es más rápido pero con 50% de eficiencia: se recomiendan 4
+    assert report['best_cores'] == 4
+
+
+def test_study_case_runs_a_few_steps_without_writing(tmp_path):
+    case_path = tmp_path / "case"
+    write_box_mesh(case_path, cells=(40, 10, 1), size=(4.0, 1.0, 0.1))
+    (case_path / "system").mkdir()
+    (case_path / "system" / "controlDict").write_text(
+        "startFrom       startTime;\nstartTime       0.5;\nendTime         10;\ndeltaT          0.01;\nwriteInterval   0.1;\n")
+
+    study_case = prepare_study_case(case_path, tmp_path / "np4", 20,
+                                    {'numberOfSubdomains': 4, 'method': ['scotch', {}]})
+    text = (study_case / "system" / "controlDict").read_text()
+    assert "endTime         0.7;" in text
+    assert "writeControl timeStep;" in text
+    assert "writeInterval   21;" in text
+    assert "numberOfSubdomains 4;" in " ".join((study_case / "system" / "decomposeParDict").read_text().split())
+
+
+def test_study_case_counts_writes_in_steps_with_fixed_time_step(tmp_path):
+    case_path = tmp_path / "case"
+    write_box_mesh(case_path, cells=(40, 10, 1), size=(4.0, 1.0, 0.1))
+    (case_path / "system").mkdir()
+    (case_path / "system" / "controlDict").write_text(
+        "startTime       0;\nendTime         1;\ndeltaT          0.001;\nwriteControl    timeStep;\n"
+        "writeInterval   100;\nadjustTimeStep  yes;\nmaxCo           0.5;\n")
+
+    study_case = prepare_study_case(case_path, tmp_path / "np2", 20,
+                                    {'numberOfSubdomains': 2, 'method': ['scotch', {}]})
+    text = (study_case / "system" / "controlDict").read_text()
+    assert "endTime         0.02;" in text
+    assert "writeControl    timeStep;" in text
+    assert "writeInterval   21;" in text
+    assert "adjustTimeStep  no;" in text
+
+
+def test_scaling_study_with_fake_backend(tmp_path):
+    case_path = tmp_path / "case"
+    write_box_mesh(case_path, cells=(40, 10, 1), size=(4.0, 1.0, 0.1))
+    (case_path / "system").mkdir()
+    (case_path / "0").mkdir()
+    (case_path / "system" / "controlDict").write_text("startTime 0;\nendTime 1;\ndeltaT 0.001;\nwriteInterval 0.1;\n")
+
+    backend = FakeBackend(steps_per_second=500, delta_t=0.001)
+    report = asyncio.run(run_scaling_study(case_path, "interFoam", [1, 2], steps=10, backend=backend))
+
+    assert [run['cores'] for run in report['runs']] == [1, 2]
+    assert all(run['time_steps'] == 10 for run in report['runs'])
+    assert report['best_cores'] in (1, 2)
+    assert report['recommended']['numberOfSubdomains'] == report['best_cores']
+    assert (case_path / STUDY_DIR / "np2.log").exists()
+    assert not (case_path / STUDY_DIR / "np2").exists()
+
+    save_report(case_path, report)
+    assert json.loads((case_path / STUDY_RESULTS_FILE).read_text())['steps'] == 10
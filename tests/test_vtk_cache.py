@@ -0,0 +1,84 @@
+import pytest
+import sys
+import os
+import time
+from pathlib import Path
+
+import pyvista as pv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.file_handler.vtk_cache import (CACHE_DIR, BOUNDARY_KIND, FILE_KIND, write_polydata, read_polydata,
+                                        prune_cache, read_vtk_file)
+from src.file_handler.foam_reader import read_boundary_patches
+from tests.foam_cases import write_row_mesh, HEADER
+
+
+@pytest.fixture
+def case_path(tmp_path: Path) -> Path:
+    case_path = tmp_path / "case"
+    (case_path / "system").mkdir(parents=True)
+    (case_path / "system" / "controlDict").write_text(HEADER.format(cls="dictionary", obj="controlDict"))
+    (case_path / "0").mkdir()
+    write_row_mesh(case_path / "constant" / "polyMesh", 0, 2,
+                   [("inlet", "left", "patch", ""), ("outlet", "right", "patch", ""), ("walls", "walls", "wall", "")])
+    return case_path
+
+
+def test_polydata_round_trip(tmp_path):
+    sphere = pv.Sphere()
+    sphere.cell_data["field"] = range(sphere.n_cells)
+    path = tmp_path / "cache" / "sphere.vtp"
+    write_polydata(sphere, path)
+
+    mesh = read_polydata(path)
+    assert mesh.n_cells == sphere.n_cells
+    assert list(mesh.cell_data["field"]) == list(range(sphere.n_cells))
+    # Sin restos del archivo temporal
+    assert [p.name for p in path.parent.iterdir()] == ["sphere.vtp"]
+    assert read_polydata(tmp_path / "missing.vtp") is None
+
+
+def test_boundary_read_is_cached_until_mesh_changes(case_path):
+    surfaces = read_boundary_patches(case_path)
+    entries = list((case_path / CACHE_DIR / BOUNDARY_KIND).iterdir())
+    assert len(entries) == 1
+
+    cached = read_boundary_patches(case_path)
+    assert list(cached) == list(surfaces)
+    assert [cached[name].n_cells for name in cached] == [1, 1, 8]
+    assert list(read_boundary_patches(case_path, ["outlet"])) == ["outlet"]
+
+    # Una malla nueva (más larga) no reutiliza la entrada anterior
+    os.rename(case_path / "constant" / "polyMesh", case_path / "old_polyMesh")
+    write_row_mesh(case_path / "constant" / "polyMesh", 0, 3,
+                   [("inlet", "left", "patch", ""), ("outlet", "right", "patch", ""), ("walls", "walls", "wall", "")])
+    surfaces = read_boundary_patches(case_path)
+    assert surfaces["walls"].n_cells == 12
+    assert surfaces["outlet"].bounds[0] == pytest.approx(3.0)
+    assert len(list((case_path / CACHE_DIR / BOUNDARY_KIND).iterdir())) == 2
+
+
+def test_prune_removes_least_recently_used(tmp_path):
+    root = tmp_path / CACHE_DIR
+    for number in range(3):
+        write_polydata(pv.Sphere(), root / FILE_KIND / f"{number}.vtp")
+        past = time.time() - 100 + number
+        os.utime(root / FILE_KIND / f"{number}.vtp", (past, past))
+    # Leer una entrada la marca como usada
+    read_polydata(root / FILE_KIND / "0.vtp")
+    size = (root / FILE_KIND / "0.vtp").stat().st_size
+
+    prune_cache(root, max_bytes=2 * size)
+    assert sorted(p.name for p in (root / FILE_KIND).iterdir()) == ["0.vtp", "2.vtp"]
+
+
+def test_legacy_vtk_file_is_converted_once(tmp_path):
+    path = tmp_path / "inlet.vtk"
+    pv.Sphere().save(path, binary=False)
+
+    mesh = read_vtk_file(str(path))
+    entries = list((tmp_path / CACHE_DIR / FILE_KIND).iterdir())
+    assert len(entries) == 1 and entries[0].suffix == ".vtp"
+    assert entries[0].stat().st_size < path.stat().st_size
+    assert read_vtk_file(str(path)).n_cells == mesh.n_cells == pv.Sphere().n_cells
@@ -0,0 +1,61 @@
+import pytest
+import sys
+import os
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.file_handler.vtk_conversion import (build_foamtovtk_args, plan_conversion, record_conversion,
+                                             foamtovtk_env, boundary_vtk_dir)
+
+
+@pytest.fixture
+def case_path(tmp_path: Path) -> Path:
+    case_path = tmp_path / "case"
+    for time in ("0", "0.5", "1"):
+        (case_path / time).mkdir(parents=True)
+    (case_path / "VTK" / "case_0" / "boundary").mkdir(parents=True)
+    return case_path
+
+
+def test_args_select_patches_fields_and_times():
+    assert build_foamtovtk_args() == ["-region", "region0", "-no-internal", "-no-fields"]
+    args = build_foamtovtk_args(patches=["inlet", "wall.*"], fields=["U", "p"], times=["0.5", "1"],
+                                include_internal=True)
+    assert args == ["-region", "region0", "-patches", "(inlet wall.*)", "-fields", "(U p)", "-time", "0.5,1"]
+
+
+def test_geometry_refresh_converts_only_first_time(case_path):
+    plan = plan_conversion(case_path)
+    assert plan['geometry_only']
+    assert plan['times'] == ["0"]
+    assert plan['num_processors'] == 1
+    assert foamtovtk_env(plan)["FOAMTOVTK_ARGS"] == "-region region0 -no-internal -no-fields -time 0"
+    assert boundary_vtk_dir(case_path) == case_path / "VTK" / "case_0" / "boundary"
+
+
+def test_new_times_only_skips_converted_times(case_path):
+    plan = plan_conversion(case_path, fields=["U"], new_times_only=True)
+    assert plan['times'] == ["0", "0.5", "1"]
+    record_conversion(case_path, plan)
+
+    (case_path / "1.5").mkdir()
+    plan = plan_conversion(case_path, fields=["U"], new_times_only=True)
+    assert plan['times'] == ["1.5"]
+    record_conversion(case_path, plan)
+    assert plan_conversion(case_path, fields=["U"], new_times_only=True) is None
+
+    # Otros campos son otra conversión
+    assert plan_conversion(case_path, fields=["U", "p"], new_times_only=True)['times'] == ["0", "0.5", "1", "1.5"]
+
+
+def test_decomposed_times_are_converted_in_parallel(case_path):
+    for i in range(2):
+        for time in ("0", "0.5", "1", "2"):
+            (case_path / f"processor{i}" / time).mkdir(parents=True)
+
+    plan = plan_conversion(case_path, fields=["U"], times=["2"])
+    assert plan['times'] == ["2"]
+    assert plan['num_processors'] == 2
+    # Un tiempo reconstruido se convierte en serie
+    assert plan_conversion(case_path, fields=["U"], times=["1"])['num_processors'] == 1